@@ -129,6 +129,25 @@ def load_config():
     config["MYSQL_PASSWORD"] = _get_env_value("MYSQL_PASSWORD", "qweqwe")
     config["MYSQL_DATABASE"] = _get_env_value("MYSQL_DATABASE", "pandaai_test")
 
+    # 本地行情缓存（为空时不启用）
+    config["QUOTATION_CACHE_DIR"] = _get_env_value("QUOTATION_CACHE_DIR", None)
+    config["QUOTATION_CACHE_MAX_BYTES"] = int(_get_env_value("QUOTATION_CACHE_MAX_BYTES", str(20 * 1024 ** 3)))
+
+    # 合约基础信息表快照目录（为空时使用本地行情缓存目录）与刷新周期（秒）
+    config["INSTRUMENT_SNAPSHOT_DIR"] = _get_env_value("INSTRUMENT_SNAPSHOT_DIR", None)
+    config["INSTRUMENT_REFRESH_SECONDS"] = int(_get_env_value("INSTRUMENT_REFRESH_SECONDS", "86400"))
+
+    # 策略日志写入：缓冲区条数上限、每批写入条数、最长缓存时间（秒）
+    # 积压时 DEBUG 日志的处理方式：keep 保留，drop 丢弃，sample 每 SR_LOG_DEBUG_SAMPLE_RATE 条保留一条
+    config["SR_LOG_BUFFER_SIZE"] = int(_get_env_value("SR_LOG_BUFFER_SIZE", "20000"))
+    config["SR_LOG_FLUSH_SIZE"] = int(_get_env_value("SR_LOG_FLUSH_SIZE", "500"))
+    config["SR_LOG_FLUSH_INTERVAL"] = float(_get_env_value("SR_LOG_FLUSH_INTERVAL", "1"))
+    config["SR_LOG_DEBUG_POLICY"] = _get_env_value("SR_LOG_DEBUG_POLICY", "sample")
+    config["SR_LOG_DEBUG_SAMPLE_RATE"] = int(_get_env_value("SR_LOG_DEBUG_SAMPLE_RATE", "10"))
+
+    # 实盘期货行情：是否订阅行情推送并缓存在交易进程内（关闭时每次从 Redis 读取）
+    config["FUTURE_QUOTE_PUSH_CACHE"] = str(_get_env_value("FUTURE_QUOTE_PUSH_CACHE", "true")).lower() == "true"
+
     return config
 
 
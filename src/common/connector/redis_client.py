@@ -117,6 +117,17 @@ class RedisClient:
             logger.error(f"Redis hget/hgetall 操作失败: {e}")
             return None
 
+    def setHashAndPublic(self, name: str, key, value, chan_pub: str):
+        """``HSET name key value`` 后把 value 发布到 chan_pub，两条命令通过 pipeline 一次往返发送"""
+        try:
+            pipe = self.client.pipeline(transaction=False)
+            pipe.hset(name, key, value)
+            pipe.publish(chan_pub, value)
+            return pipe.execute()
+        except RedisError as e:
+            logger.error(f"Redis hset/publish 操作失败: {e}")
+            return None
+
     def delHashRedis(self, name: str, *keys: str):
         """Delete one/many fields or the entire hash.
 
@@ -0,0 +1,64 @@
+import asyncio
+from types import SimpleNamespace
+
+import pytest
+
+from common.logging.user_log_buffer import SequenceAllocator, UserLogBuffer
+
+pytestmark = pytest.mark.asyncio
+
+
+class FakeCollection:
+    def __init__(self):
+        self.sequence = 0
+        self.insert_batches = []
+
+    async def find_one_and_update(self, query, update, upsert=False, return_document=False):
+        await asyncio.sleep(0)
+        self.sequence += update["$inc"]["sequence"]
+        return {"sequence": self.sequence}
+
+    async def insert_many(self, docs, ordered=True):
+        self.insert_batches.append(list(docs))
+        return SimpleNamespace(inserted_ids=[doc["_id"] for doc in docs])
+
+
+async def test_sequences_reserved_in_blocks():
+    collection = FakeCollection()
+    allocator = SequenceAllocator(lambda: collection, block_size=10)
+    sequence_list = await asyncio.gather(*[allocator.next_sequence("run") for _ in range(25)])
+    assert sorted(sequence_list) == list(range(1, 26))
+    assert allocator.reserve_count == 3
+
+
+async def test_buffer_flushes_on_size_and_interval():
+    collection = FakeCollection()
+    log_buffer = UserLogBuffer(lambda: collection, batch_size=3, flush_interval=0.05)
+    for i in range(4):
+        await log_buffer.add({"_id": str(i), "workflow_run_id": "run", "sequence": i + 1})
+    await log_buffer.add({"_id": "other", "workflow_run_id": "other_run", "sequence": 1})
+    assert [len(batch) for batch in collection.insert_batches] == [3]
+
+    await asyncio.sleep(0.2)
+    assert sorted(len(batch) for batch in collection.insert_batches) == [1, 1, 3]
+    stats = log_buffer.get_stats()
+    assert stats["inserted_count"] == 5 and stats["pending_count"] == 0
+
+
+async def test_failed_flush_keeps_records():
+    collection = FakeCollection()
+    insert_many = collection.insert_many
+
+    async def failing_insert_many(docs, ordered=True):
+        raise ConnectionError("mongo down")
+
+    collection.insert_many = failing_insert_many
+    log_buffer = UserLogBuffer(lambda: collection, batch_size=10, flush_interval=10)
+    await log_buffer.add({"_id": "0", "workflow_run_id": "run", "sequence": 1})
+    with pytest.raises(ConnectionError):
+        await log_buffer.flush("run")
+    await log_buffer.add({"_id": "1", "workflow_run_id": "run", "sequence": 2})
+
+    collection.insert_many = insert_many
+    assert await log_buffer.flush("run") == 2
+    assert [doc["_id"] for doc in collection.insert_batches[0]] == ["0", "1"]
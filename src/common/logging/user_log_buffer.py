@@ -0,0 +1,180 @@
+import asyncio
+import logging
+import time
+from typing import Any, Callable, Dict, List, Optional
+
+from pymongo.errors import BulkWriteError
+
+# MongoDB 重复主键错误码
+DUPLICATE_KEY_ERROR = 11000
+
+logger = logging.getLogger(__name__)
+
+
+async def insert_log_records(collection, records: List[Dict[str, Any]]) -> int:
+    """
+    批量插入日志记录（无序写入，单条失败不影响其余记录）
+    消息重投导致的重复主键视为已写入
+    """
+    if not records:
+        return 0
+    try:
+        result = await collection.insert_many(records, ordered=False)
+        return len(result.inserted_ids)
+    except BulkWriteError as e:
+        write_errors = e.details.get("writeErrors", [])
+        if any(error.get("code") != DUPLICATE_KEY_ERROR for error in write_errors):
+            raise
+        return e.details.get("nInserted", 0)
+
+
+class SequenceAllocator:
+    """
+    工作流日志序列号分配器
+    每次在 workflow_sequence_counters 中原子预留 block_size 个序列号，用完后再预留下一段，
+    同一进程内同一工作流的序列号保持递增
+    """
+
+    def __init__(self, counter_collection_getter: Callable[[], Any], block_size: int = 100):
+        self.counter_collection_getter = counter_collection_getter
+        self.block_size = max(1, int(block_size))
+        # {workflow_run_id: [下一个可用序列号, 已预留的最大序列号]}
+        self.range_dict: Dict[str, List[int]] = {}
+        self.lock_dict: Dict[str, asyncio.Lock] = {}
+        self.reserve_count = 0
+
+    async def next_sequence(self, workflow_run_id: str) -> int:
+        sequence_range = self.range_dict.get(workflow_run_id)
+        if sequence_range is None or sequence_range[0] > sequence_range[1]:
+            lock = self.lock_dict.setdefault(workflow_run_id, asyncio.Lock())
+            async with lock:
+                sequence_range = self.range_dict.get(workflow_run_id)
+                if sequence_range is None or sequence_range[0] > sequence_range[1]:
+                    sequence_range = await self._reserve(workflow_run_id)
+                    self.range_dict[workflow_run_id] = sequence_range
+        sequence = sequence_range[0]
+        sequence_range[0] += 1
+        return sequence
+
+    async def _reserve(self, workflow_run_id: str) -> List[int]:
+        counter_collection = self.counter_collection_getter()
+        result = await counter_collection.find_one_and_update(
+            {"workflow_run_id": workflow_run_id},
+            {"$inc": {"sequence": self.block_size}},
+            upsert=True,
+            return_document=True
+        )
+        self.reserve_count += 1
+        end = result["sequence"]
+        return [end - self.block_size + 1, end]
+
+    def release(self, workflow_run_id: str):
+        """工作流结束后释放本地缓存的序列号区间"""
+        self.range_dict.pop(workflow_run_id, None)
+        self.lock_dict.pop(workflow_run_id, None)
+
+
+class UserLogBuffer:
+    """
+    用户日志写入缓冲区
+    按 workflow_run_id 缓存日志记录，单个工作流缓存满 batch_size 条或最早一条缓存超过 flush_interval 秒时，
+    以 insert_many 一次写入；写入串行执行，保证同一工作流的日志按序列号顺序落库
+    """
+
+    def __init__(self, collection_getter: Callable[[], Any], batch_size: int = 200, flush_interval: float = 0.5):
+        self.collection_getter = collection_getter
+        self.batch_size = max(1, int(batch_size))
+        self.flush_interval = float(flush_interval)
+        # {workflow_run_id: [记录, ...]}，以及对应记录加入缓冲区的时间
+        self.buffer_dict: Dict[Optional[str], List[Dict[str, Any]]] = {}
+        self.add_time_dict: Dict[Optional[str], List[float]] = {}
+        self._write_lock = asyncio.Lock()
+        self._flush_task: Optional[asyncio.Task] = None
+        self.queued_count = 0
+        self.inserted_count = 0
+        self.flush_count = 0
+        self.flush_time = 0.0
+        self.latency_sum = 0.0
+        self.latency_count = 0
+        self.max_latency = 0.0
+
+    async def add(self, record: Dict[str, Any]):
+        workflow_run_id = record.get("workflow_run_id")
+        self.buffer_dict.setdefault(workflow_run_id, []).append(record)
+        self.add_time_dict.setdefault(workflow_run_id, []).append(time.perf_counter())
+        self.queued_count += 1
+        self._ensure_flush_task()
+        if len(self.buffer_dict[workflow_run_id]) >= self.batch_size:
+            await self.flush(workflow_run_id)
+
+    async def flush(self, workflow_run_id: Optional[str] = None, all_runs: bool = False) -> int:
+        """
+        写入缓存的日志
+        :param workflow_run_id: 要写入的工作流，all_runs 为 True 时写入全部工作流
+        """
+        if all_runs:
+            run_id_list = list(self.buffer_dict.keys())
+        else:
+            run_id_list = [workflow_run_id]
+        inserted = 0
+        for run_id in run_id_list:
+            inserted += await self._flush_run(run_id)
+        return inserted
+
+    async def _flush_run(self, workflow_run_id: Optional[str]) -> int:
+        async with self._write_lock:
+            records = self.buffer_dict.pop(workflow_run_id, None)
+            add_time_list = self.add_time_dict.pop(workflow_run_id, None)
+            if not records:
+                return 0
+            collection = self.collection_getter()
+            if collection is None:
+                logger.warning(f"MongoDB not connected, dropped {len(records)} user logs")
+                return 0
+            start_time = time.perf_counter()
+            try:
+                inserted = await insert_log_records(collection, records)
+            except Exception:
+                # 写入失败时放回缓冲区头部，由下一次写入重试（已写入的记录重试时按重复主键跳过）
+                self.buffer_dict[workflow_run_id] = records + self.buffer_dict.get(workflow_run_id, [])
+                self.add_time_dict[workflow_run_id] = add_time_list + self.add_time_dict.get(workflow_run_id, [])
+                self._ensure_flush_task()
+                raise
+            end_time = time.perf_counter()
+            self.flush_count += 1
+            self.flush_time += end_time - start_time
+            self.inserted_count += inserted
+            self.latency_count += len(add_time_list)
+            for add_time in add_time_list:
+                latency = end_time - add_time
+                self.latency_sum += latency
+                if latency > self.max_latency:
+                    self.max_latency = latency
+            return inserted
+
+    def _ensure_flush_task(self):
+        if self._flush_task is None or self._flush_task.done():
+            self._flush_task = asyncio.get_running_loop().create_task(self._flush_loop())
+
+    async def _flush_loop(self):
+        """定时写入缓存时间超过 flush_interval 的日志"""
+        while self.buffer_dict:
+            await asyncio.sleep(self.flush_interval)
+            now = time.perf_counter()
+            for workflow_run_id, add_time_list in list(self.add_time_dict.items()):
+                if add_time_list and now - add_time_list[0] >= self.flush_interval:
+                    try:
+                        await self._flush_run(workflow_run_id)
+                    except Exception as e:
+                        logger.error(f"Failed to flush user logs, workflow_run_id: {workflow_run_id}, error: {e}")
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            "queued_count": self.queued_count,
+            "inserted_count": self.inserted_count,
+            "pending_count": sum(len(records) for records in self.buffer_dict.values()),
+            "flush_count": self.flush_count,
+            "flush_time": self.flush_time,
+            "avg_latency": self.latency_sum / max(self.latency_count, 1),
+            "max_latency": self.max_latency,
+        }
@@ -1,6 +1,6 @@
 from datetime import datetime
 import logging
-from typing import Optional, Any
+from typing import Optional, Any, Dict
 from pydantic import BaseModel, Field
 from bson import ObjectId
 from panda_server.utils.time_utils import get_beijing_time
@@ -23,6 +23,7 @@ class UserLog(BaseModel):
     - work_node_id: 工作节点ID（可选）
     - sequence: 日志在同一workflow中的序列号，用于排序和分页
     - workflow_id: 工作流ID
+    - progress: 节点进度（fraction 0-1、eta 预计剩余秒数、message），仅进度日志有
     """
     id: str = Field(default_factory=lambda: str(ObjectId()), alias="_id")
     user_id: str
@@ -35,6 +36,7 @@ class UserLog(BaseModel):
     sequence: int = Field(default=0, description="日志在同一workflow中的序列号，从1开始自增，0表示待自动分配")
     workflow_id: Optional[str] = None
     error_detail: Optional[Any] = None
+    progress: Optional[Dict[str, Any]] = None
 
     class Config:
         populate_by_name = True
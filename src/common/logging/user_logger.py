@@ -6,19 +6,35 @@ from bson import ObjectId
 import asyncio
 import json
 from .user_log_model import UserLog
+from .user_log_buffer import SequenceAllocator, UserLogBuffer
 from panda_server.config.database import mongodb
 from panda_server.config.env import (
     RUN_MODE,
     WORKFLOW_EXCHANGE_NAME,
     WORKFLOW_LOG_ROUTING_KEY,
+    USER_LOG_BATCH_SIZE,
+    USER_LOG_FLUSH_INTERVAL,
+    USER_LOG_SEQUENCE_BLOCK,
 )
 
 
+def _get_logs_collection():
+    return mongodb.db["workflow_logs"] if mongodb.db is not None else None
+
+
+def _get_counter_collection():
+    return mongodb.db["workflow_sequence_counters"]
+
+
 class UserLogger:
     """用户日志记录器（统一处理日志记录和存储）"""
     
     # 类级别的共享RabbitMQ实例，避免频繁创建连接
     _shared_rabbitmq = None
+    # 类级别共享的序列号分配器与日志写入缓冲区（按事件循环创建）
+    _sequence_allocator = None
+    _log_buffer = None
+    _log_buffer_loop = None
     
     def __init__(self, user_id: str, workflow_run_id: Optional[str] = None, work_node_id: Optional[str] = None):
         self.user_id = user_id
@@ -37,18 +53,23 @@ class UserLogger:
                 cls._shared_rabbitmq = AsyncRabbitMQ()
         return cls._shared_rabbitmq
     
+    @classmethod
+    def _get_log_buffer(cls) -> UserLogBuffer:
+        """获取当前事件循环的日志写入缓冲区"""
+        loop = asyncio.get_running_loop()
+        if cls._log_buffer is None or cls._log_buffer_loop is not loop:
+            cls._log_buffer = UserLogBuffer(_get_logs_collection, int(USER_LOG_BATCH_SIZE),
+                                            float(USER_LOG_FLUSH_INTERVAL))
+            cls._sequence_allocator = SequenceAllocator(_get_counter_collection, int(USER_LOG_SEQUENCE_BLOCK))
+            cls._log_buffer_loop = loop
+        return cls._log_buffer
+
     async def _get_next_sequence(self, workflow_run_id: str) -> int:
-        """获取指定workflow的下一个序列号（使用原子操作确保并发安全）"""
+        """获取指定workflow的下一个序列号（按块原子预留，确保并发安全）"""
         if mongodb.db is None:
             return 0
-        counter_collection = mongodb.db["workflow_sequence_counters"]
-        result = await counter_collection.find_one_and_update(
-            {"workflow_run_id": workflow_run_id},
-            {"$inc": {"sequence": 1}},  # 原子递增，第一次会从0变成1
-            upsert=True,
-            return_document=True  # 返回更新后的文档
-        )
-        return result["sequence"]
+        self._get_log_buffer()
+        return await self._sequence_allocator.next_sequence(workflow_run_id)
     
     async def _publish_to_queue(self, user_log: UserLog):
         """将user_log发送到队列"""
@@ -65,7 +86,7 @@ class UserLogger:
                 "content": user_log.model_dump(by_alias=True, mode='json')
             })
             
-            self.sys_logger.info(f"将user_log消息加入rabbitMQ队列: {user_log.workflow_run_id}")
+            self.sys_logger.debug(f"将user_log消息加入rabbitMQ队列: {user_log.workflow_run_id}")
             
             await rabbit_mq.publish(
                 exchange_name=WORKFLOW_EXCHANGE_NAME,
@@ -80,22 +101,20 @@ class UserLogger:
             self.sys_logger.error(f"Failed to publish user_log to queue, fallback to direct insert: {e}")
             try:
                 if mongodb.db is not None:
-                    collection = mongodb.db["workflow_logs"]
-                    await collection.insert_one(user_log.model_dump(by_alias=True))
-                    self.sys_logger.debug(f"User log inserted to database directly as fallback")
+                    await self._get_log_buffer().add(user_log.model_dump(by_alias=True))
+                    self.sys_logger.debug(f"User log buffered for direct insert as fallback")
             except Exception as db_error:
                 self.sys_logger.error(f"Failed to insert user_log to database as fallback: {db_error}")
         # 不关闭连接，让共享实例保持连接复用
     
     async def _insert_to_database(self, user_log: UserLog):
-        """直接插入数据库"""
+        """写入数据库（经缓冲区按批量写入）"""
         if mongodb.db is None:
             self.sys_logger.warning("MongoDB not connected, cannot insert user log")
             return
-        collection = mongodb.db["workflow_logs"]
-        return await collection.insert_one(user_log.model_dump(by_alias=True))
+        await self._get_log_buffer().add(user_log.model_dump(by_alias=True))
     
-    async def _log(self, level: str, message: str, workflow_id: Optional[str] = None, work_node_id: Optional[str] = None, error_detail: Optional[str] = None, **kwargs):
+    async def _log(self, level: str, message: str, workflow_id: Optional[str] = None, work_node_id: Optional[str] = None, error_detail: Optional[str] = None, progress: Optional[Dict[str, Any]] = None, **kwargs):
         """内部日志记录方法（直接处理所有逻辑）"""
         if mongodb.db is None:
             # 数据库不可用，只记录到系统日志
@@ -111,7 +130,8 @@ class UserLogger:
             message=message,
             type="workflow_run",
             workflow_id=workflow_id,
-            error_detail=error_detail
+            error_detail=error_detail,
+            progress=progress,
         )
         
         # 如果有workflow_run_id且sequence为0，自动生成序列号
@@ -120,20 +140,20 @@ class UserLogger:
         
         try:
             # 添加调试日志
-            self.sys_logger.info(f"Current RUN_MODE: {RUN_MODE}, workflow_run_id: {user_log.workflow_run_id}")
+            self.sys_logger.debug(f"Current RUN_MODE: {RUN_MODE}, workflow_run_id: {user_log.workflow_run_id}")
             
             # 根据运行模式选择处理方式
             if RUN_MODE == "CLOUD":
                 # CLOUD模式：通过队列存储到数据库
-                self.sys_logger.info(f"CLOUD mode: publishing to queue")
+                self.sys_logger.debug(f"CLOUD mode: publishing to queue")
                 await self._publish_to_queue(user_log)
             elif RUN_MODE == "LOCAL":
                 # LOCAL模式：直接存储到数据库
-                self.sys_logger.info(f"LOCAL mode: inserting to database directly")
+                self.sys_logger.debug(f"LOCAL mode: inserting to database directly")
                 await self._insert_to_database(user_log)
             else:
                 # 其他模式：直接存数据库（fallback）
-                self.sys_logger.info(f"Other mode ({RUN_MODE}): inserting to database directly")
+                self.sys_logger.debug(f"Other mode ({RUN_MODE}): inserting to database directly")
                 await self._insert_to_database(user_log)
         except Exception as e:
             # 日志记录失败不应该影响主流程，记录到系统日志
@@ -155,9 +175,27 @@ class UserLogger:
     async def critical(self, message: str, workflow_id: Optional[str] = None, work_node_id: Optional[str] = None, **kwargs):
         await self._log("CRITICAL", message, workflow_id, work_node_id, **kwargs)
     
+    @classmethod
+    async def flush(cls, workflow_run_id: Optional[str] = None):
+        """
+        立即写入缓冲区中的日志（工作流结束时调用）
+        :param workflow_run_id: 只写入该工作流的日志并释放其序列号区间，为 None 时写入全部
+        """
+        if cls._log_buffer is None or cls._log_buffer_loop is not asyncio.get_running_loop():
+            return
+        try:
+            if workflow_run_id is None:
+                await cls._log_buffer.flush(all_runs=True)
+            else:
+                await cls._log_buffer.flush(workflow_run_id)
+                cls._sequence_allocator.release(workflow_run_id)
+        except Exception as e:
+            logging.getLogger(__name__).error(f"Failed to flush user logs: {e}")
+
     @classmethod
     async def shutdown(cls):
-        """关闭共享的RabbitMQ连接（应用退出时调用）"""
+        """写入缓冲区中的日志并关闭共享的RabbitMQ连接（应用退出时调用）"""
+        await cls.flush()
         if cls._shared_rabbitmq is not None:
             try:
                 await cls._shared_rabbitmq.close()
@@ -0,0 +1,39 @@
+import pytest
+
+from common.utils.trade_calendar import TradeCalendar
+
+DATE_LIST = ['20240102', '20240103', '20240104', '20240105', '20240108']
+
+
+def test_ordinal_lookups_match_list_index():
+    calendar = TradeCalendar(DATE_LIST)
+    assert calendar.get_next_count_date('20240103', 2) == '20240105'
+    assert calendar.get_next_count_date('20240102', -1) == '99990101'
+    assert calendar.get_next_count_date('20240108', 1) == '99990101'
+    assert calendar.get_date_distance('20240103', '20240108') == 3
+    assert '20240106' not in calendar
+    with pytest.raises(ValueError):
+        calendar.get_next_count_date('20240106', 1)
+
+
+def test_next_and_pre_date_for_non_trading_days():
+    calendar = TradeCalendar(DATE_LIST)
+    assert calendar.get_next_date('20240105') == '20240108'
+    assert calendar.get_next_date('20240106') == '20240108'
+    assert calendar.get_next_date(20240105, include=True) == '20240105'
+    assert calendar.get_pre_date('20240106') == '20240105'
+    assert calendar.get_pre_date('20240102') is None
+    assert calendar.get_date_range('20240101', '20240104') == ['20240102', '20240103', '20240104']
+
+
+def test_process_wide_calendar_is_loaded_once():
+    TradeCalendar.clear()
+    call_list = list()
+
+    def loader():
+        call_list.append(1)
+        return DATE_LIST
+
+    assert TradeCalendar.get_calendar('SH', loader) is TradeCalendar.get_calendar('SH', loader)
+    assert len(call_list) == 1
+    TradeCalendar.clear()
@@ -0,0 +1,132 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+# @File   : trade_calendar.py
+# @desc   : 交易日历，按序号索引交易日，进程内按交易所缓存
+import bisect
+import threading
+import time
+
+from common.config.config import config
+
+# 进程内缓存的交易日历超过该时长（秒）后重新加载
+CALENDAR_REFRESH_SECONDS = 24 * 3600
+
+# 超出日历范围时 get_next_count_date 的返回值，与原有逻辑一致
+OUT_OF_RANGE_DATE = '99990101'
+
+
+class TradeCalendar(object):
+    """
+    有序日期列表（YYYYMMDD 字符串）：
+    日期 -> 序号用 dict，序号 -> 日期用列表下标，非列表内日期的前后交易日用二分查找。
+    """
+
+    _calendar_dict = dict()
+    _lock = threading.Lock()
+
+    def __init__(self, date_list):
+        self.date_list = [str(date) for date in date_list]
+        self.ordinal_dict = {date: i for i, date in enumerate(self.date_list)}
+        self.load_time = time.time()
+
+    def __len__(self):
+        return len(self.date_list)
+
+    def __contains__(self, date):
+        return str(date) in self.ordinal_dict
+
+    def __iter__(self):
+        return iter(self.date_list)
+
+    def ordinal(self, date):
+        """
+        日期在日历中的序号，日期不在日历中时与 list.index 一样抛出 ValueError
+        """
+        try:
+            return self.ordinal_dict[str(date)]
+        except KeyError:
+            raise ValueError('%s is not in trade calendar' % date)
+
+    def date_at(self, ordinal):
+        return self.date_list[ordinal]
+
+    def get_next_count_date(self, date, count):
+        """
+        date 之后第 count 个日期（count 为负数时向前），超出日历范围返回 99990101
+        """
+        ordinal = self.ordinal(date) + count
+        if ordinal >= len(self.date_list) or ordinal < 0:
+            return OUT_OF_RANGE_DATE
+        return self.date_list[ordinal]
+
+    def get_date_distance(self, start_date, end_date):
+        return self.ordinal(end_date) - self.ordinal(start_date)
+
+    def get_next_date(self, date, include=False):
+        """
+        date 之后（include 为 True 时含当天）的第一个日期，date 可以不在日历中，没有时返回 None
+        """
+        date = str(date)
+        if include:
+            ordinal = bisect.bisect_left(self.date_list, date)
+        else:
+            ordinal = bisect.bisect_right(self.date_list, date)
+        if ordinal >= len(self.date_list):
+            return None
+        return self.date_list[ordinal]
+
+    def get_pre_date(self, date, include=False):
+        """
+        date 之前（include 为 True 时含当天）的最后一个日期，date 可以不在日历中，没有时返回 None
+        """
+        date = str(date)
+        if include:
+            ordinal = bisect.bisect_right(self.date_list, date) - 1
+        else:
+            ordinal = bisect.bisect_left(self.date_list, date) - 1
+        if ordinal < 0:
+            return None
+        return self.date_list[ordinal]
+
+    def get_date_range(self, start_date, end_date):
+        """
+        [start_date, end_date] 内的日期，首尾可以不在日历中
+        """
+        start = bisect.bisect_left(self.date_list, str(start_date))
+        end = bisect.bisect_right(self.date_list, str(end_date))
+        return self.date_list[start:end]
+
+    @classmethod
+    def get_calendar(cls, name, loader):
+        """
+        进程内按名称缓存的日历，首次获取或超过 CALENDAR_REFRESH_SECONDS 后调用 loader 加载
+        :param name: 日历名称，如交易所代码
+        :param loader: 无参函数，返回升序日期列表
+        """
+        calendar = cls._calendar_dict.get(name)
+        if calendar is None or time.time() - calendar.load_time > CALENDAR_REFRESH_SECONDS:
+            with cls._lock:
+                calendar = cls._calendar_dict.get(name)
+                if calendar is None or time.time() - calendar.load_time > CALENDAR_REFRESH_SECONDS:
+                    calendar = TradeCalendar(loader())
+                    cls._calendar_dict[name] = calendar
+        return calendar
+
+    @classmethod
+    def get_exchange_calendar(cls, mongo_db, exchange='SH'):
+        """
+        交易所交易日历（trade_calendar 集合）
+        :param mongo_db: DatabaseHandler
+        """
+        def loader():
+            docs = mongo_db.mongo_find(config['MONGO_DB'], collection_name="trade_calendar",
+                                       query={'is_trade': 1, 'exchange': exchange},
+                                       sort="nature_date", projection={'_id': 0, 'nature_date': 1})
+            return sorted(set(str(doc["nature_date"]) for doc in docs))
+
+        return cls.get_calendar('trade_calendar:' + exchange, loader)
+
+    @classmethod
+    def clear(cls):
+        with cls._lock:
+            cls._calendar_dict.clear()
@@ -203,6 +203,30 @@ def subscribe(symbol_list):
     context = CoreContext.get_instance()
     return context.operation_proxy.subscribe(symbol_list)
 
+@append_to_api_list
+def history_bars(symbol, n, fields=None, frequency=None):
+    """
+    获取合约最近 n 条 bar（含当前 bar），按时间升序
+    合约在 subscribe 或首次调用 history_bars 后开始缓存，最多缓存 run_info.history_bar_size 条
+    :param symbol: 合约
+    :param n: bar 条数，缓存不足 n 条时返回已有的全部
+    :param fields: None 返回全部字段（open, high, low, close, volume, turnover, oi, settlement）的二维数组；
+                   字符串返回该字段的一维数组；列表返回对应字段的二维数组
+    :param frequency: bar 频率，默认回测频率，目前仅支持与回测频率一致
+    :return: 只读 numpy.ndarray
+    """
+    context = CoreContext.get_instance()
+    return context.operation_proxy.history_bars(symbol, n, fields, frequency)
+
+@append_to_api_list
+def rolling_window(symbol, field, window):
+    """
+    合约某字段的增量滚动统计，随 bar 推送自动更新
+    :return: RollingWindow，属性 mean、std、max、min、ready
+    """
+    context = CoreContext.get_instance()
+    return context.operation_proxy.rolling_window(symbol, field, window)
+
 @append_to_api_list
 def export_data_to_file(data_frame):
     if not isinstance(data_frame, pandas.DataFrame):
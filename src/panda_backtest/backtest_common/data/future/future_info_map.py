@@ -12,12 +12,33 @@ from panda_backtest.backtest_common.data.future.base_future_info_map import Base
 import re
 from common.connector.mongodb_handler import DatabaseHandler
 from common.config.config import config
+from panda_backtest.data.quotation.instrument_registry import InstrumentRegistry
+
+FUTURE_INFO_PROJECTION = {'emcode': 1, 'name': 1, 'ftmktsname': 1, 'deliverydate': 1, 'starttradedate': 1,
+                          'lasttradedate': 1, 'emcodetype': 1, 'contractmul': 1, 'listdate': 1,
+                          'fttransmargin': 1, 'ftfirsttransmargin': 1, 'ftpricelimit': 1,
+                          'ftminpricechg': 1}
 
 @singleton
 class FutureInfoMap(BaseFutureInfoMap):
     def __init__(self, quotation_mongo_db):
         self._cache = {}
         self.quotation_mongo_db = quotation_mongo_db
+        # 启动时一次加载全部期货合约信息（按 symbolcode 索引），表中没有的合约再单独查询
+        self.registry = InstrumentRegistry('panda.future_info', self.load_all, 'symbolcode')
+
+    def load_all(self):
+        projection = dict(FUTURE_INFO_PROJECTION, _id=0, symbolcode=1)
+        instrument_info_list = list()
+        for instrument_info in self.quotation_mongo_db.mongo_find("panda", collection_name="future_info", query={},
+                                                                  projection=projection):
+            try:
+                normalize_future_info(instrument_info)
+            except Exception:
+                # 字段格式异常的合约不放入表中，取用时按单个合约查询处理
+                continue
+            instrument_info_list.append(instrument_info)
+        return instrument_info_list
 
     def __getitem__(self, key):
         if not isinstance(key, six.string_types):
@@ -26,20 +47,19 @@ class FutureInfoMap(BaseFutureInfoMap):
             instrument_info['name'] = '未知'
             return instrument_info
 
+        instrument_info = self.registry.get(key.split(".")[0])
+        if instrument_info is not None:
+            return instrument_info
+
         try:
             return self._cache[key]
         except KeyError:
 
             collection="future_info"
             instrument_info =  self.quotation_mongo_db.mongo_find_one(db_name="panda",collection_name=collection,query=
-                {'symbolcode': str(key.split(".")[0])}, projection={'emcode': 1, 'name': 1, 'ftmktsname': 1, 'deliverydate': 1, 'starttradedate': 1,
-                                       'lasttradedate': 1, 'emcodetype': 1, 'contractmul': 1, 'listdate': 1,
-                                       'fttransmargin': 1, 'ftfirsttransmargin': 1, 'ftpricelimit': 1,
-                                       'ftminpricechg': 1})
+                {'symbolcode': str(key.split(".")[0])}, projection=FUTURE_INFO_PROJECTION)
             if instrument_info:
-                instrument_info['ftfirsttransmargin'] = extract_number(instrument_info['ftfirsttransmargin'])
-                # instrument_info['emcode'] = key
-                instrument_info['ftminpricechg'] = re.search(r"\d+(\.\d+)?", instrument_info['ftminpricechg']).group()
+                normalize_future_info(instrument_info)
                 self._cache[key] = instrument_info
                 return instrument_info
             else:
@@ -79,6 +99,12 @@ class FutureInfoMap(BaseFutureInfoMap):
                 self._cache[key] = instrument_info
                 return instrument_info
 
+def normalize_future_info(instrument_info):
+    instrument_info['ftfirsttransmargin'] = extract_number(instrument_info['ftfirsttransmargin'])
+    # instrument_info['emcode'] = key
+    instrument_info['ftminpricechg'] = re.search(r"\d+(\.\d+)?", instrument_info['ftminpricechg']).group()
+    return instrument_info
+
 def extract_number(ftfirsttransmargin):
     """
     从 instrument_info 中指定的键值中提取符合条件的数字。
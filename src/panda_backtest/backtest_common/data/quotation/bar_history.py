@@ -0,0 +1,227 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+# @File   : bar_history.py
+# @desc   : 历史 bar 缓存，按合约维护定长环形缓冲区，供 history_bars 及滚动统计使用
+import math
+from collections import deque
+
+import numpy as np
+
+# history_bars 可取的字段，对应缓冲区的列
+BAR_FIELDS = ('open', 'high', 'low', 'close', 'volume', 'turnover', 'oi', 'settlement')
+BAR_FIELD_INDEX = {field: i for i, field in enumerate(BAR_FIELDS)}
+
+
+class BarRingBuffer(object):
+    """
+    定长环形缓冲区：数据存两份（[0, capacity) 与 [capacity, 2 * capacity)），
+    最近 n 条 bar 总是 data 中一段连续区间，window 直接返回视图，不拷贝。
+    """
+
+    def __init__(self, capacity, field_count=len(BAR_FIELDS)):
+        self.capacity = capacity
+        self.data = np.full((2 * capacity, field_count), np.nan)
+        self.time_data = np.zeros(2 * capacity, dtype='datetime64[s]')
+        self.pos = 0
+        self.size = 0
+
+    def __len__(self):
+        return self.size
+
+    def append(self, row, bar_time):
+        pos = self.pos
+        self.data[pos] = row
+        self.data[pos + self.capacity] = row
+        self.time_data[pos] = bar_time
+        self.time_data[pos + self.capacity] = bar_time
+        self.pos = (pos + 1) % self.capacity
+        if self.size < self.capacity:
+            self.size += 1
+
+    def window(self, n):
+        """
+        最近 n 条 bar（按时间升序），只读视图，不足 n 条时返回已有的全部
+        """
+        n = min(n, self.size)
+        end = self.pos + self.capacity
+        view = self.data[end - n:end]
+        view.flags.writeable = False
+        return view
+
+    def time_window(self, n):
+        n = min(n, self.size)
+        end = self.pos + self.capacity
+        view = self.time_data[end - n:end]
+        view.flags.writeable = False
+        return view
+
+
+class RollingWindow(object):
+    """
+    增量滚动统计：每个新值 O(1) 更新均值、标准差（样本标准差，与 pandas rolling().std() 一致），
+    最大值、最小值用单调队列维护，均摊 O(1)。
+    """
+
+    def __init__(self, window):
+        self.window = window
+        self.values = deque()
+        self.value_sum = 0.0
+        self.square_sum = 0.0
+        self.max_queue = deque()
+        self.min_queue = deque()
+        self.count = 0
+
+    def update(self, value):
+        if value is None or math.isnan(value):
+            return
+        self.values.append(value)
+        self.value_sum += value
+        self.square_sum += value * value
+        while len(self.max_queue) > 0 and self.max_queue[-1][1] <= value:
+            self.max_queue.pop()
+        self.max_queue.append((self.count, value))
+        while len(self.min_queue) > 0 and self.min_queue[-1][1] >= value:
+            self.min_queue.pop()
+        self.min_queue.append((self.count, value))
+        self.count += 1
+
+        if len(self.values) > self.window:
+            old_value = self.values.popleft()
+            self.value_sum -= old_value
+            self.square_sum -= old_value * old_value
+        expire = self.count - self.window
+        if self.max_queue[0][0] < expire:
+            self.max_queue.popleft()
+        if self.min_queue[0][0] < expire:
+            self.min_queue.popleft()
+
+        # 累加和在长时间滚动后会积累浮点误差，每滚动一个窗口重新求和一次
+        if self.count % self.window == 0:
+            self.value_sum = math.fsum(self.values)
+            self.square_sum = math.fsum(v * v for v in self.values)
+
+    @property
+    def ready(self):
+        return len(self.values) == self.window
+
+    @property
+    def mean(self):
+        if len(self.values) == 0:
+            return np.nan
+        return self.value_sum / len(self.values)
+
+    @property
+    def std(self):
+        n = len(self.values)
+        if n < 2:
+            return np.nan
+        variance = (self.square_sum - self.value_sum * self.value_sum / n) / (n - 1)
+        return math.sqrt(max(variance, 0.0))
+
+    @property
+    def max(self):
+        if len(self.max_queue) == 0:
+            return np.nan
+        return self.max_queue[0][1]
+
+    @property
+    def min(self):
+        if len(self.min_queue) == 0:
+            return np.nan
+        return self.min_queue[0][1]
+
+
+class BarHistory(object):
+    """
+    按合约缓存最近 capacity 条 bar。
+    只记录登记过的合约（subscribe 或首次调用 history_bars 时登记），
+    引擎每次 handle_bar 前调用 on_bar 从 bar_dict 取当前 bar 追加，同一时间点只追加一次。
+    """
+
+    def __init__(self, capacity=500):
+        self.capacity = capacity
+        self.symbol_set = set()
+        self.buffer_dict = dict()
+        self.last_time_dict = dict()
+        # {symbol: {(field, window): RollingWindow}}
+        self.rolling_dict = dict()
+        # 最近一次 on_bar 的行情与时间，用于新登记的合约立即记录当前 bar
+        self.bar_dict = None
+        self.bar_time = None
+
+    def track(self, symbol_list):
+        if isinstance(symbol_list, str):
+            symbol_list = [symbol_list]
+        for symbol in symbol_list:
+            if symbol in self.symbol_set:
+                continue
+            self.symbol_set.add(symbol)
+            if self.bar_time is not None:
+                self.update_symbol(symbol)
+
+    def on_bar(self, bar_dict, bar_time):
+        self.bar_dict = bar_dict
+        self.bar_time = bar_time
+        for symbol in self.symbol_set:
+            self.update_symbol(symbol)
+
+    def update_symbol(self, symbol):
+        if self.last_time_dict.get(symbol) == self.bar_time:
+            return
+        try:
+            bar_data = self.bar_dict[symbol]
+        except Exception:
+            return
+        if bar_data is None or not bar_data.symbol:
+            return
+        self.append(symbol, bar_data, self.bar_time)
+
+    def append(self, symbol, bar_data, bar_time):
+        if self.last_time_dict.get(symbol) == bar_time:
+            return
+        buffer = self.buffer_dict.get(symbol)
+        if buffer is None:
+            buffer = BarRingBuffer(self.capacity)
+            self.buffer_dict[symbol] = buffer
+        row = [getattr(bar_data, field, np.nan) for field in BAR_FIELDS]
+        buffer.append(row, bar_time)
+        self.last_time_dict[symbol] = bar_time
+        for (field, window), rolling_window in self.rolling_dict.get(symbol, {}).items():
+            rolling_window.update(float(row[BAR_FIELD_INDEX[field]]))
+
+    def history_bars(self, symbol, n, fields=None):
+        """
+        :param fields: None 返回全部字段的二维视图（列顺序同 BAR_FIELDS）；
+                       字符串返回该字段的一维视图；列表返回对应列（按列取值，会拷贝）
+        :return: numpy.ndarray，按时间升序，不足 n 条时返回已有的全部；未缓存该合约时返回 None
+        """
+        buffer = self.buffer_dict.get(symbol)
+        if buffer is None:
+            return None
+        window = buffer.window(n)
+        if fields is None:
+            return window
+        if isinstance(fields, str):
+            return window[:, BAR_FIELD_INDEX[fields]]
+        return window[:, [BAR_FIELD_INDEX[field] for field in fields]]
+
+    def history_times(self, symbol, n):
+        buffer = self.buffer_dict.get(symbol)
+        if buffer is None:
+            return None
+        return buffer.time_window(n)
+
+    def rolling(self, symbol, field, window):
+        """
+        获取合约某字段的滚动统计，首次获取时用已缓存的 bar 初始化，之后随 bar 推送增量更新
+        """
+        symbol_rolling_dict = self.rolling_dict.setdefault(symbol, dict())
+        rolling_window = symbol_rolling_dict.get((field, window))
+        if rolling_window is None:
+            rolling_window = RollingWindow(window)
+            history = self.history_bars(symbol, window, field)
+            if history is not None:
+                for value in history:
+                    rolling_window.update(float(value))
+            symbol_rolling_dict[(field, window)] = rolling_window
+        return rolling_window
@@ -0,0 +1,53 @@
+import datetime
+
+import numpy as np
+import pandas as pd
+
+from panda_backtest.backtest_common.data.quotation.bar_history import BarHistory, RollingWindow
+
+
+class FakeBar(object):
+    def __init__(self, symbol, close):
+        self.symbol = symbol
+        self.open = close - 0.5
+        self.high = close + 1
+        self.low = close - 1
+        self.close = close
+        self.volume = close * 10
+
+
+def test_history_bars_is_zero_copy_window():
+    bar_history = BarHistory(capacity=5)
+    bar_history.track('AL2501.SHF')
+    start = datetime.datetime(2024, 1, 2, 15)
+    for i in range(8):
+        bar_history.on_bar({'AL2501.SHF': FakeBar('AL2501.SHF', float(i))}, start + datetime.timedelta(days=i))
+    # 同一时间点重复推送不会重复记录
+    bar_history.on_bar({'AL2501.SHF': FakeBar('AL2501.SHF', 100.0)}, start + datetime.timedelta(days=7))
+
+    close = bar_history.history_bars('AL2501.SHF', 3, 'close')
+    assert close.tolist() == [5.0, 6.0, 7.0]
+    assert np.shares_memory(close, bar_history.buffer_dict['AL2501.SHF'].data)
+    assert not close.flags.writeable
+    assert bar_history.history_bars('AL2501.SHF', 10, 'close').tolist() == [3.0, 4.0, 5.0, 6.0, 7.0]
+    assert bar_history.history_bars('AL2501.SHF', 2, ['high', 'low']).tolist() == [[7.0, 5.0], [8.0, 6.0]]
+    assert np.isnan(bar_history.history_bars('AL2501.SHF', 1)[0, 6])
+    assert bar_history.history_bars('CU2501.SHF', 3) is None
+
+
+def test_rolling_window_matches_pandas():
+    values = np.random.RandomState(0).normal(100, 5, 300)
+    window = RollingWindow(20)
+    mean_list, std_list, max_list, min_list = [], [], [], []
+    for value in values:
+        window.update(value)
+        mean_list.append(window.mean)
+        std_list.append(window.std)
+        max_list.append(window.max)
+        min_list.append(window.min)
+
+    rolling = pd.Series(values).rolling(20)
+    np.testing.assert_allclose(mean_list[19:], rolling.mean()[19:])
+    np.testing.assert_allclose(std_list[19:], rolling.std()[19:])
+    np.testing.assert_allclose(max_list[19:], rolling.max()[19:])
+    np.testing.assert_allclose(min_list[19:], rolling.min()[19:])
@@ -9,15 +9,27 @@ import logging
 
 from panda_backtest.util.annotation.singleton_annotation import singleton
 from panda_backtest.backtest_common.data.stock.base_stock_info_map import BaseStockInfoMap
+from panda_backtest.data.quotation.instrument_registry import InstrumentRegistry
 from common.config.config import config
 
+STOCK_INFO_PROJECTION = {'_id': 0, 'symbol': 1, 'name': 1, 'type': 1}
+
 @singleton
 class StockInfoMap(BaseStockInfoMap):
     def __init__(self, quotation_mongo_db):
         self._cache = {}
         self.quotation_mongo_db = quotation_mongo_db
+        # 启动时一次加载全部股票基础信息，表中没有的代码再单独查询
+        self.registry = InstrumentRegistry(config["MONGO_DB"] + '.stock_info_new', self.load_all, 'symbol')
+
+    def load_all(self):
+        return self.quotation_mongo_db.mongo_find(config["MONGO_DB"], collection_name="stock_info_new", query={},
+                                                  projection=STOCK_INFO_PROJECTION)
 
     def __getitem__(self, key):
+        instrument_info = self.registry.get(key)
+        if instrument_info is not None:
+            return instrument_info
         if key in self._cache.keys():
             return self._cache[key]
         else:
@@ -29,7 +41,7 @@ class StockInfoMap(BaseStockInfoMap):
             instrument_info = self.quotation_mongo_db.mongo_find_one(db_name=config["MONGO_DB"],
                                                                      collection_name="stock_info_new",
                                                                      query={'symbol': str(key)},
-                                                                     projection={'_id': 0, 'symbol': 1, 'name': 1, 'type': 1}
+                                                                     projection=STOCK_INFO_PROJECTION
                                                                      )
             if instrument_info:
                 self._cache[key] = instrument_info
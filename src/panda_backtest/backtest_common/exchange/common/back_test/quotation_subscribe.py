@@ -49,7 +49,9 @@ class QuotationSubscribe(object):
         elif run_info.standard_type == 1:
             sub_future_symbol_list.add(run_info.benchmark)
 
-        if strategy_context.is_stock_trade():
+        if strategy_context.is_stock_trade() and run_info.vectorized and run_info.frequency == '1d':
+            self.start_stock_daily_list_play(list(set(sub_stock_symbol_list)), time_type)
+        elif strategy_context.is_stock_trade():
             sub_stock_symbol_list = list(set(sub_stock_symbol_list))
             if len(sub_stock_symbol_list) > 0:
                 for sub_stock_symbol in sub_stock_symbol_list:
@@ -67,15 +69,12 @@ class QuotationSubscribe(object):
                         # if run_info.matching_type == 1:
                         #     bar_data.last = bar_data.open
 
-                        event = Event(ConstantEvent.SYSTEM_STOCK_QUOTATION_CHANGE, bar_data=bar_data)
-                        event_bus.publish_event(event)
+                        event_bus.publish(ConstantEvent.SYSTEM_STOCK_QUOTATION_CHANGE, bar_data)
 
-                        event = Event(ConstantEvent.SYSTEM_STOCK_ORDER_CROSS, bar_data=bar_data)
-                        event_bus.publish_event(event)
+                        event_bus.publish(ConstantEvent.SYSTEM_STOCK_ORDER_CROSS, bar_data)
                     else:
                         # bar_data.last = bar_data.close
-                        event = Event(ConstantEvent.SYSTEM_STOCK_QUOTATION_CHANGE, bar_data=bar_data)
-                        event_bus.publish_event(event)
+                        event_bus.publish(ConstantEvent.SYSTEM_STOCK_QUOTATION_CHANGE, bar_data)
 
         if strategy_context.is_future_trade():
             sub_future_symbol_list = list(set(sub_future_symbol_list))
@@ -94,14 +93,58 @@ class QuotationSubscribe(object):
                         #     bar_data.last = bar_data.open
 
                         # 尝试撮合未成交的订单
-                        event = Event(ConstantEvent.SYSTEM_FUTURE_QUOTATION_CHANGE, bar_data=bar_data)
-                        event_bus.publish_event(event)
-                        event = Event(ConstantEvent.SYSTEM_FUTURE_ORDER_CROSS, bar_data=bar_data)
-                        event_bus.publish_event(event)
+                        event_bus.publish(ConstantEvent.SYSTEM_FUTURE_QUOTATION_CHANGE, bar_data)
+                        event_bus.publish(ConstantEvent.SYSTEM_FUTURE_ORDER_CROSS, bar_data)
                     else:
                         # bar_data.last = bar_data.close
-                        event = Event(ConstantEvent.SYSTEM_FUTURE_QUOTATION_CHANGE, bar_data=bar_data)
-                        event_bus.publish_event(event)
+                        event_bus.publish(ConstantEvent.SYSTEM_FUTURE_QUOTATION_CHANGE, bar_data)
+
+    def start_stock_daily_list_play(self, sub_stock_symbol_list, time_type=0):
+        """
+        向量化模式：当日全部订阅股票的日线行情作为一个事件推送，一次性盯市，再逐个尝试撮合
+        """
+        strategy_context = self.context.strategy_context
+        event_bus = self.context.event_bus
+        bar_data_source = QuotationData.get_instance().bar_dict.bar_data_source
+
+        bar_data_list = list()
+        for sub_stock_symbol in sub_stock_symbol_list:
+            bar_data = bar_data_source.get_stock_daily_bar(sub_stock_symbol, strategy_context.trade_date)
+            if bar_data is None or not bar_data.symbol:
+                continue
+            bar_data_list.append(bar_data)
+
+        if len(bar_data_list) == 0:
+            return
+
+        event = Event(ConstantEvent.SYSTEM_STOCK_QUOTATION_LIST_CHANGE, bar_data_list=bar_data_list)
+        event_bus.publish_event(event)
+
+        if time_type == 0:
+            # 尝试撮合未成交的订单
+            for bar_data in bar_data_list:
+                event_bus.publish(ConstantEvent.SYSTEM_STOCK_ORDER_CROSS, bar_data)
+
+    def get_sub_minute_time_set(self):
+        """
+        当日订阅合约（含基准）存在分钟 bar 的时间点（整数 HHMMSS）
+        """
+        strategy_context = self.context.strategy_context
+        run_info = strategy_context.run_info
+        bar_data_source = QuotationData.get_instance().bar_dict.bar_data_source
+
+        sub_stock_symbol_list = set()
+        sub_future_symbol_list = set()
+        if strategy_context.is_stock_trade():
+            sub_stock_symbol_list = strategy_context.sub_position_stock_symbol_list | strategy_context.sub_order_stock_symbol_list
+            if run_info.standard_type == 0:
+                sub_stock_symbol_list.add(run_info.benchmark)
+        if strategy_context.is_future_trade():
+            sub_future_symbol_list = strategy_context.sub_position_future_symbol_list | strategy_context.sub_order_future_symbol_list
+            if run_info.standard_type == 1:
+                sub_future_symbol_list.add(run_info.benchmark)
+        return bar_data_source.get_minute_bar_time_set(sub_stock_symbol_list, sub_future_symbol_list,
+                                                       strategy_context.trade_date)
 
     def init_cache_data(self):
         bar_data_source = QuotationData.get_instance().bar_dict.bar_data_source
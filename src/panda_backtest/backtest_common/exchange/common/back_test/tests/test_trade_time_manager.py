@@ -0,0 +1,35 @@
+from panda_backtest.backtest_common.exchange.common.back_test.trade_session_calendar import BarClock, minute_range
+from panda_backtest.backtest_common.exchange.common.back_test.trade_time_manager import TradeTimeManager
+from panda_backtest.backtest_common.system.context.core_context import CoreContext
+
+
+class FakeQuotationSubscribe(object):
+    def __init__(self, minute_time_set):
+        self.minute_time_set = minute_time_set
+
+    def get_sub_minute_time_set(self):
+        return self.minute_time_set
+
+
+def make_manager(minute_time_set):
+    CoreContext(None)
+    manager = TradeTimeManager(None)
+    manager.trade_date = '20250102'
+    manager.quotation_subscribe = FakeQuotationSubscribe(minute_time_set)
+    return manager
+
+
+def test_clock_skips_minutes_without_bars():
+    day_clock = BarClock(minute_range(93100, 93500))
+    # 09:33 停牌无成交
+    manager = make_manager({93100, 93200, 93400, 93500, 150000})
+
+    bar_clock = manager.get_bar_clock(day_clock)
+
+    assert [hms for hms, _ in bar_clock] == ['093100', '093200', '093400', '093500']
+
+
+def test_clock_unchanged_without_minute_data():
+    day_clock = BarClock(minute_range(93100, 93500))
+
+    assert make_manager(set()).get_bar_clock(day_clock) is day_clock
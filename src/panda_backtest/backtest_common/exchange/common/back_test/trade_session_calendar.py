@@ -0,0 +1,140 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+# @File   : trade_session_calendar.py
+# @desc   : 分钟回测交易时段日历，按品种预先生成存在 bar 的分钟时间点（整数 HHMMSS）
+import datetime
+import json
+import re
+
+# bar 以结束时间标记，如 09:31 表示 09:30~09:31 这一分钟
+STOCK_SESSION = ((93100, 113000), (130100, 150000))
+
+FUTURE_DAY_SESSION = {
+    'commodity': ((90100, 101500), (103100, 113000), (133100, 150000)),
+    'index': ((93100, 113000), (130100, 150000)),
+    'bond': ((93100, 113000), (130100, 151500)),
+}
+
+# 未配置交易时段的品种，沿用原有的逐分钟区间
+DEFAULT_FUTURE_DAY_SESSION = ((90100, 113000), (130100, 150000))
+DEFAULT_FUTURE_NIGHT_END = 23000
+
+NIGHT_START = 210100
+DAY_END = 235900
+
+# 节假日前最后一个交易日无夜盘：上一交易日与当前交易日自然日间隔超过该天数（周末为3天）
+MAX_NIGHT_GAP_DAYS = 3
+
+
+def hms_to_minute(hms):
+    return hms // 10000 * 60 + hms // 100 % 100
+
+
+def minute_range(start_hms, end_hms):
+    """
+    [start_hms, end_hms] 内逐分钟的整数 HHMMSS
+    """
+    return [minute // 60 * 10000 + minute % 60 * 100
+            for minute in range(hms_to_minute(start_hms), hms_to_minute(end_hms) + 1)]
+
+
+def session_minutes(session_list):
+    minute_set = set()
+    for start_hms, end_hms in session_list:
+        minute_set.update(minute_range(start_hms, end_hms))
+    return minute_set
+
+
+def get_product_code(symbol):
+    match = re.match(r'[A-Za-z]+', symbol)
+    if match is None:
+        return symbol
+    return match.group().upper()
+
+
+class BarClock(object):
+    """
+    一段连续交易时段内的 bar 时间点，hms 字符串及距当日零点的时间差预先生成
+    """
+
+    def __init__(self, hms_list):
+        self.hms_list = sorted(hms_list)
+        self.hms_str_list = ['%06d' % hms for hms in self.hms_list]
+        self.offset_list = [datetime.timedelta(hours=hms // 10000, minutes=hms // 100 % 100, seconds=hms % 100)
+                            for hms in self.hms_list]
+
+    def __len__(self):
+        return len(self.hms_list)
+
+    def __iter__(self):
+        return iter(zip(self.hms_str_list, self.offset_list))
+
+
+class TradeSessionCalendar(object):
+    """
+    由品种交易时段配置生成分钟回测的时钟：
+    day_clock: 日盘; evening_clock: 夜盘 21:01 至 23:59; morning_clock: 夜盘跨零点部分。
+    多个品种取交易时段并集，品种未知时沿用原有的全时段。
+    """
+
+    def __init__(self, trade_time_dict=None):
+        self.trade_time_dict = trade_time_dict or dict()
+
+    @classmethod
+    def load(cls, trade_time_file):
+        with open(trade_time_file, 'r') as load_f:
+            return cls(json.load(load_f))
+
+    def get_stock_clock(self):
+        return BarClock(session_minutes(STOCK_SESSION)), BarClock([]), BarClock([])
+
+    def get_future_clock(self, symbol_list=None):
+        """
+        :param symbol_list: 回测涉及的期货合约，为空时按全部品种处理
+        :return: (day_clock, evening_clock, morning_clock)
+        """
+        product_set = {get_product_code(symbol) for symbol in symbol_list or []}
+        if len(product_set) == 0 or not product_set.issubset(self.trade_time_dict.keys()):
+            day_session_list = [DEFAULT_FUTURE_DAY_SESSION]
+            night_end_list = [DEFAULT_FUTURE_NIGHT_END]
+        else:
+            day_session_list = [FUTURE_DAY_SESSION[self.trade_time_dict[product]['DaySession']]
+                                for product in product_set]
+            night_end_list = [int(self.trade_time_dict[product]['NightEnd'])
+                              for product in product_set if self.trade_time_dict[product]['NightEnd']]
+
+        day_minute_set = set()
+        for day_session in day_session_list:
+            day_minute_set.update(session_minutes(day_session))
+
+        evening_minute_set = set()
+        morning_minute_set = set()
+        for night_end in night_end_list:
+            if night_end >= NIGHT_START:
+                evening_minute_set.update(minute_range(NIGHT_START, night_end))
+            else:
+                evening_minute_set.update(minute_range(NIGHT_START, DAY_END))
+                morning_minute_set.update(minute_range(0, night_end))
+
+        return BarClock(day_minute_set), BarClock(evening_minute_set), BarClock(morning_minute_set)
+
+    def get_clock(self, stock_trade, future_trade, future_symbol_list=None):
+        """
+        按账户类型合并股票、期货交易时段
+        """
+        if not future_trade:
+            return self.get_stock_clock()
+        day_clock, evening_clock, morning_clock = self.get_future_clock(future_symbol_list)
+        if stock_trade:
+            day_clock = BarClock(set(day_clock.hms_list) | session_minutes(STOCK_SESSION))
+        return day_clock, evening_clock, morning_clock
+
+    @staticmethod
+    def has_night_session(last_trade_date, trade_date):
+        """
+        当前交易日是否有夜盘（夜盘在上一交易日晚间），长假前最后一个交易日晚间无夜盘
+        """
+        if last_trade_date is None:
+            return True
+        gap = datetime.datetime.strptime(trade_date, '%Y%m%d') - datetime.datetime.strptime(last_trade_date, '%Y%m%d')
+        return gap.days <= MAX_NIGHT_GAP_DAYS
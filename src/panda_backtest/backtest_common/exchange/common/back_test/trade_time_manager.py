@@ -1,18 +1,26 @@
 import datetime
 import logging
+import os
 
 import time
 
 import pymongo
 
+from panda_backtest import project_dir
 from panda_backtest.backtest_common.exception.error_exception import ErrorException
+from panda_backtest.backtest_common.exchange.common.back_test.trade_session_calendar import TradeSessionCalendar, \
+    BarClock, minute_range
+from panda_backtest.backtest_common.exchange.common.back_test.quotation_subscribe import QuotationSubscribe
 from panda_backtest.backtest_common.exception.strategy_exception_builder import StrategyExceptionBuilder
 from panda_backtest.util.time.time_util import TimeUtil
 from common.config.config import config
+from common.utils.trade_calendar import TradeCalendar
 from panda_backtest.backtest_common.system.context.core_context import CoreContext
 from panda_backtest.backtest_common.system.event.event import Event, ConstantEvent
 from panda_backtest.util.log.remote_log_factory import RemoteLogFactory
 
+logger = logging.getLogger(__name__)
+
 
 class TradeTimeManager(object):
     def __init__(self, quotation_mongo_db):
@@ -27,26 +35,24 @@ class TradeTimeManager(object):
         # 所有自然日，多种情况
         # 7*24或者有期货且回测为分钟: 回测第一个自然日从开始回测的上一个最近交易日开始
         self.all_nature_date_list = list()
+        # 交易日、自然日的序号索引，由上面两个列表生成
+        self.trade_calendar = TradeCalendar([])
+        self.nature_calendar = TradeCalendar([])
+        self.session_calendar = TradeSessionCalendar.load(os.path.join(project_dir, 'future_trade_time.json'))
+        self.range_clock_cache = dict()
+        self.quotation_subscribe = QuotationSubscribe()
 
     def is_trade_date(self):
         return self.trade_date == self.now
 
     def get_next_count_date(self, date, count):
-        index_num = self.all_date_list.index(date)
-        if index_num + count >= len(self.all_date_list) or index_num + count < 0:
-            return '99990101'
-        return self.all_date_list[index_num + count]
+        return self.trade_calendar.get_next_count_date(date, count)
 
     def get_next_count_nature_date(self, date, count):
-        index_num = self.all_nature_date_list.index(date)
-        if index_num + count >= len(self.all_nature_date_list) or index_num + count < 0:
-            return '99990101'
-        return self.all_nature_date_list[index_num + count]
+        return self.nature_calendar.get_next_count_date(date, count)
 
     def get_date_distance(self, start_date, end_date):
-        start_index = self.all_nature_date_list.index(start_date)
-        end_index = self.all_nature_date_list.index(end_date)
-        return end_index - start_index
+        return self.nature_calendar.get_date_distance(start_date, end_date)
 
     def start_trade_time_play(self):
         """
@@ -66,44 +72,29 @@ class TradeTimeManager(object):
         end = run_info.end_date
         event_bus = self.context.event_bus
 
-        # 交易日期
-        # trade_dates = collection.find({
-        #     'nature_date': {'$gte': str(start), '$lte': str(end)}, 'is_trade': 1, 'exchange': 'SH'}).sort('nature_date')
-        docs = self.quotation_mongo_db.mongo_find(config['MONGO_DB'], collection_name="trade_calendar",
-                                                         query={
-                                                             'nature_date': {'$gte': int(start), '$lte': int(end)},
-                                                             'is_trade': 1, 'exchange': 'SH'},
-                                                         sort="nature_date")
-        trade_dates_list = list(docs)
-        # trade_dates_list = [str(doc["nature_date"]) for doc in docs]
+        # 交易日期，取自进程内缓存的交易所日历
+        exchange_calendar = TradeCalendar.get_exchange_calendar(self.quotation_mongo_db)
+        trade_dates_list = exchange_calendar.get_date_range(start, end)
         if len(trade_dates_list) == 0:
             event = Event(ConstantEvent.SYSTEM_CALCULATE_RESULT)
             event_bus.publish_event(event)
             return
 
-        for trade_cal in trade_dates_list:
-            trade_date = str(trade_cal['nature_date'])
-            self.all_date_list.append(trade_date)
+        self.all_date_list.extend(trade_dates_list)
 
         start_date = self.all_date_list[0]
         if frequency == '1M':
             if date_type == 1 or (account_type != 0 and account_type != 3 and account_type != 4):
-                # start_date = collection.find({
-                #     'nature_date': {'$lt': str(start)}, 'is_trade': 1, 'exchange': 'SH'}) \
-                #     .sort('nature_date', pymongo.DESCENDING).limit(1)
-                start_date = self.quotation_mongo_db.mongo_find_one(config['MONG_DB'], collection_name="trade_calendar",
-                                                                    query={
-                                                                        'nature_date': {'$lt': str(start)},
-                                                                        'is_trade': 1, 'exchange': 'SH'},
-                                                                    sort=[('nature_date', -1)])
-                if start_date:
-                    start_date_dict = start_date.next()
-                    start_date = start_date_dict['nature_date']
+                pre_date = exchange_calendar.get_pre_date(start)
+                if pre_date:
+                    start_date = pre_date
         else:
             if date_type == 1:
                 start_date = start
 
         self.all_nature_date_list = TimeUtil.get_begin_to_end_date_list(start_date, end)
+        self.trade_calendar = TradeCalendar(self.all_date_list)
+        self.nature_calendar = TradeCalendar(self.all_nature_date_list)
 
         if date_type == 0:
             rang_date_list = self.all_date_list
@@ -146,7 +137,7 @@ class TradeTimeManager(object):
                 self.hms = '083000'
                 self.trade_time = datetime.datetime.strptime((nature_date + ' 083000'), '%Y%m%d %H%M%S')
 
-                if nature_date in self.all_date_list:
+                if nature_date in self.trade_calendar:
                     event = Event(ConstantEvent.SYSTEM_NEW_DATE)
                     event_bus.publish_event(event)
 
@@ -160,19 +151,17 @@ class TradeTimeManager(object):
                 if run_info.matching_type == 1:
                     self.hms = '093000'
                     self.trade_time = datetime.datetime.strptime((nature_date + ' 093000'), '%Y%m%d %H%M%S')
-                    event = Event(ConstantEvent.SYSTEM_HANDLE_BAR)
-                    event_bus.publish_event(event)
+                    event_bus.publish(ConstantEvent.SYSTEM_HANDLE_BAR)
                     self.hms = '150000'
                     self.trade_time = datetime.datetime.strptime((nature_date + ' 150000'), '%Y%m%d %H%M%S')
                 else:
                     self.hms = '150000'
                     self.trade_time = datetime.datetime.strptime((nature_date + ' 150000'), '%Y%m%d %H%M%S')
-                    event = Event(ConstantEvent.SYSTEM_HANDLE_BAR)
-                    event_bus.publish_event(event)
+                    event_bus.publish(ConstantEvent.SYSTEM_HANDLE_BAR)
 
                 # print('SYSTEM_HANDLE_BAR耗时：===》' + str(time.time() - day_start_time))
 
-                if nature_date in self.all_date_list:
+                if nature_date in self.trade_calendar:
                     event = Event(ConstantEvent.SYSTEM_END_DATE)
                     event_bus.publish_event(event)
                     self.trade_date = self.get_next_count_date(self.trade_date, 1)
@@ -182,6 +171,10 @@ class TradeTimeManager(object):
         elif frequency == '1M':
             self.trade_date = self.all_date_list[0]
             self.now = self.all_nature_date_list[0]
+            future_trade = account_type != 0 and account_type != 3 and account_type != 4
+            day_clock, evening_clock, morning_clock = self.session_calendar.get_clock(
+                account_type in (0, 2, 4, 6), future_trade, run_info.session_symbol_list)
+            last_trade_date = self.all_nature_date_list[0] if future_trade else None
             total = len(rang_date_list)
             i = 0
             for nature_date in rang_date_list:
@@ -189,30 +182,29 @@ class TradeTimeManager(object):
                 SRLogger.process(i, total)
                 i = i + 1
                 if date_type == 0:
-                    if account_type != 0 and account_type != 3 and account_type != 4:
+                    if future_trade:
                         self.hms = '203000'
                         self.trade_time = datetime.datetime.strptime((nature_date + ' 203000'), '%Y%m%d %H%M%S')
                         event = Event(ConstantEvent.SYSTEM_NEW_DATE)
                         event_bus.publish_event(event)
-                        self.run_trade('210100', '235900')
-                        self.now = self.get_next_count_nature_date(self.now, 1)
-                        self.run_trade('000000', '023000')
+                        if TradeSessionCalendar.has_night_session(last_trade_date, self.trade_date):
+                            self.run_clock(self.get_bar_clock(evening_clock))
+                            if len(morning_clock) > 0:
+                                self.now = self.get_next_count_nature_date(self.now, 1)
+                                self.run_clock(self.get_bar_clock(morning_clock))
                         if self.now != self.trade_date:
                             self.now = self.trade_date
-                        money_time = '090100'
+                        last_trade_date = self.trade_date
                     else:
                         self.hms = '083000'
                         self.trade_time = datetime.datetime.strptime((nature_date + ' 083000'), '%Y%m%d %H%M%S')
                         event = Event(ConstantEvent.SYSTEM_NEW_DATE)
                         event_bus.publish_event(event)
 
-                        money_time = '093100'
-
                     event = Event(ConstantEvent.SYSTEM_DAY_START)
                     event_bus.publish_event(event)
 
-                    self.run_trade(money_time, '113000')
-                    self.run_trade('130100', '150000')
+                    self.run_clock(self.get_bar_clock(day_clock))
                     event = Event(ConstantEvent.SYSTEM_END_DATE)
                     event_bus.publish_event(event)
                     self.trade_date = self.get_next_count_date(self.trade_date, 1)
@@ -235,7 +227,7 @@ class TradeTimeManager(object):
                     event_bus.publish_event(event)
                     self.run_trade('83000', '153000')
 
-                    if nature_date in self.all_date_list:
+                    if nature_date in self.trade_calendar:
                         event = Event(ConstantEvent.SYSTEM_END_DATE)
                         event_bus.publish_event(event)
 
@@ -250,18 +242,36 @@ class TradeTimeManager(object):
         event_bus.publish_event(event)
 
     def run_trade(self, start_time, end_time):
-        trade_time = start_time
-        while start_time <= trade_time <= end_time:
-            now_date_time = datetime.datetime.strptime(str(trade_time), '%H%M%S')
-            self.trade_time = datetime.datetime.strptime((self.now + ' ' + trade_time), '%Y%m%d %H%M%S')
-            self.hms = trade_time
-
-            event_bus = self.context.event_bus
-            event = Event(ConstantEvent.SYSTEM_HANDLE_BAR)
-            event_bus.publish_event(event)
+        """
+        逐分钟推送 [start_time, end_time] 内的 bar
+        """
+        key = (int(start_time), int(end_time))
+        bar_clock = self.range_clock_cache.get(key)
+        if bar_clock is None:
+            bar_clock = BarClock(minute_range(*key))
+            self.range_clock_cache[key] = bar_clock
+        self.run_clock(bar_clock)
+
+    def get_bar_clock(self, bar_clock):
+        """
+        只保留当日订阅合约存在分钟 bar 的时间点；当日没有加载到任何分钟 bar 时沿用完整时段
+        """
+        minute_time_set = self.quotation_subscribe.get_sub_minute_time_set()
+        if len(minute_time_set) == 0:
+            logger.warning(f"交易日 {self.trade_date} 订阅合约无分钟行情，按完整交易时段推送")
+            return bar_clock
+        return BarClock([hms for hms in bar_clock.hms_list if hms in minute_time_set])
 
-            now_date_time = now_date_time + datetime.timedelta(minutes=1)
-            trade_time = now_date_time.strftime('%H%M%S')
+    def run_clock(self, bar_clock):
+        """
+        按预先生成的交易时段推送 bar，不再逐分钟做字符串与时间的转换
+        """
+        event_bus = self.context.event_bus
+        day_time = datetime.datetime.strptime(self.now, '%Y%m%d')
+        for hms, offset in bar_clock:
+            self.trade_time = day_time + offset
+            self.hms = hms
+            event_bus.publish(ConstantEvent.SYSTEM_HANDLE_BAR)
 
     def is_stock_trade(self):
         if ('093000' <= self.hms <= '113000') or ('130000' <= self.hms <= '150000'):
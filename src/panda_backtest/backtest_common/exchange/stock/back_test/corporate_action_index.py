@@ -0,0 +1,56 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+# @File   : corporate_action_index.py
+# @desc   : 公司行为（分红、ETF 拆分）按日期索引，回测期间一次加载，标的增加时增量加载
+from collections import defaultdict
+
+from common.config.config import config
+
+
+class CorporateActionIndex(object):
+    """
+    按 date_field 索引的公司行为记录：{日期: [记录, ...]}。
+    只加载已出现过的标的从当前交易日到回测结束日的记录；
+    之后出现的新标的（新开仓）只补查新标的，已加载的标的不再查询。
+    """
+
+    def __init__(self, quotation_mongo_db, collection_name, date_field, projection):
+        self.quotation_mongo_db = quotation_mongo_db
+        self.collection_name = collection_name
+        self.date_field = date_field
+        self.projection = projection
+        self.run_id = None
+        self.date_index = defaultdict(list)
+        self.loaded_symbol_set = set()
+        self.query_count = 0
+
+    def reset(self, run_id):
+        self.run_id = run_id
+        self.date_index.clear()
+        self.loaded_symbol_set.clear()
+
+    def get_day_actions(self, symbol_set, trade_date, end_date, run_id):
+        """
+        :param symbol_set: 当日需要处理的标的
+        :return: 当日 symbol_set 内标的的记录
+        """
+        if run_id != self.run_id:
+            self.reset(run_id)
+
+        new_symbol_list = [symbol for symbol in symbol_set if symbol not in self.loaded_symbol_set]
+        if len(new_symbol_list) > 0:
+            self.load(new_symbol_list, trade_date, end_date)
+
+        return [action_dict for action_dict in self.date_index.get(trade_date, ())
+                if action_dict['symbol'] in symbol_set]
+
+    def load(self, symbol_list, start_date, end_date):
+        action_cur = self.quotation_mongo_db.mongo_find(config["MONGO_DB"], collection_name=self.collection_name,
+                                                        query={'symbol': {'$in': symbol_list},
+                                                               self.date_field: {'$gte': start_date,
+                                                                                 '$lte': str(end_date)}},
+                                                        projection=self.projection)
+        for action_dict in action_cur:
+            self.date_index[action_dict[self.date_field]].append(action_dict)
+        self.loaded_symbol_set.update(symbol_list)
+        self.query_count += 1
@@ -1,16 +1,19 @@
 import time
 import logging
 
+from panda_backtest.backtest_common.exchange.stock.back_test.corporate_action_index import CorporateActionIndex
 from panda_backtest.backtest_common.model.quotation.dividend import Dividend
 
 from panda_backtest.backtest_common.system.context.core_context import CoreContext
 from panda_backtest.backtest_common.system.event.event import Event, ConstantEvent
-from common.config.config import config
 
 class DividendManager(object):
     def __init__(self, quotation_mongo_db):
         self.quotation_mongo_db = quotation_mongo_db
         self.context = CoreContext.get_instance()
+        self.dividend_index = CorporateActionIndex(self.quotation_mongo_db, 'stock_dividends', 'ex_div_date',
+                                                   {'_id': 0, 'symbol': 1, 'share_trans_ratio': 1, 'share_ratio': 1,
+                                                    'unit_cash_div_tax': 1, 'ex_div_date': 1})
 
     def start_dividend(self):
         """
@@ -33,20 +36,13 @@ class DividendManager(object):
         if len(all_pos_set) == 0:
             return
 
-        # start = time.time()
-        collection = "stock_dividends"
-        dividend_cur = self.quotation_mongo_db.mongo_find(config["MONGO_DB"], collection_name=collection,
-                                                          query={'symbol': {'$in': list(all_pos_set)},
-                                                                 'ex_div_date': strategy_context.trade_date},
-                                                          projection={'_id': 0, 'symbol': 1, 'share_trans_ratio': 1,
-                                                                      'share_ratio': 1, 'unit_cash_div_tax': 1,
-                                                                      'ex_div_date': 1})
-        # dividend_cur = collection.find(
-        #     {'symbol': {'$in': list(all_pos_set)}, 'ex_div_date': strategy_context.trade_date},
-        #     {'_id': 0, 'symbol': 1, 'share_trans_ratio': 1, 'share_ratio': 1, 'unit_cash_div_tax': 1, 'ex_div_date': 1})
+        # 分红数据按除权除息日预先索引，持仓标的增加时才补查数据库
+        dividend_cur = self.dividend_index.get_day_actions(all_pos_set, strategy_context.trade_date,
+                                                           run_info.end_date, run_info.run_id)
+        dividend_list = list()
         for dividend_dict in dividend_cur:
             dividend = Dividend()
-            dividend.__dict__ = dividend_dict
+            dividend.__dict__ = dict(dividend_dict)
             if dividend.share_trans_ratio is None:
                 dividend.share_trans_ratio = 0
 
@@ -56,7 +52,15 @@ class DividendManager(object):
             if dividend.cash_div_tax is None:
                 dividend.cash_div_tax = 0
 
+            if run_info.vectorized:
+                dividend_list.append(dividend)
+                continue
+
             # 推送分红事件
             event = Event(ConstantEvent.SYSTEM_STOCK_DIVIDEND, dividend=dividend)
             event_bus.publish_event(event)
-        # print('分红耗时：' + str(time.time() - start))
+
+        if len(dividend_list) > 0:
+            # 向量化模式：当日全部分红作为一个事件推送
+            event = Event(ConstantEvent.SYSTEM_STOCK_DIVIDEND_LIST, dividend_list=dividend_list)
+            event_bus.publish_event(event)
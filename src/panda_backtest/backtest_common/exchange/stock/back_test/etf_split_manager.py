@@ -9,10 +9,10 @@ import logging
 
 import time
 
+from panda_backtest.backtest_common.exchange.stock.back_test.corporate_action_index import CorporateActionIndex
 from panda_backtest.backtest_common.model.quotation.etf_split import ETFSplit
 from panda_backtest.backtest_common.system.context.core_context import CoreContext
 from panda_backtest.backtest_common.system.event.event import Event, ConstantEvent
-from common.config.config import config
 from panda_backtest.util.time.time_util import TimeUtil
 
 class ETFSplitManager(object):
@@ -20,6 +20,8 @@ class ETFSplitManager(object):
     def __init__(self, quotation_mongo_db):
         self.quotation_mongo_db = quotation_mongo_db
         self.context = CoreContext.get_instance()
+        self.etf_split_index = CorporateActionIndex(self.quotation_mongo_db, 'etf_split', 'trade_date',
+                                                    {'_id': 0, 'symbol': 1, 'divcvratio': 1, 'trade_date': 1})
 
     def get_etf_split(self):
         old_time = time.time()
@@ -43,13 +45,9 @@ class ETFSplitManager(object):
         trade_date = strategy_context.trade_date
 
         event_bus = self.context.event_bus
-        collection = "etf_split"
-        etf_split_list = self.quotation_mongo_db.mongo_find(config["MONGO_DB"],collection_name=collection,query={'symbol': {'$in': list(all_pos_set)},
-             'trade_date': trade_date},projection={'_id': 0, 'symbol': 1, 'divcvratio': 1})
-        # etf_split_list = collection.find(
-        #     {'symbol': {'$in': list(all_pos_set)},
-        #      'trade_date': trade_date},
-        #     {'_id': 0, 'symbol': 1, 'divcvratio': 1})
+        # 拆分数据按交易日预先索引，持仓标的增加时才补查数据库
+        etf_split_list = self.etf_split_index.get_day_actions(all_pos_set, trade_date, run_info.end_date,
+                                                              run_info.run_id)
         for etf_split_dict in etf_split_list:
             etf_split = ETFSplit()
             if etf_split_dict['divcvratio'] is not None:
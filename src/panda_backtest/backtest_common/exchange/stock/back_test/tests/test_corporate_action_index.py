@@ -0,0 +1,41 @@
+from panda_backtest.backtest_common.exchange.stock.back_test.corporate_action_index import CorporateActionIndex
+
+DIVIDEND_LIST = [
+    {'symbol': '000001.SZ', 'ex_div_date': '20240612', 'unit_cash_div_tax': 0.719},
+    {'symbol': '600000.SH', 'ex_div_date': '20240612', 'unit_cash_div_tax': 0.321},
+    {'symbol': '600000.SH', 'ex_div_date': '20240720', 'unit_cash_div_tax': 0.1},
+]
+
+
+class FakeMongo(object):
+    def __init__(self):
+        self.query_list = list()
+
+    def mongo_find(self, db_name, collection_name, query, hint=None, sort=None, projection=None):
+        self.query_list.append(query)
+        date_range = query['ex_div_date']
+        return [dict(doc) for doc in DIVIDEND_LIST if doc['symbol'] in query['symbol']['$in']
+                and date_range['$gte'] <= doc['ex_div_date'] <= date_range['$lte']]
+
+
+def test_day_lookup_only_queries_new_symbols():
+    mongo = FakeMongo()
+    dividend_index = CorporateActionIndex(mongo, 'stock_dividends', 'ex_div_date', None)
+
+    assert dividend_index.get_day_actions({'000001.SZ'}, '20240611', '20241231', 'run1') == []
+    assert len(dividend_index.get_day_actions({'000001.SZ'}, '20240612', '20241231', 'run1')) == 1
+    assert len(mongo.query_list) == 1
+
+    # 新开仓的标的只补查该标的，已加载标的的记录保留
+    day_list = dividend_index.get_day_actions({'000001.SZ', '600000.SH'}, '20240612', '20241231', 'run1')
+    assert sorted(action['symbol'] for action in day_list) == ['000001.SZ', '600000.SH']
+    assert mongo.query_list[1]['symbol']['$in'] == ['600000.SH']
+
+    # 已卖出的标的不再推送
+    assert dividend_index.get_day_actions({'000001.SZ'}, '20240720', '20241231', 'run1') == []
+    assert len(dividend_index.get_day_actions({'600000.SH'}, '20240720', '20241231', 'run1')) == 1
+    assert len(mongo.query_list) == 2
+
+    # 新一次回测重新加载
+    dividend_index.get_day_actions({'600000.SH'}, '20240720', '20241231', 'run2')
+    assert len(mongo.query_list) == 3
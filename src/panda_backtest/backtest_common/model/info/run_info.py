@@ -69,3 +69,17 @@ class RunInfo:
     product_name = EMPTY_STRING
     # 自定义标签
     custom_tag = EMPTY_STRING
+    # 是否预加载日线行情面板
+    preload_quotation = False
+    # 预加载行情面板的额外合约
+    preload_symbol_list = None
+    # 是否启用向量化日线盯市
+    vectorized = False
+    # 分钟回测交易时段所依据的期货合约，为空时按全部时段
+    session_symbol_list = None
+    # 是否统计事件总线各事件、处理函数的耗时
+    profile_event = False
+    # 回测结果每累计多少个交易日批量写入一次数据库
+    result_flush_days = 20
+    # history_bars 每个合约缓存的 bar 条数
+    history_bar_size = 500
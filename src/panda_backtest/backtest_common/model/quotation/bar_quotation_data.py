@@ -27,6 +27,8 @@ class BarQuotationData:
     preclose = EMPTY_FLOAT
     limit_up = EMPTY_FLOAT
     limit_down = EMPTY_FLOAT
+    publish_time = EMPTY_FLOAT         # 实盘行情进程写入时间戳（秒）
+    receive_time = EMPTY_FLOAT         # 实盘交易进程收到行情的时间戳（秒）
 
     askprice1 = EMPTY_FLOAT
     bidprice1 = EMPTY_FLOAT
@@ -4,9 +4,15 @@
 # @Author : wlb
 # @File   : panda_backtest_account.py
 # @desc   :
+from collections import namedtuple
+
 from panda_backtest.backtest_common.constant.strategy_constant import *
 import logging
 
+# 回测结果保存用的账户快照，只包含入库字段
+AccountSnapshot = namedtuple('AccountSnapshot', ('gmt_create', 'available_funds', 'static_profit', 'market_value', 'total_profit',
+                                                 'holding_pnl', 'daily_pnl'))
+
 class PandaBacktestAccount:
     type = EMPTY_INT                                      # 类型（0：股票  1：期货 2:统计, 3:基金）
     back_id = EMPTY_STRING                                # 关联回测结果主键id
@@ -37,3 +43,8 @@ class PandaBacktestAccount:
     buy_market_value = EMPTY_FLOAT
     sell_market_value = EMPTY_FLOAT
 
+    def snapshot(self):
+        """
+        生成当前账户的快照，未赋值（沿用类默认值）的字段为 None
+        """
+        return AccountSnapshot._make(map(self.__dict__.get, AccountSnapshot._fields))
@@ -4,9 +4,15 @@
 # @Author : wlb
 # @File   : panda_backtest_position.py
 # @desc   :
+from collections import namedtuple
+
 from panda_backtest.backtest_common.constant.strategy_constant import *
 import logging
 
+# 回测结果保存用的持仓快照，只包含入库字段
+PositionSnapshot = namedtuple('PositionSnapshot', ('gmt_create', 'contract_code', 'position', 'sellable', 'price', 'last_price',
+                                                   'market_value', 'holding_pnl', 'accumulate_profit'))
+
 class PandaBacktestPosition:
     back_id = EMPTY_STRING                              # 关联回测结果主键id
     account_id = EMPTY_STRING                           # 账号ID
@@ -44,3 +50,8 @@ class PandaBacktestPosition:
     sell_margin = EMPTY_FLOAT                           # 组合持仓空头保证金
     stock_type = EMPTY_INT                              # 股票具体类型（0:普通，1:国债, 2:etf,3:指数）
 
+    def snapshot(self):
+        """
+        生成当前持仓的快照，未赋值（沿用类默认值）的字段为 None
+        """
+        return PositionSnapshot._make(map(self.__dict__.get, PositionSnapshot._fields))
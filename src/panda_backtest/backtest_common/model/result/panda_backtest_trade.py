@@ -4,9 +4,15 @@
 # @Author : wlb
 # @File   : panda_backtest_trade.py
 # @desc   : 策略回测交易详情数据
+from collections import namedtuple
+
 from panda_backtest.backtest_common.constant.strategy_constant import *
 import logging
 
+# 回测结果保存用的成交快照，只包含入库字段
+TradeSnapshot = namedtuple('TradeSnapshot', ('trade_date', 'gmt_create', 'gmt_create_time', 'contract_code', 'business',
+                                             'direction', 'price', 'volume', 'cost'))
+
 class PandaBacktestTrade:
     back_id = EMPTY_STRING                          # 关联回测结果主键id
     account_id = EMPTY_STRING                       # 账号ID
@@ -38,3 +44,9 @@ class PandaBacktestTrade:
     is_close_local = EMPTY_INT
     run_id = EMPTY_STRING
     stock_type = EMPTY_INT
+
+    def snapshot(self):
+        """
+        生成当前成交的快照，未赋值（沿用类默认值）的字段为 None
+        """
+        return TradeSnapshot._make(map(self.__dict__.get, TradeSnapshot._fields))
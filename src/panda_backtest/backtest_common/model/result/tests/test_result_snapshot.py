@@ -0,0 +1,28 @@
+from panda_backtest.backtest_common.model.result.panda_backtest_account import PandaBacktestAccount
+from panda_backtest.backtest_common.model.result.panda_backtest_position import PandaBacktestPosition
+from panda_backtest.backtest_common.model.result.panda_backtest_trade import PandaBacktestTrade
+
+
+def test_snapshot_is_detached_from_model():
+    position = PandaBacktestPosition()
+    position.contract_code = '000001.SZ'
+    position.position = 100
+    position.market_value = 1050.0
+
+    snapshot = position.snapshot()
+    position.position = 200
+    position.market_value = 2100.0
+
+    assert snapshot.contract_code == '000001.SZ'
+    assert snapshot.position == 100
+    assert snapshot.market_value == 1050.0
+    # 未赋值字段与 jsonpickle 编码实例属性的结果一致，为 None 而非类默认值
+    assert snapshot.holding_pnl is None
+
+
+def test_snapshot_fields_are_model_attributes():
+    for model in (PandaBacktestAccount, PandaBacktestPosition, PandaBacktestTrade):
+        snapshot = model().snapshot()
+        for field in snapshot._fields:
+            assert hasattr(model, field)
+        assert all(value is None for value in snapshot)
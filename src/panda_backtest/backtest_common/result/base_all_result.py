@@ -114,6 +114,10 @@ class BaseAllTradeReverseResult(object):
         for trade_reverse_result in self.stock_result_dict.values():
             trade_reverse_result.refresh_position(bar_data)
 
+    def refresh_stock_position_list(self, bar_data_list):
+        for trade_reverse_result in self.stock_result_dict.values():
+            trade_reverse_result.refresh_position_list(bar_data_list)
+
     def on_future_rtn_order(self, order):
         future_reverse_result = self.future_result_dict[order.account]
         future_reverse_result.on_future_rtn_order(order)
@@ -158,6 +162,15 @@ class BaseAllTradeReverseResult(object):
         if run_info.standard_type == 0:
             self.standard_symbol_result.on_rtn_dividend(dividend)
 
+    def on_rtn_dividend_list(self, dividend_list):
+        for trade_reverse_result in self.stock_result_dict.values():
+            trade_reverse_result.on_rtn_dividend_list(dividend_list)
+        strategy_context = self.context.strategy_context
+        run_info = strategy_context.run_info
+        if run_info.standard_type == 0:
+            for dividend in dividend_list:
+                self.standard_symbol_result.on_rtn_dividend(dividend)
+
     def on_etf_rtn_split(self, fund_split):
         for trade_reverse_result in self.stock_result_dict.values():
             trade_reverse_result.on_etf_rtn_split(fund_split)
@@ -195,3 +208,7 @@ class BaseAllTradeReverseResult(object):
     def on_future_delivery(self, future_symbol):
         for future_reverse_result in self.future_result_dict.values():
             future_reverse_result.future_symbol_delivery(future_symbol)
+
+    def close(self):
+        """回测结束或异常中止时释放结果保存占用的资源"""
+        pass
@@ -109,6 +109,10 @@ class BaseTradeReverseResult(object):
                                                   self.xb_back_test_account.today_withdraw - \
                                                   self.xb_back_test_account.today_deposit
 
+    def refresh_position_list(self, bar_data_list):
+        for bar_data in bar_data_list:
+            self.refresh_position(bar_data)
+
     def on_stock_rtn_order(self, order):
         if order.status == ACTIVE:
             if order.side == SIDE_BUY:
@@ -261,6 +265,10 @@ class BaseTradeReverseResult(object):
             sr_logger = RemoteLogFactory.get_sr_logger()
             sr_logger.info(STOCK_DIVIDEND_INFO % (str(self.account), dividend.symbol, str(cash_tax), str(position_tax)))
 
+    def on_rtn_dividend_list(self, dividend_list):
+        for dividend in dividend_list:
+            self.on_rtn_dividend(dividend)
+
     def on_etf_rtn_split(self, etf_split):
         if etf_split.symbol in self.xb_back_test_position_dict.keys():
             xb_back_test_position = self.xb_back_test_position_dict[etf_split.symbol]
@@ -0,0 +1,156 @@
+import random
+from types import SimpleNamespace
+
+import pytest
+
+from panda_backtest.backtest_common.constant.strategy_constant import SIDE_BUY, SIDE_SELL
+from panda_backtest.backtest_common.data.quotation.quotation_data import QuotationData
+from panda_backtest.backtest_common.model.quotation.dividend import Dividend
+from panda_backtest.backtest_common.model.quotation.etf_split import ETFSplit
+from panda_backtest.backtest_common.model.result.panda_backtest_trade import PandaBacktestTrade
+from panda_backtest.backtest_common.result.stock.back_test.base_trade_reverse_result import BaseTradeReverseResult
+from panda_backtest.backtest_common.result.stock.back_test.vector_trade_reverse_result import \
+    VectorTradeReverseResult
+from panda_backtest.backtest_common.system.context.core_context import CoreContext
+from panda_backtest.data.context.strategy_context import StrategyContext
+
+ACCOUNT = '8888'
+SYMBOL_LIST = ['%06d.SZ' % i for i in range(1, 41)]
+ACCOUNT_FIELDS = ['available_funds', 'frozen_capital', 'market_value', 'total_profit', 'add_profit',
+                  'daily_pnl', 'cost', 'yes_total_capital']
+POSITION_FIELDS = ['position', 'sellable', 'price', 'last_price', 'market_value', 'accumulate_profit', 'cost']
+
+
+def build_schedule(day_count=30, seed=7):
+    """
+    生成确定性的每日事件：成交、分红、拆分、行情
+    """
+    rng = random.Random(seed)
+    last_price = {symbol: rng.uniform(5, 50) for symbol in SYMBOL_LIST}
+    holding = {symbol: 0 for symbol in SYMBOL_LIST}
+    schedule = list()
+    trade_id = 0
+    for day in range(day_count):
+        dividend_list = list()
+        for symbol in rng.sample(SYMBOL_LIST, 3):
+            if holding[symbol] > 0:
+                dividend = Dividend()
+                dividend.symbol = symbol
+                dividend.unit_cash_div_tax = rng.choice([0, 0.12, 0.5])
+                dividend.share_trans_ratio = rng.choice([0, 0.1])
+                dividend.share_ratio = rng.choice([0, 0.2])
+                dividend_list.append(dividend)
+                holding[symbol] = int(holding[symbol] * (1 + dividend.share_trans_ratio + dividend.share_ratio))
+
+        trade_list = list()
+        for symbol in rng.sample(SYMBOL_LIST, 8):
+            trade_id += 1
+            trade = PandaBacktestTrade()
+            trade.account_id = ACCOUNT
+            trade.trade_id = str(trade_id)
+            trade.contract_code = symbol
+            trade.contract_name = symbol
+            trade.price = last_price[symbol]
+            if holding[symbol] > 0 and rng.random() < 0.4:
+                trade.business = SIDE_SELL
+                trade.volume = holding[symbol] if rng.random() < 0.5 else holding[symbol] // 2
+                holding[symbol] -= trade.volume
+            else:
+                trade.business = SIDE_BUY
+                trade.volume = rng.randint(1, 20) * 100
+                holding[symbol] += trade.volume
+            trade.cost = max(trade.price * trade.volume * 0.0008, 5)
+            if trade.volume > 0:
+                trade_list.append(trade)
+
+        for symbol in SYMBOL_LIST:
+            last_price[symbol] = round(last_price[symbol] * rng.uniform(0.95, 1.05), 2)
+        bar_list = [SimpleNamespace(symbol=symbol, last=last_price[symbol]) for symbol in SYMBOL_LIST]
+
+        split_list = list()
+        if day % 10 == 9:
+            symbol = max(holding, key=holding.get)
+            etf_split = ETFSplit()
+            etf_split.symbol = symbol
+            etf_split.divcvratio = 2
+            split_list.append(etf_split)
+            holding[symbol] = int(holding[symbol] * 2)
+
+        schedule.append((str(20250101 + day), dividend_list, trade_list, bar_list, split_list))
+    return schedule
+
+
+def copy_trade(trade):
+    new_trade = PandaBacktestTrade()
+    new_trade.__dict__.update(trade.__dict__)
+    return new_trade
+
+
+def run_backtest(result_cls, schedule, vectorized):
+    strategy_context = StrategyContext()
+    strategy_context.run_info.run_id = 'test'
+    strategy_context.run_info.stock_account = ACCOUNT
+    strategy_context.run_info.stock_starting_cash = 100000000
+    trade_time_manager = SimpleNamespace(trade_date=None, hms='150000', now=None)
+    strategy_context.init_trade_time_manager(trade_time_manager)
+    CoreContext(strategy_context)
+    bar_dict = dict()
+    QuotationData.get_instance().init_bar_dict(bar_dict)
+
+    result = result_cls(ACCOUNT)
+    result.init_data()
+    snapshot_list = list()
+    for trade_date, dividend_list, trade_list, bar_list, split_list in schedule:
+        trade_time_manager.trade_date = trade_date
+        result.new_date()
+        if vectorized:
+            result.on_rtn_dividend_list(dividend_list)
+        else:
+            for dividend in dividend_list:
+                result.on_rtn_dividend(dividend)
+
+        for trade in trade_list:
+            bar_dict[trade.contract_code] = SimpleNamespace(symbol=trade.contract_code, last=trade.price)
+            result.on_stock_rtn_trade(copy_trade(trade))
+
+        if vectorized:
+            result.refresh_position_list(bar_list)
+        else:
+            for bar_data in bar_list:
+                result.refresh_position(bar_data)
+
+        for etf_split in split_list:
+            result.on_etf_rtn_split(etf_split)
+
+        snapshot_list.append((
+            {field: getattr(result.xb_back_test_account, field) for field in ACCOUNT_FIELDS},
+            {symbol: {field: getattr(position, field) for field in POSITION_FIELDS}
+             for symbol, position in result.xb_back_test_position_dict.items()}))
+    return snapshot_list, result
+
+
+def test_vector_result_matches_event_driven_result():
+    schedule = build_schedule()
+    event_snapshot_list, _ = run_backtest(BaseTradeReverseResult, schedule, vectorized=False)
+    vector_snapshot_list, _ = run_backtest(VectorTradeReverseResult, schedule, vectorized=True)
+
+    assert len(event_snapshot_list) == len(vector_snapshot_list)
+    for (event_account, event_position), (vector_account, vector_position) in zip(event_snapshot_list,
+                                                                                  vector_snapshot_list):
+        assert vector_account == pytest.approx(event_account, rel=1e-9)
+        assert vector_position.keys() == event_position.keys()
+        for symbol, position in event_position.items():
+            assert vector_position[symbol] == pytest.approx(position, rel=1e-9)
+            assert isinstance(vector_position[symbol]['position'], int)
+
+
+def test_vector_result_slots_follow_positions():
+    schedule = build_schedule(day_count=60, seed=11)
+    _, result = run_backtest(VectorTradeReverseResult, schedule, vectorized=True)
+
+    assert result.slot_index.keys() == result.xb_back_test_position_dict.keys()
+    assert len(result.slot_symbol_list) <= len(SYMBOL_LIST)
+    for symbol, slot in result.slot_index.items():
+        position = result.xb_back_test_position_dict[symbol]
+        assert result.position_arr[slot] == position.position
+        assert result.market_value_arr[slot] == pytest.approx(position.market_value)
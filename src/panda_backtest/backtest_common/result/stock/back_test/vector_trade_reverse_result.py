@@ -0,0 +1,173 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+# @File   : vector_trade_reverse_result.py
+# @desc   : 向量化股票账户结果，持仓按槽位存放在数组中，日线盯市、分红一次性计算
+import numpy as np
+
+from panda_backtest.backtest_common.constant.string_constant import STOCK_DIVIDEND_INFO
+from panda_backtest.backtest_common.result.stock.back_test.base_trade_reverse_result import BaseTradeReverseResult
+from panda_backtest.util.log.remote_log_factory import RemoteLogFactory
+
+INIT_SLOT_SIZE = 64
+
+
+class VectorTradeReverseResult(BaseTradeReverseResult):
+    """
+    持仓数量、持仓均价、最新价、市值按槽位存放在 float64 数组中，
+    盯市和分红对全部持仓一次性计算后，再回写持仓对象（用于策略查询和保存每日结果）。
+    成交、拆分等逐笔事件沿用父类逻辑，处理完后同步对应槽位。
+    """
+
+    def __init__(self, account):
+        super().__init__(account)
+        self.slot_index = dict()            # 合约 -> 槽位
+        self.slot_symbol_list = list()      # 槽位 -> 合约
+        self.free_slot_list = list()
+        self.position_arr = np.zeros(INIT_SLOT_SIZE, dtype=np.float64)
+        self.price_arr = np.zeros(INIT_SLOT_SIZE, dtype=np.float64)
+        self.last_price_arr = np.zeros(INIT_SLOT_SIZE, dtype=np.float64)
+        self.market_value_arr = np.zeros(INIT_SLOT_SIZE, dtype=np.float64)
+
+    def alloc_slot(self, symbol):
+        if self.free_slot_list:
+            slot = self.free_slot_list.pop()
+            self.slot_symbol_list[slot] = symbol
+        else:
+            slot = len(self.slot_symbol_list)
+            self.slot_symbol_list.append(symbol)
+            if slot >= len(self.position_arr):
+                size = len(self.position_arr) * 2
+                self.position_arr = np.resize(self.position_arr, size)
+                self.price_arr = np.resize(self.price_arr, size)
+                self.last_price_arr = np.resize(self.last_price_arr, size)
+                self.market_value_arr = np.resize(self.market_value_arr, size)
+        self.slot_index[symbol] = slot
+        return slot
+
+    def sync_position(self, symbol):
+        """
+        持仓对象发生逐笔变化后，同步到数组槽位；持仓已清空则释放槽位
+        """
+        position = self.xb_back_test_position_dict.get(symbol)
+        slot = self.slot_index.get(symbol)
+        if position is None:
+            if slot is not None:
+                del self.slot_index[symbol]
+                self.slot_symbol_list[slot] = None
+                self.position_arr[slot] = 0
+                self.market_value_arr[slot] = 0
+                self.free_slot_list.append(slot)
+            return
+        if slot is None:
+            slot = self.alloc_slot(symbol)
+        self.position_arr[slot] = position.position
+        self.price_arr[slot] = position.price
+        self.last_price_arr[slot] = position.last_price
+        self.market_value_arr[slot] = position.market_value
+
+    def refresh_position(self, bar_data):
+        self.refresh_position_list([bar_data])
+
+    def refresh_position_list(self, bar_data_list):
+        """
+        按一批行情对全部持仓盯市
+        """
+        slot_list = list()
+        last_list = list()
+        for bar_data in bar_data_list:
+            slot = self.slot_index.get(bar_data.symbol)
+            if slot is None or not bar_data.last:
+                continue
+            slot_list.append(slot)
+            last_list.append(bar_data.last)
+        if not slot_list:
+            return
+
+        slots = np.array(slot_list, dtype=np.int64)
+        last_price = np.array(last_list, dtype=np.float64)
+        position = self.position_arr[slots]
+        old_market_value = self.market_value_arr[slots]
+        market_value = last_price * position
+        accumulate_profit = position * (last_price - self.price_arr[slots])
+        self.last_price_arr[slots] = last_price
+        self.market_value_arr[slots] = market_value
+
+        for slot, last, value, profit in zip(slot_list, last_price.tolist(), market_value.tolist(),
+                                             accumulate_profit.tolist()):
+            xb_back_test_position = self.xb_back_test_position_dict[self.slot_symbol_list[slot]]
+            xb_back_test_position.last_price = last
+            xb_back_test_position.market_value = value
+            xb_back_test_position.accumulate_profit = profit
+
+        market_value_change = float(np.sum(market_value - old_market_value))
+        self.xb_back_test_account.market_value += market_value_change
+        self.xb_back_test_account.total_profit += market_value_change
+        self.xb_back_test_account.add_profit = self.xb_back_test_account.total_profit - \
+                                               self.xb_back_test_account.start_capital + \
+                                               self.xb_back_test_account.withdraw - \
+                                               self.xb_back_test_account.deposit
+        self.xb_back_test_account.daily_pnl = self.xb_back_test_account.total_profit - self.xb_back_test_account.yes_total_capital + \
+                                              self.xb_back_test_account.today_withdraw - \
+                                              self.xb_back_test_account.today_deposit
+
+    def on_stock_rtn_trade(self, trade):
+        super().on_stock_rtn_trade(trade)
+        if trade.account_id == self.account:
+            self.sync_position(trade.contract_code)
+
+    def on_rtn_dividend(self, dividend):
+        super().on_rtn_dividend(dividend)
+        self.sync_position(dividend.symbol)
+
+    def on_rtn_dividend_list(self, dividend_list):
+        """
+        当日全部分红一次性计算
+        """
+        dividend_list = [dividend for dividend in dividend_list if dividend.symbol in self.slot_index]
+        if not dividend_list:
+            return
+        if len({dividend.symbol for dividend in dividend_list}) != len(dividend_list):
+            # 同一合约当日多条分红记录，需按顺序逐条处理
+            for dividend in dividend_list:
+                self.on_rtn_dividend(dividend)
+            return
+
+        slot_list = [self.slot_index[dividend.symbol] for dividend in dividend_list]
+        slots = np.array(slot_list, dtype=np.int64)
+        unit_cash = np.array([dividend.unit_cash_div_tax for dividend in dividend_list], dtype=np.float64)
+        share_ratio = np.array([dividend.share_trans_ratio + dividend.share_ratio for dividend in dividend_list],
+                               dtype=np.float64)
+
+        old_position = self.position_arr[slots]
+        cash_tax = unit_cash * old_position
+        position_tax = old_position * share_ratio
+        position = np.trunc(old_position + position_tax)
+        price = (self.price_arr[slots] * old_position - cash_tax) / position
+        last_price = self.last_price_arr[slots]
+        old_market_value = self.market_value_arr[slots]
+        market_value = last_price * position
+        accumulate_profit = position * (price - last_price)
+
+        self.position_arr[slots] = position
+        self.price_arr[slots] = price
+        self.market_value_arr[slots] = market_value
+
+        sr_logger = RemoteLogFactory.get_sr_logger()
+        for dividend, pos, avg_price, value, profit, cash, pos_tax in zip(
+                dividend_list, position.tolist(), price.tolist(), market_value.tolist(),
+                accumulate_profit.tolist(), cash_tax.tolist(), position_tax.tolist()):
+            xb_back_test_position = self.xb_back_test_position_dict[dividend.symbol]
+            xb_back_test_position.position = int(pos)
+            xb_back_test_position.price = avg_price
+            xb_back_test_position.market_value = value
+            xb_back_test_position.accumulate_profit = profit
+            sr_logger.info(STOCK_DIVIDEND_INFO % (str(self.account), dividend.symbol, str(cash), str(pos_tax)))
+
+        self.xb_back_test_account.market_value += float(np.sum(market_value - old_market_value))
+        self.xb_back_test_account.available_funds += float(np.sum(cash_tax))
+        self.xb_back_test_account.total_profit = self.xb_back_test_account.available_funds + \
+                                                 self.xb_back_test_account.market_value + self.xb_back_test_account.frozen_capital
+
+    def on_etf_rtn_split(self, etf_split):
+        super().on_etf_rtn_split(etf_split)
+        self.sync_position(etf_split.symbol)
@@ -6,11 +6,23 @@ class Engine(object):
         self._context = context
 
     def run(self, handle_message):
-        self.create_handle_data_event(handle_message)
+        try:
+            self.create_handle_data_event(handle_message)
+        finally:
+            # 回测异常中止时 save_result_to_db 不会执行，在此结束结果写入线程
+            all_result = self._context.strategy_context.all_trade_reverse_result
+            if all_result is not None:
+                all_result.close()
 
     def create_handle_data_event(self, handle_message):
         old_ticks = time.time()
         self._context.event_process.init_backtest_params(handle_message)
+        event_bus = self._context.event_bus
+        run_info = self._context.strategy_context.run_info
+        if run_info.profile_event:
+            event_bus.enable_profile()
         self._context.event_process.event_factory()
         new_ticks = time.time() - old_ticks
         print('策略运行时间' + str(new_ticks))
+        if run_info.profile_event:
+            print('事件耗时统计：\n' + event_bus.profile_table())
@@ -1,6 +1,7 @@
 from enum import Enum
 
 from collections import defaultdict
+import time
 import traceback
 
 class ConstantEvent(Enum):
@@ -57,10 +58,14 @@ class ConstantEvent(Enum):
     SYSTEM_STOCK_ORDER_CANCEL = 'SYSTEM_STOCK_ORDER_CANCEL'
     # 股票分红
     SYSTEM_STOCK_DIVIDEND = 'SYSTEM_STOCK_DIVIDEND'
+    # 股票当日全部分红（向量化模式）
+    SYSTEM_STOCK_DIVIDEND_LIST = 'SYSTEM_STOCK_DIVIDEND_LIST'
     # etf份额拆分
     SYSTEM_ETF_SPLIT = 'SYSTEM_ETF_SPLIT'
     # 股票行情更新
     SYSTEM_STOCK_QUOTATION_CHANGE = 'SYSTEM_STOCK_QUOTATION_CHANGE'
+    # 股票一批行情更新（向量化模式）
+    SYSTEM_STOCK_QUOTATION_LIST_CHANGE = 'SYSTEM_STOCK_QUOTATION_LIST_CHANGE'
     # 股票账号资金更新
     SYSTEM_STOCK_ASSET_REFRESH = 'SYSTEM_STOCK_ASSET_REFRESH'
     # 实盘所有持仓刷新
@@ -154,32 +159,75 @@ class Event(object):
         return ' '.join('{}:{}'.format(k, v) for k, v in self.__dict__.items())
 
 class EventBus(object):
+    """
+    事件总线。注册时按事件预先生成处理函数元组，发布时直接遍历；
+    开启 profile 后，处理函数被包装为计时版本，统计每个 事件/处理函数 的调用次数与累计耗时。
+    """
+
     def __init__(self):
         self._handles = defaultdict(list)
+        self._dispatch = dict()
+        self.profile = False
+        # (事件, 处理函数名) -> [调用次数, 累计耗时]
+        self.profile_dict = dict()
 
     def register_handle(self, event, handle):
         self._handles[event].append(handle)
+        self._compile(event)
 
     def add_handle(self, event, handle):
         self._handles[event].insert(0, handle)
+        self._compile(event)
+
+    def _compile(self, event):
+        if self.profile:
+            self._dispatch[event] = tuple(self._profile_handle(event, handle) for handle in self._handles[event])
+        else:
+            self._dispatch[event] = tuple(self._handles[event])
+
+    def _profile_handle(self, event, handle):
+        event_name = event.value if isinstance(event, ConstantEvent) else str(event)
+        key = (event_name, getattr(handle, '__qualname__', repr(handle)))
+        record = self.profile_dict.setdefault(key, [0, 0.0])
+        perf_counter = time.perf_counter
+
+        def profiled_handle(*args):
+            start = perf_counter()
+            try:
+                return handle(*args)
+            finally:
+                record[0] += 1
+                record[1] += perf_counter() - start
+
+        return profiled_handle
+
+    def enable_profile(self):
+        self.profile = True
+        for event in list(self._handles.keys()):
+            self._compile(event)
 
     def publish_event(self, event):
-        for l in self._handles[event.event_name]:
-            if event.event_name == ConstantEvent.STRATEGY_HANDLE_BAR or \
-                    event.event_name == ConstantEvent.STRATEGY_INIT or \
-                    event.event_name == ConstantEvent.STRATEGY_TRADING_BEFORE or \
-                    event.event_name == ConstantEvent.STRATEGY_TRADING_AFTER or \
-                    event.event_name == ConstantEvent.STRATEGY_DAY_BEFORE or \
-                    event.event_name == ConstantEvent.STOCK_ORDER_CANCEL or \
-                    event.event_name == ConstantEvent.FUND_ORDER_CANCEL or \
-                    event.event_name == ConstantEvent.STRATEGY_HANDLE_TICK or \
-                    event.event_name == ConstantEvent.ON_FUTURE_TRADE_RTN or \
-                    event.event_name == ConstantEvent.ON_STOCK_TRADE_RTN or \
-                    event.event_name == ConstantEvent.RISK_CONTROL_INIT or \
-                    event.event_name == ConstantEvent.RISK_CONTROL_TRADING_BEFORE or \
-                    event.event_name == ConstantEvent.RISK_CONTROL_TRADING_AFTER or \
-                    event.event_name == ConstantEvent.RISK_CONTROL_DAY_BEFORE or \
-                    event.event_name == ConstantEvent.RISK_CONTROL_ORDER_VERIFY:
-                l(*event.kwargs.values())
-            else:
-                l(*event.kwargs.values())
\ No newline at end of file
+        for handle in self._dispatch.get(event.event_name, ()):
+            handle(*event.kwargs.values())
+
+    def publish(self, event_name, *args):
+        """
+        高频事件（SYSTEM_HANDLE_BAR、SYSTEM_STOCK_QUOTATION_CHANGE 等）的发布入口，不创建 Event 对象
+        """
+        for handle in self._dispatch.get(event_name, ()):
+            handle(*args)
+
+    def profile_table(self):
+        """
+        按累计耗时降序输出 事件/处理函数 的统计表（累计耗时包含处理函数内部触发的嵌套事件）
+        """
+        row_list = sorted(self.profile_dict.items(), key=lambda item: item[1][1], reverse=True)
+        header = ('event', 'handle', 'calls', 'total(s)', 'per call(us)')
+        lines = [header]
+        for (event_name, handle_name), (count, total) in row_list:
+            if count == 0:
+                continue
+            lines.append((event_name, handle_name, str(count), '%.4f' % total, '%.2f' % (total / count * 1e6)))
+        width_list = [max(len(line[i]) for line in lines) for i in range(len(header))]
+        return '\n'.join('  '.join(cell.ljust(width) for cell, width in zip(line, width_list)).rstrip()
+                         for line in lines)
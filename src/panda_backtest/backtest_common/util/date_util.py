@@ -9,40 +9,37 @@ import logging
 
 from common.connector.mongodb_handler import DatabaseHandler
 from common.config.config import config
+from common.utils.trade_calendar import TradeCalendar, OUT_OF_RANGE_DATE
 
 
 class DateUtil(object):
     _quotation_db = DatabaseHandler(config)
 
+    @classmethod
+    def get_calendar(cls):
+        """
+        trading_calendar_all 按 sort_idx 排列的交易日历，进程内缓存
+        """
+        def loader():
+            docs = cls._quotation_db.mongo_find(db_name="panda", collection_name="trading_calendar_all", query={},
+                                                sort="sort_idx", projection={'_id': 0, 'trading_date': 1})
+            return [doc['trading_date'] for doc in docs]
+
+        return TradeCalendar.get_calendar('trading_calendar_all', loader)
+
     @classmethod
     def get_pre_date(cls, trade_date,pre_number=1):
-        curr_trade_date_cur = cls._quotation_db.mongo_find_one(db_name="panda", collection_name="trading_calendar_all",
-                                                               query={
-                                                                   'trading_date': str(trade_date),
-                                                               })
-        if not curr_trade_date_cur:
-            return None
-        sort_dex=curr_trade_date_cur['sort_idx']-pre_number
-        pre_trade_date = cls._quotation_db.mongo_find_one(db_name="panda", collection_name="trading_calendar_all",
-                                                               query={
-                                                                   'sort_idx': int(sort_dex),
-                                                               })
-        return pre_trade_date['trading_date']
+        return cls.get_next_trade_date(trade_date, -pre_number)
 
     @classmethod
     def get_next_trade_date(cls, trade_date,next_number=1):
-        curr_trade_date_cur = cls._quotation_db.mongo_find_one(db_name="panda", collection_name="trading_calendar_all",
-                                                              query={
-                                                                  'trading_date': str(trade_date),
-                                                              })
-        if not curr_trade_date_cur:
+        calendar = cls.get_calendar()
+        if trade_date not in calendar:
+            return None
+        trade_date = calendar.get_next_count_date(trade_date, next_number)
+        if trade_date == OUT_OF_RANGE_DATE:
             return None
-        sort_dex = curr_trade_date_cur['sort_idx'] + next_number
-        trade_date = cls._quotation_db.mongo_find_one(db_name="panda", collection_name="trading_calendar_all",
-                                                          query={
-                                                              'sort_idx': int(sort_dex),
-                                                          })
-        return trade_date['trading_date']
+        return trade_date
 
 
 if __name__ == '__main__':
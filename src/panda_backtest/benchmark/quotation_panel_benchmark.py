@@ -0,0 +1,88 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+# @File   : quotation_panel_benchmark.py
+# @desc   : 日线行情逐日查询 与 面板预加载 的查询次数、耗时对比
+#
+# 用法：
+#   python -m panda_backtest.benchmark.quotation_panel_benchmark --start 20220101 --end 20241231 --universe 500
+import argparse
+import time
+
+from common.config.config import config
+from common.connector.mongodb_handler import DatabaseHandler
+from panda_backtest.backtest_common.system.context.core_context import CoreContext
+from panda_backtest.data.context.strategy_context import StrategyContext
+from panda_backtest.data.quotation.bar_data_source import BarDataSource
+
+
+def load_trade_date_list(mongo_db, start_date, end_date):
+    docs = mongo_db.mongo_find(config['MONGO_DB'], collection_name="trade_calendar",
+                               query={'nature_date': {'$gte': int(start_date), '$lte': int(end_date)},
+                                      'is_trade': 1, 'exchange': 'SH'},
+                               sort="nature_date")
+    return [str(doc['nature_date']) for doc in docs]
+
+
+def load_universe(mongo_db, trade_date, size):
+    docs = mongo_db.mongo_find(config['MONGO_DB'], collection_name="stock_market",
+                               query={'date': trade_date}, projection={'_id': 0, 'symbol': 1})
+    return sorted({doc['symbol'] for doc in docs})[:size]
+
+
+def play(bar_data_source, trade_date_list, symbol_list):
+    """
+    模拟回测引擎的日线取数过程：每日清空缓存、初始化持仓行情、逐合约读取
+    """
+    bar_count = 0
+    for trade_date in trade_date_list:
+        bar_data_source.clear_cache_data()
+        bar_data_source.init_stock_list_daily_quotation(symbol_list, trade_date)
+        for symbol in symbol_list:
+            if bar_data_source.get_stock_daily_bar(symbol, trade_date) is not None:
+                bar_count += 1
+    return bar_count
+
+
+def run_benchmark(start_date, end_date, universe_size, symbol_list=None):
+    CoreContext(StrategyContext())
+    mongo_db = DatabaseHandler(config=config)
+    trade_date_list = load_trade_date_list(mongo_db, start_date, end_date)
+    if not symbol_list:
+        symbol_list = load_universe(mongo_db, trade_date_list[0], universe_size)
+
+    result_list = list()
+    for mode in ('per_day', 'panel'):
+        bar_data_source = BarDataSource()
+        # 预热合约基本信息，两种模式共用，不计入对比
+        for symbol in symbol_list:
+            bar_data_source.stock_info_map[symbol]
+
+        start = time.time()
+        if mode == 'panel':
+            bar_data_source.preload_daily_quotation(symbol_list, [], start_date, end_date)
+        preload_cost = time.time() - start
+        bar_count = play(bar_data_source, trade_date_list, symbol_list)
+        result_list.append({
+            'mode': mode,
+            'days': len(trade_date_list),
+            'symbols': len(symbol_list),
+            'bars': bar_count,
+            'queries': bar_data_source.query_count,
+            'preload_seconds': round(preload_cost, 3),
+            'total_seconds': round(time.time() - start, 3),
+        })
+    return result_list
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='日线行情面板预加载基准测试')
+    parser.add_argument('--start', default='20220101')
+    parser.add_argument('--end', default='20241231')
+    parser.add_argument('--universe', type=int, default=500, help='合约数量（未指定 --symbols 时生效）')
+    parser.add_argument('--symbols', default='', help='逗号分隔的合约代码')
+    args = parser.parse_args()
+
+    symbols = [symbol for symbol in args.symbols.split(',') if symbol]
+    for result in run_benchmark(args.start, args.end, args.universe, symbols):
+        print('%(mode)-8s days=%(days)-5d symbols=%(symbols)-5d bars=%(bars)-8d queries=%(queries)-8d '
+              'preload=%(preload_seconds)ss total=%(total_seconds)ss' % result)
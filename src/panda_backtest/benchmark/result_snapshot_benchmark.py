@@ -0,0 +1,113 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+# @File   : result_snapshot_benchmark.py
+# @desc   : 回测结果每日保存前的序列化耗时对比：jsonpickle + deepcopy 与 模型快照
+#
+# 用法：
+#   python -m panda_backtest.benchmark.result_snapshot_benchmark --positions 300 --trades 50 --days 250
+import argparse
+import copy
+import json
+import time
+
+import jsonpickle
+
+from panda_backtest.backtest_common.model.result.panda_backtest_account import PandaBacktestAccount
+from panda_backtest.backtest_common.model.result.panda_backtest_position import PandaBacktestPosition
+from panda_backtest.backtest_common.model.result.panda_backtest_trade import PandaBacktestTrade
+
+
+def build_day_data(position_count, trade_count, account_count=2):
+    """
+    构造与回测中字段赋值情况相近的一日账户、持仓、成交
+    """
+    account_list = list()
+    for i in range(account_count):
+        account = PandaBacktestAccount()
+        account.account_id = str(8888 + i)
+        account.gmt_create = '20250102'
+        account.available_funds = 1000000.0
+        account.total_profit = 1200000.0
+        account.static_profit = 1100000.0
+        account.market_value = 200000.0
+        account.daily_pnl = 1500.0
+        account.holding_pnl = 1200.0
+        account.start_capital = 1000000.0
+        account.yes_total_capital = 1198500.0
+        account_list.append(account)
+
+    position_list = list()
+    for i in range(position_count):
+        position = PandaBacktestPosition()
+        position.account_id = '8888'
+        position.contract_code = '%06d.SZ' % i
+        position.contract_name = position.contract_code
+        position.gmt_create = '20250102'
+        position.position = 1000
+        position.sellable = 1000
+        position.price = 10.0
+        position.last_price = 10.5
+        position.market_value = 10500.0
+        position.accumulate_profit = 500.0
+        position.cost = 5.0
+        position_list.append(position)
+
+    trade_list = list()
+    for i in range(trade_count):
+        trade = PandaBacktestTrade()
+        trade.account_id = '8888'
+        trade.trade_id = str(i)
+        trade.contract_code = '%06d.SZ' % i
+        trade.contract_name = trade.contract_code
+        trade.business = i % 2
+        trade.volume = 100
+        trade.price = 10.0
+        trade.cost = 5.0
+        trade.gmt_create = '20250102'
+        trade.gmt_create_time = '093100'
+        trade.trade_date = '20250102'
+        trade_list.append(trade)
+    return account_list, position_list, trade_list
+
+
+def encode_snapshot(account_list, position_list, trade_list):
+    return ([account.snapshot() for account in account_list],
+            [position.snapshot() for position in position_list],
+            [trade.snapshot() for trade in trade_list])
+
+
+def encode_jsonpickle(account_list, position_list, trade_list):
+    return (copy.deepcopy([account.__dict__ for account in account_list]),
+            json.loads(jsonpickle.encode(position_list, unpicklable=False)),
+            json.loads(jsonpickle.encode(trade_list, unpicklable=False)))
+
+
+def run_benchmark(position_count, trade_count, day_count):
+    account_list, position_list, trade_list = build_day_data(position_count, trade_count)
+    result_list = list()
+    for mode, encode in (('jsonpickle', encode_jsonpickle), ('snapshot', encode_snapshot)):
+        start = time.perf_counter()
+        for _ in range(day_count):
+            encode(account_list, position_list, trade_list)
+        total = time.perf_counter() - start
+        result_list.append({
+            'mode': mode,
+            'days': day_count,
+            'positions': position_count,
+            'trades': trade_count,
+            'per_day_ms': round(total / day_count * 1000, 4),
+            'total_seconds': round(total, 3),
+        })
+    return result_list
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='回测结果每日快照基准测试')
+    parser.add_argument('--positions', type=int, default=300)
+    parser.add_argument('--trades', type=int, default=50)
+    parser.add_argument('--days', type=int, default=250)
+    args = parser.parse_args()
+
+    for result in run_benchmark(args.positions, args.trades, args.days):
+        print('%(mode)-10s days=%(days)-5d positions=%(positions)-5d trades=%(trades)-5d '
+              'per_day=%(per_day_ms)sms total=%(total_seconds)ss' % result)
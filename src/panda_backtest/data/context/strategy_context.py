@@ -57,6 +57,13 @@ class StrategyContext(object):
         self.run_info.stock_account = handle_message.setdefault('stock_account', '8888')
         self.run_info.future_account = handle_message.setdefault('future_account', '5588')
         self.run_info.fund_account = handle_message.setdefault('fund_account', '2233')
+        self.run_info.preload_quotation = handle_message.setdefault('preload_quotation', False)
+        self.run_info.preload_symbol_list = handle_message.setdefault('preload_symbol_list', None)
+        self.run_info.vectorized = handle_message.setdefault('vectorized', False)
+        self.run_info.session_symbol_list = handle_message.setdefault('session_symbol_list', None)
+        self.run_info.profile_event = handle_message.setdefault('profile_event', False)
+        self.run_info.result_flush_days = handle_message.setdefault('result_flush_days', 20)
+        self.run_info.history_bar_size = handle_message.setdefault('history_bar_size', 500)
         self.run_info.run_strategy_type = 0
         self.run_info.start_run_time = time.time()
         standard_info_list = self.run_info.benchmark.split('.')
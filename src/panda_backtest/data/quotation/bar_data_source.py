@@ -6,6 +6,7 @@
 # @desc   : 行情自定义字典
 import calendar
 import logging
+from collections import OrderedDict
 
 import datetime
 import time
@@ -20,10 +21,22 @@ from panda_backtest.util.annotation.singleton_annotation import singleton
 import pymongo
 from panda_backtest.util.time.time_util import TimeUtil
 from panda_backtest.backtest_common.data.stock.stock_info_map import StockInfoMap
+from panda_backtest.data.quotation.quotation_panel import QuotationPanel
+from panda_backtest.data.quotation.quotation_disk_cache import QuotationDiskCache
 from sympy import false
 
+# 面板预加载时单次 $in 查询的合约数量
+PANEL_QUERY_CHUNK_SIZE = 500
+# 进程内保留的面板数量，同一进程内连续回测（如参数寻优）复用已加载的面板
+PANEL_MEMO_SIZE = 4
+
+logger = logging.getLogger(__name__)
+
 
 class BarDataSource(BaseBarDataSource):
+    # (面板名, 开始日期, 结束日期, 合约) -> QuotationPanel，面板只读，可跨回测共享
+    panel_memo = OrderedDict()
+
     def __init__(self):
         self.quotation_mongo_db = DatabaseHandler(config=config)
         self.stock_daily_bar = dict()
@@ -34,6 +47,13 @@ class BarDataSource(BaseBarDataSource):
         self.context = CoreContext.get_instance()
         self.stock_info_map = StockInfoMap(self.quotation_mongo_db)
         self.last_field = 'close'
+        # 日线行情面板（预加载模式）
+        self.stock_panel = None
+        self.future_panel = None
+        # 本地行情缓存（未配置时为None）
+        self.disk_cache = QuotationDiskCache.get_instance()
+        # 数据库查询次数统计
+        self.query_count = 0
 
     def change_last_field(self, field_type):
         if field_type == 0:
@@ -84,6 +104,154 @@ class BarDataSource(BaseBarDataSource):
     #             self.stock_daily_bar[symbol] = bar
     #         # print('股票日线查询====》合约：%s,耗时：%s' % (symbol, str(time.time() - start)))
     #         return bar
+    def preload_daily_quotation(self, stock_symbol_list, future_symbol_list, start_date, end_date):
+        """
+        预加载回测区间内的日线行情面板，之后面板内合约的日线查询按下标读取，不再访问数据库
+        :param stock_symbol_list: 股票、场内基金、指数代码
+        :param future_symbol_list: 期货合约代码
+        :param start_date: 回测开始日期
+        :param end_date: 回测结束日期
+        :return:
+        """
+        start_date = str(start_date)
+        end_date = str(end_date)
+        # 区间未结束的面板数据可能仍在更新，不写入本地缓存，进程内面板只在当日复用
+        today = time.strftime('%Y%m%d')
+        use_disk_cache = self.disk_cache is not None and end_date < today
+        memo_date = None if end_date < today else today
+
+        if stock_symbol_list:
+            self.stock_panel = self.get_memo_panel(
+                'stock_daily', start_date, end_date, stock_symbol_list, use_disk_cache, memo_date,
+                lambda: self.load_stock_panel(stock_symbol_list, start_date, end_date))
+
+        if future_symbol_list:
+            self.future_panel = self.get_memo_panel(
+                'future_daily', start_date, end_date, future_symbol_list, use_disk_cache, memo_date,
+                lambda: self.load_future_panel(future_symbol_list, start_date, end_date))
+
+    def get_memo_panel(self, name, start_date, end_date, symbol_list, use_disk_cache, memo_date, loader):
+        """
+        依次从进程内面板、本地缓存、数据库获取面板
+        """
+        symbol_list = sorted(symbol_list)
+        key = (name, start_date, end_date, memo_date, tuple(symbol_list))
+        panel = BarDataSource.panel_memo.get(key)
+        if panel is not None:
+            BarDataSource.panel_memo.move_to_end(key)
+            return panel
+
+        if use_disk_cache:
+            panel = self.disk_cache.get_panel(name, '%s_%s' % (start_date, end_date), symbol_list, loader,
+                                              QuotationPanel)
+        else:
+            panel = loader()
+        BarDataSource.panel_memo[key] = panel
+        while len(BarDataSource.panel_memo) > PANEL_MEMO_SIZE:
+            BarDataSource.panel_memo.popitem(last=False)
+        return panel
+
+    def load_stock_panel(self, stock_symbol_list, start_date, end_date):
+        collection_symbol_dict = dict()
+        for symbol in stock_symbol_list:
+            collection = self.get_stock_daily_collection(symbol)
+            collection_symbol_dict.setdefault(collection, list()).append(symbol)
+
+        record_list = list()
+        for collection, symbol_list in collection_symbol_dict.items():
+            for i in range(0, len(symbol_list), PANEL_QUERY_CHUNK_SIZE):
+                self.query_count += 1
+                bar_cur = self.quotation_mongo_db.mongo_find(
+                    db_name=config["MONGO_DB"],
+                    collection_name=collection,
+                    query={"symbol": {'$in': symbol_list[i:i + PANEL_QUERY_CHUNK_SIZE]},
+                           "date": {'$gte': start_date, '$lte': end_date}},
+                    projection={'_id': 0}
+                )
+                record_list.extend((bar_dict['symbol'], bar_dict) for bar_dict in bar_cur)
+        panel = QuotationPanel(stock_symbol_list, start_date, end_date)
+        panel.load(record_list)
+        return panel
+
+    def load_future_panel(self, future_symbol_list, start_date, end_date):
+        # 期货日线库中的代码不带交易所后缀
+        code_symbol_dict = dict()
+        for symbol in future_symbol_list:
+            code_symbol_dict.setdefault(symbol.split(".")[0], list()).append(symbol)
+        code_list = list(code_symbol_dict.keys())
+
+        record_list = list()
+        for i in range(0, len(code_list), PANEL_QUERY_CHUNK_SIZE):
+            self.query_count += 1
+            bar_cur = self.quotation_mongo_db.mongo_find(
+                db_name="panda",
+                collection_name="future_1d_market",
+                query={"symbol": {'$in': code_list[i:i + PANEL_QUERY_CHUNK_SIZE]},
+                       "date": {'$gte': start_date, '$lte': end_date}},
+                projection={'_id': 0}
+            )
+            for bar_dict in bar_cur:
+                for symbol in code_symbol_dict.get(bar_dict['symbol'], []):
+                    record_list.append((symbol, bar_dict))
+        panel = QuotationPanel(future_symbol_list, start_date, end_date)
+        panel.load(record_list)
+        return panel
+
+    def get_daily_table(self, db_name, collection, trade_date):
+        """
+        读取某交易日全市场日线（本地缓存分区），未命中时整日查询一次并写入缓存
+        同一集合、交易日只有一个分区：统一按 date 查询，投影 {'_id': 0}
+        :return: RecordTable，按 symbol 索引；无数据时返回None
+        """
+        query = {'date': str(trade_date)}
+        projection = {'_id': 0}
+
+        def loader():
+            self.query_count += 1
+            return self.quotation_mongo_db.mongo_find(db_name=db_name, collection_name=collection,
+                                                      query=query, projection=projection)
+
+        return self.disk_cache.get_table(collection, trade_date,
+                                         {'db': db_name, 'query': query, 'projection': projection}, loader)
+
+    def get_minute_table(self, collection, trade_date, symbol, projection=None):
+        """
+        读取单合约单日分钟线（本地缓存分区），未命中时查询并写入缓存
+        :return: RecordTable，按 time 索引；无数据时返回None
+        """
+        query = {"trade_date": int(trade_date), "symbol": symbol}
+
+        def loader():
+            self.query_count += 1
+            return list(self.quotation_mongo_db.get_mongo_collection(config["MONGO_DB"], collection)
+                        .find(query, projection))
+
+        return self.disk_cache.get_table(collection, trade_date, {'query': query, 'projection': projection},
+                                         loader, key_field='time')
+
+    def get_panel_daily_bar(self, panel, cache, symbol, trade_date):
+        """
+        从日线行情面板读取行情并放入当日缓存
+        :return: 当日无行情时返回None
+        """
+        bar_dict = panel.get(symbol, trade_date)
+        if bar_dict is None:
+            return None
+        bar = DailyQuotationData()
+        bar.__dict__ = bar_dict
+        bar.last = bar_dict.get(self.last_field)
+        cache[symbol] = bar
+        return bar
+
+    def get_stock_daily_collection(self, symbol):
+        stock_type = self.stock_info_map[symbol]['type']
+        if stock_type == 1:
+            return "index_daily_price"
+        elif stock_type == 2:
+            return "etf_daily_quotation_v2"
+        else:
+            return "stock_market"
+
     def get_stock_daily_bar(self, symbol, trade_date):
         # 缓存命中，直接返回
         if symbol in self.stock_daily_bar:
@@ -91,18 +259,30 @@ class BarDataSource(BaseBarDataSource):
             bar.last = getattr(bar, self.last_field)
             return bar
 
+        # 面板预加载命中，按下标读取
+        if self.stock_panel is not None and self.stock_panel.covers(symbol, trade_date):
+            return self.get_panel_daily_bar(self.stock_panel, self.stock_daily_bar, symbol, trade_date)
+
         # 未命中缓存，准备查询
-        stock_type = self.stock_info_map[symbol]['type']
-        if stock_type == 1:
-            collection = "index_daily_price"
-        elif stock_type == 2:
-            collection = "etf_daily_quotation_v2"
-        else:
-            collection = "stock_market"
+        collection = self.get_stock_daily_collection(symbol)
+
+        # 本地行情缓存：按交易日整日缓存全市场日线
+        if self.disk_cache is not None:
+            table = self.get_daily_table(config["MONGO_DB"], collection, trade_date)
+            bar_dict = table.get(symbol) if table is not None else None
+            if bar_dict is None:
+                logger.debug(f"无数据：symbol={symbol}, date={trade_date}, collection={collection}")
+                return None
+            bar = DailyQuotationData()
+            bar.__dict__ = bar_dict
+            bar.last = bar_dict.get(self.last_field)
+            self.stock_daily_bar[symbol] = bar
+            return bar
 
         bar_dict = None  # ✅ 先初始化，避免 try 异常后 bar_dict 未定义
 
         try:
+            self.query_count += 1
             bar_dict_list = self.quotation_mongo_db.mongo_find(
                 db_name=config["MONGO_DB"],
                 collection_name=collection,
@@ -140,14 +320,18 @@ class BarDataSource(BaseBarDataSource):
 
         # 获取一天的数据
 
-        stock_type = self.stock_info_map[symbol]['type']
-        if stock_type == 1:
-            # TODO
-            collection = self.quotation_mongo_db.stock_quotation_min_data
+        if self.disk_cache is not None:
+            table = self.get_minute_table("stock_quotation_min_data", trade_date, symbol)
+            bar_dict = table.records() if table is not None else []
         else:
-            collection = self.quotation_mongo_db.stock_quotation_min_data
-
-        bar_dict = collection.find({"trade_date": int(trade_date), "symbol": symbol})
+            stock_type = self.stock_info_map[symbol]['type']
+            if stock_type == 1:
+                # TODO
+                collection = self.quotation_mongo_db.stock_quotation_min_data
+            else:
+                collection = self.quotation_mongo_db.stock_quotation_min_data
+            self.query_count += 1
+            bar_dict = collection.find({"trade_date": int(trade_date), "symbol": symbol})
         bar_obj_dict = dict()
         for bar in bar_dict:
             bar_obj = BarQuotationData()
@@ -161,6 +345,21 @@ class BarDataSource(BaseBarDataSource):
         else:
             return BarQuotationData()
 
+    def get_minute_bar_time_set(self, stock_symbol_list, future_symbol_list, trade_date):
+        """
+        当日已加载分钟 bar 的时间点（整数 HHMMSS）并集，未加载的合约先整日加载
+        """
+        time_set = set()
+        for symbol in stock_symbol_list:
+            if symbol not in self.stock_minute_bar:
+                self.get_stock_minute_bar(symbol, trade_date, 0)
+            time_set.update(self.stock_minute_bar[symbol].keys())
+        for symbol in future_symbol_list:
+            if symbol not in self.future_all_minute_bar:
+                self.get_future_minute_bar(symbol, trade_date, 0)
+            time_set.update(self.future_all_minute_bar[symbol].keys())
+        return time_set
+
     def get_future_daily_bar(self, symbol, date):
         start = time.time()
         # print('期货日线查询1====》合约：%s 日期：%s' % (symbol, date))
@@ -171,11 +370,22 @@ class BarDataSource(BaseBarDataSource):
             bar.last = getattr(bar, self.last_field)
             return bar
 
+        if self.future_panel is not None and self.future_panel.covers(symbol, date):
+            bar = self.get_panel_daily_bar(self.future_panel, self.future_daily_bar, symbol, date)
+            if bar is None:
+                return DailyQuotationData()
+            return bar
+
         # collection = "daily_future_quotation"
         collection = "future_1d_market"
 
-        # bar_dict = self.quotation_mongo_db.mongo_find_one(db_name="panda",collection_name=collection,query={"trade_date": int(date), "symbol": symbol})
-        bar_dict = self.quotation_mongo_db.mongo_find_one(db_name="panda",collection_name=collection,query={"date": str(date), "symbol": symbol.split(".")[0]})
+        if self.disk_cache is not None:
+            table = self.get_daily_table("panda", collection, date)
+            bar_dict = table.get(symbol.split(".")[0]) if table is not None else None
+        else:
+            self.query_count += 1
+            # bar_dict = self.quotation_mongo_db.mongo_find_one(db_name="panda",collection_name=collection,query={"trade_date": int(date), "symbol": symbol})
+            bar_dict = self.quotation_mongo_db.mongo_find_one(db_name="panda",collection_name=collection,query={"date": str(date), "symbol": symbol.split(".")[0]})
         bar = DailyQuotationData()
         if bar_dict:
             bar.__dict__ = bar_dict
@@ -200,8 +410,13 @@ class BarDataSource(BaseBarDataSource):
                 return BarQuotationData()
 
         # 获取一天的数据
-        collection = self.quotation_mongo_db.future_quotation_min_data_v2
-        bar_dict = collection.find({"trade_date": int(trade_date), "symbol": symbol}, {'_id': 0})
+        if self.disk_cache is not None:
+            table = self.get_minute_table("future_quotation_min_data_v2", trade_date, symbol, {'_id': 0})
+            bar_dict = table.records() if table is not None else []
+        else:
+            collection = self.quotation_mongo_db.future_quotation_min_data_v2
+            self.query_count += 1
+            bar_dict = collection.find({"trade_date": int(trade_date), "symbol": symbol}, {'_id': 0})
         bar_obj_dict = dict()
         settlement = self.get_future_daily_bar(symbol, trade_date).settlement
         for bar in bar_dict:
@@ -236,6 +451,7 @@ class BarDataSource(BaseBarDataSource):
             else:
                 find_dict = {'publish_date': {'$lte': trade_date, '$gt': pre_trade_date}, 'symbol': symbol}
 
+            self.query_count += 1
             bar_dict = collection.find_one(find_dict,
                                            {'_id': 0, 'insert_time': 0})
             bar = DailyQuotationData()
@@ -248,6 +464,9 @@ class BarDataSource(BaseBarDataSource):
             return bar
 
     def init_stock_list_daily_quotation(self, symbol_list, trade_date, freq='1d'):
+        if self.stock_panel is not None and freq == '1d':
+            # 面板内合约按需从面板读取，无需再查询
+            symbol_list = [symbol for symbol in symbol_list if not self.stock_panel.covers(symbol, trade_date)]
         if len(symbol_list) == 0:
             return
 
@@ -299,7 +518,13 @@ class BarDataSource(BaseBarDataSource):
 
     def init_stock_list_daily_quotation_by_collection(self, symbol_list, trade_date, freq='1d', collection=None):
         if freq == '1d':
-            bar_cur = self.quotation_mongo_db.mongo_find(config["MONGO_DB"],collection_name=collection,query={"symbol": {'$in': symbol_list}, "trade_date": trade_date},projection={'_id': 0, 'insert_time': 0})
+            if self.disk_cache is not None:
+                # 与 get_stock_daily_bar 共用按 date 划分的整日分区
+                table = self.get_daily_table(config["MONGO_DB"], collection, trade_date)
+                bar_cur = [table.get(symbol) for symbol in symbol_list] if table is not None else []
+            else:
+                self.query_count += 1
+                bar_cur = self.quotation_mongo_db.mongo_find(config["MONGO_DB"],collection_name=collection,query={"symbol": {'$in': symbol_list}, "trade_date": trade_date},projection={'_id': 0, 'insert_time': 0})
             # bar_cur = collection.find({"symbol": {'$in': symbol_list}, "trade_date": trade_date},
             #                           {'_id': 0, 'insert_time': 0})
             for bar_dict in bar_cur:
@@ -315,6 +540,7 @@ class BarDataSource(BaseBarDataSource):
                 self.stock_minute_bar[symbol] = dict()
 
             bar_cur = collection.find({"trade_date": int(trade_date), "symbol": {'$in': symbol_list}}, {'_id': 0})
+            self.query_count += 1
             bar_cur = self.quotation_mongo_db.mongo_find(config["MONGO_DB"], collection_name=collection,
                                                          query={"symbol": {'$in': symbol_list},
                                                                 "trade_date": trade_date},
@@ -337,9 +563,18 @@ class BarDataSource(BaseBarDataSource):
 
     def init_future_daily_quotation(self, symbol_list, trade_date):
         # collection = self.quotation_mongo_db.daily_future_quotation
-        if symbol_list:
-            processed_symbol_list = [symbol.split(".")[0] for symbol in symbol_list]
-        bar_cur = self.quotation_mongo_db.mongo_find(db_name="panda",collection_name="future_1d_market",query={"date": str(trade_date), "symbol": {'$in': processed_symbol_list}})
+        if self.future_panel is not None:
+            # 面板内合约按需从面板读取，无需再查询
+            symbol_list = [symbol for symbol in symbol_list if not self.future_panel.covers(symbol, trade_date)]
+        if not symbol_list:
+            return
+        processed_symbol_list = [symbol.split(".")[0] for symbol in symbol_list]
+        if self.disk_cache is not None:
+            table = self.get_daily_table("panda", "future_1d_market", trade_date)
+            bar_cur = [table.get(symbol) for symbol in processed_symbol_list] if table is not None else []
+        else:
+            self.query_count += 1
+            bar_cur = self.quotation_mongo_db.mongo_find(db_name="panda",collection_name="future_1d_market",query={"date": str(trade_date), "symbol": {'$in': processed_symbol_list}})
         # print('期货初始化日线查询====》trade_date：%s ' % trade_date)
         for bar_dict in bar_cur:
             bar = DailyQuotationData()
@@ -355,9 +590,14 @@ class BarDataSource(BaseBarDataSource):
         start = time.time()
         for symbol in symbol_list:
             self.future_all_minute_bar[symbol] = dict()
-        collection = self.quotation_mongo_db.future_quotation_min_data_v2
-        bar_cur = collection.find({"trade_date": int(trade_date), "symbol": {'$in': symbol_list}}, {'_id': 0}).sort(
-            [('symbol', pymongo.ASCENDING)])
+        if self.disk_cache is not None:
+            table_dict = self.disk_cache.get_tables(
+                "future_quotation_min_data_v2", trade_date, symbol_list,
+                lambda symbol: {'query': {"trade_date": int(trade_date), "symbol": symbol}, 'projection': {'_id': 0}},
+                lambda miss_symbol_list: self.find_future_min_quotation(miss_symbol_list, trade_date))
+            bar_cur = [bar_dict for symbol in sorted(table_dict) for bar_dict in table_dict[symbol].records()]
+        else:
+            bar_cur = self.find_future_min_quotation(symbol_list, trade_date)
         cur_symbol = None
         cur_settle = None
         for bar_dict in bar_cur:
@@ -375,6 +615,12 @@ class BarDataSource(BaseBarDataSource):
                 self.future_all_minute_bar[bar_dict['symbol']][bar_dict['time']] = bar
         # print('期货分钟初始化查询====》合约：%s,耗时：%s' % (str(symbol_list), str(time.time() - start)))
 
+    def find_future_min_quotation(self, symbol_list, trade_date):
+        collection = self.quotation_mongo_db.get_mongo_collection(config["MONGO_DB"], "future_quotation_min_data_v2")
+        self.query_count += 1
+        return collection.find({"trade_date": int(trade_date), "symbol": {'$in': symbol_list}}, {'_id': 0}).sort(
+            [('symbol', pymongo.ASCENDING)])
+
     def init_fund_list_daily_quotation(self, symbol_list, trade_date):
         if len(symbol_list) == 0:
             return
@@ -394,6 +640,7 @@ class BarDataSource(BaseBarDataSource):
                          'publish_date': {'$lte': trade_date, '$gt': pre_trade_date},
                          }
 
+        self.query_count += 1
         bar_cur = collection.find(find_dict).sort(
             [('end_date', pymongo.ASCENDING)])
 
@@ -0,0 +1,130 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+# @File   : instrument_registry.py
+# @desc   : 合约基础信息表，一次查询加载整张集合为列式表，本地快照用于快速启动，按周期刷新
+#
+# 快照文件：<INSTRUMENT_SNAPSHOT_DIR 或 QUOTATION_CACHE_DIR>/instrument/<name>.pkl
+import logging
+import os
+import pickle
+import threading
+import time
+import uuid
+
+from common.config.config import config
+from panda_backtest.data.quotation.quotation_disk_cache import RecordTable
+
+# 快照格式版本，格式变化时递增
+SNAPSHOT_VERSION = 1
+# 刷新失败后的重试间隔（秒）
+RETRY_SECONDS = 60
+
+logger = logging.getLogger(__name__)
+
+
+class InstrumentRegistry(object):
+    """
+    合约基础信息表：
+    首次访问时加载，优先读取未过期的本地快照，否则调用 loader 一次查询整张集合并写快照；
+    加载超过 refresh_seconds 后，下次访问时重新加载（常驻服务按周期刷新）。
+    数据存放在 RecordTable 中，按 key_field 建立行索引，取用过的记录还原为 dict 后缓存。
+    """
+
+    def __init__(self, name, loader, key_field, refresh_seconds=None, snapshot_dir=None):
+        """
+        :param name: 表名，作为快照文件名
+        :param loader: 无参函数，返回全部记录 dict 的列表
+        :param key_field: 行索引字段
+        """
+        self.name = name
+        self.loader = loader
+        self.key_field = key_field
+        if refresh_seconds is None:
+            refresh_seconds = config.get('INSTRUMENT_REFRESH_SECONDS', 86400)
+        self.refresh_seconds = refresh_seconds
+        if snapshot_dir is None:
+            snapshot_dir = config.get('INSTRUMENT_SNAPSHOT_DIR') or config.get('QUOTATION_CACHE_DIR')
+        self.snapshot_path = os.path.join(snapshot_dir, 'instrument', name + '.pkl') if snapshot_dir else None
+        self.table = None
+        self.load_time = 0
+        self.record_cache = dict()
+        self.load_count = 0
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        """
+        :return: 记录 dict，表中没有时返回 None
+        """
+        if self.is_expired():
+            self.refresh()
+        try:
+            return self.record_cache[key]
+        except KeyError:
+            record = self.table.get(key)
+            if record is not None:
+                self.record_cache[key] = record
+            return record
+
+    def __len__(self):
+        if self.is_expired():
+            self.refresh()
+        return len(self.table)
+
+    def is_expired(self):
+        return self.table is None or time.time() - self.load_time > self.refresh_seconds
+
+    def refresh(self):
+        with self._lock:
+            if not self.is_expired():
+                return
+            snapshot = self.read_snapshot()
+            if snapshot is not None and time.time() - snapshot[1] <= self.refresh_seconds:
+                table, load_time = snapshot
+            else:
+                try:
+                    table = RecordTable.from_records(self.loader(), self.key_field)
+                    load_time = time.time()
+                    self.load_count += 1
+                    self.write_snapshot(table, load_time)
+                except Exception as e:
+                    stale_table = snapshot[0] if snapshot is not None else self.table
+                    if stale_table is None:
+                        raise
+                    # 数据库不可用时沿用过期的数据，RETRY_SECONDS 后再试
+                    logger.warning(f"刷新合约信息表失败，沿用已有数据: {self.name}, {e}")
+                    table = stale_table
+                    load_time = time.time() - max(self.refresh_seconds - RETRY_SECONDS, 0)
+            self.table = table
+            self.load_time = load_time
+            self.record_cache = dict()
+
+    def read_snapshot(self):
+        if self.snapshot_path is None or not os.path.exists(self.snapshot_path):
+            return None
+        try:
+            with open(self.snapshot_path, 'rb') as f:
+                snapshot = pickle.load(f)
+            if snapshot['version'] != SNAPSHOT_VERSION:
+                return None
+            return RecordTable.from_partition(snapshot['meta'], snapshot['arrays'],
+                                              snapshot['objects']), snapshot['load_time']
+        except Exception as e:
+            logger.warning(f"读取合约信息快照失败，将重新加载: {self.snapshot_path}, {e}")
+            return None
+
+    def write_snapshot(self, table, load_time):
+        if self.snapshot_path is None:
+            return
+        meta, array_dict, objects = table.to_partition()
+        tmp_path = '%s.%s.tmp' % (self.snapshot_path, uuid.uuid4().hex)
+        try:
+            os.makedirs(os.path.dirname(self.snapshot_path), exist_ok=True)
+            with open(tmp_path, 'wb') as f:
+                pickle.dump({'version': SNAPSHOT_VERSION, 'load_time': load_time, 'meta': meta,
+                             'arrays': array_dict, 'objects': objects}, f, protocol=pickle.HIGHEST_PROTOCOL)
+            # 整个文件替换，其他进程不会读到写了一半的快照
+            os.replace(tmp_path, self.snapshot_path)
+        except OSError as e:
+            logger.debug(f"写入合约信息快照失败: {self.snapshot_path}, {e}")
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
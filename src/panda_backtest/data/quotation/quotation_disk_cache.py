@@ -0,0 +1,399 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+# @File   : quotation_disk_cache.py
+# @desc   : 本地列式行情缓存，多次回测共享，按 集合 / 交易日 / 合约 分区
+#
+# 分区目录：<QUOTATION_CACHE_DIR>/<collection>/<trade_date>/<key>/
+#   meta.json    字段、主键等元信息
+#   *.npy        数值列（命中时以 mmap 方式打开）
+#   objects.pkl  非数值列
+# key 为查询条件的哈希，查询条件或缓存格式变化时自然落到新的分区。
+# 只缓存已结束的交易日（早于当天），当天及之后的行情可能仍在更新，直接查询数据库。
+#
+# 预热：
+#   python -m panda_backtest.data.quotation.quotation_disk_cache --start 20220101 --end 20241231
+import argparse
+import hashlib
+import json
+import logging
+import os
+import pickle
+import shutil
+import threading
+import time
+import uuid
+from collections import OrderedDict
+
+import numpy as np
+
+from common.config.config import config
+from panda_backtest.data.quotation.quotation_panel import classify_fields, restore_record
+
+# 缓存格式版本，格式变化时递增
+CACHE_VERSION = 1
+# 进程内保留的已打开分区数量
+OPEN_PARTITION_LIMIT = 256
+# 超出容量上限后清理到上限的比例
+EVICT_TARGET_RATIO = 0.9
+
+logger = logging.getLogger(__name__)
+
+
+class RecordTable(object):
+    """
+    列式记录表：数值字段存放在 float64 二维数组 values[row, field]，
+    非数值字段存放在 object 二维数组 objects[row, field]，按主键字段建立行索引
+    """
+
+    def __init__(self, key_field, float_fields, int_fields, object_fields, values, objects):
+        self.key_field = key_field
+        self.float_fields = float_fields
+        self.int_fields = int_fields
+        self.object_fields = object_fields
+        self.values = values
+        self.objects = objects
+        self.key_index = dict()
+        key_pos = self._field_pos(key_field)
+        if key_pos is not None:
+            for row in range(len(values)):
+                key = self._row_value(row, key_pos)
+                self.key_index.setdefault(key, row)
+
+    @classmethod
+    def from_records(cls, bar_dict_list, key_field=None):
+        bar_dict_list = list(bar_dict_list)
+        float_fields, int_fields, object_fields = classify_fields(bar_dict_list)
+        values = np.full((len(bar_dict_list), len(float_fields)), np.nan, dtype=np.float64)
+        objects = np.full((len(bar_dict_list), len(object_fields)), None, dtype=object)
+        for row, bar_dict in enumerate(bar_dict_list):
+            for field_pos, field in enumerate(float_fields):
+                value = bar_dict.get(field)
+                if value is not None:
+                    values[row, field_pos] = value
+            for field_pos, field in enumerate(object_fields):
+                objects[row, field_pos] = bar_dict.get(field)
+        return cls(key_field, float_fields, int_fields, object_fields, values, objects)
+
+    def __len__(self):
+        return len(self.values)
+
+    def get(self, key):
+        row = self.key_index.get(key)
+        if row is None:
+            return None
+        return self.record(row)
+
+    def record(self, row):
+        return restore_record(self.float_fields, self.int_fields, self.values[row],
+                              self.object_fields, self.objects[row])
+
+    def records(self):
+        for row in range(len(self.values)):
+            yield self.record(row)
+
+    def to_partition(self):
+        meta = {
+            'key_field': self.key_field,
+            'float_fields': self.float_fields,
+            'int_fields': self.int_fields,
+            'object_fields': self.object_fields,
+        }
+        return meta, {'values': self.values}, self.objects
+
+    @classmethod
+    def from_partition(cls, meta, array_dict, objects):
+        return cls(meta['key_field'], meta['float_fields'], meta['int_fields'], meta['object_fields'],
+                   array_dict['values'], objects)
+
+    def _field_pos(self, field):
+        if field in self.object_fields:
+            return 1, self.object_fields.index(field)
+        if field in self.float_fields:
+            return 0, self.float_fields.index(field)
+        return None
+
+    def _row_value(self, row, key_pos):
+        kind, pos = key_pos
+        if kind == 1:
+            return self.objects[row, pos]
+        value = self.values[row, pos]
+        return int(value) if self.float_fields[pos] in self.int_fields else float(value)
+
+
+class QuotationDiskCache(object):
+    _instance = None
+    _lock = threading.Lock()
+
+    def __init__(self, cache_dir, max_bytes):
+        self.cache_dir = cache_dir
+        self.max_bytes = max_bytes
+        self.total_bytes = None
+        self.open_partitions = OrderedDict()
+        self.hit_count = 0
+        self.miss_count = 0
+        self._write_lock = threading.Lock()
+        os.makedirs(os.path.join(self.cache_dir, '.tmp'), exist_ok=True)
+
+    @classmethod
+    def get_instance(cls):
+        """
+        未配置 QUOTATION_CACHE_DIR 时返回None（不启用本地缓存）
+        """
+        if QuotationDiskCache._instance is None:
+            cache_dir = config.get('QUOTATION_CACHE_DIR')
+            if not cache_dir:
+                return None
+            with cls._lock:
+                if QuotationDiskCache._instance is None:
+                    QuotationDiskCache._instance = QuotationDiskCache(
+                        cache_dir, config.get('QUOTATION_CACHE_MAX_BYTES'))
+        return QuotationDiskCache._instance
+
+    @staticmethod
+    def is_final(trade_date):
+        """交易日早于当天时行情不再变化，可以缓存"""
+        return str(trade_date) < time.strftime('%Y%m%d')
+
+    def get_table(self, collection, trade_date, query, loader, key_field='symbol'):
+        """
+        读取一个分区，未命中时调用 loader 查询数据库并写入缓存；当天及之后的交易日不缓存
+        :param collection: 集合名
+        :param trade_date: 交易日
+        :param query: 分区对应的查询条件，用于计算分区key
+        :param loader: 无参函数，返回该分区的全部行情记录
+        :param key_field: 行索引字段
+        :return: RecordTable，数据库中无数据时返回None（空结果不缓存）
+        """
+        if not self.is_final(trade_date):
+            bar_dict_list = loader()
+            return RecordTable.from_records(bar_dict_list, key_field) if bar_dict_list else None
+        path = self.partition_path(collection, trade_date, query)
+        table = self.open_table(path)
+        if table is not None:
+            self.hit_count += 1
+            return table
+        self.miss_count += 1
+        bar_dict_list = loader()
+        if not bar_dict_list:
+            return None
+        table = RecordTable.from_records(bar_dict_list, key_field)
+        self.write_partition(path, table)
+        self._remember(path, table)
+        return table
+
+    def get_tables(self, collection, trade_date, symbol_list, query_func, bulk_loader, key_field='time'):
+        """
+        批量读取按合约划分的分区，未命中的合约用一次批量查询补齐；当天及之后的交易日不缓存
+        :param query_func: 合约 -> 分区查询条件
+        :param bulk_loader: 未命中合约列表 -> 行情记录列表
+        :return: {合约: RecordTable}，无数据的合约不在结果中
+        """
+        if not self.is_final(trade_date):
+            return {symbol: RecordTable.from_records(bar_dict_list, key_field)
+                    for symbol, bar_dict_list in self._group_by_symbol(bulk_loader(list(symbol_list))).items()}
+
+        table_dict = dict()
+        miss_symbol_list = list()
+        for symbol in symbol_list:
+            table = self.open_table(self.partition_path(collection, trade_date, query_func(symbol)))
+            if table is None:
+                miss_symbol_list.append(symbol)
+            else:
+                self.hit_count += 1
+                table_dict[symbol] = table
+
+        if miss_symbol_list:
+            self.miss_count += len(miss_symbol_list)
+            for symbol, bar_dict_list in self._group_by_symbol(bulk_loader(miss_symbol_list)).items():
+                if symbol not in miss_symbol_list:
+                    continue
+                path = self.partition_path(collection, trade_date, query_func(symbol))
+                table = RecordTable.from_records(bar_dict_list, key_field)
+                self.write_partition(path, table)
+                self._remember(path, table)
+                table_dict[symbol] = table
+        return table_dict
+
+    @staticmethod
+    def _group_by_symbol(bar_dict_list):
+        symbol_bar_dict = dict()
+        for bar_dict in bar_dict_list:
+            symbol_bar_dict.setdefault(bar_dict['symbol'], list()).append(bar_dict)
+        return symbol_bar_dict
+
+    def get_panel(self, name, date_range, query, loader, panel_cls):
+        """
+        读取整段行情面板，未命中时调用 loader 构建并写入缓存
+        :param name: 面板名称，作为分区的第一级目录
+        :param date_range: 区间，作为分区的第二级目录
+        :param query: 面板对应的合约池等条件，用于计算分区key
+        """
+        path = self.partition_path(name, date_range, query)
+        panel = self.open_partition(path, panel_cls)
+        if panel is not None:
+            self.hit_count += 1
+            return panel
+        self.miss_count += 1
+        panel = loader()
+        self.write_partition(path, panel)
+        return panel
+
+    def partition_path(self, collection, trade_date, query):
+        content = json.dumps({'version': CACHE_VERSION, 'collection': collection, 'query': query},
+                             sort_keys=True, default=str)
+        key = hashlib.sha1(content.encode('utf-8')).hexdigest()
+        return os.path.join(self.cache_dir, str(collection), str(trade_date), key)
+
+    def open_table(self, path):
+        table = self.open_partitions.get(path)
+        if table is not None:
+            self.open_partitions.move_to_end(path)
+            return table
+        table = self.open_partition(path, RecordTable)
+        if table is not None:
+            self._remember(path, table)
+        return table
+
+    def open_partition(self, path, partition_cls):
+        meta_path = os.path.join(path, 'meta.json')
+        if not os.path.exists(meta_path):
+            return None
+        try:
+            with open(meta_path, 'r', encoding='utf-8') as f:
+                meta = json.load(f)
+            array_dict = {name: np.load(os.path.join(path, name + '.npy'), mmap_mode='r')
+                          for name in meta['arrays']}
+            with open(os.path.join(path, 'objects.pkl'), 'rb') as f:
+                objects = pickle.load(f)
+            # 更新访问时间，供 LRU 清理使用
+            os.utime(meta_path)
+        except Exception as e:
+            logger.warning(f"读取行情缓存分区失败，将重新加载: {path}, {e}")
+            return None
+        return partition_cls.from_partition(meta, array_dict, objects)
+
+    def write_partition(self, path, partition):
+        meta, array_dict, objects = partition.to_partition()
+        meta['arrays'] = list(array_dict.keys())
+        tmp_path = os.path.join(self.cache_dir, '.tmp', uuid.uuid4().hex)
+        try:
+            os.makedirs(tmp_path)
+            for name, array in array_dict.items():
+                np.save(os.path.join(tmp_path, name + '.npy'), np.ascontiguousarray(array))
+            with open(os.path.join(tmp_path, 'objects.pkl'), 'wb') as f:
+                pickle.dump(objects, f, protocol=pickle.HIGHEST_PROTOCOL)
+            # meta.json 最后写入，作为分区完整的标志
+            with open(os.path.join(tmp_path, 'meta.json'), 'w', encoding='utf-8') as f:
+                json.dump(meta, f, default=str)
+            size = self._dir_size(tmp_path)
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            os.rename(tmp_path, path)
+        except OSError as e:
+            # 其他进程已写入同一分区，或磁盘异常时放弃写缓存
+            logger.debug(f"写入行情缓存分区失败: {path}, {e}")
+            shutil.rmtree(tmp_path, ignore_errors=True)
+            return
+        with self._write_lock:
+            if self.total_bytes is None:
+                self.total_bytes = self._scan_size()
+            else:
+                self.total_bytes += size
+            if self.max_bytes and self.total_bytes > self.max_bytes:
+                self.evict()
+
+    def evict(self):
+        """
+        按最近访问时间清理分区，直到占用不超过容量上限的 EVICT_TARGET_RATIO
+        """
+        partition_list = list()
+        for partition_path in self._iter_partitions():
+            try:
+                access_time = os.path.getmtime(os.path.join(partition_path, 'meta.json'))
+            except OSError:
+                continue
+            partition_list.append((access_time, partition_path))
+        partition_list.sort()
+
+        target_bytes = self.max_bytes * EVICT_TARGET_RATIO
+        total_bytes = sum(self._dir_size(partition_path) for _, partition_path in partition_list)
+        for _, partition_path in partition_list:
+            if total_bytes <= target_bytes:
+                break
+            size = self._dir_size(partition_path)
+            shutil.rmtree(partition_path, ignore_errors=True)
+            self.open_partitions.pop(partition_path, None)
+            total_bytes -= size
+        self.total_bytes = total_bytes
+
+    def _remember(self, path, table):
+        self.open_partitions[path] = table
+        self.open_partitions.move_to_end(path)
+        while len(self.open_partitions) > OPEN_PARTITION_LIMIT:
+            self.open_partitions.popitem(last=False)
+
+    def _iter_partitions(self):
+        for collection in os.scandir(self.cache_dir):
+            if not collection.is_dir() or collection.name == '.tmp':
+                continue
+            for trade_date in os.scandir(collection.path):
+                if not trade_date.is_dir():
+                    continue
+                for partition in os.scandir(trade_date.path):
+                    if partition.is_dir():
+                        yield partition.path
+
+    def _scan_size(self):
+        return sum(self._dir_size(partition_path) for partition_path in self._iter_partitions())
+
+    @staticmethod
+    def _dir_size(path):
+        size = 0
+        for entry in os.scandir(path):
+            if entry.is_file():
+                size += entry.stat().st_size
+        return size
+
+
+def warm_daily_cache(start_date, end_date, collection_list):
+    """
+    预热回测区间内每个交易日的全市场日线分区（与 get_stock_daily_bar、init_stock_list_daily_quotation 共用）
+    """
+    from common.connector.mongodb_handler import DatabaseHandler
+    from panda_backtest.backtest_common.system.context.core_context import CoreContext
+    from panda_backtest.data.context.strategy_context import StrategyContext
+    from panda_backtest.data.quotation.bar_data_source import BarDataSource
+
+    CoreContext(StrategyContext())
+    mongo_db = DatabaseHandler(config=config)
+    bar_data_source = BarDataSource()
+    if bar_data_source.disk_cache is None:
+        raise RuntimeError('未配置 QUOTATION_CACHE_DIR，无法预热本地行情缓存')
+
+    docs = mongo_db.mongo_find(config['MONGO_DB'], collection_name="trade_calendar",
+                               query={'nature_date': {'$gte': int(start_date), '$lte': int(end_date)},
+                                      'is_trade': 1, 'exchange': 'SH'},
+                               sort="nature_date")
+    trade_date_list = [str(doc['nature_date']) for doc in docs]
+    for i, trade_date in enumerate(trade_date_list):
+        for collection in collection_list:
+            if collection == 'future_1d_market':
+                bar_data_source.get_daily_table("panda", collection, trade_date)
+            else:
+                bar_data_source.get_daily_table(config["MONGO_DB"], collection, trade_date)
+        logger.info('预热行情缓存 %s (%s/%s)' % (trade_date, i + 1, len(trade_date_list)))
+    disk_cache = bar_data_source.disk_cache
+    logger.info('预热完成，命中：%s，新写入：%s' % (disk_cache.hit_count, disk_cache.miss_count))
+
+
+if __name__ == '__main__':
+    from common.logging.system_logger import setup_logging
+
+    setup_logging()
+    parser = argparse.ArgumentParser(description='预热本地行情缓存')
+    parser.add_argument('--start', required=True, help='开始日期，如 20220101')
+    parser.add_argument('--end', required=True, help='结束日期，如 20241231')
+    parser.add_argument('--collections',
+                        default='stock_market,etf_daily_quotation_v2,index_daily_price,index_daily_quotation',
+                        help='逗号分隔的日线集合，期货为 future_1d_market')
+    args = parser.parse_args()
+    warm_daily_cache(args.start, args.end, [c for c in args.collections.split(',') if c])
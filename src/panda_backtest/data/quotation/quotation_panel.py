@@ -0,0 +1,158 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+# @File   : quotation_panel.py
+# @desc   : 日线行情面板，按 日期 × 合约 × 字段 列式存放回测区间内的全部日线行情
+import numpy as np
+
+FIELD_INT = 0
+FIELD_FLOAT = 1
+FIELD_OBJECT = 2
+
+
+def value_type(value):
+    if value is None:
+        return FIELD_INT
+    if isinstance(value, bool) or not isinstance(value, (int, float, np.integer, np.floating)):
+        return FIELD_OBJECT
+    if isinstance(value, (int, np.integer)):
+        return FIELD_INT
+    return FIELD_FLOAT
+
+
+def classify_fields(bar_dict_list):
+    """
+    按取值类型划分字段
+    :return: (数值字段, 其中的整数字段, 非数值字段)
+    """
+    field_type_dict = dict()
+    for bar_dict in bar_dict_list:
+        for field, value in bar_dict.items():
+            field_type_dict[field] = max(field_type_dict.get(field, FIELD_INT), value_type(value))
+
+    float_fields = [field for field, field_type in field_type_dict.items() if field_type != FIELD_OBJECT]
+    int_fields = [field for field in float_fields if field_type_dict[field] == FIELD_INT]
+    object_fields = [field for field, field_type in field_type_dict.items() if field_type == FIELD_OBJECT]
+    return float_fields, int_fields, object_fields
+
+
+def restore_record(float_fields, int_fields, value_row, object_fields, object_row):
+    """
+    由一行数值、非数值数据还原行情记录dict，NaN 还原为 None
+    """
+    bar_dict = dict(zip(float_fields, value_row.tolist()))
+    for field, value in bar_dict.items():
+        if value != value:
+            bar_dict[field] = None
+    for field in int_fields:
+        if bar_dict[field] is not None:
+            bar_dict[field] = int(bar_dict[field])
+    if object_fields:
+        bar_dict.update(zip(object_fields, object_row.tolist()))
+    return bar_dict
+
+
+class QuotationPanel(object):
+    """
+    回测开始时一次性批量加载的日线行情面板。
+    数值字段存放在 float64 三维数组 values[date, symbol, field] 中，
+    非数值字段（代码、日期字符串等）存放在 object 三维数组 objects[date, symbol, field] 中，
+    按 (合约, 日期) 下标取值，不再逐日逐合约查询数据库。
+    """
+
+    def __init__(self, symbol_list, start_date, end_date):
+        self.start_date = str(start_date)
+        self.end_date = str(end_date)
+        self.symbol_index = {symbol: i for i, symbol in enumerate(symbol_list)}
+        self.date_index = dict()
+        self.float_fields = list()
+        self.int_fields = list()
+        self.object_fields = list()
+        self.values = np.empty((0, len(self.symbol_index), 0), dtype=np.float64)
+        self.objects = np.empty((0, len(self.symbol_index), 0), dtype=object)
+        self.exists = np.zeros((0, len(self.symbol_index)), dtype=bool)
+
+    @property
+    def symbol_count(self):
+        return len(self.symbol_index)
+
+    @property
+    def date_count(self):
+        return len(self.date_index)
+
+    def load(self, record_list, date_field='date'):
+        """
+        由数据库记录构建面板
+        :param record_list: [(面板合约代码, 行情记录dict), ...]
+        :param date_field: 行情记录中的日期字段
+        :return:
+        """
+        record_list = [(symbol, bar_dict) for symbol, bar_dict in record_list if symbol in self.symbol_index]
+        date_list = sorted({str(bar_dict[date_field]) for _, bar_dict in record_list})
+        self.date_index = {date: i for i, date in enumerate(date_list)}
+
+        self.float_fields, self.int_fields, self.object_fields = classify_fields(
+            bar_dict for _, bar_dict in record_list)
+
+        shape = (len(date_list), len(self.symbol_index))
+        self.values = np.full(shape + (len(self.float_fields),), np.nan, dtype=np.float64)
+        self.objects = np.full(shape + (len(self.object_fields),), None, dtype=object)
+        self.exists = np.zeros(shape, dtype=bool)
+
+        for symbol, bar_dict in record_list:
+            date_pos = self.date_index[str(bar_dict[date_field])]
+            symbol_pos = self.symbol_index[symbol]
+            self.exists[date_pos, symbol_pos] = True
+            for field_pos, field in enumerate(self.float_fields):
+                value = bar_dict.get(field)
+                if value is not None:
+                    self.values[date_pos, symbol_pos, field_pos] = value
+            for field_pos, field in enumerate(self.object_fields):
+                self.objects[date_pos, symbol_pos, field_pos] = bar_dict.get(field)
+
+    def covers(self, symbol, trade_date):
+        """
+        面板是否负责该合约该日期的行情（负责但无数据时 get 返回 None）
+        """
+        return symbol in self.symbol_index and self.start_date <= str(trade_date) <= self.end_date
+
+    def get(self, symbol, trade_date):
+        """
+        按下标读取某合约某日的行情，还原为与数据库记录一致的dict
+        :return: dict，当日无行情时返回None
+        """
+        date_pos = self.date_index.get(str(trade_date))
+        symbol_pos = self.symbol_index.get(symbol)
+        if date_pos is None or symbol_pos is None or not self.exists[date_pos, symbol_pos]:
+            return None
+        return restore_record(self.float_fields, self.int_fields, self.values[date_pos, symbol_pos],
+                              self.object_fields, self.objects[date_pos, symbol_pos])
+
+    def nbytes(self):
+        return self.values.nbytes + self.objects.nbytes + self.exists.nbytes
+
+    def to_partition(self):
+        """
+        导出为本地缓存分区：(元信息, 数组dict, 非数值数据)
+        """
+        meta = {
+            'start_date': self.start_date,
+            'end_date': self.end_date,
+            'symbol_list': list(self.symbol_index.keys()),
+            'date_list': list(self.date_index.keys()),
+            'float_fields': self.float_fields,
+            'int_fields': self.int_fields,
+            'object_fields': self.object_fields,
+        }
+        return meta, {'values': self.values, 'exists': self.exists}, self.objects
+
+    @classmethod
+    def from_partition(cls, meta, array_dict, objects):
+        panel = cls(meta['symbol_list'], meta['start_date'], meta['end_date'])
+        panel.date_index = {date: i for i, date in enumerate(meta['date_list'])}
+        panel.float_fields = meta['float_fields']
+        panel.int_fields = meta['int_fields']
+        panel.object_fields = meta['object_fields']
+        panel.values = array_dict['values']
+        panel.exists = array_dict['exists']
+        panel.objects = objects
+        return panel
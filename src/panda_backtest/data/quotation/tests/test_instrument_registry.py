@@ -0,0 +1,49 @@
+from panda_backtest.data.quotation.instrument_registry import InstrumentRegistry
+
+STOCK_INFO_LIST = [
+    {'symbol': '000001.SZ', 'name': '平安银行', 'type': 0},
+    {'symbol': '510300.SH', 'name': '沪深300ETF', 'type': 2},
+]
+
+
+class CountingLoader(object):
+    def __init__(self):
+        self.call_count = 0
+
+    def __call__(self):
+        self.call_count += 1
+        return [dict(info) for info in STOCK_INFO_LIST]
+
+
+def test_registry_loads_once_and_warm_starts_from_snapshot(tmp_path):
+    loader = CountingLoader()
+    registry = InstrumentRegistry('stock_info_new', loader, 'symbol', refresh_seconds=3600, snapshot_dir=str(tmp_path))
+    assert registry.get('510300.SH') == {'symbol': '510300.SH', 'name': '沪深300ETF', 'type': 2}
+    assert registry.get('000001.SZ')['type'] == 0
+    assert registry.get('600000.SH') is None
+    assert loader.call_count == 1
+
+    # 新进程读取快照，不查询数据库
+    warm_loader = CountingLoader()
+    warm_registry = InstrumentRegistry('stock_info_new', warm_loader, 'symbol', refresh_seconds=3600,
+                                       snapshot_dir=str(tmp_path))
+    assert warm_registry.get('000001.SZ')['name'] == '平安银行'
+    assert warm_loader.call_count == 0
+
+
+def test_registry_refreshes_after_expiry():
+    loader = CountingLoader()
+    registry = InstrumentRegistry('stock_info_new', loader, 'symbol', refresh_seconds=3600, snapshot_dir='')
+    registry.get('000001.SZ')
+    registry.load_time -= 7200
+    registry.get('000001.SZ')
+    assert loader.call_count == 2
+
+    # 刷新失败时沿用已有数据
+    def failed_loader():
+        raise ConnectionError('mongo down')
+
+    registry.loader = failed_loader
+    registry.load_time -= 7200
+    assert registry.get('510300.SH')['type'] == 2
+    assert not registry.is_expired()
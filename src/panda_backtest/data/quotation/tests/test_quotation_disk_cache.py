@@ -0,0 +1,93 @@
+import os
+import time
+
+from panda_backtest.data.quotation.quotation_disk_cache import QuotationDiskCache, RecordTable
+from panda_backtest.data.quotation.quotation_panel import QuotationPanel
+
+
+def daily_query(trade_date):
+    return {'db': 'panda', 'query': {'date': trade_date}, 'projection': {'_id': 0}}
+
+
+def daily_loader(trade_date):
+    return lambda: [{'symbol': '000001.SZ', 'date': trade_date, 'close': 10.5, 'volume': 100}]
+
+
+def test_daily_partition_cached_only_for_finished_trade_dates(tmp_path):
+    disk_cache = QuotationDiskCache(str(tmp_path), 0)
+    load_count = list()
+
+    def loader():
+        load_count.append(1)
+        return [{'symbol': '000001.SZ', 'date': trade_date, 'close': 10.5, 'volume': 100}]
+
+    trade_date = '20240102'
+    query = {'db': 'panda', 'query': {'date': trade_date}, 'projection': {'_id': 0}}
+    assert disk_cache.get_table('stock_market', trade_date, query, loader).get('000001.SZ')['close'] == 10.5
+    # 同一查询条件命中同一分区（含进程外重新打开）
+    assert QuotationDiskCache(str(tmp_path), 0).get_table('stock_market', trade_date, query, loader) is not None
+    assert len(load_count) == 1
+
+    trade_date = time.strftime('%Y%m%d')
+    query = {'db': 'panda', 'query': {'date': trade_date}, 'projection': {'_id': 0}}
+    for _ in range(2):
+        assert disk_cache.get_table('stock_market', trade_date, query, loader).get('000001.SZ')['volume'] == 100
+    assert len(load_count) == 3
+    assert not (tmp_path / 'stock_market' / trade_date).exists()
+
+
+def test_panel_reopened_from_disk_without_loading(tmp_path):
+    load_count = list()
+
+    def loader():
+        load_count.append(1)
+        panel = QuotationPanel(['000001.SZ', '600000.SH'], '20240102', '20240103')
+        panel.load([('000001.SZ', {'symbol': '000001.SZ', 'date': '20240102', 'close': 10.5}),
+                    ('600000.SH', {'symbol': '600000.SH', 'date': '20240103', 'close': 7.2})])
+        return panel
+
+    symbol_list = ['000001.SZ', '600000.SH']
+    QuotationDiskCache(str(tmp_path), 0).get_panel('stock_daily', '20240102_20240103', symbol_list, loader,
+                                                   QuotationPanel)
+    disk_cache = QuotationDiskCache(str(tmp_path), 0)
+    panel = disk_cache.get_panel('stock_daily', '20240102_20240103', symbol_list, loader, QuotationPanel)
+
+    assert len(load_count) == 1 and disk_cache.hit_count == 1
+    assert panel.get('600000.SH', '20240103')['close'] == 7.2
+    assert panel.get('600000.SH', '20240102') is None
+
+
+def test_minute_tables_for_today_are_not_cached(tmp_path):
+    disk_cache = QuotationDiskCache(str(tmp_path), 0)
+    trade_date = time.strftime('%Y%m%d')
+    loaded_list = list()
+
+    def bulk_loader(symbol_list):
+        loaded_list.append(symbol_list)
+        return [{'symbol': symbol, 'time': 93100, 'close': 1.0} for symbol in symbol_list]
+
+    for _ in range(2):
+        table_dict = disk_cache.get_tables('future_quotation_min_data_v2', trade_date, ['RB2505.SHF'],
+                                           lambda symbol: {'symbol': symbol}, bulk_loader)
+        assert table_dict['RB2505.SHF'].get(93100)['close'] == 1.0
+    assert loaded_list == [['RB2505.SHF'], ['RB2505.SHF']]
+    assert not (tmp_path / 'future_quotation_min_data_v2').exists()
+
+
+def test_least_recently_used_daily_partition_evicted(tmp_path):
+    disk_cache = QuotationDiskCache(str(tmp_path), 0)
+    path_dict = dict()
+    for trade_date in ('20240102', '20240103'):
+        disk_cache.get_table('stock_market', trade_date, daily_query(trade_date), daily_loader(trade_date))
+        path_dict[trade_date] = disk_cache.partition_path('stock_market', trade_date, daily_query(trade_date))
+        os.utime(os.path.join(path_dict[trade_date], 'meta.json'), (time.time() - 100, time.time() - 100))
+    partition_size = disk_cache._dir_size(path_dict['20240102'])
+
+    # 重新打开 20240102 的分区，访问时间更新为最近
+    assert disk_cache.open_partition(path_dict['20240102'], RecordTable)
+    disk_cache.max_bytes = partition_size * 2.5
+    disk_cache.get_table('stock_market', '20240104', daily_query('20240104'), daily_loader('20240104'))
+
+    assert os.path.exists(path_dict['20240102'])
+    assert not os.path.exists(path_dict['20240103'])
+    assert disk_cache.total_bytes <= disk_cache.max_bytes
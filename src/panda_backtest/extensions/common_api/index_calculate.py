@@ -11,6 +11,9 @@ import pandas as pd
 import sys
 import math
 
+logger = logging.getLogger(__name__)
+
+
 class IndexCalculate(object):
 
     @staticmethod
@@ -19,8 +22,8 @@ class IndexCalculate(object):
             _beta = np.nan
             return _beta
 
-        print('_portfolio===>' + str(len(_portfolio)))
-        print('_benchmark===>' + str(len(_benchmark)))
+        logger.debug('_portfolio===>' + str(len(_portfolio)))
+        logger.debug('_benchmark===>' + str(len(_benchmark)))
         cov = np.cov(np.vstack([
             _portfolio,
             _benchmark
@@ -37,7 +40,7 @@ class IndexCalculate(object):
         :return: 输出beta值
         """
         if len(return_line) < 2:
-            print('beta: %f' % np.nan)
+            logger.debug('beta: %f' % np.nan)
             return np.nan
 
         df = pd.DataFrame({'date': date_line,
@@ -45,7 +48,7 @@ class IndexCalculate(object):
                            'benchmark_rtn': indexreturn_line})
         # 账户收益和基准收益的协方差除以基准收益的方差
         b = df['rtn'].cov(df['benchmark_rtn']) / df['benchmark_rtn'].var()
-        print('beta: %f' % b)
+        logger.debug('beta: %f' % b)
         return b
 
     @staticmethod
@@ -58,14 +61,14 @@ class IndexCalculate(object):
         else:
             annual_return_value = math.pow(
                 1 + end_account_rate, 1 / (date_num / 250)) - 1
-        print('策略年化收益：%s' % str(annual_return_value))
+        logger.debug('策略年化收益：%s' % str(annual_return_value))
         return annual_return_value
 
     @staticmethod
     def standard_symbol_return(end_standard_symbol_rate, date_num):
         standard_symbol_return_value = pow(
             1 + end_standard_symbol_rate, 1 / (date_num / 250)) - 1
-        print('基准年化收益：%s' % str(standard_symbol_return_value))
+        logger.debug('基准年化收益：%s' % str(standard_symbol_return_value))
         return standard_symbol_return_value
 
     @staticmethod
@@ -76,8 +79,8 @@ class IndexCalculate(object):
         else:
             volatility = np.array(account_daily_income_rate).std(ddof=1)
             annual_volatility = volatility * (250 ** 0.5)
-        print('波动收益率：' + str(volatility))
-        print('年化波动收益率：' + str(annual_volatility))
+        logger.debug('波动收益率：' + str(volatility))
+        logger.debug('年化波动收益率：' + str(annual_volatility))
         return annual_volatility
 
     @staticmethod
@@ -108,7 +111,7 @@ class IndexCalculate(object):
         start_date = df.sort_values(
             by='capital', ascending=False).iloc[0]['date']
 
-        print('最大回撤为：%f, 开始日期：%s, 结束日期：%s' % (max_dd, start_date, end_date))
+        logger.debug('最大回撤为：%f, 开始日期：%s, 结束日期：%s' % (max_dd, start_date, end_date))
         return max_dd
 
     @staticmethod
@@ -126,7 +129,7 @@ class IndexCalculate(object):
         if volatility == 0.0:
             return np.nan
         sharpe = (strategy_year_income_rate - risk_free_rate) / volatility
-        print('夏普比率：%s:' % str(sharpe))
+        logger.debug('夏普比率：%s:' % str(sharpe))
         return sharpe
 
     @staticmethod
@@ -145,7 +148,7 @@ class IndexCalculate(object):
         """
         al = strategy_year_income_rate - risk_free_rate - \
              beta * (standard_income_rate - risk_free_rate)
-        print('alpha比率%f:' % al)
+        logger.debug('alpha比率%f:' % al)
         return al
 
     # 计算信息比率函数
@@ -168,7 +171,7 @@ class IndexCalculate(object):
         avg_tracking_return = np.mean(active_return)
 
         information_ratio = 250 * avg_tracking_return / annual_te
-        print('信息波动率：' + str(information_ratio))
+        logger.debug('信息波动率：' + str(information_ratio))
         return information_ratio
 
     @staticmethod
@@ -185,8 +188,8 @@ class IndexCalculate(object):
         #                              ((self._annual_factor / (len(self._portfolio) - 1)) ** 0.5)
         downside_risk = (sum_mean_squares / (len(diff) - 1)) ** 0.5
         annual_downside_risk = downside_risk * (250 ** 0.5)
-        print('下行风险：' + str(downside_risk))
-        print('年化下行风险：' + str(annual_downside_risk))
+        logger.debug('下行风险：' + str(downside_risk))
+        logger.debug('年化下行风险：' + str(annual_downside_risk))
         return annual_downside_risk
 
     @staticmethod
@@ -198,13 +201,13 @@ class IndexCalculate(object):
         active_return = np.array(account_daily_income_rate) - \
                         np.array(standard_symbol_income_rate)
         racking_error = active_return.std(ddof=1)
-        print('跟踪误差：' + str(racking_error))
+        logger.debug('跟踪误差：' + str(racking_error))
         return racking_error
 
     @staticmethod
     def annual_tracking_error(racking_error):
         annual_tracking_error = racking_error * (250 ** 0.5)
-        print('年化跟踪误差：' + str(annual_tracking_error))
+        logger.debug('年化跟踪误差：' + str(annual_tracking_error))
         return annual_tracking_error
 
     @staticmethod
@@ -217,7 +220,7 @@ class IndexCalculate(object):
             return sortino
 
         sortino = (ar - sr) / downside_risk
-        print('索提诺比率:' + str(sortino))
+        logger.debug('索提诺比率:' + str(sortino))
         return sortino
 
     @staticmethod
@@ -237,7 +240,7 @@ class IndexCalculate(object):
         else:
             annual_return_value = math.pow(
                 1 + end_account_rate, 1 / (date_num / 250)) - 1
-        print('基准年化收益：%s' % str(annual_return_value))
+        logger.debug('基准年化收益：%s' % str(annual_return_value))
         return annual_return_value
 
     @staticmethod
@@ -0,0 +1,141 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+# @File   : streaming_metrics.py
+# @desc   : 增量计算策略指标，每个交易日结束时更新一次，任意时刻 O(1) 得到当前指标
+import math
+
+import numpy as np
+
+from panda_backtest.extensions.common_api.index_calculate import IndexCalculate
+
+
+class StreamingMetrics(object):
+    """
+    每日更新一次的策略指标累加器，结果与 IndexCalculate 对整段序列的计算一致：
+    策略、基准及超额收益用 Welford 算法累计均值与二阶中心矩（样本方差 ddof=1），
+    策略与基准的协方差累计二阶混合矩，下行风险累计负超额收益的平方和，
+    最大回撤维护历史最高权益及最小回撤。
+    """
+
+    def __init__(self, risk_free_rate=0.04):
+        self.risk_free_rate = risk_free_rate
+        self.count = 0
+        self.portfolio_mean = 0.0
+        self.portfolio_m2 = 0.0
+        self.benchmark_mean = 0.0
+        self.benchmark_m2 = 0.0
+        self.co_moment = 0.0
+        self.active_mean = 0.0
+        self.active_m2 = 0.0
+        self.downside_square_sum = 0.0
+        self.peak_capital = None
+        self.max_drawdown = 0
+
+    def update(self, portfolio_return, benchmark_return, capital):
+        """
+        :param portfolio_return: 策略当日收益率
+        :param benchmark_return: 基准当日收益率
+        :param capital: 当日账户总权益
+        """
+        self.count += 1
+        n = self.count
+        portfolio_delta = portfolio_return - self.portfolio_mean
+        self.portfolio_mean += portfolio_delta / n
+        self.portfolio_m2 += portfolio_delta * (portfolio_return - self.portfolio_mean)
+        benchmark_delta = benchmark_return - self.benchmark_mean
+        self.benchmark_mean += benchmark_delta / n
+        self.benchmark_m2 += benchmark_delta * (benchmark_return - self.benchmark_mean)
+        self.co_moment += portfolio_delta * (benchmark_return - self.benchmark_mean)
+
+        active_return = portfolio_return - benchmark_return
+        active_delta = active_return - self.active_mean
+        self.active_mean += active_delta / n
+        self.active_m2 += active_delta * (active_return - self.active_mean)
+        if active_return < 0:
+            self.downside_square_sum += active_return * active_return
+
+        if self.peak_capital is None or capital > self.peak_capital:
+            self.peak_capital = capital
+        if self.peak_capital != 0:
+            self.max_drawdown = min(self.max_drawdown, capital / self.peak_capital - 1)
+
+    def volatility(self):
+        """
+        年化波动率
+        """
+        if self.count < 2:
+            return 0.
+        return math.sqrt(self.portfolio_m2 / (self.count - 1)) * (250 ** 0.5)
+
+    def beta(self):
+        if self.count < 2 or self.benchmark_m2 == 0:
+            return np.nan
+        return self.co_moment / self.benchmark_m2
+
+    def downside_risk(self):
+        """
+        年化下行风险
+        """
+        if self.count < 2:
+            return 0
+        return math.sqrt(self.downside_square_sum / (self.count - 1)) * (250 ** 0.5)
+
+    def tracking_error(self):
+        if self.count < 2:
+            return 0
+        return math.sqrt(self.active_m2 / (self.count - 1))
+
+    def info_ratio(self, annual_te):
+        if self.count < 2 or annual_te == 0:
+            return None
+        return 250 * self.active_mean / annual_te
+
+    def avg_excess_return(self):
+        return self.portfolio_mean - self.risk_free_rate / 250
+
+    def result(self, strategy_profit, standard_profit, date_num):
+        """
+        当前策略指标
+        :param strategy_profit: 策略累计收益率
+        :param standard_profit: 基准累计收益率
+        :param date_num: 年化所用的交易日数
+        """
+        ar = IndexCalculate.annual_return(strategy_profit, date_num)
+        sr = IndexCalculate.new_annual_return(standard_profit, date_num)
+        md = self.max_drawdown
+        vol = self.volatility()
+        sharpe = IndexCalculate.sharpe_ratio(ar, self.risk_free_rate, vol)
+        dw = self.downside_risk()
+        annual_te = IndexCalculate.annual_tracking_error(self.tracking_error())
+        info_ratio = self.info_ratio(annual_te)
+        sortino = IndexCalculate.sortino(ar, sr, dw)
+
+        if vol and math.isnan(vol):
+            vol = None
+
+        if sharpe and math.isnan(sharpe):
+            sharpe = None
+
+        beta = self.beta()
+        if beta and math.isnan(beta):
+            beta = None
+            alpha = None
+        else:
+            alpha = IndexCalculate.alpha(ar, self.risk_free_rate, sr, beta)
+
+        return {
+            'strategy_profit': strategy_profit,
+            'annual_return': ar,
+            'standard_profit': standard_profit,
+            'standard_annual_return': sr,
+            'alpha': alpha,
+            'beta': beta,
+            'sharpe': sharpe,
+            'volatility': vol,
+            'max_drawdown': md,
+            'info_ratio': info_ratio,
+            'sortino': sortino,
+            'tracking_error': annual_te,
+            'kama_ratio': IndexCalculate.kama_ratio(ar, md),
+            'downside_risk': dw,
+        }
@@ -0,0 +1,54 @@
+import numpy as np
+import pytest
+
+from panda_backtest.extensions.common_api.index_calculate import IndexCalculate
+from panda_backtest.extensions.common_api.streaming_metrics import StreamingMetrics
+
+
+def test_streaming_metrics_match_index_calculate():
+    rng = np.random.default_rng(7)
+    portfolio = list(rng.normal(0.0005, 0.02, 300))
+    benchmark = list(rng.normal(0.0003, 0.015, 300))
+    capital = list(1000000 * np.cumprod(1 + np.array(portfolio)))
+    date_list = [str(20200101 + i) for i in range(300)]
+
+    metrics = StreamingMetrics()
+    for portfolio_return, benchmark_return, day_capital in zip(portfolio, benchmark, capital):
+        metrics.update(portfolio_return, benchmark_return, day_capital)
+
+    annual_te = IndexCalculate.annual_tracking_error(IndexCalculate.tracking_error(portfolio, benchmark))
+    assert metrics.volatility() == pytest.approx(IndexCalculate.volatility(portfolio), rel=1e-10)
+    assert metrics.beta() == pytest.approx(IndexCalculate.new_beta(portfolio, benchmark), rel=1e-10)
+    assert metrics.max_drawdown == pytest.approx(IndexCalculate.max_drawdown(date_list, capital), rel=1e-10)
+    assert metrics.downside_risk() == pytest.approx(IndexCalculate.downside_risk(portfolio, benchmark), rel=1e-10)
+    assert metrics.tracking_error() == pytest.approx(IndexCalculate.tracking_error(portfolio, benchmark), rel=1e-10)
+    assert metrics.info_ratio(annual_te) == pytest.approx(
+        IndexCalculate.info_ratio(portfolio, benchmark, annual_te), rel=1e-10)
+    assert metrics.avg_excess_return() == pytest.approx(
+        IndexCalculate.avg_excess_return(portfolio, [0.04 / 250] * len(portfolio)), rel=1e-10)
+
+    result = metrics.result(capital[-1] / 1000000 - 1, 0.1, len(date_list))
+    ar = IndexCalculate.annual_return(capital[-1] / 1000000 - 1, len(date_list))
+    assert result['sharpe'] == pytest.approx(
+        IndexCalculate.sharpe_ratio(ar, 0.04, IndexCalculate.volatility(portfolio)), rel=1e-10)
+
+
+def test_streaming_metrics_short_series():
+    metrics = StreamingMetrics()
+    result = metrics.result(0, 0, 0)
+    assert result['volatility'] == 0 and result['max_drawdown'] == 0 and result['beta'] is None
+
+    metrics.update(0.01, 0.02, 100)
+    assert metrics.volatility() == IndexCalculate.volatility([0.01])
+    assert metrics.downside_risk() == IndexCalculate.downside_risk([0.01], [0.02])
+    assert metrics.info_ratio(0.1) is None
+
+
+def test_streaming_metrics_result_does_not_print(capsys):
+    metrics = StreamingMetrics()
+    for portfolio_return, benchmark_return, capital in [(0.01, 0.02, 101), (-0.02, 0.01, 99), (0.03, -0.01, 102)]:
+        metrics.update(portfolio_return, benchmark_return, capital)
+
+    metrics.result(0.02, 0.02, 3)
+
+    assert capsys.readouterr().out == ''
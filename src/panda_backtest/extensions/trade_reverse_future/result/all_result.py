@@ -5,7 +5,6 @@
 # @File   : all_result.py
 # @desc   :
 
-import math
 import logging
 
 import json
@@ -16,24 +15,32 @@ from panda_backtest.extensions.trade_reverse_future.result.result_sqlite import
 from panda_backtest.extensions.trade_reverse_future.result.standard_symbol_result import StandSymbolResult
 from panda_backtest.backtest_common.result.base_all_result import BaseAllTradeReverseResult
 from panda_backtest.extensions.trade_reverse_future.result.trade_reverse_result import TradeReverseResult
+from panda_backtest.backtest_common.result.stock.back_test.vector_trade_reverse_result import VectorTradeReverseResult
 from panda_backtest.extensions.trade_reverse_future.result.future_reverse_result import FutureReverseResult
 from panda_backtest.util.annotation.singleton_annotation import singleton
 from panda_backtest.backtest_common.model.result.panda_backtest_account import PandaBacktestAccount
 from panda_backtest.backtest_common.model.result.panda_backtest_profit import PandaBacktestProfit
-from panda_backtest.extensions.common_api.index_calculate import IndexCalculate
+from panda_backtest.extensions.common_api.streaming_metrics import StreamingMetrics
 
 class AllTradeReverseResult(BaseAllTradeReverseResult):
 
     def __init__(self):
         super().__init__()
         self.result_db = ResultDb()
+        # 最近一次计算的策略指标
+        self.strategy_result = dict()
+        # 每日增量更新的策略指标
+        self.metrics = StreamingMetrics()
 
     def init_data(self):
         super().add_standard_result(StandSymbolResult())
         super().init_data()
 
     def add_stock_account(self, account):
-        self.stock_result_dict[account] = TradeReverseResult(account)
+        if self.context.strategy_context.run_info.vectorized:
+            self.stock_result_dict[account] = VectorTradeReverseResult(account)
+        else:
+            self.stock_result_dict[account] = TradeReverseResult(account)
 
     def add_future_account(self, future_account):
         self.future_result_dict[future_account] = FutureReverseResult(future_account)
@@ -59,7 +66,7 @@ class AllTradeReverseResult(BaseAllTradeReverseResult):
         for trade_reverse_result in self.stock_result_dict.values():
             all_position_list.extend(list(trade_reverse_result.xb_back_test_position_dict.values()))
             all_trade_list.extend(list(trade_reverse_result.xb_back_test_trade_dict.values()))
-            all_account_list.append(trade_reverse_result.xb_back_test_account.__dict__)
+            all_account_list.append(trade_reverse_result.xb_back_test_account)
             self.all_account.available_funds += trade_reverse_result.xb_back_test_account.available_funds
             self.all_account.total_profit += trade_reverse_result.xb_back_test_account.total_profit
             self.all_account.add_profit += trade_reverse_result.xb_back_test_account.add_profit
@@ -75,7 +82,7 @@ class AllTradeReverseResult(BaseAllTradeReverseResult):
             all_position_list.extend(list(future_reverse_result.long_position_dict.values()))
             all_position_list.extend(list(future_reverse_result.short_position_dict.values()))
             all_trade_list.extend(list(future_reverse_result.xb_back_test_trade_dict.values()))
-            all_account_list.append(future_reverse_result.xb_back_test_account.__dict__)
+            all_account_list.append(future_reverse_result.xb_back_test_account)
             self.all_account.available_funds += future_reverse_result.xb_back_test_account.available_funds
             self.all_account.total_profit += future_reverse_result.xb_back_test_account.total_profit
             self.all_account.add_profit += future_reverse_result.xb_back_test_account.add_profit
@@ -90,7 +97,7 @@ class AllTradeReverseResult(BaseAllTradeReverseResult):
         for fund_reverse_result in self.fund_result_dict.values():
             all_position_list.extend(list(fund_reverse_result.xb_back_test_position_dict.values()))
             all_trade_list.extend(list(fund_reverse_result.xb_back_test_trade_dict.values()))
-            all_account_list.append(fund_reverse_result.xb_back_test_account.__dict__)
+            all_account_list.append(fund_reverse_result.xb_back_test_account)
             self.all_account.available_funds += fund_reverse_result.xb_back_test_account.available_funds
             self.all_account.total_profit += fund_reverse_result.xb_back_test_account.total_profit
             self.all_account.add_profit += fund_reverse_result.xb_back_test_account.add_profit
@@ -103,7 +110,7 @@ class AllTradeReverseResult(BaseAllTradeReverseResult):
             self.all_profit.day_put += fund_reverse_result.xb_back_test_profit.day_put
             fund_reverse_result.xb_back_test_trade_dict.clear()
 
-        all_account_list.append(self.all_account.__dict__)
+        all_account_list.append(self.all_account)
         self.all_account_value_list.append(self.all_account.total_profit)
 
         if self.all_account.yes_total_capital == 0:
@@ -130,58 +137,34 @@ class AllTradeReverseResult(BaseAllTradeReverseResult):
                                (last_csi_profit + 1)
         self.all_profit.overful_profit = (today_strategy_profit - today_csi_profit + 1) * (last_overful_profit + 1) - 1
 
+        self.metrics.update(self.all_strategy_portfolio[-1], self.standard_symbol_result.standard_portfolio[-1],
+                            self.all_account.total_profit)
+
         self.result_db.save_daily_data_to_db(all_account_list, all_position_list, all_trade_list,
-                                             self.all_profit.__dict__)
+                                             self.all_profit.__dict__, self.current_metrics)
+
+    def current_metrics(self):
+        """
+        截至当前交易日的策略指标，按已回测的交易日数年化
+        """
+        return self.metrics.result(self.all_profit.strategy_profit, self.all_profit.csi_stock, self.metrics.count)
 
     def save_strategy_result(self):
         strategy_context = self.context.strategy_context
-        # 策略年化收益
-        ar = IndexCalculate.annual_return(self.all_profit.strategy_profit, strategy_context.trade_date_len)
         last_standard_profit = self.standard_symbol_result.standard_symbol_value / self.standard_symbol_result.start_capital - 1
-        # 基准年化收益
-        sr = IndexCalculate.new_annual_return(last_standard_profit, strategy_context.trade_date_len)
-        # 最大回撤
-        md = IndexCalculate.max_drawdown(
-            strategy_context.trade_date_list, self.all_account_value_list)
-        vol = IndexCalculate.volatility(self.all_strategy_portfolio)
-        sharpe = IndexCalculate.sharpe_ratio(ar, 0.04, vol)
-        dw = IndexCalculate.downside_risk(
-            self.all_strategy_portfolio,
-            self.standard_symbol_result.standard_portfolio)
-
-        te = IndexCalculate.tracking_error(
-            self.all_strategy_portfolio,
-            self.standard_symbol_result.standard_portfolio)
-
-        annual_te = IndexCalculate.annual_tracking_error(te)
-
-        info_ration = IndexCalculate.info_ratio(
-            self.all_strategy_portfolio, self.standard_symbol_result.standard_portfolio, annual_te)
-
-        aer = IndexCalculate.avg_excess_return(
-            self.all_strategy_portfolio,
-            [0.04 / 250] * len(self.all_strategy_portfolio))
-        sortino = IndexCalculate.sortino(ar, sr, dw)
-
-        if vol and math.isnan(vol):
-            vol = None
-
-        if sharpe and math.isnan(sharpe):
-            sharpe = None
-
-        beta = IndexCalculate.new_beta(self.all_strategy_portfolio, self.standard_symbol_result.standard_portfolio)
-        if beta and math.isnan(beta):
-            beta = None
-            alpha = None
-        else:
-            alpha = IndexCalculate.alpha(ar, 0.04, sr, beta)
-
-        kama_ratio = IndexCalculate.kama_ratio(ar, md)
-        self.result_db.save_result_to_db(self.all_profit.strategy_profit, ar,
-                                         last_standard_profit, sr, alpha, beta, sharpe, vol,
-                                         md, info_ration, sortino, annual_te, kama_ratio, dw,
+        self.strategy_result = self.metrics.result(self.all_profit.strategy_profit, last_standard_profit,
+                                                   strategy_context.trade_date_len)
+        result = self.strategy_result
+        self.result_db.save_result_to_db(self.all_profit.strategy_profit, result['annual_return'],
+                                         last_standard_profit, result['standard_annual_return'], result['alpha'],
+                                         result['beta'], result['sharpe'], result['volatility'],
+                                         result['max_drawdown'], result['info_ratio'], result['sortino'],
+                                         result['tracking_error'], result['kama_ratio'], result['downside_risk'],
                                          self.standard_symbol_result.symbol_name)
 
+    def close(self):
+        self.result_db.close()
+
     def draw(self, data):
         sr_logger = RemoteLogFactory.get_sr_logger()
         if type(data) != list:
@@ -27,7 +27,7 @@ class ResultDb(object):
     def save_daily_data_to_db(self, all_account_list, all_position_list, all_trade_list, all_profit_dict):
         all_position_list = json.loads(jsonpickle.encode(all_position_list, unpicklable=False))
         all_trade_list = json.loads(jsonpickle.encode(all_trade_list, unpicklable=False))
-        save_all_account_list = copy.deepcopy(all_account_list)
+        save_all_account_list = copy.deepcopy([account.__dict__ for account in all_account_list])
         self.result_queue.put_nowait((0, save_all_account_list, all_position_list, all_trade_list, all_profit_dict))
 
     def save_result_to_db(self, last_strategy_profit, ar, last_standard_profit, sr, alpha, beta, sharpe, vol,
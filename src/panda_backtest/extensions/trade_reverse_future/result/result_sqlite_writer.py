@@ -0,0 +1,158 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+# @File   : result_sqlite_writer.py
+# @desc   : 回测结果 SQLite 写入线程，常驻线程持有独立事件循环与数据库连接，批量写入
+import asyncio
+import logging
+import sqlite3
+import threading
+import time
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+
+def to_sqlite_value(value):
+    """
+    快照直接取自模型字段，可能带有行情数据中的 numpy 标量，写入前转换为 Python 内置类型
+    """
+    if isinstance(value, np.generic):
+        return value.item()
+    return value
+
+
+def build_insert_sql(table, column_list):
+    return 'INSERT INTO %s (%s) VALUES (%s)' % (table, ', '.join(column_list),
+                                                ', '.join(':' + column for column in column_list))
+
+
+class ResultSQLiteWriter(object):
+    """
+    单一常驻写入线程：
+    线程内运行独立的事件循环（用于执行 DAO 协程），并持有一个 WAL 模式的 SQLite 连接；
+    write_many 提交的多张表数据以 executemany 在同一个事务内写入。
+    整批写入失败时回滚，改为逐条写入（每条一个保存点），只跳过出错的记录并记录日志。
+    """
+
+    def __init__(self, db_path):
+        self.db_path = db_path
+        self.conn = None
+        self.loop = asyncio.new_event_loop()
+        # 写入统计
+        self.flush_count = 0
+        self.row_count = 0
+        self.failed_count = 0
+        self.flush_time = 0.0
+        self.last_flush_latency = 0.0
+        self.writer_thread = threading.Thread(target=self._run_loop, name='result-sqlite-writer')
+        self.writer_thread.daemon = True
+        self.writer_thread.start()
+        self.call(self._connect())
+
+    def _run_loop(self):
+        asyncio.set_event_loop(self.loop)
+        self.loop.run_forever()
+
+    async def _connect(self):
+        # 事务由写入方显式 BEGIN/COMMIT
+        self.conn = sqlite3.connect(self.db_path, isolation_level=None)
+        self.conn.execute('PRAGMA journal_mode=WAL')
+        self.conn.execute('PRAGMA synchronous=NORMAL')
+
+    def submit(self, coro):
+        """
+        提交协程到写入线程，不等待结果
+        :return: concurrent.futures.Future
+        """
+        return asyncio.run_coroutine_threadsafe(coro, self.loop)
+
+    def call(self, coro):
+        """
+        提交协程到写入线程并等待结果
+        """
+        return self.submit(coro).result()
+
+    def write_many(self, table_rows, before_write=None):
+        """
+        :param table_rows: [(table, row_list), ...]，row_list 中每行是 {列名: 值}，同一张表各行的列相同
+        :param before_write: 写入前在写入线程执行的协程（如创建回测主记录）
+        """
+        return self.submit(self._write_many(table_rows, before_write))
+
+    async def _write_many(self, table_rows, before_write=None):
+        if before_write is not None:
+            await before_write
+        start_time = time.perf_counter()
+        sql_rows = [(build_insert_sql(table, list(row_list[0].keys())),
+                     [{column: to_sqlite_value(value) for column, value in row.items()} for row in row_list])
+                    for table, row_list in table_rows if len(row_list) > 0]
+        try:
+            self.conn.execute('BEGIN')
+            for insert_sql, row_list in sql_rows:
+                self.conn.executemany(insert_sql, row_list)
+            self.conn.execute('COMMIT')
+            row_count = sum(len(row_list) for _, row_list in sql_rows)
+            failed_count = 0
+        except Exception as e:
+            if self.conn.in_transaction:
+                self.conn.execute('ROLLBACK')
+            logger.warning(f"批量写入回测结果失败，改为逐条写入: {e}")
+            row_count, failed_count = self._write_each(sql_rows)
+        latency = time.perf_counter() - start_time
+        self.flush_count += 1
+        self.row_count += row_count
+        self.failed_count += failed_count
+        self.flush_time += latency
+        self.last_flush_latency = latency
+        logger.debug(f"批量写入 {row_count} 条回测结果，失败 {failed_count} 条，耗时 {latency:.4f}s")
+        return row_count
+
+    def _write_each(self, sql_rows):
+        row_count = 0
+        failed_count = 0
+        self.conn.execute('BEGIN')
+        for insert_sql, row_list in sql_rows:
+            for row in row_list:
+                self.conn.execute('SAVEPOINT result_row')
+                try:
+                    self.conn.execute(insert_sql, row)
+                    row_count += 1
+                except Exception as e:
+                    self.conn.execute('ROLLBACK TO result_row')
+                    failed_count += 1
+                    logger.error(f"写入回测结果失败，{insert_sql}: {row}，错误: {e}")
+                self.conn.execute('RELEASE result_row')
+        self.conn.execute('COMMIT')
+        return row_count, failed_count
+
+    def rows_per_second(self):
+        if self.flush_time == 0:
+            return 0.0
+        return self.row_count / self.flush_time
+
+    def get_stats(self):
+        return {
+            'flush_count': self.flush_count,
+            'row_count': self.row_count,
+            'failed_count': self.failed_count,
+            'flush_time': self.flush_time,
+            'last_flush_latency': self.last_flush_latency,
+            'rows_per_second': self.rows_per_second(),
+        }
+
+    async def _close_conn(self):
+        if self.conn is not None:
+            self.conn.close()
+            self.conn = None
+
+    def close(self):
+        """
+        关闭连接并结束写入线程，已提交的写入会先执行完；可重复调用
+        """
+        if not self.writer_thread.is_alive():
+            return
+        self.call(self._close_conn())
+        self.loop.call_soon_threadsafe(self.loop.stop)
+        self.writer_thread.join()
+        self.loop.close()
@@ -0,0 +1,59 @@
+import sqlite3
+
+import numpy as np
+
+from panda_backtest.extensions.trade_reverse_future.result.result_sqlite_writer import ResultSQLiteWriter
+
+
+def make_writer(tmp_path):
+    db_path = str(tmp_path / 'result.db')
+    conn = sqlite3.connect(db_path)
+    conn.execute('CREATE TABLE backtest_profit (back_id TEXT, date TEXT, profit REAL NOT NULL)')
+    conn.commit()
+    conn.close()
+    return db_path, ResultSQLiteWriter(db_path)
+
+
+def read_rows(db_path):
+    conn = sqlite3.connect(db_path)
+    row_list = conn.execute('SELECT back_id, date, profit FROM backtest_profit ORDER BY date').fetchall()
+    conn.close()
+    return row_list
+
+
+def test_writer_batches_rows_in_wal_mode(tmp_path):
+    db_path, writer = make_writer(tmp_path)
+    called_list = list()
+
+    async def before_write():
+        called_list.append(1)
+
+    future_list = [writer.write_many([('backtest_profit', [dict(back_id='test', date=str(20250101 + i * 10 + j),
+                                                                profit=np.float64(j)) for j in range(10)])],
+                                     before_write=before_write())
+                   for i in range(5)]
+    assert [future.result() for future in future_list] == [10] * 5
+    stats = writer.get_stats()
+    writer.close()
+    writer.close()
+
+    assert called_list == [1] * 5
+    assert stats['flush_count'] == 5
+    assert stats['row_count'] == 50
+    assert len(read_rows(db_path)) == 50
+    assert not writer.writer_thread.is_alive()
+    conn = sqlite3.connect(db_path)
+    assert conn.execute('PRAGMA journal_mode').fetchone()[0] == 'wal'
+    conn.close()
+
+
+def test_writer_skips_only_failed_rows(tmp_path):
+    db_path, writer = make_writer(tmp_path)
+    future = writer.write_many([('backtest_profit', [dict(back_id='test', date='20250101', profit=1.0),
+                                                     dict(back_id='test', date='20250102', profit=None),
+                                                     dict(back_id='test', date='20250103', profit=3.0)])])
+    assert future.result() == 2
+    assert writer.get_stats()['failed_count'] == 1
+    writer.close()
+
+    assert read_rows(db_path) == [('test', '20250101', 1.0), ('test', '20250103', 3.0)]
@@ -18,10 +18,43 @@ class ReverseEventProcess(BaseEventProcess):
         strategy_context = self._context.strategy_context
         strategy_context.init_run_info(handle_message)
         strategy_context.init_trade_time_manager(self.trade_time_manager)
-        bar_map = BarMap(BarDataSource())
+        bar_data_source = BarDataSource()
+        bar_map = BarMap(bar_data_source)
         QuotationData.get_instance().init_bar_dict(bar_map)
+        if strategy_context.run_info.preload_quotation:
+            self.preload_quotation(bar_data_source)
         self.init_data()
 
+    def preload_quotation(self, bar_data_source):
+        """
+        预加载回测区间 × 合约池的日线行情面板
+        合约池：基准、因子表中的合约以及 preload_symbol_list 指定的合约
+        """
+        strategy_context = self._context.strategy_context
+        run_info = strategy_context.run_info
+
+        symbol_set = set(run_info.preload_symbol_list or [])
+        if run_info.benchmark:
+            symbol_set.add(run_info.benchmark)
+        df_factor = getattr(strategy_context, 'df_factor', None)
+        if df_factor is not None and 'symbol' in df_factor.columns:
+            symbol_set.update(df_factor['symbol'].dropna().astype(str).unique())
+
+        stock_symbol_list = list()
+        future_symbol_list = list()
+        for symbol in sorted(symbol_set):
+            key_list = symbol.split('.')
+            exchange = key_list[1] if len(key_list) == 2 else 'SH'
+            if exchange == 'OF':
+                continue
+            elif exchange == 'SZ' or exchange == 'SH':
+                stock_symbol_list.append(symbol)
+            else:
+                future_symbol_list.append(symbol)
+
+        bar_data_source.preload_daily_quotation(stock_symbol_list, future_symbol_list,
+                                                run_info.start_date, run_info.end_date)
+
     def init_data(self):
         self._context.operation_proxy.init_data()
         self._context.operation_proxy.init_event()
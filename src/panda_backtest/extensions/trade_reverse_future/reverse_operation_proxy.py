@@ -13,6 +13,7 @@ from panda_backtest.backtest_common.exchange.common.back_test.quotation_subscrib
 from panda_backtest.backtest_common.exchange.stock.back_test.stock_exchange import StockExchange
 
 from panda_backtest.backtest_common.data.quotation.quotation_data import QuotationData
+from panda_backtest.backtest_common.data.quotation.bar_history import BarHistory
 
 from panda_backtest.backtest_common.system.event.event import *
 from panda_backtest.extensions.trade_reverse_future.result.all_result import AllTradeReverseResult
@@ -38,9 +39,11 @@ class ReverseOperationProxy(object):
         self.fund_exchange = FundExchange(self.quotation_mongo_db)
         self.future_trade_api = FutureTradeApi(self.future_exchange)
         self.fund_trade_api = FundTradeApi(self.fund_exchange)
+        self.bar_history = None
 
     def init_data(self):
         strategy_context = self._context.strategy_context
+        self.bar_history = BarHistory(strategy_context.run_info.history_bar_size)
         self.all_trade_reverse_result = AllTradeReverseResult()
         strategy_context.init_all_result(self.all_trade_reverse_result)
         self.init_stock_account()
@@ -61,8 +64,11 @@ class ReverseOperationProxy(object):
         event_bus.register_handle(ConstantEvent.SYSTEM_STOCK_RTN_ORDER, self.sys_stock_rtn_order)
         event_bus.register_handle(ConstantEvent.SYSTEM_STOCK_RTN_TRADE, self.sys_stock_rtn_trade)
         event_bus.register_handle(ConstantEvent.SYSTEM_STOCK_QUOTATION_CHANGE, self.sys_stock_quotation_change)
+        event_bus.register_handle(ConstantEvent.SYSTEM_STOCK_QUOTATION_LIST_CHANGE,
+                                  self.sys_stock_quotation_list_change)
         event_bus.register_handle(ConstantEvent.SYSTEM_STOCK_ORDER_CANCEL, self.sys_stock_order_cancel)
         event_bus.register_handle(ConstantEvent.SYSTEM_STOCK_DIVIDEND, self.sys_stock_dividend)
+        event_bus.register_handle(ConstantEvent.SYSTEM_STOCK_DIVIDEND_LIST, self.sys_stock_dividend_list)
         event_bus.register_handle(ConstantEvent.SYSTEM_STOCK_QUOTATION_START_SUB, self.sys_sub_stock)
         event_bus.register_handle(ConstantEvent.SYSTEM_STOCK_QUOTATION_START_UN_SUB, self.sys_un_sub_stock)
         event_bus.register_handle(ConstantEvent.SYSTEM_ETF_SPLIT, self.sys_etf_split)
@@ -137,6 +143,7 @@ class ReverseOperationProxy(object):
         if run_info.matching_type == 1:
             bar_data.change_last_field(0)
         self.quotation_subscribe.start_quotation_play(time_type=0)
+        self.bar_history.on_bar(bar_data, strategy_context.trade_time)
 
         if strategy_context.enable_risk_control:
             event = Event(
@@ -255,6 +262,14 @@ class ReverseOperationProxy(object):
         if run_info.standard_type == 0:
             self.all_trade_reverse_result.refresh_standard_symbol(bar_data)
 
+    def sys_stock_quotation_list_change(self, bar_data_list):
+        self.all_trade_reverse_result.refresh_stock_position_list(bar_data_list)
+        strategy_context = self._context.strategy_context
+        run_info = strategy_context.run_info
+        if run_info.standard_type == 0:
+            for bar_data in bar_data_list:
+                self.all_trade_reverse_result.refresh_standard_symbol(bar_data)
+
     def sys_stock_order_cancel(self, order):
         sr_logger = RemoteLogFactory.get_sr_logger()
         if order.now_system_order == 2:
@@ -276,6 +291,9 @@ class ReverseOperationProxy(object):
     def sys_stock_dividend(self, dividend):
         self.all_trade_reverse_result.on_rtn_dividend(dividend)
 
+    def sys_stock_dividend_list(self, dividend_list):
+        self.all_trade_reverse_result.on_rtn_dividend_list(dividend_list)
+
     def sys_etf_split(self, etf_split):
         self.all_trade_reverse_result.on_etf_rtn_split(etf_split)
 
@@ -379,7 +397,20 @@ class ReverseOperationProxy(object):
         strategy_context.un_sub_fund_symbol(symbol_list, sub_type)
 
     def subscribe(self, symbol_list):
-        pass
+        self.bar_history.track(symbol_list)
+
+    def history_bars(self, symbol, n, fields=None, frequency=None):
+        run_info = self._context.strategy_context.run_info
+        if frequency is not None and frequency != run_info.frequency:
+            sr_logger = RemoteLogFactory.get_sr_logger()
+            sr_logger.error('history_bars 仅支持回测频率 %s，不支持 %s' % (run_info.frequency, frequency))
+            return None
+        self.bar_history.track(symbol)
+        return self.bar_history.history_bars(symbol, n, fields)
+
+    def rolling_window(self, symbol, field, window):
+        self.bar_history.track(symbol)
+        return self.bar_history.rolling(symbol, field, window)
 
     def place_order(self, account_id, order_dict):
         """
@@ -0,0 +1,122 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+# @File   : main_param_sweep.py
+# @desc   : 参数寻优，按参数网格在进程池中并行运行股票回测
+import itertools
+import json
+import logging
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+import pandas as pd
+
+logger = logging.getLogger(__name__)
+
+METRIC_COLUMNS = ['annual_return', 'sharpe', 'max_drawdown', 'strategy_profit', 'volatility', 'alpha', 'beta',
+                  'info_ratio', 'sortino']
+
+
+def expand_param_grid(param_grid):
+    """
+    {'a': [1, 2], 'b': ['x']} -> [{'a': 1, 'b': 'x'}, {'a': 2, 'b': 'x'}]
+    """
+    name_list = list(param_grid.keys())
+    return [dict(zip(name_list, value_list)) for value_list in itertools.product(*param_grid.values())]
+
+
+def build_run_params(param_dict):
+    """
+    转换为 start(run_params=...) 的格式：[[类型(0:数值，1:字符串), 参数名, 参数值], ...]
+    """
+    run_params_list = list()
+    for name, value in param_dict.items():
+        if isinstance(value, (int, float)) and not isinstance(value, bool):
+            run_params_list.append([0, name, str(value)])
+        else:
+            run_params_list.append([1, name, value])
+    return json.dumps(run_params_list)
+
+
+def build_result_frame(param_list, result_list):
+    """
+    汇总各组参数的回测结果，每组参数一行，缺失的指标列补空
+    :param result_list: 与 param_list 一一对应的 (back_test_id, strategy_result)，回测失败为 None
+    """
+    row_list = list()
+    for param_dict, result in zip(param_list, result_list):
+        row = dict(param_dict)
+        if result is None:
+            row['back_test_id'] = None
+        else:
+            back_test_id, strategy_result = result
+            row['back_test_id'] = back_test_id
+            row.update(strategy_result)
+        row_list.append(row)
+    result_df = pd.DataFrame(row_list)
+    for column in METRIC_COLUMNS:
+        if column not in result_df.columns:
+            result_df[column] = None
+    return result_df
+
+
+# 工作进程内的公共回测参数（含因子数据），由进程池 initializer 设置一次，不随每个任务传递
+_backtest_kwargs = None
+
+
+def init_sweep_worker(backtest_kwargs):
+    global _backtest_kwargs
+    _backtest_kwargs = backtest_kwargs
+
+
+def run_sweep_point(param_dict):
+    """
+    在工作进程中运行一组参数的回测。
+    工作进程在多次回测之间保留 StockInfoMap、数据库连接、行情面板等进程内缓存。
+    """
+    from panda_backtest.main_workflow_stock import start, get_backtest_id
+    from panda_backtest.backtest_common.system.context.core_context import CoreContext
+
+    back_test_id = get_backtest_id()
+    start(back_test_id=back_test_id, run_params=build_run_params(param_dict), **_backtest_kwargs)
+    all_trade_reverse_result = CoreContext.get_instance().operation_proxy.all_trade_reverse_result
+    return back_test_id, dict(all_trade_reverse_result.strategy_result)
+
+
+def run_param_sweep(code, param_grid, start_date, end_date, start_capital, standard_symbol, commission_rate,
+                    account_id, df_factor, frequency='1d', max_workers=None, preload_quotation=True,
+                    vectorized=False, sweep_id=None):
+    """
+    按参数网格并行回测
+    :param code: 策略代码，参数通过 context.<参数名> 读取
+    :param param_grid: {参数名: [取值, ...]}
+    :param max_workers: 进程数，默认CPU核数
+    :param sweep_id: 寻优任务的回测记录 id，寻优进度写入该记录
+    :return: DataFrame，每组参数一行：参数列、back_test_id 及回测指标
+    """
+    from panda_backtest.system.panda_log import SRLogger
+
+    param_list = expand_param_grid(param_grid)
+    backtest_kwargs = dict(code=code, start_date=start_date, end_date=end_date, start_capital=start_capital,
+                           standard_symbol=standard_symbol, commission_rate=commission_rate,
+                           account_id=account_id, df_factor=df_factor, frequency=frequency,
+                           preload_quotation=preload_quotation, vectorized=vectorized)
+
+    if sweep_id is not None:
+        SRLogger.init_process(sweep_id)
+    total = len(param_list)
+    result_list = [None] * total
+    # 回测进程内有数据库连接与后台线程，使用 spawn 避免 fork 后继承其状态
+    with ProcessPoolExecutor(max_workers=max_workers, mp_context=multiprocessing.get_context('spawn'),
+                             initializer=init_sweep_worker, initargs=(backtest_kwargs,)) as executor:
+        future_dict = {executor.submit(run_sweep_point, param_dict): i for i, param_dict in enumerate(param_list)}
+        done = 0
+        for future in as_completed(future_dict):
+            i = future_dict[future]
+            try:
+                result_list[i] = future.result()
+            except Exception as e:
+                logger.error(f"参数寻优回测失败，参数：{param_list[i]}，错误：{e}")
+            done += 1
+            SRLogger.process(done, total)
+
+    return build_result_frame(param_list, result_list)
@@ -14,7 +14,8 @@ import os
 import time
 import json
 from bson import ObjectId
-def start(code:str,start_future_capital:int,future_account_id:str,start_date:str,end_date:str,commission_rate:int,margin_rate:int,frequency:str,df_factor:pd.DataFrame):
+def start(code:str,start_future_capital:int,future_account_id:str,start_date:str,end_date:str,commission_rate:int,margin_rate:int,frequency:str,df_factor:pd.DataFrame, preload_quotation: bool = False,
+          session_symbol_list: list = None, profile_event: bool = False):
     strategy_risk_control_list = []
     back_test_id = str(ObjectId())
 
@@ -37,6 +38,9 @@ def start(code:str,start_future_capital:int,future_account_id:str,start_date:str
                       'margin_rate': margin_rate,
                       'start_future_capital': start_future_capital,
                       'start_fund_capital': 1000000,
+                      'preload_quotation': preload_quotation,
+                      'session_symbol_list': session_symbol_list,
+                      'profile_event': profile_event,
                       }
     # 系统核心上下文 创建q
     strategy_context = StrategyContext()
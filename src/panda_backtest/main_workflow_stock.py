@@ -16,7 +16,8 @@ def get_backtest_id():
     return str(ObjectId())
 
 def start(back_test_id:str,code:str,start_date:str,end_date:str, start_capital: int, standard_symbol: str,
-          commission_rate: int, account_id: str, df_factor: pd.DataFrame,frequency:str):
+          commission_rate: int, account_id: str, df_factor: pd.DataFrame,frequency:str, preload_quotation: bool = False,
+          vectorized: bool = False, profile_event: bool = False, run_params: str = 'no_opz'):
     symbol_map = {
         "上证指数": "000001.SH",
         "沪深300": "000300.SH",
@@ -27,7 +28,7 @@ def start(back_test_id:str,code:str,start_date:str,end_date:str, start_capital:
     handle_message = {'code': code,
                       # 'file':'/Users/peiqi/code/python/panda_workflow/src/panda_backtest/strategy/stock01.py',
                       'file':'C:/work/panda_quantflow/src/panda_backtest/strategy/stock01.py',
-                      'run_params': 'no_opz',
+                      'run_params': run_params,
                       'start_capital': start_capital,
                       'start_date': start_date,
                       'end_date': end_date,
@@ -46,6 +47,9 @@ def start(back_test_id:str,code:str,start_date:str,end_date:str, start_capital:
                       'margin_rate': 1,
                       'start_future_capital': 10000000,
                       'start_fund_capital': 1000000,
+                      'preload_quotation': preload_quotation,
+                      'vectorized': vectorized,
+                      'profile_event': profile_event,
                       'date_type': 0
                       }
     # LogFactory.init_logger() - 已替换为统一日志配置
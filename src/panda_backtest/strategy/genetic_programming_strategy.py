@@ -44,6 +44,8 @@ def initialize(context):
         'AU2512.SHF',    # 黄金
         'AG2512.SHF'     # 白银
     ]
+    # 订阅后由引擎缓存历史 bar，通过 history_bars 获取
+    subscribe(context.futures_pool)
     
     # 遗传规划参数
     context.population_size = 20        # 种群大小
@@ -63,7 +65,6 @@ def initialize(context):
     }
     
     # 初始化数据存储
-    context.price_history = {}          # 价格历史数据
     context.factor_population = []      # 因子种群
     context.fitness_scores = []         # 适应度分数
     context.best_factors = {}           # 最优因子
@@ -89,9 +90,6 @@ def handle_data(context, bar_dict):
     """
     current_date = context.now
     
-    # 更新价格历史
-    update_price_history(context, bar_dict)
-    
     # 检查是否到达调仓日
     if not should_rebalance(context, current_date):
         # 非调仓日进行风险控制
@@ -134,26 +132,6 @@ def should_rebalance(context, current_date):
     except:
         return True
 
-def update_price_history(context, bar_dict):
-    """更新价格历史数据"""
-    for symbol in context.futures_pool:
-        if symbol in bar_dict:
-            if symbol not in context.price_history:
-                context.price_history[symbol] = []
-            
-            context.price_history[symbol].append({
-                'date': context.now,
-                'open': bar_dict[symbol].open,
-                'high': bar_dict[symbol].high,
-                'low': bar_dict[symbol].low,
-                'close': bar_dict[symbol].close,
-                'volume': bar_dict[symbol].volume
-            })
-            
-            # 保持历史数据长度
-            if len(context.price_history[symbol]) > context.factor_window * 2:
-                context.price_history[symbol] = context.price_history[symbol][-context.factor_window * 2:]
-
 def genetic_programming_optimization(context, available_futures):
     """
     遗传规划优化因子
@@ -215,18 +193,17 @@ def evaluate_fitness(context, symbols):
         returns = []
         
         for symbol in symbols:
-            if symbol in context.price_history and len(context.price_history[symbol]) >= 10:
+            closes = history_bars(symbol, 10, 'close')
+            if closes is not None and len(closes) >= 10:
                 # 计算因子值
                 factor_score = calculate_factor_score(context, symbol, individual[symbol])
                 
                 # 简化的收益计算
                 if factor_score is not None:
-                    price_data = context.price_history[symbol][-10:]
-                    price_returns = [(price_data[i]['close'] / price_data[i-1]['close'] - 1) 
-                                   for i in range(1, len(price_data))]
+                    price_returns = closes[1:] / closes[:-1] - 1
                     
                     # 因子信号与收益的相关性作为收益代理
-                    if price_returns:
+                    if len(price_returns) > 0:
                         signal_return = factor_score * np.mean(price_returns)
                         returns.append(signal_return)
         
@@ -244,17 +221,15 @@ def evaluate_fitness(context, symbols):
 
 def calculate_factor_score(context, symbol, factor_config):
     """计算单个因子得分"""
-    if symbol not in context.price_history:
-        return None
-    
-    price_data = context.price_history[symbol]
-    if len(price_data) < max(factor_config['window1'], factor_config['window2']):
+    # 价格序列由引擎缓存，直接取最近 factor_window * 2 条 bar
+    price_data = history_bars(symbol, context.factor_window * 2, ['close', 'volume'])
+    if price_data is None or len(price_data) < max(factor_config['window1'], factor_config['window2']):
         return None
     
     try:
         # 提取价格序列
-        closes = [p['close'] for p in price_data]
-        volumes = [p['volume'] for p in price_data]
+        closes = price_data[:, 0]
+        volumes = price_data[:, 1]
         
         # 计算主因子
         primary_func = context.function_library[factor_config['primary_factor']]
@@ -0,0 +1,123 @@
+# -*- coding: utf-8 -*-
+"""
+File: bounded_log_writer.py
+Description: 有界的策略日志写入器，日志先进入定长环形缓冲区，由后台线程按条数、时间批量写入
+"""
+import logging
+import threading
+import time
+from collections import deque
+
+# 积压时 DEBUG 日志的处理方式
+DEBUG_POLICY_KEEP = 'keep'
+DEBUG_POLICY_DROP = 'drop'
+DEBUG_POLICY_SAMPLE = 'sample'
+
+
+class BoundedLogWriter(object):
+    """
+    写日志不阻塞调用方：
+    缓冲区满时丢弃最早的日志；缓冲区超过一半（积压）时按 debug_policy 丢弃或抽样 DEBUG 日志。
+    后台线程在缓存条数达到 flush_size 或距上次写入超过 flush_interval 秒时，把整批日志交给 write_func。
+    """
+
+    def __init__(self, write_func, capacity=20000, flush_size=500, flush_interval=1.0,
+                 debug_policy=DEBUG_POLICY_SAMPLE, debug_sample_rate=10, debug_level=3):
+        """
+        :param write_func: 写入函数，参数为日志 dict 列表，列表交由 write_func 持有，不再复用
+        :param debug_level: DEBUG 日志的 level 值
+        """
+        self.write_func = write_func
+        self.capacity = capacity
+        self.flush_size = flush_size
+        self.flush_interval = flush_interval
+        self.debug_policy = debug_policy
+        self.debug_sample_rate = max(1, debug_sample_rate)
+        self.debug_level = debug_level
+        self.high_water = capacity // 2
+        self.buffer = deque()
+        self.condition = threading.Condition()
+        self.closed = False
+        self.thread = None
+        self.debug_count = 0
+        self.queued_count = 0
+        self.flushed_count = 0
+        self.dropped_count = 0
+        self.failed_count = 0
+
+    def start(self):
+        self.thread = threading.Thread(target=self.run, name='sr-log-writer', daemon=True)
+        self.thread.start()
+
+    def put(self, record):
+        """
+        :return: 日志是否进入缓冲区
+        """
+        with self.condition:
+            if self.closed:
+                self.dropped_count += 1
+                return False
+            size = len(self.buffer)
+            if record.get('level') == self.debug_level and size >= self.high_water and not self.keep_debug():
+                self.dropped_count += 1
+                return False
+            if size >= self.capacity:
+                self.buffer.popleft()
+                self.dropped_count += 1
+            self.buffer.append(record)
+            self.queued_count += 1
+            if len(self.buffer) >= self.flush_size:
+                self.condition.notify()
+        return True
+
+    def keep_debug(self):
+        if self.debug_policy == DEBUG_POLICY_KEEP:
+            return True
+        if self.debug_policy == DEBUG_POLICY_DROP:
+            return False
+        self.debug_count += 1
+        return self.debug_count % self.debug_sample_rate == 0
+
+    def run(self):
+        last_flush_time = time.time()
+        while True:
+            with self.condition:
+                while not self.closed and len(self.buffer) < self.flush_size:
+                    timeout = last_flush_time + self.flush_interval - time.time()
+                    if timeout <= 0:
+                        break
+                    self.condition.wait(timeout)
+                batch = [self.buffer.popleft() for _ in range(min(len(self.buffer), self.flush_size))]
+                finished = self.closed and len(self.buffer) == 0
+            if len(batch) > 0:
+                self.write(batch)
+            last_flush_time = time.time()
+            if finished:
+                break
+
+    def write(self, batch):
+        try:
+            self.write_func(batch)
+            self.flushed_count += len(batch)
+        except Exception as e:
+            self.failed_count += len(batch)
+            logging.error(f"写入策略日志失败: {e}")
+
+    def close(self, timeout=20):
+        """
+        写入缓冲区中剩余的日志后结束后台线程，最多等待 timeout 秒
+        """
+        with self.condition:
+            self.closed = True
+            self.condition.notify()
+        if self.thread is not None:
+            self.thread.join(timeout)
+
+    def get_stats(self):
+        return {
+            'queued': self.queued_count,
+            'flushed': self.flushed_count,
+            'dropped': self.dropped_count,
+            'failed': self.failed_count,
+            'pending': len(self.buffer),
+        }
@@ -5,11 +5,9 @@ Author: peiqi
 Date: 2025/5/14
 Description: 
 """
-import copy
 import logging
 
 import datetime
-import time
 import pandas
 import queue
 import threading
@@ -18,27 +16,53 @@ from common.connector.mongodb_handler import DatabaseHandler
 from panda_backtest.util.time.time_util import TimeUtil
 from common.config.config import config
 from panda_server.dao.backtest_dao import BacktestDAO
+from panda_backtest.system.bounded_log_writer import BoundedLogWriter
 
 class SRLogger:
     _strategy_context = None
     _back_test_id = None
     _opz_params_str = None
-    _log_queue = None
+    _log_writer = None
+    _mongo_client = None
     _process_queue = queue.Queue()
+    _process_thread = None
+    _process_lock = threading.Lock()
     _sort = 0
-    _insert_flag = True
 
     @classmethod
     def init_strategy_context(cls, back_test_id, opz_params_str, strategy_context):
-        SRLogger._log_queue = queue.Queue()
+        if SRLogger._log_writer is not None:
+            SRLogger._log_writer.close()
         SRLogger._strategy_context = strategy_context
         SRLogger._back_test_id = back_test_id
         SRLogger._opz_params_str = opz_params_str
-        log_thread = threading.Thread(target=cls.log_consume)
-        log_thread.start()
-        process_thread = threading.Thread(target=cls.process_consume)
-        process_thread.setDaemon(True)
-        process_thread.start()
+        SRLogger._log_writer = BoundedLogWriter(cls.write_logs,
+                                                capacity=config['SR_LOG_BUFFER_SIZE'],
+                                                flush_size=config['SR_LOG_FLUSH_SIZE'],
+                                                flush_interval=config['SR_LOG_FLUSH_INTERVAL'],
+                                                debug_policy=config['SR_LOG_DEBUG_POLICY'],
+                                                debug_sample_rate=config['SR_LOG_DEBUG_SAMPLE_RATE'])
+        SRLogger._log_writer.start()
+        cls.start_process_consumer()
+
+    @classmethod
+    def init_process(cls, back_test_id):
+        """
+        只上报进度、不写策略日志（如参数寻优的主进程）
+        """
+        SRLogger._back_test_id = back_test_id
+        cls.start_process_consumer()
+
+    @classmethod
+    def start_process_consumer(cls):
+        """
+        每个进程只启动一个进度消费线程，同一进程内的多次回测（如参数寻优工作进程）共用
+        """
+        with SRLogger._process_lock:
+            if SRLogger._process_thread is not None and SRLogger._process_thread.is_alive():
+                return
+            SRLogger._process_thread = threading.Thread(target=cls.process_consume, daemon=True)
+            SRLogger._process_thread.start()
 
     @staticmethod
     def info(content):
@@ -87,10 +111,19 @@ class SRLogger:
 
     @staticmethod
     def end():
-        t_end = time.time() + 20
-        SRLogger.log_provide('日志进程结束啦', -1)
-        while SRLogger._insert_flag and time.time() < t_end:
-            continue
+        # 写入剩余日志，最多等待 20 秒
+        if SRLogger._log_writer is not None:
+            SRLogger._log_writer.close(timeout=20)
+            logging.info(f"策略日志写入统计: {SRLogger._log_writer.get_stats()}")
+
+    @staticmethod
+    def get_stats():
+        """
+        日志写入计数：queued 进入缓冲区、flushed 已写入、dropped 丢弃、failed 写入失败、pending 待写入
+        """
+        if SRLogger._log_writer is None:
+            return None
+        return SRLogger._log_writer.get_stats()
 
     @staticmethod
     def performance_analysis(content):
@@ -103,6 +136,7 @@ class SRLogger:
             insert_content = dict()
             insert_content['level'] = 0
             insert_content['progress_rate'] = progress_rate
+            insert_content['relation_id'] = SRLogger._back_test_id
             SRLogger._process_queue.put_nowait(insert_content)
 
     @staticmethod
@@ -125,23 +159,24 @@ class SRLogger:
         if risk_control_name is not None:
             insert_content['risk_control_name'] = risk_control_name
         SRLogger._sort = SRLogger._sort + 1
-        SRLogger._log_queue.put_nowait(insert_content)
+        SRLogger._log_writer.put(insert_content)
 
     @staticmethod
     def process_consume():
         """消费进度队列，更新数据库中的回测进度"""
-        last_progress = -1  # 记录上次更新的进度，避免频繁更新
+        last_progress = None  # 记录上次更新的 (回测 id, 进度)，避免频繁更新
         
         while True:
             try:
                 insert_content = SRLogger._process_queue.get(timeout=12 * 60 * 60)
                 progress_rate = insert_content.get('progress_rate', 0)
+                back_test_id = insert_content.get('relation_id')
                 
                 # 只有当进度变化时才更新数据库（避免频繁更新）
-                if progress_rate != last_progress and SRLogger._back_test_id:
-                    last_progress = progress_rate
+                if (back_test_id, progress_rate) != last_progress and back_test_id:
+                    last_progress = (back_test_id, progress_rate)
                     # 异步更新进度到 SQLite
-                    SRLogger._update_progress_async(SRLogger._back_test_id, float(progress_rate))
+                    SRLogger._update_progress_async(back_test_id, float(progress_rate))
                     
             except queue.Empty:
                 print('进程信息超时')
@@ -177,25 +212,8 @@ class SRLogger:
             logging.error(f"异步更新进度失败: {e}")
 
     @staticmethod
-    def log_consume():
-        mongo_client = DatabaseHandler(config=config)
-        log_list = list()
-        while True:
-            try:
-                insert_content = SRLogger._log_queue.get(timeout=12 * 60 * 60)
-                if insert_content['level'] == -1:
-                    print('日志线程收到结束信号')
-                    # 收到结束信号
-                    if len(log_list) > 0:
-                        mongo_client.mongo_insert_many(config["MONGO_DB"], collection_name="panda_user_strategy_log", documents=log_list)
-                        SRLogger._insert_flag = False
-                        break
-                log_list.append(insert_content)
-                if len(log_list) > 50:
-                    insert_log_list = copy.deepcopy(log_list)
-                    log_list = list()
-                    mongo_client.mongo_insert_many(config["MONGO_DB"], collection_name="panda_user_strategy_log", documents=insert_log_list)
-
-            except queue.Empty:
-                print('日志超时')
-                break
+    def write_logs(log_list):
+        if SRLogger._mongo_client is None:
+            SRLogger._mongo_client = DatabaseHandler(config=config)
+        SRLogger._mongo_client.mongo_insert_many(config["MONGO_DB"], collection_name="panda_user_strategy_log",
+                                                 documents=log_list)
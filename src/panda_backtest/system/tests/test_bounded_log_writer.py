@@ -0,0 +1,44 @@
+import threading
+
+from panda_backtest.system.bounded_log_writer import BoundedLogWriter
+
+
+def test_writer_flushes_batches_and_drains_on_close():
+    batch_list = list()
+    writer = BoundedLogWriter(batch_list.append, capacity=1000, flush_size=10, flush_interval=60)
+    writer.start()
+    for i in range(25):
+        writer.put({'level': 1, 'sort': i})
+    writer.close(timeout=5)
+
+    assert not writer.thread.is_alive()
+    assert [record['sort'] for batch in batch_list for record in batch] == list(range(25))
+    assert writer.get_stats() == {'queued': 25, 'flushed': 25, 'dropped': 0, 'failed': 0, 'pending': 0}
+
+
+def test_writer_bounds_memory_under_backpressure():
+    release = threading.Event()
+    batch_list = list()
+
+    def slow_write(batch):
+        release.wait(5)
+        batch_list.append(batch)
+
+    writer = BoundedLogWriter(slow_write, capacity=20, flush_size=5, flush_interval=60,
+                              debug_policy='sample', debug_sample_rate=4)
+    # 后台线程未启动，模拟写入跟不上
+    for i in range(10):
+        writer.put({'level': 1, 'sort': i})
+    kept = [writer.put({'level': 3, 'sort': 100 + i}) for i in range(8)]
+    assert kept == [False, False, False, True] * 2
+    for i in range(30):
+        writer.put({'level': 4, 'sort': 200 + i})
+    assert len(writer.buffer) == 20
+
+    writer.start()
+    release.set()
+    writer.close(timeout=5)
+    stats = writer.get_stats()
+    assert stats == {'queued': 42, 'flushed': 20, 'dropped': 28, 'failed': 0, 'pending': 0}
+    # 保留的是最新的 20 条
+    assert [record['sort'] for batch in batch_list for record in batch] == list(range(210, 230))
@@ -0,0 +1,22 @@
+import json
+
+from panda_backtest.main_param_sweep import METRIC_COLUMNS, build_result_frame, build_run_params, expand_param_grid
+
+
+def test_grid_expands_to_every_combination():
+    param_list = expand_param_grid({'window': [5, 10], 'mode': ['fast']})
+
+    assert param_list == [{'window': 5, 'mode': 'fast'}, {'window': 10, 'mode': 'fast'}]
+    assert json.loads(build_run_params(param_list[0])) == [[0, 'window', '5'], [1, 'mode', 'fast']]
+
+
+def test_result_frame_keeps_param_order_and_failed_points():
+    param_list = expand_param_grid({'window': [5, 10, 20]})
+    result_list = [('id-5', {'sharpe': 1.2, 'annual_return': 0.1}), None, ('id-20', {'sharpe': 0.8})]
+
+    result_df = build_result_frame(param_list, result_list)
+
+    assert result_df['window'].tolist() == [5, 10, 20]
+    assert result_df['back_test_id'].isna().tolist() == [False, True, False]
+    assert result_df.loc[0, 'sharpe'] == 1.2
+    assert set(METRIC_COLUMNS) <= set(result_df.columns)
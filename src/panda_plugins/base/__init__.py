@@ -3,5 +3,6 @@ import logging
 
 from .work_node_registery import work_node
 from .ui_control import ui
+from .cancellation import CancellationToken, WorkflowCancelledError
 
-__all__ = ["BaseWorkNode", "work_node", "ui"]
+__all__ = ["BaseWorkNode", "work_node", "ui", "CancellationToken", "WorkflowCancelledError"]
@@ -1,11 +1,13 @@
 from abc import ABC, abstractmethod
+import asyncio
 import logging
 import queue
 import time
 from pydantic import BaseModel
-from typing import Type, Optional
+from typing import Callable, Type, Optional
 import panda_plugins.base.jsonschema_patches  # 必须保留
 from common.logging.user_logger import UserLogger
+from panda_plugins.base.cancellation import CancellationToken
 
 
 class BaseWorkNode(ABC):
@@ -22,6 +24,10 @@ class BaseWorkNode(ABC):
     __work_node_type__: str
     __short_description__: str = ""  # html rich text
     __long_description__: str = ""  # html rich text
+    __work_node_cacheable__: bool = False  # 相同输入时是否复用历史输出，仅结果确定且无副作用的节点开启
+    __work_node_market_data__: bool = False  # 是否读取行情、因子数据库，缓存键需包含行情最新交易日
+    __work_node_version__: str = "1"  # 节点逻辑变更但代码未变时（如依赖外部模型文件），可提升版本使缓存失效
+    __work_node_resource__: str = "light"  # 资源类型：light 在服务进程线程池执行，cpu / memory 在工作进程池执行
 
     def __init__(self):
         # 日志记录器，由工作流执行器设置
@@ -29,6 +35,11 @@ class BaseWorkNode(ABC):
         self._workflow_id = None  # 存储workflow_id
         self._sys_logger = logging.getLogger(self.__class__.__name__)
         self._log_queue = queue.Queue()  # 用于缓存日志消息
+        self._log_sink: Optional[Callable] = None  # 在工作进程中执行时由节点执行池设置，日志与进度经此发回服务进程
+        self._progress: Optional[dict] = None  # 最近一次 report_progress 上报的进度
+        self._reported_percent = -1  # 已写入用户日志的进度百分比
+        self._log_lock = None  # 串行处理队列日志，保证日志序列号顺序
+        self.cancel_token = CancellationToken()  # 取消令牌，由工作流执行器替换为所属工作流运行的令牌
 
         # 创建标准 logger 接口
         self.logger = self.LoggerWrapper(self)
@@ -99,7 +110,7 @@ class BaseWorkNode(ABC):
         """
         将日志消息放入队列，避免在同步上下文中直接调用异步方法
         """
-        if self._user_logger:
+        if self._user_logger or self._log_sink:
             # 将日志信息放入队列
             log_entry = {
                 "level": level,
@@ -108,6 +119,9 @@ class BaseWorkNode(ABC):
                 "timestamp": time.time(),
                 "kwargs": kwargs,
             }
+            if self._log_sink:
+                self._log_sink("log", log_entry)
+                return
             try:
                 self._log_queue.put_nowait(log_entry)
             except queue.Full:
@@ -118,13 +132,70 @@ class BaseWorkNode(ABC):
                 f"[USER_LOG] {message} (metadata: {kwargs})"
             )
 
+    def _setup_remote_logging(self, workflow_id: str, log_sink: Callable):
+        """
+        在工作进程中执行时由节点执行池调用：日志与进度调用 log_sink(kind, data) 发回服务进程
+        """
+        self._workflow_id = workflow_id
+        self._log_sink = log_sink
+
+    def _drain_queued_logs(self) -> list:
+        """取出队列中的全部日志"""
+        log_entries = []
+        while True:
+            try:
+                log_entries.append(self._log_queue.get_nowait())
+            except queue.Empty:
+                return log_entries
+
+    def _set_progress(self, progress: dict):
+        """记录进度（工作进程中上报的进度由节点执行池转发到服务进程的节点实例）"""
+        self._progress = progress
+
+    def get_progress(self) -> float:
+        """最近一次上报的进度，0 - 1，未上报时为 0"""
+        progress = self._progress
+        return progress["fraction"] if progress else 0.0
+
+    def report_progress(self, fraction: float, eta: Optional[float] = None, message: Optional[str] = None):
+        """
+        上报节点执行进度，工作流执行器定时读取，用于更新工作流进度并写入用户日志
+
+        Args:
+            fraction: 完成比例，0 - 1
+            eta: 预计剩余时间（秒）
+            message: 进度说明
+
+        Example usage in plugin:
+            for epoch in range(epochs):
+                train_one_epoch()
+                self.report_progress((epoch + 1) / epochs, message=f"epoch {epoch + 1}/{epochs}")
+        """
+        progress = {
+            "fraction": min(max(float(fraction), 0.0), 1.0),
+            "eta": eta,
+            "message": message,
+            "timestamp": time.time(),
+        }
+        if self._log_sink:
+            self._log_sink("progress", progress)
+        else:
+            self._set_progress(progress)
+
     async def _process_queued_logs(self):
         """
         处理队列中的日志消息（异步方法，由工作流执行器调用）
         """
         if not self._user_logger:
             return
-
+        if self._log_lock is None:
+            self._log_lock = asyncio.Lock()
+        # 执行期间由工作流执行器定时调用，与节点结束后的调用可能并发
+        async with self._log_lock:
+            await self._write_queued_logs()
+
+    async def _write_queued_logs(self):
+        """写入队列中的日志与进度"""
         while not self._log_queue.empty():
             try:
                 log_entry = self._log_queue.get_nowait()
@@ -143,6 +214,33 @@ class BaseWorkNode(ABC):
             except Exception as e:
                 self._sys_logger.warning(f"Failed to process queued log: {e}")
 
+        # 进度每变化 1% 写入一条用户日志
+        progress = self._progress
+        if progress is None:
+            return
+        percent = int(progress["fraction"] * 100)
+        if percent == self._reported_percent:
+            return
+        self._reported_percent = percent
+        try:
+            message = f"节点进度 {percent}%"
+            if progress["message"]:
+                message += f"：{progress['message']}"
+            await self._user_logger.info(message, workflow_id=self._workflow_id, progress=progress)
+        except Exception as e:
+            self._sys_logger.warning(f"Failed to process node progress: {e}")
+
+    def is_cancelled(self) -> bool:
+        """所属工作流是否已被终止"""
+        return self.cancel_token.is_cancelled()
+
+    def check_cancelled(self):
+        """
+        所属工作流已被终止时抛出 WorkflowCancelledError
+        运行时间较长的节点应在循环中调用，以便终止工作流后尽快释放执行资源
+        """
+        self.cancel_token.raise_if_cancelled()
+
     def log_debug(self, message: str, **kwargs):
         """
         记录调试级别日志
@@ -0,0 +1,76 @@
+"""
+工作流节点的协作式取消
+
+工作流被终止后，执行器把节点的 cancel_token 标记为已取消。运行时间较长的节点在循环中调用
+self.check_cancelled()（或 self.cancel_token.raise_if_cancelled()），尽快结束并释放执行线程/进程。
+服务进程内通过 threading.Event 通知；令牌传到工作进程后改为检查标记文件是否存在，并限制检查频率，
+因此可以在每个 batch、每次迭代中调用。
+"""
+import os
+import threading
+import time
+from typing import Optional
+
+
+class WorkflowCancelledError(Exception):
+    """节点因工作流被终止而提前结束"""
+
+
+class CancellationToken:
+    """
+    取消令牌
+
+    Args:
+        marker_path: 取消标记文件路径，需要跨进程传递取消信号时设置
+        check_interval: 在工作进程中检查标记文件的最小间隔（秒）
+    """
+
+    def __init__(self, marker_path: Optional[str] = None, check_interval: float = 0.5):
+        self.marker_path = marker_path
+        self.check_interval = check_interval
+        self.reason: Optional[str] = None
+        self._event = threading.Event()
+        self._remote = False
+        self._next_check = 0.0
+
+    def cancel(self, reason: Optional[str] = None):
+        """标记为已取消，可重复调用"""
+        if self._event.is_set():
+            return
+        self.reason = reason
+        if self.marker_path:
+            os.makedirs(os.path.dirname(self.marker_path), exist_ok=True)
+            with open(self.marker_path, "w", encoding="utf-8") as f:
+                f.write(reason or "")
+        self._event.set()
+
+    def is_cancelled(self) -> bool:
+        if self._event.is_set():
+            return True
+        if self._remote and self.marker_path:
+            now = time.monotonic()
+            if now >= self._next_check:
+                self._next_check = now + self.check_interval
+                if os.path.exists(self.marker_path):
+                    self._event.set()
+                    return True
+        return False
+
+    def raise_if_cancelled(self):
+        if self.is_cancelled():
+            raise WorkflowCancelledError(self.reason or "工作流已被终止")
+
+    def __getstate__(self):
+        state = self.__dict__.copy()
+        state["_cancelled"] = state.pop("_event").is_set()
+        return state
+
+    def __setstate__(self, state):
+        cancelled = state.pop("_cancelled")
+        self.__dict__.update(state)
+        # 反序列化得到的令牌位于其他进程，只能通过标记文件得知取消
+        self._event = threading.Event()
+        self._remote = True
+        self._next_check = 0.0
+        if cancelled:
+            self._event.set()
@@ -0,0 +1,49 @@
+import pytest
+
+from panda_plugins.base import BaseWorkNode
+
+
+class ProgressNode(BaseWorkNode):
+    @classmethod
+    def input_model(cls):
+        return None
+
+    @classmethod
+    def output_model(cls):
+        return None
+
+    def run(self, input):
+        return None
+
+
+class FakeUserLogger:
+    def __init__(self):
+        self.message_list = []
+
+    async def info(self, message, **kwargs):
+        self.message_list.append(message)
+
+
+def test_report_progress_clamps_fraction():
+    node = ProgressNode()
+    assert node.get_progress() == 0.0
+
+    node.report_progress(1.5)
+    assert node.get_progress() == 1.0
+    node.report_progress(-0.2)
+    assert node.get_progress() == 0.0
+
+
+@pytest.mark.asyncio
+async def test_progress_logged_once_per_percent():
+    node = ProgressNode()
+    node._user_logger = FakeUserLogger()
+
+    for fraction in (0.101, 0.105, 0.109):
+        node.report_progress(fraction, message="epoch")
+        await node._process_queued_logs()
+    node.report_progress(0.11)
+    await node._process_queued_logs()
+    await node._process_queued_logs()
+
+    assert node._user_logger.message_list == ["节点进度 10%：epoch", "节点进度 11%"]
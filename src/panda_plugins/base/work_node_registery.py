@@ -1,7 +1,10 @@
-from typing import Callable, Literal, Optional, Type, Dict
+import traceback
+from typing import Any, Callable, Literal, Optional, Type, Dict
 from panda_plugins.base.base_work_node import BaseWorkNode
 
 ALL_WORK_NODES: Dict[str, Type[BaseWorkNode]] = {}
+# 延迟加载、尚未导入的节点：类名 -> 节点清单中的信息（work_node_info 的结果及所在模块、文件）
+LAZY_WORK_NODES: Dict[str, Dict[str, Any]] = {}
 
 def work_node(
     name: Optional[str],
@@ -11,6 +14,10 @@ def work_node(
     box_color: Optional[
         Literal["red", "brown", "green", "blue", "cyan", "purple", "yellow", "black"]
     ] = "black",
+    cacheable: bool = False,
+    market_data: bool = False,
+    version: str = "1",
+    resource: Literal["light", "cpu", "memory"] = "light",
 ) -> Callable[[Type[BaseWorkNode]], Type[BaseWorkNode]]:
     """
     Decorator for registering work nodes.
@@ -20,6 +27,16 @@ def work_node(
     - group: The group of the work node, support multi-level directory structure separated by "/".
     - [Deprecated] order: The order of the work node.
     - type: The type of the work node.
+    - cacheable: Whether the output can be reused when the node code, static inputs and upstream outputs
+      are unchanged. Off by default; only enable it for deterministic nodes without side effects
+      (no backtests, model files or random initialization).
+    - market_data: Whether the node reads the market / factor database. The cache key of such nodes
+      also includes the latest trade date of the market data, so new data invalidates cached outputs.
+    - version: Bump it to invalidate cached outputs when behavior changes without a code change.
+    - resource: Resource class used to schedule the node. "light" nodes run on a thread of the server
+      process; "cpu" nodes run on a worker process pool sized to the CPU cores; "memory" nodes
+      (e.g. model training) run on a smaller worker process pool. Inputs and outputs of "cpu" / "memory"
+      nodes are pickled across processes.
 
     用于注册工作节点的装饰器。
     使用 @work_node() 来注册工作节点。
@@ -28,6 +45,12 @@ def work_node(
     - group: 工作节点的分组,支持以"/"形式分割多层目录结构。
     - [Deprecated] order: 工作节点的顺序。
     - type: 工作节点的类型。
+    - cacheable: 节点代码、静态输入和上游输出均未变化时，是否复用历史输出。默认关闭，仅结果确定且无副作用
+      （不执行回测、不写模型文件、无随机初始化）的节点可以开启。
+    - market_data: 节点是否读取行情、因子数据库。此类节点的缓存键包含行情数据的最新交易日，行情更新后缓存失效。
+    - version: 节点行为变化但代码未变时，提升版本号使已缓存的输出失效。
+    - resource: 节点的资源类型。light 在服务进程的线程中执行；cpu 在进程数等于 CPU 核数的工作进程池中执行；
+      memory（如模型训练）在进程数较少的工作进程池中执行。cpu / memory 节点的输入输出需要跨进程 pickle。
     """
 
     def decorator(cls: Type[BaseWorkNode]) -> Type[BaseWorkNode]:
@@ -47,8 +70,42 @@ def work_node(
         setattr(cls, "__work_node_order__", order)
         setattr(cls, "__work_node_type__", type)
         setattr(cls, "__work_node_box_color__", box_color)
+        setattr(cls, "__work_node_cacheable__", cacheable)
+        setattr(cls, "__work_node_market_data__", market_data)
+        setattr(cls, "__work_node_version__", version)
+        setattr(cls, "__work_node_resource__", resource)
 
         ALL_WORK_NODES[cls.__name__] = cls
         return cls
 
     return decorator
+
+
+def work_node_info(node_class: Type[BaseWorkNode]) -> Dict[str, Any]:
+    """
+    Metadata and input / output JSON schema of a work node.
+    A schema that fails to generate is None, with the error in input_schema_error / output_schema_error.
+
+    工作节点的元数据与输入输出 JSON Schema。
+    生成失败的 Schema 为 None，错误信息记录在 input_schema_error / output_schema_error。
+    """
+    node_info = {
+        "name": getattr(node_class, "__work_node_name__"),
+        "display_name": getattr(node_class, "__work_node_display_name__"),
+        "group": getattr(node_class, "__work_node_group__"),
+        "type": getattr(node_class, "__work_node_type__"),
+        "short_description": getattr(node_class, "__short_description__"),
+        "long_description": getattr(node_class, "__long_description__"),
+        "box_color": getattr(node_class, "__work_node_box_color__"),
+        "resource": getattr(node_class, "__work_node_resource__"),
+    }
+    for key, model_getter in (("input_schema", node_class.input_model), ("output_schema", node_class.output_model)):
+        node_info[key] = None
+        node_info[f"{key}_error"] = None
+        try:
+            model = model_getter()
+            if model:
+                node_info[key] = model.model_json_schema()
+        except Exception as e:
+            node_info[f"{key}_error"] = f"{e}\n{traceback.format_exc()}"
+    return node_info
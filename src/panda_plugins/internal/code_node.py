@@ -23,7 +23,7 @@ class CodeInputModel(BaseModel):
 class CodeOutputModel(BaseModel):
     code: str= Field(default="",title="策略代码",)
 
-@work_node(name="Python代码输入", group="01-基础工具", type="code",box_color="green")
+@work_node(name="Python代码输入", group="01-基础工具", type="code",box_color="green", cacheable=False)
 class CodeControl(BaseWorkNode):
     @classmethod
     def input_model(cls) -> Optional[Type[BaseModel]]:
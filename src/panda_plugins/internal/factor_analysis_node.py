@@ -55,7 +55,7 @@ class FactorAnalysisOutputModel(BaseModel):
     """
     task_id: str = Field(default="error", title="分析结果")
 
-@work_node(name="因子分析", group="04-因子相关", type="general", box_color="blue")
+@work_node(name="因子分析", group="04-因子相关", type="general", box_color="blue", resource="cpu")
 class FactorAnalysisControl(BaseWorkNode):
     """
     Implement a example node, which can add two numbers and return the result.
@@ -24,7 +24,8 @@ class FactorBuildOutputModel(BaseModel):
     class Config:
         arbitrary_types_allowed = True
 
-@work_node(name="因子构建节点", group="04-因子相关", type="general", box_color="blue")
+@work_node(name="因子构建节点", group="04-因子相关", type="general", box_color="blue", resource="cpu",
+           cacheable=True, market_data=True)
 class FactorBuildControl(BaseWorkNode):
     @classmethod
     def input_model(cls) -> Optional[Type[BaseModel]]:
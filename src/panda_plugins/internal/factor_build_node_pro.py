@@ -31,7 +31,8 @@ class FactorBuildProOutputModel(BaseModel):
     class Config:
         arbitrary_types_allowed = True
 
-@work_node(name="综合因子构建节点", group="04-因子相关", type="general", box_color="blue")
+@work_node(name="综合因子构建节点", group="04-因子相关", type="general", box_color="blue", resource="cpu",
+           cacheable=True, market_data=True)
 class FactorBuildProControl(BaseWorkNode):
     def __init__(self):
         super().__init__()
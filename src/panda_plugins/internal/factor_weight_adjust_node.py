@@ -59,7 +59,7 @@ class FactorWeightAdjustOutputModel(BaseModel):
             raise ValueError('df_factor must be a pandas DataFrame')
         return v
 
-@work_node(name="因子权重调整（归一化）", group="04-因子相关", type="general", box_color="blue")
+@work_node(name="因子权重调整（归一化）", group="04-因子相关", type="general", box_color="blue", cacheable=True)
 class FactorWeightAdjustControl(BaseWorkNode):
     """
     因子权重调整节点
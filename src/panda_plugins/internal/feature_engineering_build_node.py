@@ -28,7 +28,7 @@ class FeatureOutputBuildModel(BaseModel):
     class Config:
         arbitrary_types_allowed = True
 
-@work_node(name="特征工程构建", group="02-特征工程", type="general", box_color="brown")
+@work_node(name="特征工程构建", group="02-特征工程", type="general", box_color="brown", resource="cpu")
 class FeatureEngineeringBuildNode(BaseWorkNode):
 
     @classmethod
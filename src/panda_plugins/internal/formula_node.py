@@ -24,7 +24,7 @@ class FormulaInputModel(BaseModel):
 class FormulaOutputModel(BaseModel):
     formulas: str= Field(default="",title="公式",)
 
-@work_node(name="公式输入", group="02-特征工程", type="general",box_color="green")
+@work_node(name="公式输入", group="02-特征工程", type="general",box_color="green", cacheable=True)
 class FormulaControl(BaseWorkNode):
     @classmethod
     def input_model(cls) -> Optional[Type[BaseModel]]:
@@ -58,7 +58,7 @@ class LightGBMOutput(BaseModel):
     class Config:
         arbitrary_types_allowed = True
 
-@work_node(name="LightGBM模型", group="03-机器学习", type="general", box_color="red")
+@work_node(name="LightGBM模型", group="03-机器学习", type="general", box_color="red", resource="memory")
 class LightGBMControl(BaseWorkNode):
 
     @classmethod
@@ -49,7 +49,7 @@ class MLFactorBuildOutputModel(BaseModel):
             raise ValueError('factor must be a pandas DataFrame')
         return v
 
-@work_node(name="因子构建(机器学习)", group="04-因子相关", type="general", box_color="blue")
+@work_node(name="因子构建(机器学习)", group="04-因子相关", type="general", box_color="blue", resource="memory")
 class MLFactorBuildControl(BaseWorkNode):
     @classmethod
     def input_model(cls) -> Optional[Type[BaseModel]]:
@@ -17,6 +17,7 @@ import tensorflow as tf
 from tensorflow.keras.models import Sequential
 from tensorflow.keras.layers import GRU, Dense, Dropout
 from tensorflow.keras.optimizers import Adam
+from tensorflow.keras.callbacks import LambdaCallback
 from sklearn.preprocessing import StandardScaler
 from pydantic import BaseModel, Field
 from pathlib import Path
@@ -25,6 +26,7 @@ from panda_plugins.base.work_node_registery import work_node
 from panda_plugins.base import ui
 from panda_factor.generate.macro_factor import MacroFactor
 from panda_plugins.internal.models.common_models import MLModel, MLOutputModel, FeatureModel
+from panda_plugins.utils.sequence_dataset import SequenceDataset
 
 logger = logging.getLogger(__name__)
 
@@ -88,7 +90,9 @@ class GRUModelWrapper:
     name="GRU模型", 
     group="03-机器学习", 
     type="general", 
-    box_color="blue"
+    box_color="blue",
+    cacheable=False,  # 网络权重随机初始化，训练结果不确定
+    resource="memory",
 )
 class GRUControl(BaseWorkNode):
     """Node for GRU model training and prediction"""
@@ -141,21 +145,15 @@ class GRUControl(BaseWorkNode):
         X_scaled = scaler_X.fit_transform(X)
         y_scaled = scaler_y.fit_transform(y.values.reshape(-1, 1))
 
-        # 创建时间序列数据：使用滑动窗口方法来创建 (样本数, 时间步长, 特征数)
-        def create_gru_data(X, y, time_step):
-            X_lstm, y_lstm = [], []
-            for i in range(len(X) - time_step):
-                X_lstm.append(X[i:(i + time_step)])
-                y_lstm.append(y[i + time_step])
+        # 创建时间序列数据：按合约取滑动窗口 (样本数, 时间步长, 特征数)，窗口不跨合约，训练时按批次取出
+        dataset = SequenceDataset.from_frame(X, X_scaled, y_scaled, time_step)
+        del X_scaled, y_scaled
+        if len(dataset) == 0:
+            self.log_error(f"没有合约的数据行数超过时间步长 {time_step}，无法构造训练样本")
+            raise ValueError(f"没有合约的数据行数超过时间步长 {time_step}，无法构造训练样本")
 
-            return np.array(X_lstm), np.array(y_lstm)
-        X_scaled, y_scaled = create_gru_data(X_scaled, y_scaled, time_step)
+        self.log_info(f"[样本数, 时间步长, 特征数]: [{len(dataset)},{time_step},{dataset.feature_count}]")
 
-        self.log_info(f"[样本数, 时间步长, 特征数]: [{X_scaled.shape[0]},{time_step},{X.shape[1]}]")
-
-        # 将数据转换为3D输入 [样本数, 时间步长, 特征数]
-        X_scaled = X_scaled.reshape((X_scaled.shape[0], time_step, X.shape[1]))
-        
         # 初始化GRU模型
         model = Sequential()
         model.add(GRU(units=units))
@@ -167,7 +165,20 @@ class GRUControl(BaseWorkNode):
         model.compile(optimizer=Adam(learning_rate=learning_rate), loss='mean_squared_error')
         
         # 训练GRU模型
-        model.fit(X_scaled, y_scaled, epochs=epochs, batch_size=batch_size, verbose=1)
+        # 每个 batch 结束后检查工作流是否被终止，每个 epoch 结束后上报进度
+        node_callback = LambdaCallback(
+            on_train_batch_end=lambda batch, logs: self.check_cancelled(),
+            on_epoch_end=lambda epoch, logs: self.report_progress(
+                (epoch + 1) / epochs, message=f"epoch {epoch + 1}/{epochs}"
+            ),
+        )
+        model.fit(
+            dataset.iter_batches(batch_size),
+            steps_per_epoch=dataset.steps_per_epoch(batch_size),
+            epochs=epochs,
+            verbose=1,
+            callbacks=[node_callback],
+        )
         print("训练结束")
 
         # 设置模型保存路径
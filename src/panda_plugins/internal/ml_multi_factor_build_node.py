@@ -55,7 +55,7 @@ class MLMultiFactorBuildOutputModel(BaseModel):
             raise ValueError('factor must be a pandas DataFrame')
         return v
 
-@work_node(name="多因子构建(机器学习)", group="06-线下课专属", type="general", box_color="blue")
+@work_node(name="多因子构建(机器学习)", group="06-线下课专属", type="general", box_color="blue", resource="memory")
 class MLMultiFactorBuildControl(BaseWorkNode):
     @classmethod
     def input_model(cls) -> Optional[Type[BaseModel]]:
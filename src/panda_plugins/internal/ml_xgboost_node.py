@@ -45,7 +45,7 @@ class MLXgboostInputModel(BaseModel):
     class Config:
         arbitrary_types_allowed = True
 
-@work_node(name="Xgboost模型", group="03-机器学习", type="general", box_color="red")
+@work_node(name="Xgboost模型", group="03-机器学习", type="general", box_color="red", resource="memory")
 class MLXgboostControl(BaseWorkNode):
 
     @classmethod
@@ -52,7 +52,7 @@ class MTLFactorBuildOutputModel(BaseModel):
             raise ValueError('factor must be a pandas DataFrame')
         return v
 
-@work_node(name="因子构建(机器学习-单模型多特征)", group="06-线下课专属", type="general", box_color="blue")
+@work_node(name="因子构建(机器学习-单模型多特征)", group="06-线下课专属", type="general", box_color="blue", resource="memory")
 class MTLFactorBuildControl(BaseWorkNode):
     @classmethod
     def input_model(cls) -> Optional[Type[BaseModel]]:
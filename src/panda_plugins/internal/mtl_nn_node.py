@@ -97,7 +97,9 @@ class MTLNNInputModel(BaseModel):
     name="多任务神经网络",
     group="03-机器学习",
     type="general",
-    box_color="red"
+    box_color="red",
+    cacheable=False,  # 网络权重随机初始化，训练结果不确定
+    resource="memory",
 )
 class MTLNNControl(BaseWorkNode):
 
@@ -159,6 +161,8 @@ class MTLNNControl(BaseWorkNode):
         y_tensor = torch.FloatTensor(y_scaled)
 
         for epoch in range(input.epochs):
+            # 工作流被终止时停止训练
+            self.check_cancelled()
             model.train()
             optimizer.zero_grad()
             output = model(X_tensor)
@@ -167,6 +171,7 @@ class MTLNNControl(BaseWorkNode):
             optimizer.step()
             if epoch % 10 == 0:
                 print(f"Epoch {epoch}: Loss = {loss.item():.4f}")
+            self.report_progress((epoch + 1) / input.epochs, message=f"epoch {epoch + 1}/{input.epochs}")
 
         model_dir = Path(__file__).parent / 'models'
         model_dir.mkdir(parents=True, exist_ok=True)
@@ -68,7 +68,7 @@ class MultiFactorMergeOutputModel(BaseModel):
             raise ValueError('merged_factors must be a pandas DataFrame')
         return v
 
-@work_node(name="多因子合并(5-1)", group="04-因子相关", type="general", box_color="green")
+@work_node(name="多因子合并(5-1)", group="04-因子相关", type="general", box_color="green", cacheable=True)
 class MultiFactorMergeControl(BaseWorkNode):
     """
     多因子合并节点
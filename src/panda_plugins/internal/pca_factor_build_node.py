@@ -79,7 +79,7 @@ class PCAFactorBuildOutputModel(BaseModel):
             raise ValueError('factor must be a pandas DataFrame')
         return v
 
-@work_node(name="PCA因子构建", group="06-线下课专属", type="general", box_color="blue")
+@work_node(name="PCA因子构建", group="06-线下课专属", type="general", box_color="blue", resource="cpu")
 class PCAFactorBuildControl(BaseWorkNode):
     @classmethod
     def input_model(cls) -> Optional[Type[BaseModel]]:
@@ -49,7 +49,8 @@ class RandomForestInputModel(BaseModel):
     name="随机森林模型",
     group="03-机器学习",
     type="general",
-    box_color="red"
+    box_color="red",
+    resource="memory"
 )
 class RandomForestControl(BaseWorkNode):
     """随机森林模型训练节点"""
@@ -88,7 +88,8 @@ class SVMModelWrapper:
     name="SVM模型", 
     group="03-机器学习", 
     type="general", 
-    box_color="red"
+    box_color="red",
+    resource="memory"
 )
 class SVMControl(BaseWorkNode):
     """Node for SVM model training and prediction"""
@@ -47,7 +47,7 @@ class XgboostInputModel(BaseModel):
     reg_alpha: float = Field(default=0, title="L1正则化",description="越大越容易欠拟合")
     reg_lambda: float = Field(default=1, title="L2正则化",description="越大越容易欠拟合")
 
-@work_node(name="Xgboost模型(旧)", group="03-机器学习", type="general", box_color="red")
+@work_node(name="Xgboost模型(旧)", group="03-机器学习", type="general", box_color="red", resource="memory")
 class XgboostControl(BaseWorkNode):
 
     @classmethod
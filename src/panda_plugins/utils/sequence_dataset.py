@@ -0,0 +1,100 @@
+"""
+时序模型（LSTM、GRU 等）的滑动窗口样本
+
+按合约（MultiIndex 中的 symbol 层）分别按时间排序后取窗口，窗口不跨合约。
+特征矩阵只以 float32 保存一份，窗口是其上的跨步视图（numpy sliding_window_view），
+训练时按批次取出窗口，内存占用与特征矩阵相当，不随 time_step 成倍增长。
+"""
+import math
+from typing import Iterator, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+from numpy.lib.stride_tricks import sliding_window_view
+
+
+class SequenceDataset:
+    """
+    滑动窗口样本：第 i 个样本的特征为同一合约连续 time_step 行 X[s:s + time_step]，标签为其后一行 y[s + time_step]
+
+    Args:
+        X: 特征矩阵，(行数, 特征数)
+        y: 标签，(行数,) 或 (行数, 标签数)
+        time_step: 时间步长
+        symbols: 每行所属合约，为 None 时视为同一个合约
+        dates: 每行日期，同一合约内按日期排序；为 None 时保持原有顺序
+    """
+
+    def __init__(self, X: np.ndarray, y: np.ndarray, time_step: int,
+                 symbols: Optional[np.ndarray] = None, dates: Optional[np.ndarray] = None):
+        if time_step < 1:
+            raise ValueError("时间步长必须大于 0")
+        n_rows = len(X)
+        if symbols is None:
+            symbols = np.zeros(n_rows, dtype=np.int8)
+        if dates is None:
+            dates = np.arange(n_rows)
+        # 按 (合约, 日期) 排序，排序结果只复制一次并转为 float32
+        order = np.lexsort((np.asarray(dates), np.asarray(symbols)))
+        self.X = np.ascontiguousarray(np.asarray(X)[order], dtype=np.float32)
+        y = np.asarray(y)
+        self.y = np.ascontiguousarray((y.reshape(-1, 1) if y.ndim == 1 else y)[order], dtype=np.float32)
+        self.time_step = time_step
+
+        # 每行所在合约的起始行，标签行之前至少有 time_step 行属于同一合约时构成一个样本
+        sorted_symbols = np.asarray(symbols)[order]
+        row_index = np.arange(n_rows)
+        is_group_start = np.ones(n_rows, dtype=bool)
+        is_group_start[1:] = sorted_symbols[1:] != sorted_symbols[:-1]
+        group_start = np.maximum.accumulate(np.where(is_group_start, row_index, 0)) if n_rows else row_index
+        target_rows = row_index[row_index - group_start >= time_step]
+        self.starts = target_rows - time_step
+        self.targets = target_rows
+
+        # (行数 - time_step + 1, time_step, 特征数) 的视图，不复制数据
+        if n_rows >= time_step:
+            self.windows = sliding_window_view(self.X, time_step, axis=0).transpose(0, 2, 1)
+        else:
+            self.windows = np.empty((0, time_step, self.X.shape[1]), dtype=np.float32)
+
+    @classmethod
+    def from_frame(cls, df: pd.DataFrame, X: np.ndarray, y: np.ndarray, time_step: int) -> "SequenceDataset":
+        """
+        按 df 的索引确定合约与日期：MultiIndex 含 symbol 层时按合约分组，含 date 层时按日期排序
+        """
+        symbols = dates = None
+        if isinstance(df.index, pd.MultiIndex):
+            names = list(df.index.names)
+            if "symbol" in names:
+                symbols = df.index.get_level_values("symbol").to_numpy()
+            if "date" in names:
+                dates = df.index.get_level_values("date").to_numpy()
+        return cls(X, y, time_step, symbols=symbols, dates=dates)
+
+    def __len__(self) -> int:
+        return len(self.starts)
+
+    @property
+    def feature_count(self) -> int:
+        return self.X.shape[1]
+
+    def get_batch(self, sample_index: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """取出一批样本，返回 (特征 (样本数, time_step, 特征数), 标签 (样本数, 标签数))"""
+        return self.windows[self.starts[sample_index]], self.y[self.targets[sample_index]]
+
+    def steps_per_epoch(self, batch_size: int) -> int:
+        return math.ceil(len(self) / batch_size)
+
+    def iter_batches(self, batch_size: int, shuffle: bool = True, seed: Optional[int] = None,
+                     repeat: bool = True) -> Iterator[Tuple[np.ndarray, np.ndarray]]:
+        """
+        按批次生成样本，每轮重新打乱顺序；repeat 为 True 时无限循环，
+        配合 model.fit(dataset.iter_batches(batch_size), steps_per_epoch=dataset.steps_per_epoch(batch_size))
+        """
+        rng = np.random.default_rng(seed)
+        while True:
+            sample_order = rng.permutation(len(self)) if shuffle else np.arange(len(self))
+            for start in range(0, len(self), batch_size):
+                yield self.get_batch(sample_order[start:start + batch_size])
+            if not repeat:
+                return
@@ -0,0 +1,43 @@
+import numpy as np
+import pandas as pd
+
+from panda_plugins.utils.sequence_dataset import SequenceDataset
+
+
+def make_factor(dates, symbols):
+    index = pd.MultiIndex.from_product([dates, symbols], names=["date", "symbol"])
+    return pd.DataFrame({
+        "close": np.arange(len(index), dtype=np.float64),
+        "label": np.arange(len(index), dtype=np.float64) + 1000,
+    }, index=index)
+
+
+def test_windows_do_not_cross_symbols():
+    factor = make_factor(["20240101", "20240102", "20240103", "20240104"], ["000001.SZ", "000002.SZ"])
+    dataset = SequenceDataset.from_frame(
+        factor, factor[["close"]].to_numpy(), factor["label"].to_numpy(), time_step=2
+    )
+
+    # 每个合约 4 行，时间步长 2，各得 2 个样本
+    assert len(dataset) == 4
+    X_batch, y_batch = dataset.get_batch(np.arange(len(dataset)))
+    assert X_batch.dtype == np.float32 and X_batch.shape == (4, 2, 1)
+    # 000001.SZ 的 close 为 0, 2, 4, 6；000002.SZ 为 1, 3, 5, 7
+    np.testing.assert_array_equal(X_batch[:, :, 0], [[0, 2], [2, 4], [1, 3], [3, 5]])
+    np.testing.assert_array_equal(y_batch[:, 0], [1004, 1006, 1005, 1007])
+    # 窗口是特征矩阵上的视图
+    assert np.shares_memory(dataset.windows, dataset.X)
+
+
+def test_iter_batches_covers_every_sample_each_epoch():
+    factor = make_factor([f"202401{day:02d}" for day in range(1, 11)], ["000001.SZ", "000002.SZ", "000003.SZ"])
+    dataset = SequenceDataset.from_frame(
+        factor, factor[["close"]].to_numpy(), factor["label"].to_numpy(), time_step=3
+    )
+    batch_size = 4
+    steps = dataset.steps_per_epoch(batch_size)
+    batches = dataset.iter_batches(batch_size, seed=0)
+
+    for _ in range(2):
+        labels = np.concatenate([next(batches)[1][:, 0] for _ in range(steps)])
+        np.testing.assert_array_equal(np.sort(labels), np.sort(dataset.y[dataset.targets, 0]))
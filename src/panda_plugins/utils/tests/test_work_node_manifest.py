@@ -0,0 +1,71 @@
+import sys
+
+from panda_plugins.base.work_node_registery import ALL_WORK_NODES, LAZY_WORK_NODES
+from panda_plugins.utils import work_node_loader
+from panda_plugins.utils.work_node_manifest import load_manifest
+
+NODE_CODE = '''
+from typing import Optional, Type
+from pydantic import BaseModel
+import lazy_heavy_dependency
+from panda_plugins.base import BaseWorkNode, work_node
+
+
+class LazyInput(BaseModel):
+    window: int = 5
+
+
+@work_node(name="延迟加载节点", group="测试", resource="memory")
+class LazyManifestNode(BaseWorkNode):
+    @classmethod
+    def input_model(cls) -> Optional[Type[BaseModel]]:
+        return LazyInput
+
+    @classmethod
+    def output_model(cls) -> Optional[Type[BaseModel]]:
+        return None
+
+    def run(self, input):
+        return None
+'''
+
+
+def test_lazy_load_from_manifest(tmp_path, monkeypatch):
+    node_folder = tmp_path / "nodes"
+    node_folder.mkdir()
+    (node_folder / "lazy_manifest_node.py").write_text(NODE_CODE, encoding="utf-8")
+    # 模拟模块级导入的重量级依赖
+    dependency_folder = tmp_path / "deps"
+    dependency_folder.mkdir()
+    (dependency_folder / "lazy_heavy_dependency.py").write_text("", encoding="utf-8")
+    monkeypatch.syspath_prepend(str(dependency_folder))
+    manifest_path = str(tmp_path / "manifest.json")
+
+    try:
+        # 首次在子进程中重建清单，之后直接读取；均不在当前进程导入节点模块
+        manifest = load_manifest([str(node_folder)], manifest_path)
+        assert load_manifest([str(node_folder)], manifest_path) == manifest
+        node_info = manifest["nodes"]["LazyManifestNode"]
+        assert node_info["display_name"] == "延迟加载节点" and node_info["resource"] == "memory"
+        assert node_info["input_schema"]["properties"]["window"]["default"] == 5
+        assert "lazy_heavy_dependency" not in sys.modules
+
+        LAZY_WORK_NODES.update(manifest["nodes"])
+        assert work_node_loader.get_all_work_node_infos()["LazyManifestNode"]["group"] == "测试"
+        assert "LazyManifestNode" not in ALL_WORK_NODES
+
+        # 首次使用时导入
+        node_class = work_node_loader.get_work_node_class("LazyManifestNode")
+        assert node_class.__work_node_resource__ == "memory"
+        assert "lazy_heavy_dependency" in sys.modules
+
+        # 节点文件修改后清单过期，重建
+        (node_folder / "lazy_manifest_node.py").write_text(
+            NODE_CODE.replace("window: int = 5", "window: int = 10"), encoding="utf-8"
+        )
+        manifest = load_manifest([str(node_folder)], manifest_path)
+        assert manifest["nodes"]["LazyManifestNode"]["input_schema"]["properties"]["window"]["default"] == 10
+    finally:
+        LAZY_WORK_NODES.pop("LazyManifestNode", None)
+        ALL_WORK_NODES.pop("LazyManifestNode", None)
+        sys.modules.pop("lazy_heavy_dependency", None)
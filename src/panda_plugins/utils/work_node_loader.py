@@ -2,7 +2,12 @@ import os
 import importlib.util
 import sys
 import pathlib
+import threading
+import time
+from typing import Dict, List, Optional, Tuple, Type
 from common.logging.system_logger import logging, setup_logging
+from panda_plugins.base.base_work_node import BaseWorkNode
+from panda_plugins.base.work_node_registery import ALL_WORK_NODES, LAZY_WORK_NODES, work_node_info
 
 logger = logging.getLogger(__name__)
 
@@ -10,29 +15,122 @@ logger = logging.getLogger(__name__)
 INTERNAL_REL = "internal"
 CUSTOM_REL = "custom"
 
-def load_all_nodes():
+# 节点类名 -> (模块名, 文件路径)
+NODE_SOURCES: Dict[str, Tuple[str, str]] = {}
+# 延迟导入时避免同一文件被并发导入
+_import_lock = threading.Lock()
+
+
+def get_node_folders() -> List[str]:
     """
-    Load all work nodes from both internal and custom folders.
-    
-    从内部和自定义文件夹加载所有工作节点。
+    内部与自定义节点目录，不存在时创建
     """
     current_file = pathlib.Path(__file__).resolve()
     plugins_root = current_file.parent.parent
+    folders = []
+    for rel in (INTERNAL_REL, CUSTOM_REL):
+        folder = os.path.join(plugins_root, rel)
+        if not os.path.exists(folder):
+            os.makedirs(folder, exist_ok=True)
+        else:
+            folders.append(folder)
+    return folders
+
+
+def get_rss_mb() -> float:
+    """当前进程的常驻内存（MB），无法读取时返回峰值"""
+    try:
+        with open("/proc/self/status", encoding="utf-8") as f:
+            for line in f:
+                if line.startswith("VmRSS:"):
+                    return int(line.split()[1]) / 1024
+    except OSError:
+        pass
+    import resource
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+def load_all_nodes(lazy: bool = False, manifest_path: str = "data/work_node_manifest.json"):
+    """
+    Load all work nodes from both internal and custom folders.
+    When lazy is True, only node metadata is read from the manifest (rebuilt in a child process
+    when node files change); a node module is imported the first time the node is executed.
     
-    internal_folder = os.path.join(plugins_root, INTERNAL_REL)
-    custom_folder = os.path.join(plugins_root, CUSTOM_REL)
-    
-    if not os.path.exists(internal_folder):
-        os.makedirs(internal_folder, exist_ok=True)
-    else:
-        load_all_nodes_from_folder(internal_folder)
-    if not os.path.exists(custom_folder):
-        os.makedirs(custom_folder, exist_ok=True)
-    else:
-        load_all_nodes_from_folder(custom_folder)
-    
+    从内部和自定义文件夹加载所有工作节点。
+    lazy 为 True 时只从节点清单读取节点元数据（节点文件变化时在子进程中重建清单），
+    节点模块在节点首次执行时导入。
+    """
+    start_time = time.perf_counter()
+    folders = get_node_folders()
+    if lazy:
+        # 延迟导入避免循环依赖
+        from panda_plugins.utils.work_node_manifest import load_manifest
+
+        for folder in folders:
+            add_folder_to_path(folder)
+        try:
+            manifest = load_manifest(folders, manifest_path)
+            LAZY_WORK_NODES.update(manifest["nodes"])
+        except Exception as e:
+            logger.error(f"Failed to load work node manifest, loading all nodes instead: {e}")
+            lazy = False
+    if not lazy:
+        for folder in folders:
+            load_all_nodes_from_folder(folder)
+
     # 防止插件加载时，日志配置被覆盖
     setup_logging()
+    logger.info(
+        f"Work nodes loaded ({'lazy' if lazy else 'eager'}): "
+        f"{len(set(ALL_WORK_NODES) | set(LAZY_WORK_NODES))} nodes, imported {len(ALL_WORK_NODES)}, "
+        f"{time.perf_counter() - start_time:.2f}s, RSS {get_rss_mb():.1f} MB"
+    )
+
+
+def add_folder_to_path(folder_path: str):
+    """
+    Add the folder and its subfolders to sys.path.
+
+    将目录及其所有子目录加入 sys.path。
+    """
+    for root, _, _ in os.walk(folder_path):
+        if root not in sys.path:
+            sys.path.append(root)
+
+
+def iter_node_files(folder_path: str) -> List[Tuple[str, str]]:
+    """
+    List (module name, file path) of all work node files in the folder and its subfolders.
+
+    列出目录及其所有子目录中的工作节点文件 (模块名, 文件路径)。
+    """
+    node_files = []
+    for root, _, files in os.walk(folder_path):
+        for fname in sorted(files):
+            if fname.endswith(".py") and not fname.startswith("__"):
+                fpath = os.path.join(root, fname)
+                rel_path = os.path.relpath(fpath, folder_path)
+                node_files.append((os.path.splitext(rel_path)[0].replace(os.path.sep, '.'), fpath))
+    return node_files
+
+
+def exec_node_file(modulename: str, fpath: str) -> List[str]:
+    """
+    Execute a work node file and return the class names of the work nodes it registered.
+
+    执行工作节点文件，返回其注册的工作节点类名。
+    """
+    spec = importlib.util.spec_from_file_location(modulename, fpath)
+    if not spec or not spec.loader:
+        return []
+    module = importlib.util.module_from_spec(spec)
+    registered_before = set(ALL_WORK_NODES)
+    spec.loader.exec_module(module)
+    node_names = [name for name in ALL_WORK_NODES if name not in registered_before]
+    for name in node_names:
+        NODE_SOURCES[name] = (modulename, fpath)
+    return node_names
+
 
 def load_all_nodes_from_folder(folder_path: str):
     """
@@ -40,39 +138,61 @@ def load_all_nodes_from_folder(folder_path: str):
     
     从文件目录及其所有子目录动态导入所有工作节点模块.
     """
-    sys.path.append(folder_path)
+    # Add the folder and its subfolders to sys.path
+    # 添加目录及其子目录到sys.path
+    add_folder_to_path(folder_path)
     
     loaded_count = 0
     failed_count = 0
 
-    for root, _, files in os.walk(folder_path):
-        # Add current subdirectory to sys.path
-        # 添加当前子目录到sys.path
-        if root != folder_path:
-            sys.path.append(root)
-            
-        for fname in files:
-            if fname.endswith(".py") and not fname.startswith("__"):
-                fpath = os.path.join(root, fname)
-                rel_path = os.path.relpath(fpath, folder_path)
-                modulename = os.path.splitext(rel_path)[0].replace(os.path.sep, '.')
-                
-                if modulename in sys.modules:
-                    continue
-
-                spec = importlib.util.spec_from_file_location(modulename, fpath)
-                if spec and spec.loader:
-                    module = importlib.util.module_from_spec(spec)
-                    try:
-                        spec.loader.exec_module(module)
-                        loaded_count += 1
-                        logger.debug(f"Loaded {modulename} from {folder_path}/{fname}")
-                    except Exception as e:
-                        logger.error(f"Failed to load {modulename} from {folder_path}/{fname}: {e}")
-                        failed_count += 1
+    for modulename, fpath in iter_node_files(folder_path):
+        if modulename in sys.modules:
+            continue
+        try:
+            exec_node_file(modulename, fpath)
+            loaded_count += 1
+            logger.debug(f"Loaded {modulename} from {fpath}")
+        except Exception as e:
+            logger.error(f"Failed to load {modulename} from {fpath}: {e}")
+            failed_count += 1
     
     logger.debug(f"From {folder_path}: Loaded {loaded_count} nodes, Failed {failed_count} nodes")
 
+
+def get_work_node_class(name: str) -> Optional[Type[BaseWorkNode]]:
+    """
+    Get a registered work node class, importing its module on first use when loaded lazily.
+
+    获取已注册的工作节点类；延迟加载的节点在首次使用时导入其模块。
+    """
+    node_class = ALL_WORK_NODES.get(name)
+    if node_class is not None or name not in LAZY_WORK_NODES:
+        return node_class
+    with _import_lock:
+        node_class = ALL_WORK_NODES.get(name)
+        if node_class is None:
+            node_info = LAZY_WORK_NODES[name]
+            start_time = time.perf_counter()
+            exec_node_file(node_info["module"], node_info["file"])
+            node_class = ALL_WORK_NODES.get(name)
+            logger.info(
+                f"Imported work node {name} from {node_info['file']} in "
+                f"{time.perf_counter() - start_time:.2f}s, RSS {get_rss_mb():.1f} MB"
+            )
+    return node_class
+
+
+def get_all_work_node_infos() -> Dict[str, dict]:
+    """
+    Metadata and input / output JSON schema of all work nodes, without importing lazily loaded nodes.
+
+    所有工作节点的元数据与输入输出 JSON Schema，不导入延迟加载的节点。
+    """
+    node_infos = dict(LAZY_WORK_NODES)
+    for name, node_class in ALL_WORK_NODES.items():
+        node_infos[name] = work_node_info(node_class)
+    return node_infos
+
 # TODO @cgt 调试函数
 def load_work_node_from_db(obj_id: str):
     """
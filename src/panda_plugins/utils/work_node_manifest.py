@@ -0,0 +1,124 @@
+"""
+工作节点清单
+
+清单记录每个工作节点的元数据、输入输出 JSON Schema 以及所在模块和文件，服务启动时读取清单即可
+列出全部节点，不必导入节点模块（其中不少在模块级导入 TensorFlow、PyTorch、XGBoost 等）。
+节点文件或 panda_plugins/base 下的文件有增删、修改（按修改时间与大小判断）时，
+在子进程中导入全部节点重建清单，服务进程不因此常驻这些依赖。
+
+用法（由 load_manifest 调用）：
+    python -m panda_plugins.utils.work_node_manifest <清单路径> <节点目录> [<节点目录> ...]
+"""
+import json
+import os
+import pathlib
+import subprocess
+import sys
+import time
+from typing import Any, Dict, List
+
+from common.logging.system_logger import logging
+
+logger = logging.getLogger(__name__)
+
+MANIFEST_VERSION = 1
+# 重建清单的子进程最长运行时间（秒）
+BUILD_TIMEOUT = 600
+
+BASE_FOLDER = str(pathlib.Path(__file__).resolve().parent.parent / "base")
+
+
+def get_file_stamps(folders: List[str]) -> Dict[str, List[int]]:
+    """节点文件与 panda_plugins/base 下文件的 {路径: [修改时间(ns), 大小]}"""
+    from panda_plugins.utils.work_node_loader import iter_node_files
+
+    stamps = {}
+    for folder in [BASE_FOLDER, *folders]:
+        for _, fpath in iter_node_files(folder):
+            stat = os.stat(fpath)
+            stamps[fpath] = [stat.st_mtime_ns, stat.st_size]
+    return stamps
+
+
+def build_manifest(folders: List[str]) -> Dict[str, Any]:
+    """在当前进程中导入全部节点，生成清单"""
+    from panda_plugins.base.work_node_registery import ALL_WORK_NODES, work_node_info
+    from panda_plugins.utils.work_node_loader import NODE_SOURCES, load_all_nodes_from_folder
+
+    file_stamps = get_file_stamps(folders)
+    for folder in folders:
+        load_all_nodes_from_folder(folder)
+    nodes = {}
+    for name, node_class in ALL_WORK_NODES.items():
+        if name not in NODE_SOURCES:
+            continue
+        node_info = work_node_info(node_class)
+        node_info["module"], node_info["file"] = NODE_SOURCES[name]
+        nodes[name] = node_info
+    return {
+        "version": MANIFEST_VERSION,
+        "python": sys.executable,
+        "folders": folders,
+        "files": file_stamps,
+        "nodes": nodes,
+    }
+
+
+def write_manifest(manifest: Dict[str, Any], manifest_path: str):
+    """先写临时文件再替换，避免其他进程读到写了一半的清单"""
+    manifest_dir = os.path.dirname(os.path.abspath(manifest_path))
+    os.makedirs(manifest_dir, exist_ok=True)
+    tmp_path = f"{manifest_path}.{os.getpid()}.tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump(manifest, f, ensure_ascii=False)
+    os.replace(tmp_path, manifest_path)
+
+
+def read_manifest(manifest_path: str, folders: List[str]) -> Dict[str, Any] | None:
+    """读取清单，清单不存在或已过期时返回 None"""
+    try:
+        with open(manifest_path, encoding="utf-8") as f:
+            manifest = json.load(f)
+    except (OSError, ValueError):
+        return None
+    if (
+        manifest.get("version") != MANIFEST_VERSION
+        or manifest.get("python") != sys.executable
+        or manifest.get("folders") != folders
+        or manifest.get("files") != get_file_stamps(folders)
+    ):
+        return None
+    return manifest
+
+
+def load_manifest(folders: List[str], manifest_path: str) -> Dict[str, Any]:
+    """
+    读取节点清单，过期时在子进程中重建
+    """
+    manifest = read_manifest(manifest_path, folders)
+    if manifest is not None:
+        return manifest
+
+    start_time = time.perf_counter()
+    env = dict(os.environ)
+    env["PYTHONPATH"] = os.pathsep.join(path for path in sys.path if path)
+    result = subprocess.run(
+        [sys.executable, "-m", "panda_plugins.utils.work_node_manifest", manifest_path, *folders],
+        env=env,
+        capture_output=True,
+        text=True,
+        timeout=BUILD_TIMEOUT,
+    )
+    if result.returncode != 0:
+        raise RuntimeError(f"work node manifest build failed: {result.stderr[-2000:]}")
+    with open(manifest_path, encoding="utf-8") as f:
+        manifest = json.load(f)
+    logger.info(
+        f"Work node manifest rebuilt: {len(manifest['nodes'])} nodes, "
+        f"{time.perf_counter() - start_time:.2f}s, path: {manifest_path}"
+    )
+    return manifest
+
+
+if __name__ == "__main__":
+    write_manifest(build_manifest(sys.argv[2:]), sys.argv[1])
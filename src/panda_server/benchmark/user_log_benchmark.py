@@ -0,0 +1,132 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+# @File   : user_log_benchmark.py
+# @desc   : 工作流用户日志写入对比：逐条（序列号 + insert_one） 与 按块预留序列号 + 批量写入
+#
+# 用本地内存集合模拟 MongoDB，每次调用等待 --rtt 毫秒模拟一次网络往返，
+# 统计写入吞吐（条/秒）与日志从产生到落库的端到端延迟
+#
+# 用法：
+#   python -m panda_server.benchmark.user_log_benchmark --workflows 4 --lines 2000 --rtt 0.5
+import argparse
+import asyncio
+import time
+from types import SimpleNamespace
+
+from common.logging.user_log_buffer import SequenceAllocator, UserLogBuffer
+
+
+class LocalCollection:
+    """MongoDB 集合的本地替身，只实现日志写入用到的接口，记录每条文档的落库时间"""
+
+    def __init__(self, rtt):
+        self.rtt = rtt
+        self.counter_dict = dict()
+        self.docs = list()
+        self.insert_time_list = list()
+        self.call_count = 0
+
+    async def _round_trip(self):
+        self.call_count += 1
+        await asyncio.sleep(self.rtt)
+
+    async def find_one_and_update(self, query, update, upsert=False, return_document=False):
+        await self._round_trip()
+        key = query["workflow_run_id"]
+        self.counter_dict[key] = self.counter_dict.get(key, 0) + update["$inc"]["sequence"]
+        return {"workflow_run_id": key, "sequence": self.counter_dict[key]}
+
+    async def insert_one(self, doc):
+        await self._round_trip()
+        self.docs.append(doc)
+        self.insert_time_list.append(time.perf_counter())
+        return SimpleNamespace(inserted_id=doc["_id"])
+
+    async def insert_many(self, docs, ordered=True):
+        await self._round_trip()
+        now = time.perf_counter()
+        self.docs.extend(docs)
+        self.insert_time_list.extend([now] * len(docs))
+        return SimpleNamespace(inserted_ids=[doc["_id"] for doc in docs])
+
+
+def build_record(workflow_run_id, i):
+    return {"_id": "%s-%d" % (workflow_run_id, i), "user_id": "benchmark", "workflow_run_id": workflow_run_id,
+            "level": "INFO", "message": "node progress %d" % i, "type": "workflow_run", "sequence": 0,
+            "created_at": time.perf_counter()}
+
+
+async def run_per_line(workflow_count, line_count, rtt):
+    collection = LocalCollection(rtt)
+
+    async def produce(workflow_run_id):
+        for i in range(line_count):
+            record = build_record(workflow_run_id, i)
+            result = await collection.find_one_and_update({"workflow_run_id": workflow_run_id},
+                                                          {"$inc": {"sequence": 1}}, upsert=True,
+                                                          return_document=True)
+            record["sequence"] = result["sequence"]
+            await collection.insert_one(record)
+
+    start = time.perf_counter()
+    await asyncio.gather(*[produce("run%d" % i) for i in range(workflow_count)])
+    return collection, time.perf_counter() - start
+
+
+async def run_batched(workflow_count, line_count, rtt, batch_size, flush_interval, block_size):
+    collection = LocalCollection(rtt)
+    allocator = SequenceAllocator(lambda: collection, block_size)
+    log_buffer = UserLogBuffer(lambda: collection, batch_size, flush_interval)
+
+    async def produce(workflow_run_id):
+        for i in range(line_count):
+            record = build_record(workflow_run_id, i)
+            record["sequence"] = await allocator.next_sequence(workflow_run_id)
+            await log_buffer.add(record)
+            # 让出事件循环，模拟节点在两条日志之间的计算
+            await asyncio.sleep(0)
+        await log_buffer.flush(workflow_run_id)
+
+    start = time.perf_counter()
+    await asyncio.gather(*[produce("run%d" % i) for i in range(workflow_count)])
+    return collection, time.perf_counter() - start
+
+
+def summarize(mode, collection, total_seconds):
+    latency_list = sorted(insert_time - doc["created_at"]
+                          for doc, insert_time in zip(collection.docs, collection.insert_time_list))
+    line_count = len(collection.docs)
+    return {
+        'mode': mode,
+        'lines': line_count,
+        'round_trips': collection.call_count,
+        'lines_per_second': round(line_count / total_seconds),
+        'avg_latency_ms': round(sum(latency_list) / line_count * 1000, 3),
+        'p99_latency_ms': round(latency_list[int(line_count * 0.99) - 1] * 1000, 3),
+        'total_seconds': round(total_seconds, 3),
+    }
+
+
+async def run_benchmark(workflow_count, line_count, rtt_ms, batch_size, flush_interval, block_size):
+    rtt = rtt_ms / 1000
+    collection, total = await run_per_line(workflow_count, line_count, rtt)
+    result_list = [summarize('per_line', collection, total)]
+    collection, total = await run_batched(workflow_count, line_count, rtt, batch_size, flush_interval, block_size)
+    result_list.append(summarize('batched', collection, total))
+    return result_list
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='工作流用户日志写入基准测试')
+    parser.add_argument('--workflows', type=int, default=4)
+    parser.add_argument('--lines', type=int, default=2000)
+    parser.add_argument('--rtt', type=float, default=0.5, help='模拟的单次数据库往返耗时（毫秒）')
+    parser.add_argument('--batch-size', type=int, default=200)
+    parser.add_argument('--flush-interval', type=float, default=0.5)
+    parser.add_argument('--block-size', type=int, default=100)
+    args = parser.parse_args()
+
+    for result in asyncio.run(run_benchmark(args.workflows, args.lines, args.rtt, args.batch_size,
+                                            args.flush_interval, args.block_size)):
+        print('%(mode)-10s lines=%(lines)-7d round_trips=%(round_trips)-7d lines/s=%(lines_per_second)-8d '
+              'avg_latency=%(avg_latency_ms)sms p99_latency=%(p99_latency_ms)sms total=%(total_seconds)ss' % result)
@@ -0,0 +1,64 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+# @File   : work_node_load_benchmark.py
+# @desc   : 工作节点加载对比：启动时导入全部节点模块 与 读取节点清单、首次执行时再导入
+#
+# 每种方式在独立的子进程中执行 load_all_nodes 并列出全部节点（与 /plugins 接口相同），
+# 统计耗时、常驻内存（RSS）以及已导入的重量级依赖。延迟加载分别测量清单重建（冷启动）与读取已有清单。
+#
+# 用法：
+#   python -m panda_server.benchmark.work_node_load_benchmark --manifest /tmp/work_node_manifest.json
+import argparse
+import json
+import os
+import subprocess
+import sys
+
+HEAVY_MODULES = ("tensorflow", "torch", "xgboost", "lightgbm", "sklearn")
+
+CHILD_CODE = """
+import json, sys, time
+start_time = time.perf_counter()
+from panda_plugins.utils.work_node_loader import get_all_work_node_infos, get_rss_mb, load_all_nodes
+load_all_nodes(lazy=sys.argv[1] == "lazy", manifest_path=sys.argv[2])
+node_count = len(get_all_work_node_infos())
+print(json.dumps({
+    "nodes": node_count,
+    "seconds": time.perf_counter() - start_time,
+    "rss_mb": get_rss_mb(),
+    "heavy_modules": [name for name in json.loads(sys.argv[3]) if name in sys.modules],
+}))
+"""
+
+
+def run_child(mode, manifest_path):
+    env = dict(os.environ)
+    env["PYTHONPATH"] = os.pathsep.join(path for path in sys.path if path)
+    result = subprocess.run(
+        [sys.executable, "-c", CHILD_CODE, mode, manifest_path, json.dumps(HEAVY_MODULES)],
+        env=env, capture_output=True, text=True, check=True,
+    )
+    return json.loads(result.stdout.strip().splitlines()[-1])
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--manifest", default="/tmp/work_node_manifest.json", help="节点清单路径（会被覆盖）")
+    args = parser.parse_args()
+
+    if os.path.exists(args.manifest):
+        os.remove(args.manifest)
+    results = [
+        ("eager", run_child("eager", args.manifest)),
+        ("lazy (rebuild manifest)", run_child("lazy", args.manifest)),
+        ("lazy (cached manifest)", run_child("lazy", args.manifest)),
+    ]
+    print("%-26s %8s %10s %10s  %s" % ("mode", "nodes", "seconds", "rss_mb", "heavy modules"))
+    for mode, result in results:
+        print("%-26s %8d %10.2f %10.1f  %s" % (
+            mode, result["nodes"], result["seconds"], result["rss_mb"], ",".join(result["heavy_modules"]) or "-"
+        ))
+
+
+if __name__ == "__main__":
+    main()
@@ -118,7 +118,35 @@ WORKFLOW_ROUTING_KEY = _get_env_value("WORKFLOW_ROUTING_KEY", "workflow.run")
 WORKFLOW_RUN_QUEUE = _get_env_value("WORKFLOW_RUN_QUEUE", "workflow_run")
 WORKFLOW_LOG_ROUTING_KEY = _get_env_value("WORKFLOW_LOG_ROUTING_KEY", "workflow.log")
 WORKFLOW_LOG_QUEUE = _get_env_value("WORKFLOW_LOG_QUEUE", "workflow_log")
-PANDA_SERVER_WORKFLOW_WORKERS = _get_env_value("PANDA_SERVER_WORKFLOW_WORKERS", "5")
+# CLOUD 模式同时执行的工作流数量，0 表示等于 CPU 核数
+PANDA_SERVER_WORKFLOW_WORKERS = _get_env_value("PANDA_SERVER_WORKFLOW_WORKERS", "0")
+# 工作流节点执行线程池大小（所有工作流共享，执行 light 节点）及单个工作流同时运行的节点数上限
+WORKFLOW_NODE_WORKERS = _get_env_value("WORKFLOW_NODE_WORKERS", "8")
+WORKFLOW_NODE_CONCURRENCY = _get_env_value("WORKFLOW_NODE_CONCURRENCY", "4")
+# 节点工作进程池：cpu 节点进程数（0 表示等于 CPU 核数）、memory 节点进程数、每个进程执行多少个节点后替换
+WORKFLOW_CPU_WORKERS = _get_env_value("WORKFLOW_CPU_WORKERS", "0")
+WORKFLOW_MEMORY_WORKERS = _get_env_value("WORKFLOW_MEMORY_WORKERS", "2")
+WORKFLOW_WORKER_MAX_TASKS = _get_env_value("WORKFLOW_WORKER_MAX_TASKS", "20")
+# 工作流终止：CLOUD 模式广播终止消息的 fanout 交换机，兜底检查数据库中终止状态的间隔（秒，0 表示不检查）
+WORKFLOW_CANCEL_EXCHANGE_NAME = _get_env_value("WORKFLOW_CANCEL_EXCHANGE_NAME", "workflow.cancel")
+WORKFLOW_CANCEL_POLL_INTERVAL = _get_env_value("WORKFLOW_CANCEL_POLL_INTERVAL", "2")
+# 节点执行期间写入节点日志、按节点上报的进度更新工作流进度的间隔（秒）
+WORKFLOW_LOG_STREAM_INTERVAL = _get_env_value("WORKFLOW_LOG_STREAM_INTERVAL", "1")
+# 工作流节点输出缓存：开关、过期天数、缓存总大小上限（MB）
+NODE_OUTPUT_CACHE_ENABLED = _get_env_value("NODE_OUTPUT_CACHE_ENABLED", "true")
+NODE_OUTPUT_CACHE_TTL_DAYS = _get_env_value("NODE_OUTPUT_CACHE_TTL_DAYS", "7")
+NODE_OUTPUT_CACHE_MAX_MB = _get_env_value("NODE_OUTPUT_CACHE_MAX_MB", "2048")
+# 用户日志批量写入：单个工作流缓存条数上限、最长缓存时间（秒）、每次预留的序列号个数
+USER_LOG_BATCH_SIZE = _get_env_value("USER_LOG_BATCH_SIZE", "200")
+USER_LOG_FLUSH_INTERVAL = _get_env_value("USER_LOG_FLUSH_INTERVAL", "0.5")
+USER_LOG_SEQUENCE_BLOCK = _get_env_value("USER_LOG_SEQUENCE_BLOCK", "100")
+# 节点输出列式存储：DataFrame 行数达到该值时按 Parquet 存储，每个行组的行数
+NODE_OUTPUT_COLUMNAR_MIN_ROWS = _get_env_value("NODE_OUTPUT_COLUMNAR_MIN_ROWS", "1000")
+NODE_OUTPUT_ROW_GROUP_ROWS = _get_env_value("NODE_OUTPUT_ROW_GROUP_ROWS", "50000")
+
+# 工作节点延迟加载：启动时只读取节点清单，节点模块在首次执行时导入；节点清单路径
+WORK_NODE_LAZY_LOAD = _get_env_value("WORK_NODE_LAZY_LOAD", "true")
+WORK_NODE_MANIFEST_PATH = _get_env_value("WORK_NODE_MANIFEST_PATH", "data/work_node_manifest.json")
 
 # LLM 相关配置
 DEEPSEEK_API_KEY = _get_env_value("DEEPSEEK_API_KEY", None)
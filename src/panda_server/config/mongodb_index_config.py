@@ -51,6 +51,15 @@ WORKFLOW_COUNTERS_INDEXES = [
     }
 ]
 
+# 工作流节点输出缓存索引定义
+WORKFLOW_NODE_OUTPUT_CACHE_INDEXES = [
+    {
+        "name": "workflow_node_output_cache_by_last_used_idx",
+        "keys": [("last_used_at", 1)],
+        "options": {}
+    }
+]
+
 async def init_workflow_logs_indexes(db_instance):
     """初始化工作流日志相关的所有索引"""
     await sync_collection_indexes(
@@ -70,7 +79,17 @@ async def init_workflow_counters_indexes(db_instance):
         collection_display_name="workflow sequence counters"
     )
 
+async def init_workflow_node_output_cache_indexes(db_instance):
+    """初始化工作流节点输出缓存相关的索引"""
+    await sync_collection_indexes(
+        db_instance=db_instance,
+        collection_name="workflow_node_output_cache",
+        indexes_to_create=WORKFLOW_NODE_OUTPUT_CACHE_INDEXES,
+        collection_display_name="workflow node output cache"
+    )
+
 async def init_all_indexes(db_instance):
     """初始化所有数据库索引"""
     await init_workflow_logs_indexes(db_instance)
-    await init_workflow_counters_indexes(db_instance)
\ No newline at end of file
+    await init_workflow_counters_indexes(db_instance)
+    await init_workflow_node_output_cache_indexes(db_instance)
\ No newline at end of file
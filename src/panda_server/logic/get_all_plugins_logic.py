@@ -1,7 +1,6 @@
 from fastapi import HTTPException, status
-from panda_plugins.base.work_node_registery import ALL_WORK_NODES
+from panda_plugins.utils.work_node_loader import get_all_work_node_infos
 from panda_server.models.all_plugins_response import AllPluginsResponse, PluginInfo, PluginGroup
-import traceback
 import logging
 
 # 定义 collection 名称
@@ -13,41 +12,36 @@ logger = logging.getLogger(__name__)
 async def get_all_plugins_logic():
     all_plugins = []
 
-    for name, node_class in ALL_WORK_NODES.items():
+    # 延迟加载的节点从节点清单读取元数据与 JSON Schema，不导入节点模块
+    for name, node_info in get_all_work_node_infos().items():
         # 获取节点基本信息
         plugin_info = PluginInfo(
             object_type = "plugin",
-            name=getattr(node_class, "__work_node_name__"),
-            display_name=getattr(node_class, "__work_node_display_name__"),
-            group=getattr(node_class, "__work_node_group__"),
-            type=getattr(node_class, "__work_node_type__"),
-            short_description=getattr(node_class, "__short_description__"),
-            long_description=getattr(node_class,"__long_description__"),
-            box_color=getattr(node_class, "__work_node_box_color__"),
+            name=node_info["name"],
+            display_name=node_info["display_name"],
+            group=node_info["group"],
+            type=node_info["type"],
+            short_description=node_info["short_description"],
+            long_description=node_info["long_description"],
+            box_color=node_info["box_color"],
         )
 
         # 获取输入模型的JSON Schema
-        try:
-            input_model = node_class.input_model()
-            if input_model:
-                plugin_info.input_schema = input_model.model_json_schema()
-        except Exception as e:
-            stack_trace = traceback.format_exc()
+        if node_info["input_schema_error"]:
             logger.error(
-                f"unexpected error in get input schema of work node {name} \nerror: {e}\n{stack_trace}"
+                f"unexpected error in get input schema of work node {name} \nerror: {node_info['input_schema_error']}"
             )
             raise HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR)
+        if node_info["input_schema"]:
+            plugin_info.input_schema = node_info["input_schema"]
 
         # 获取输出模型的JSON Schema
-        try:
-            output_model = node_class.output_model()
-            if output_model:
-                plugin_info.output_schema = output_model.model_json_schema()
-        except Exception as e:
-            stack_trace = traceback.format_exc()
+        if node_info["output_schema_error"]:
             logger.error(
-                f"unexpected error in get output schema of work node {name} \nerror: {e}\n{stack_trace}"
+                f"unexpected error in get output schema of work node {name} \nerror: {node_info['output_schema_error']}"
             )
+        elif node_info["output_schema"]:
+            plugin_info.output_schema = node_info["output_schema"]
 
         all_plugins.append(plugin_info)
     
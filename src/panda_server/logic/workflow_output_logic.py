@@ -1,9 +1,11 @@
+import json
 import logging
 import math
 from typing import Any
+import pandas as pd
 from fastapi import HTTPException
 from panda_server.models.base_api_response import BaseAPIResponse
-from panda_server.utils.db_storage import get_from_gridfs, get_gridfs_metadata
+from panda_server.utils.db_storage import get_gridfs_metadata, get_gridfs_summary, get_partial_from_gridfs
 from pydantic import BaseModel
 
 # 获取 logger
@@ -16,6 +18,8 @@ async def workflow_output_get_logic(
     user_id: str,
     page: int | None = None,
     limit: int | None = None,
+    columns: str | None = None,
+    summary: bool = False,
 ) -> BaseAPIResponse:
     # 获取文件 metadata
     metadata = await get_gridfs_metadata("workflow_node_output_fs", output_obj_id)
@@ -26,37 +30,53 @@ async def workflow_output_get_logic(
     # 校验 uid 是否有权限
     if metadata.get("owner") not in [user_id, "*"]:
         raise HTTPException(status_code=403, detail="Permission denied")
-    # 获取文件内容
-    object, _ = await get_from_gridfs("workflow_node_output_fs", output_obj_id)
-    if not object:
-        raise HTTPException(status_code=500, detail="Internal server data error")
-    # 如果是 pydantic 模型对象, 转换为 dict
-    if isinstance(object, BaseModel):
-        object = object.model_dump()
-    # 根据 locator 检索对象
-    if locator:
-        try:
-            object = get_by_locator(object, locator)
-        except (KeyError, IndexError, TypeError):
-            raise HTTPException(status_code=400, detail="Invalid locator")
-        except Exception as e:
-            logger.error(f"Error getting object by locator: {e}")
+    if summary:
+        frames = await get_gridfs_summary("workflow_node_output_fs", output_obj_id)
+        if frames is None:
             raise HTTPException(status_code=500, detail="Internal server data error")
+        return BaseAPIResponse(data={"frames": frames})
+    object = await get_output_object(output_obj_id, locator, page, limit, columns)
+    return BaseAPIResponse(data=object)
+
+
+async def get_output_object(
+    output_obj_id: str,
+    locator: str,
+    page: int | None = None,
+    limit: int | None = None,
+    columns: str | None = None,
+) -> Any:
+    """
+    根据 locator 读取节点输出的一部分并分页
+    DataFrame 字段只读取 columns（逗号分隔）指定的列和当前页的行，不反序列化整个输出
+    """
+    column_list = [column for column in columns.split(",") if column] if columns else None
+    start, stop = None, None
+    if page and limit:
+        start, stop = (page - 1) * limit, page * limit
+    try:
+        object, total = await get_partial_from_gridfs(
+            "workflow_node_output_fs", output_obj_id, locator or "", column_list, start, stop
+        )
+    except (KeyError, IndexError, TypeError):
+        raise HTTPException(status_code=400, detail="Invalid locator")
+    except Exception as e:
+        logger.error(f"Error getting object by locator: {e}")
+        raise HTTPException(status_code=500, detail="Internal server data error")
     # 分页
     if page and limit:
-        # 只有 list 类型可以分页
-        if not isinstance(object, list):
+        # 只有 list 和 DataFrame 类型可以分页
+        if total is None:
             raise HTTPException(
                 status_code=400, detail="Invalid object type for pagination"
             )
         # 判断查询是否超过最大页数
-        max_page = math.ceil(len(object) / limit)
+        max_page = math.ceil(total / limit)
         if page > max_page:
             raise HTTPException(
                 status_code=400, detail=f"Page out of range, max page: {max_page}"
             )
-        object = object[(page - 1) * limit : min(page * limit, len(object))]
-        
+
         # 添加分页相关信息
         object= {
             "pagination": {
@@ -65,8 +85,20 @@ async def workflow_output_get_logic(
             },
             "data": object,
         }
+    return to_response_data(object)
 
-    return BaseAPIResponse(data=object)
+
+def to_response_data(object: Any) -> Any:
+    """DataFrame / Series 转换为可 JSON 序列化的 split 格式: {columns, index, data}"""
+    if isinstance(object, (pd.DataFrame, pd.Series)):
+        return json.loads(object.to_json(orient="split", date_format="iso"))
+    if isinstance(object, BaseModel):
+        object = object.model_dump()
+    if isinstance(object, dict):
+        return {key: to_response_data(value) for key, value in object.items()}
+    if isinstance(object, list):
+        return [to_response_data(value) for value in object]
+    return object
 
 
 def get_by_locator(object: dict, locator: str) -> Any:
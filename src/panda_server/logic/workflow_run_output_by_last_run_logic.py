@@ -1,14 +1,11 @@
 import logging
-import math
-from typing import Any
 from panda_server.enums.feature_tag import FeatureTag
 from panda_server.enums.workflow_run_status import WorkflowStatus
 from panda_server.models.workflow_model import WorkflowModel
 from fastapi import HTTPException
 from panda_server.models.base_api_response import BaseAPIResponse
 from panda_server.models.workflow_run_model import WorkflowRunModel
-from panda_server.utils.db_storage import get_from_gridfs, get_gridfs_metadata
-from pydantic import BaseModel
+from panda_server.logic.workflow_output_logic import get_output_object
 from panda_server.config.database import mongodb
 from bson import ObjectId
 
@@ -33,6 +30,7 @@ async def workflow_run_output_by_last_run_logic(
     user_id: str,
     page: int | None = None,
     limit: int | None = None,
+    columns: str | None = None,
 ) -> BaseAPIResponse:
     # 获取 workflow 信息
     workflow_collection = mongodb.get_collection("workflow")
@@ -66,45 +64,7 @@ async def workflow_run_output_by_last_run_logic(
     response_data = []
     for detail in feature_tag_detail:
         output_obj_id = workflow_run.output_data_obj.get(detail.node_id)
-        # 获取文件内容
-        object, _ = await get_from_gridfs("workflow_node_output_fs", output_obj_id)
-        if not object:
-            raise HTTPException(status_code=500, detail="Internal server data error")
-        # 如果是 pydantic 模型对象, 转换为 dict
-        if isinstance(object, BaseModel):
-            object = object.model_dump()
-        # 根据 locator 检索对象
-        if locator:
-            try:
-                object = get_by_locator(object, locator)
-            except (KeyError, IndexError, TypeError):
-                raise HTTPException(status_code=400, detail="Invalid locator")
-            except Exception as e:
-                logger.error(f"Error getting object by locator: {e}")
-                raise HTTPException(status_code=500, detail="Internal server data error")
-        # 分页
-        if page and limit:
-            # 只有 list 类型可以分页
-            if not isinstance(object, list):
-                raise HTTPException(
-                    status_code=400, detail="Invalid object type for pagination"
-                )
-            # 判断查询是否超过最大页数
-            max_page = math.ceil(len(object) / limit)
-            if page > max_page:
-                raise HTTPException(
-                    status_code=400, detail=f"Page out of range, max page: {max_page}"
-                )
-            object = object[(page - 1) * limit : min(page * limit, len(object))]
-            
-            # 添加分页相关信息
-            object= {
-                "pagination": {
-                    "max_page": max_page,
-                    "has_more": page < max_page,
-                },
-                "data": object,
-            }
+        object = await get_output_object(output_obj_id, locator, page, limit, columns)
         # 将结果添加到 response_data 中
         response_data.append({
             "node_id": detail.node_id,
@@ -113,16 +73,3 @@ async def workflow_run_output_by_last_run_logic(
         })
 
     return BaseAPIResponse(data=response_data)
-
-
-def get_by_locator(object: dict, locator: str) -> Any:
-    """
-    根据 locator 检索对象
-    locator 格式: 'a.b.0' 表示检索 a.b[0] 字段
-    """
-    keys = locator.split(".")
-    for key in keys:
-        if key.isdigit():
-            key = int(key)
-        object = object[key]
-    return object
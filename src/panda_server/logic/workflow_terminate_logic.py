@@ -7,6 +7,7 @@ from panda_server.models.base_api_response import BaseAPIResponse
 from panda_server.models.run_workflow_request import TerminateWorkflowRunRequest
 from panda_server.models.workflow_run_model import WorkflowRunModel
 from panda_server.enums.workflow_run_status import WorkflowStatus
+from panda_server.utils.workflow_cancellation import WorkflowCancellationRegistry
 
 # 获取 logger
 logger = logging.getLogger(__name__)
@@ -59,19 +60,21 @@ async def workflow_terminate_logic(
             detail="Workflow run is not running or pending",
         )
 
+    # 数据库插入终止记号（其他进程的兜底检查由此发现终止）
+    await workflow_run_collection.update_one(
+        {"_id": ObjectId(workflow_run_id)},
+        {"$set": {"status": WorkflowStatus.MANUAL_STOP}},
+    )
+    # 工作流在本进程执行时立即取消
+    cancelled = WorkflowCancellationRegistry.get_instance().cancel(
+        workflow_run_id, "工作流已被手动终止"
+    )
     # 确定运行模式
-    if RUN_MODE == "CLOUD":
-        # TODO 调用 RabitMQ 发送终止消息
-        # 数据库插入终止记号
-        await workflow_run_collection.update_one(
-            {"_id": ObjectId(workflow_run_id)},
-            {"$set": {"status": WorkflowStatus.MANUAL_STOP}},
-        )
-    elif RUN_MODE == "LOCAL":
-        # 数据库插入终止记号
-        await workflow_run_collection.update_one(
-            {"_id": ObjectId(workflow_run_id)},
-            {"$set": {"status": WorkflowStatus.MANUAL_STOP}},
-        )
+    if RUN_MODE == "CLOUD" and not cancelled:
+        # 广播终止消息，执行该工作流的消费者进程立即取消
+        try:
+            await WorkflowCancellationRegistry.get_instance().broadcast(workflow_run_id)
+        except Exception as e:
+            logger.warning(f"Failed to broadcast workflow cancel message, id: {workflow_run_id}, error: {e}")
 
     return BaseAPIResponse(data=None) 
\ No newline at end of file
@@ -0,0 +1,21 @@
+import logging
+from panda_server.messaging.workflow_consumer import WorkflowConsumer
+from panda_server.models.base_api_response import BaseAPIResponse
+from panda_server.utils.node_worker_pool import NodeWorkerPool
+
+# 获取 logger
+logger = logging.getLogger(__name__)
+
+
+async def workflow_worker_stats_logic() -> BaseAPIResponse:
+    """
+    工作流执行资源的使用情况：
+    - node_pool: 各节点执行通道的队列深度、运行数、每个工作进程（线程）的执行次数与利用率
+    - run_queue: CLOUD 模式下工作流队列的积压数量与正在执行的工作流数量，LOCAL 模式为 None
+    """
+    return BaseAPIResponse(
+        data={
+            "node_pool": NodeWorkerPool.get_instance().get_stats(),
+            "run_queue": await WorkflowConsumer.get_stats(),
+        }
+    )
@@ -12,6 +12,7 @@ from panda_server.config.env import *
 from panda_plugins.utils.work_node_loader import load_all_nodes
 from panda_server.messaging.consumer_manager import QueueConsumerManager
 from panda_server.messaging.rabbitmq_client import AsyncRabbitMQ
+from panda_server.utils.node_worker_pool import NodeWorkerPool
 from panda_server.routes import (
     base_routes,
     plugins_routes,
@@ -64,7 +65,8 @@ async def lifespan(app: FastAPI):
     await mongodb.init_local_db()
 
     logger.info("Loading work nodes...")
-    load_all_nodes()
+    # 延迟加载时只读取节点清单，节点模块在首次执行时导入
+    load_all_nodes(lazy=WORK_NODE_LAZY_LOAD.lower() == "true", manifest_path=WORK_NODE_MANIFEST_PATH)
     logger.info("Work nodes loading completed")
 
     # RabbitMQ connection logic
@@ -89,6 +91,9 @@ async def lifespan(app: FastAPI):
     yield
 
     # Shutdown logic
+    logger.info("Shutting down workflow node worker pool...")
+    NodeWorkerPool.get_instance().shutdown()
+
     logger.info("Closing SQLite database...")
     await sqlite_db.close_db()
     logger.info("SQLite database closed")
@@ -1,4 +1,5 @@
 import logging
+import os
 from panda_server.config.env import PANDA_SERVER_WORKFLOW_WORKERS
 from panda_server.messaging.rabbitmq_client import AsyncRabbitMQ
 from panda_server.messaging.workflow_consumer import WorkflowConsumer
@@ -17,13 +18,13 @@ class QueueConsumerManager:
     async def start_all_consumers(self, client: AsyncRabbitMQ):
         """启动所有消费者"""
         
-        # 启动工作流执行消费者
-        workflow_workers = int(PANDA_SERVER_WORKFLOW_WORKERS)
+        # 启动工作流执行消费者，未配置时按 CPU 核数（节点计算在工作进程池中执行，不受单个解释器限制）
+        workflow_workers = int(PANDA_SERVER_WORKFLOW_WORKERS) or os.cpu_count() or 1
         logger.info(f"Starting {workflow_workers} workflow execution consumers")
         await self.workflow_consumer.start_workers(client, workflow_workers)
         
         # 启动工作流日志消费者（使用较少的worker）
-        log_workers = max(1, int(PANDA_SERVER_WORKFLOW_WORKERS) // 2)
+        log_workers = max(1, workflow_workers // 2)
         logger.info(f"Starting {log_workers} workflow log consumers")
         await self.log_consumer.start_workers(client, log_workers)
         
@@ -4,6 +4,8 @@ from panda_server.config.env import (
     WORKFLOW_EXCHANGE_NAME,
     WORKFLOW_LOG_ROUTING_KEY,
     WORKFLOW_LOG_QUEUE,
+    USER_LOG_BATCH_SIZE,
+    USER_LOG_FLUSH_INTERVAL,
 )
 from panda_server.messaging.rabbitmq_client import AsyncRabbitMQ
 from panda_server.messaging.log_processor import WorkflowLogQueueConsumer
@@ -45,11 +47,14 @@ class LogConsumer:
                 f"workflow log worker {worker_id} started listening to queue: {WORKFLOW_LOG_QUEUE}"
             )
             logger.info(f"workflow log worker {worker_id} config: exchange={WORKFLOW_EXCHANGE_NAME}, routing_key={WORKFLOW_LOG_ROUTING_KEY}")
-            await client.consume_full_message(
+            # 批量消费：整批日志一次写入数据库后再一次确认整批消息
+            await client.consume_batch(
                 queue_name=WORKFLOW_LOG_QUEUE,
                 exchange_name=WORKFLOW_EXCHANGE_NAME,
                 routing_key=WORKFLOW_LOG_ROUTING_KEY,
-                callback=process_message_with_full_data,
+                callback=WorkflowLogQueueConsumer.process_workflow_log_batch,
+                batch_size=int(USER_LOG_BATCH_SIZE),
+                batch_timeout=float(USER_LOG_FLUSH_INTERVAL),
             )
         except Exception as e:
             logger.error(f"workflow log worker {worker_id} execution failed: {str(e)}")
@@ -1,12 +1,59 @@
 import logging
-from typing import Dict, Any
+from typing import Dict, Any, List
 from panda_server.config.database import mongodb
+from panda_server.config.env import USER_LOG_SEQUENCE_BLOCK
 from common.logging.user_log_model import UserLog
+from common.logging.user_log_buffer import SequenceAllocator, insert_log_records
 
 
 class WorkflowLogQueueConsumer:
     """工作流日志队列消费者（CLOUD模式专用）"""
     
+    # 消费端共享的序列号分配器（为 sequence 为 0 的日志按块预留序列号）
+    _sequence_allocator = None
+
+    @classmethod
+    def _get_sequence_allocator(cls) -> SequenceAllocator:
+        if cls._sequence_allocator is None:
+            cls._sequence_allocator = SequenceAllocator(
+                lambda: mongodb.db["workflow_sequence_counters"], int(USER_LOG_SEQUENCE_BLOCK)
+            )
+        return cls._sequence_allocator
+
+    @staticmethod
+    async def process_workflow_log_batch(message_list: List[Dict[str, Any]]):
+        """批量处理workflow_log队列消息，整批日志一次写入数据库"""
+        logger = logging.getLogger(__name__)
+        log_data_list = []
+        for message_data in message_list:
+            message_type = message_data.get("type")
+            if message_type == "insert_workflow_log":
+                log_data_list.append(message_data.get("content"))
+            else:
+                logger.warning(f"Unknown message type: {message_type}")
+        await WorkflowLogQueueConsumer._handle_insert_workflow_logs(log_data_list)
+
+    @staticmethod
+    async def _handle_insert_workflow_logs(log_data_list: List[Dict[str, Any]]):
+        """批量插入workflow_log，异常向上抛出，由消费端逐条重新处理"""
+        if not log_data_list:
+            return
+        if mongodb.db is None:
+            logging.getLogger(__name__).error("MongoDB not connected, cannot insert workflow_log")
+            return
+
+        allocator = WorkflowLogQueueConsumer._get_sequence_allocator()
+        records = []
+        for log_data in log_data_list:
+            user_log = UserLog(**log_data)
+            # 如果有workflow_run_id且sequence为0，自动生成序列号
+            if user_log.workflow_run_id and user_log.sequence == 0:
+                user_log.sequence = await allocator.next_sequence(user_log.workflow_run_id)
+            records.append(user_log.model_dump(by_alias=True, exclude_unset=True))
+
+        inserted = await insert_log_records(mongodb.db["workflow_logs"], records)
+        logging.getLogger(__name__).info(f"Inserted {inserted} workflow_logs in batch of {len(records)}")
+
     @staticmethod
     async def process_workflow_log_message(message_data: Dict[str, Any]):
         """处理workflow_log队列消息"""
@@ -42,15 +89,8 @@ class WorkflowLogQueueConsumer:
                 
             # 如果有workflow_run_id且sequence为0，自动生成序列号
             if user_log.workflow_run_id and user_log.sequence == 0:
-                # 获取下一个序列号
-                counter_collection = mongodb.db["workflow_sequence_counters"]
-                result = await counter_collection.find_one_and_update(
-                    {"workflow_run_id": user_log.workflow_run_id},
-                    {"$inc": {"sequence": 1}},
-                    upsert=True,
-                    return_document=True
-                )
-                user_log.sequence = result["sequence"]
+                allocator = WorkflowLogQueueConsumer._get_sequence_allocator()
+                user_log.sequence = await allocator.next_sequence(user_log.workflow_run_id)
             
             # 直接插入数据库（绕过队列）
             collection = mongodb.db["workflow_logs"]
@@ -232,6 +232,85 @@ class AsyncRabbitMQ:
             logger.error(f"Failed to consume messages: {e}")
             raise
 
+    async def consume_batch(
+            self,
+            queue_name: str,
+            callback: Callable[[list], Any],
+            exchange_name: Optional[str] = None,
+            routing_key: Optional[str] = None,
+            exchange_type: ExchangeType = ExchangeType.DIRECT,
+            durable: bool = True,
+            batch_size: int = 100,
+            batch_timeout: float = 0.2,
+    ) -> None:
+        """
+        批量消费指定队列的消息（传递完整消息对象列表）
+        累计 batch_size 条或距本批第一条消息超过 batch_timeout 秒后整批交给 callback，
+        处理成功后一次确认整批消息（multiple ack）；整批处理失败时逐条重新处理，
+        只拒绝（不重新入队）仍然失败的消息，避免一条异常消息连累整批。
+        使用独立的通道，避免批量确认影响同一连接上的其他消费者。
+
+        :param callback: 消息处理回调函数，接收完整消息字典的列表
+        :param batch_size: 每批最多消息数量（同时作为预取数量）
+        :param batch_timeout: 凑批最长等待时间(秒)
+        """
+        if not self.connection or self.connection.is_closed:
+            await self.connect()
+
+        try:
+            channel = await self.connection.channel()
+            await channel.set_qos(prefetch_count=int(batch_size))
+
+            if exchange_name:
+                exchange = await channel.declare_exchange(
+                    exchange_name, exchange_type, durable=durable
+                )
+                queue = await channel.declare_queue(queue_name, durable=durable)
+                await queue.bind(exchange, routing_key or queue_name)
+            else:
+                queue = await channel.declare_queue(queue_name, durable=durable)
+
+            message_queue: asyncio.Queue = asyncio.Queue()
+            await queue.consume(message_queue.put, no_ack=False)
+            loop = asyncio.get_running_loop()
+            while True:
+                message_list = [await message_queue.get()]
+                deadline = loop.time() + batch_timeout
+                while len(message_list) < batch_size:
+                    timeout = deadline - loop.time()
+                    if timeout <= 0:
+                        break
+                    try:
+                        message_list.append(await asyncio.wait_for(message_queue.get(), timeout))
+                    except asyncio.TimeoutError:
+                        break
+
+                decoded_list = []
+                for message in message_list:
+                    try:
+                        decoded_list.append((message, json.loads(message.body.decode())))
+                    except Exception as e:
+                        logger.error(f"Error decoding message: {e}")
+                        await message.nack(requeue=False)
+                if not decoded_list:
+                    continue
+
+                try:
+                    await callback([data for _, data in decoded_list])
+                    await decoded_list[-1][0].ack(multiple=True)
+                except Exception as e:
+                    logger.error(f"Error processing message batch, retrying one by one: {e}")
+                    for message, data in decoded_list:
+                        try:
+                            await callback([data])
+                            await message.ack()
+                        except Exception as e:
+                            logger.error(f"Error processing message: {e}")
+                            await message.nack(requeue=False)
+        except Exception as e:
+            logger.error(f"Failed to consume messages: {e}")
+            raise
+
     async def __aenter__(self):
         await self.connect()
         return self
@@ -7,21 +7,54 @@ from panda_server.config.env import (
 )
 from panda_server.messaging.rabbitmq_client import AsyncRabbitMQ
 from panda_server.utils.run_workflow_utils import mark_workflow_run_failed, run_workflow_in_background
+from panda_server.utils.workflow_cancellation import WorkflowCancellationRegistry
 
 logger = logging.getLogger(__name__)
 
 
 async def process_workflow_message(content):
     """处理workflow运行消息"""
-    await run_workflow_in_background(content)
+    WorkflowConsumer.active_runs += 1
+    try:
+        await run_workflow_in_background(content)
+    finally:
+        WorkflowConsumer.active_runs -= 1
 
 
 class WorkflowConsumer:
     """工作流执行消费者"""
+
+    # 所有 worker 共享的运行统计
+    client: AsyncRabbitMQ | None = None
+    worker_count = 0
+    active_runs = 0
     
     def __init__(self):
         pass
 
+    @classmethod
+    async def get_stats(cls) -> dict | None:
+        """
+        工作流队列的积压数量与正在执行的工作流数量，未启动消费者（LOCAL 模式）时返回 None
+        """
+        if cls.client is None:
+            return None
+        queue_depth = None
+        try:
+            channel = await cls.client.connection.channel()
+            try:
+                queue = await channel.declare_queue(WORKFLOW_RUN_QUEUE, passive=True)
+                queue_depth = queue.declaration_result.message_count
+            finally:
+                await channel.close()
+        except Exception as e:
+            logger.warning(f"Failed to get workflow queue depth: {e}")
+        return {
+            "workers": cls.worker_count,
+            "active_runs": cls.active_runs,
+            "queue_depth": queue_depth,
+        }
+
     async def single_worker(self, worker_id: int, client: AsyncRabbitMQ):
         """单个工作流执行worker"""
         try:
@@ -43,5 +76,9 @@ class WorkflowConsumer:
     async def start_workers(self, client: AsyncRabbitMQ, worker_count: int):
         """启动多个工作流执行worker"""
         logger.info(f"Creating {worker_count} workflow execution workers")
+        WorkflowConsumer.client = client
+        WorkflowConsumer.worker_count = worker_count
+        # 接收终止广播，取消本进程中执行的工作流
+        WorkflowCancellationRegistry.get_instance().start_listener(client)
         for i in range(worker_count):
             asyncio.create_task(self.single_worker(i, client)) 
\ No newline at end of file
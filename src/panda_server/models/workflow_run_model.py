@@ -1,7 +1,7 @@
 from pydantic import BaseModel, Field
 import logging
 
-from typing import List, Dict, Annotated, Optional
+from typing import Any, List, Dict, Annotated, Optional
 from bson import ObjectId
 
 from panda_server.enums.workflow_run_status import WorkflowStatus
@@ -69,6 +69,10 @@ class WorkflowRunBaseModel(BaseModel):
     output_data_obj: Dict[str, str] = Field(
         description="Node output data: key: uuid of the node, value: output_db_id"
     )
+    link_stats: Optional[Dict[str, Any]] = Field(
+        default=None,
+        description="Inter-node data handoff statistics: link count, per-link overhead, process peak memory and its increase during the run"
+    )
 
     class Config:
         json_encoders = {ObjectId: str}
@@ -92,3 +96,4 @@ class WorkflowRunUpdateModel(WorkflowRunBaseModel):
     failed_node_ids: Optional[List[str]] = None
     passed_link_ids: Optional[List[str]] = None
     output_data_obj: Optional[Dict[str, str]] = None
+    link_stats: Optional[Dict[str, Any]] = None
@@ -19,6 +19,7 @@ from panda_server.logic.workflow_run_get_logic import workflow_run_get_logic
 from panda_server.logic.workflow_logs_get_logic import workflow_logs_get_logic
 from panda_server.logic.workflow_terminate_logic import workflow_terminate_logic
 from panda_server.logic.workflow_output_logic import workflow_output_get_logic
+from panda_server.logic.workflow_worker_stats_logic import workflow_worker_stats_logic
 from panda_server.logic.workflow_run_output_by_last_run_logic import (
     WorkflowNoLastRunException,
     WorkflowRunFailedException,
@@ -252,6 +253,17 @@ async def terminate_workflow_run(
     return await workflow_terminate_logic(request, user_id)
 
 
+@router.get("/run/workers", status_code=status.HTTP_200_OK)
+async def get_workflow_worker_stats() -> BaseAPIResponse:
+    """
+    查询节点执行池与工作流队列的使用情况
+
+    Returns:
+        BaseAPIResponse: 各执行通道的队列深度、工作进程利用率，以及 CLOUD 模式下的工作流队列积压
+    """
+    return await workflow_worker_stats_logic()
+
+
 @router.get("/run/output", status_code=status.HTTP_200_OK)
 async def get_workflow_run_output(
     user_id: str = Header(..., alias="uid", description="用户ID"),
@@ -268,15 +280,23 @@ async def get_workflow_run_output(
         ge=1,
         le=100,
     ),
+    columns: str | None = Query(
+        default=None, description="检索结果为 DataFrame 时只返回这些列, 逗号分隔, 可选"
+    ),
+    summary: bool = Query(
+        default=False, description="只返回输出中各 DataFrame 的行数、列名与类型"
+    ),
 ) -> BaseAPIResponse:
     """
     根据 output_obj_id 获取输出对象
+    DataFrame 可以按 page / limit 分页, 只读取当前页的行
     Returns:
         BaseAPIResponse: 包含输出对象数据的响应
     """
     try:
         return await workflow_output_get_logic(
-            output_obj_id, locator, user_id=user_id, page=page, limit=limit
+            output_obj_id, locator, user_id=user_id, page=page, limit=limit,
+            columns=columns, summary=summary,
         )
     except HTTPException:
         raise
@@ -312,6 +332,9 @@ async def get_workflow_run_output_by_last_run(
         ge=1,
         le=100,
     ),
+    columns: str | None = Query(
+        default=None, description="检索结果为 DataFrame 时只返回这些列, 逗号分隔, 可选"
+    ),
 ) -> BaseAPIResponse:
     """
     根据 workflow_id 获取最后一次运行的结果
@@ -319,7 +342,8 @@ async def get_workflow_run_output_by_last_run(
     """
     try:
         return await workflow_run_output_by_last_run_logic(
-            workflow_id, feature_tag, locator, user_id=user_id, page=page, limit=limit
+            workflow_id, feature_tag, locator, user_id=user_id, page=page, limit=limit,
+            columns=columns,
         )
     except (WorkflowRunningException, WorkflowRunFailedException, WorkflowNoLastRunException) as e:
         return BaseAPIResponse(code=e.code, message=e.message, data=None)
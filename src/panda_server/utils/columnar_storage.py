@@ -0,0 +1,343 @@
+"""
+节点输出的列式存储格式
+
+节点输出中的 DataFrame 字段按 Parquet（zstd 压缩，按行组切块）存储，其余部分作为骨架用 cloudpickle 序列化，
+骨架中 DataFrame 的位置用 FrameRef 占位。所有数据段依次拼接成一个文件，各段的偏移、长度、行列信息记录在清单中，
+清单保存在 GridFS 文件的 metadata 里。
+读取时可以只读骨架、只读某个 DataFrame 的部分列和部分行组，或者只看清单中的摘要，不必反序列化整个输出。
+未安装 pyarrow 或输出中没有可列式存储的 DataFrame 时，仍整体使用 cloudpickle。
+"""
+import io
+import logging
+from typing import Any, Dict, List, Optional, Tuple
+
+import cloudpickle
+import pandas as pd
+
+logger = logging.getLogger(__name__)
+
+STORAGE_FORMAT = "columnar"
+STORAGE_VERSION = 1
+COMPRESSION = "zstd"
+
+
+class FrameRef:
+    """骨架中 DataFrame 的占位"""
+
+    def __init__(self, locator: str):
+        self.locator = locator
+
+    def __repr__(self):
+        return f"FrameRef({self.locator!r})"
+
+
+def _import_pyarrow():
+    try:
+        import pyarrow
+        import pyarrow.parquet
+    except ImportError:
+        return None
+    return pyarrow
+
+
+def is_columnar(metadata: Optional[dict]) -> bool:
+    storage = (metadata or {}).get("storage")
+    return isinstance(storage, dict) and storage.get("format") == STORAGE_FORMAT
+
+
+def split_locator(locator: str) -> List[str]:
+    return locator.split(".") if locator else []
+
+
+def get_by_locator(obj: Any, keys: List[str]) -> Any:
+    """与 workflow_output_logic.get_by_locator 规则一致：数字按下标检索"""
+    for key in keys:
+        if key.isdigit():
+            key = int(key)
+        obj = obj[key]
+    return obj
+
+
+def _is_frame_storable(df: pd.DataFrame, min_rows: int) -> bool:
+    if len(df) < min_rows or df.attrs or isinstance(df.columns, pd.MultiIndex):
+        return False
+    return all(isinstance(column, str) for column in df.columns) and df.columns.is_unique
+
+
+def _split_frames(obj: Any, path: List[str], frames: Dict[str, pd.DataFrame], min_rows: int) -> Any:
+    """把 dict / list 中的 DataFrame 替换为 FrameRef，返回骨架"""
+    if isinstance(obj, pd.DataFrame):
+        if _is_frame_storable(obj, min_rows):
+            locator = ".".join(path)
+            frames[locator] = obj
+            return FrameRef(locator)
+        return obj
+    if isinstance(obj, dict):
+        # 键不是字符串或含 "." 时 locator 无法定位，保持原样
+        if not all(isinstance(key, str) and "." not in key and not key.isdigit() for key in obj):
+            return obj
+        return {key: _split_frames(value, path + [key], frames, min_rows) for key, value in obj.items()}
+    if isinstance(obj, list):
+        return [_split_frames(value, path + [str(i)], frames, min_rows) for i, value in enumerate(obj)]
+    return obj
+
+
+def _write_frame(pa, df: pd.DataFrame, row_group_rows: int) -> Optional[Tuple[bytes, dict]]:
+    """DataFrame 转成 Parquet，无法无损转换（嵌套对象、混合类型等）时返回 None"""
+    range_index = isinstance(df.index, pd.RangeIndex)
+    try:
+        table = pa.Table.from_pandas(df, preserve_index=not range_index)
+    except Exception as e:
+        logger.debug(f"DataFrame can not be stored as parquet: {e}")
+        return None
+    if any(pa.types.is_nested(field.type) for field in table.schema):
+        return None
+    buffer = io.BytesIO()
+    pa.parquet.write_table(table, buffer, compression=COMPRESSION, row_group_size=max(1, row_group_rows))
+    parquet_file = pa.parquet.ParquetFile(io.BytesIO(buffer.getvalue()))
+    info = {
+        "rows": len(df),
+        "columns": list(df.columns),
+        "dtypes": [str(dtype) for dtype in df.dtypes],
+        "row_groups": [parquet_file.metadata.row_group(i).num_rows for i in range(parquet_file.num_row_groups)],
+        # RangeIndex 不写入文件，读取时按行号还原
+        "range_index": [df.index.start, df.index.step] if range_index else None,
+    }
+    return buffer.getvalue(), info
+
+
+def encode(obj: Any, min_rows: int = 1000, row_group_rows: int = 50000) -> Optional[Tuple[bytes, dict]]:
+    """
+    :param obj: 已转换为可 pickle 形式的节点输出（pydantic 模型已 model_dump）
+    :return: (文件内容, 清单)，没有可列式存储的 DataFrame 或未安装 pyarrow 时返回 None
+    """
+    pa = _import_pyarrow()
+    if pa is None:
+        return None
+    frames: Dict[str, pd.DataFrame] = {}
+    skeleton = _split_frames(obj, [], frames, min_rows)
+    if not frames:
+        return None
+
+    segment_list = []
+    frame_info_list = []
+    offset = 0
+    for locator, df in frames.items():
+        written = _write_frame(pa, df, row_group_rows)
+        if written is None:
+            skeleton = _restore_ref(skeleton, locator, df)
+            continue
+        data, info = written
+        info.update(locator=locator, offset=offset, length=len(data))
+        segment_list.append(data)
+        frame_info_list.append(info)
+        offset += len(data)
+    if not frame_info_list:
+        return None
+
+    skeleton_bytes = cloudpickle.dumps(skeleton)
+    manifest = {
+        "format": STORAGE_FORMAT,
+        "version": STORAGE_VERSION,
+        "skeleton": {"offset": offset, "length": len(skeleton_bytes)},
+        "frames": frame_info_list,
+    }
+    segment_list.append(skeleton_bytes)
+    return b"".join(segment_list), manifest
+
+
+def _restore_ref(skeleton: Any, locator: str, df: pd.DataFrame) -> Any:
+    """把无法列式存储的 DataFrame 放回骨架"""
+    keys = split_locator(locator)
+    if not keys:
+        return df
+    parent = get_by_locator(skeleton, keys[:-1])
+    parent[int(keys[-1]) if isinstance(parent, list) else keys[-1]] = df
+    return skeleton
+
+
+class _Segment(io.RawIOBase):
+    """文件中 [offset, offset + length) 一段的只读视图，供 pyarrow 按需读取"""
+
+    def __init__(self, file, offset: int, length: int):
+        self.file = file
+        self.offset = offset
+        self.length = length
+        self.position = 0
+
+    def readable(self):
+        return True
+
+    def seekable(self):
+        return True
+
+    def tell(self):
+        return self.position
+
+    def seek(self, position, whence=io.SEEK_SET):
+        if whence == io.SEEK_CUR:
+            position += self.position
+        elif whence == io.SEEK_END:
+            position += self.length
+        self.position = min(max(position, 0), self.length)
+        return self.position
+
+    def read(self, size=-1):
+        if size is None or size < 0 or self.position + size > self.length:
+            size = self.length - self.position
+        if size <= 0:
+            return b""
+        self.file.seek(self.offset + self.position)
+        data = self.file.read(size)
+        self.position += len(data)
+        return data
+
+    def readinto(self, buffer):
+        data = self.read(len(buffer))
+        buffer[:len(data)] = data
+        return len(data)
+
+
+def read_skeleton(file, manifest: dict) -> Any:
+    segment = manifest["skeleton"]
+    file.seek(segment["offset"])
+    return cloudpickle.loads(file.read(segment["length"]))
+
+
+def find_frame(manifest: dict, locator: str) -> Optional[dict]:
+    for info in manifest["frames"]:
+        if info["locator"] == locator:
+            return info
+    return None
+
+
+def read_frame(file, frame_info: dict, columns: Optional[List[str]] = None,
+               start: Optional[int] = None, stop: Optional[int] = None) -> pd.DataFrame:
+    """
+    读取一个 DataFrame 的部分列、部分行，只读取涉及的列块和行组
+    :param start: 起始行号（包含），默认 0
+    :param stop: 结束行号（不包含），默认到最后一行
+    """
+    pa = _import_pyarrow()
+    if pa is None:
+        raise ImportError("pyarrow is required to read columnar node output")
+    if columns is not None:
+        unknown = [column for column in columns if column not in frame_info["columns"]]
+        if unknown:
+            raise KeyError(unknown[0])
+    rows = frame_info["rows"]
+    start = min(max(start or 0, 0), rows)
+    stop = rows if stop is None else min(max(stop, start), rows)
+
+    parquet_file = pa.parquet.ParquetFile(_Segment(file, frame_info["offset"], frame_info["length"]))
+    group_list = []
+    first_row = None
+    group_start = 0
+    for i, group_rows in enumerate(frame_info["row_groups"]):
+        group_stop = group_start + group_rows
+        if group_start < stop and group_stop > start:
+            group_list.append(i)
+            if first_row is None:
+                first_row = group_start
+        group_start = group_stop
+    if group_list:
+        table = parquet_file.read_row_groups(group_list, columns=columns, use_pandas_metadata=True)
+        df = table.to_pandas().iloc[start - first_row: stop - first_row]
+    else:
+        table = parquet_file.schema_arrow.empty_table()
+        if columns is not None:
+            table = table.select(columns + [name for name in table.column_names
+                                            if name.startswith("__index_level_")])
+        df = table.to_pandas()
+    if frame_info.get("range_index") is not None:
+        index_start, index_step = frame_info["range_index"]
+        df.index = pd.RangeIndex(index_start + start * index_step, index_start + stop * index_step, index_step)
+    return df
+
+
+def decode(file, manifest: dict) -> Any:
+    """读取完整的节点输出"""
+    skeleton = read_skeleton(file, manifest)
+    return fill_frames(file, manifest, skeleton)
+
+
+def fill_frames(file, manifest: dict, obj: Any) -> Any:
+    """把骨架（或其中一部分）中的 FrameRef 替换为完整的 DataFrame"""
+    if isinstance(obj, FrameRef):
+        return read_frame(file, find_frame(manifest, obj.locator))
+    if isinstance(obj, dict):
+        return {key: fill_frames(file, manifest, value) for key, value in obj.items()}
+    if isinstance(obj, list):
+        return [fill_frames(file, manifest, value) for value in obj]
+    return obj
+
+
+def summarize(manifest: dict) -> List[dict]:
+    """清单中各 DataFrame 的摘要：位置、行数、列名与类型"""
+    return [
+        {
+            "locator": info["locator"],
+            "rows": info["rows"],
+            "columns": [{"name": name, "dtype": dtype} for name, dtype in zip(info["columns"], info["dtypes"])],
+            "stored_bytes": info["length"],
+        }
+        for info in manifest["frames"]
+    ]
+
+
+def summarize_object(obj: Any) -> List[dict]:
+    """未列式存储的输出，从反序列化后的对象生成相同结构的摘要"""
+    frames: Dict[str, pd.DataFrame] = {}
+    _split_frames(obj, [], frames, 0)
+    return [
+        {
+            "locator": locator,
+            "rows": len(df),
+            "columns": [{"name": str(name), "dtype": str(dtype)} for name, dtype in df.dtypes.items()],
+            "stored_bytes": None,
+        }
+        for locator, df in frames.items()
+    ]
+
+
+def read_partial(file, manifest: dict, locator: str = "", columns: Optional[List[str]] = None,
+                 start: Optional[int] = None, stop: Optional[int] = None) -> Tuple[Any, Optional[int]]:
+    """
+    按 locator 读取列式存储的节点输出的一部分，只读取需要的数据段
+    :param columns: 定位到 DataFrame 时只读取这些列
+    :param start / stop: 定位到 DataFrame / Series / list 时只返回这些行
+    :return: (检索结果, 分页前的总行数)，结果不能分页时总行数为 None
+    :raises KeyError / IndexError / TypeError: locator 或 columns 无效
+    """
+    keys = split_locator(locator)
+    for info in manifest["frames"]:
+        frame_keys = split_locator(info["locator"])
+        if keys[:len(frame_keys)] != frame_keys:
+            continue
+        rest = keys[len(frame_keys):]
+        if not rest:
+            return read_frame(file, info, columns, start, stop), info["rows"]
+        if columns is not None:
+            raise TypeError("columns can only be selected on a DataFrame")
+        # locator 指向 DataFrame 的某一列
+        if len(rest) == 1:
+            return read_frame(file, info, rest, start, stop)[rest[0]], info["rows"]
+        return slice_value(get_by_locator(read_frame(file, info, rest[:1]), rest), None, start, stop)
+
+    skeleton = read_skeleton(file, manifest)
+    value = fill_frames(file, manifest, get_by_locator(skeleton, keys))
+    return slice_value(value, columns, start, stop)
+
+
+def slice_value(value: Any, columns: Optional[List[str]] = None, start: Optional[int] = None,
+                stop: Optional[int] = None) -> Tuple[Any, Optional[int]]:
+    """对已加载到内存的检索结果选列、分页，规则与 read_partial 一致"""
+    if columns is not None:
+        if not isinstance(value, pd.DataFrame):
+            raise TypeError("columns can only be selected on a DataFrame")
+        value = value[columns]
+    if isinstance(value, (pd.DataFrame, pd.Series)):
+        return value.iloc[start:stop], len(value)
+    if isinstance(value, list):
+        return value[start:stop], len(value)
+    return value, None
@@ -1,11 +1,15 @@
+import asyncio
+import io
 import cloudpickle
 import logging
 import bson
 import gridfs
 
-from typing import Any
+from typing import Any, List, Optional
 from bson import Binary
 from panda_server.config.database import  mongodb
+from panda_server.config.env import NODE_OUTPUT_COLUMNAR_MIN_ROWS, NODE_OUTPUT_ROW_GROUP_ROWS
+from panda_server.utils import columnar_storage
 from bson import ObjectId
 import logging
 from motor.motor_asyncio import AsyncIOMotorGridFSBucket
@@ -76,13 +80,21 @@ async def get_from_collection(collection_name: str, obj_id: str) -> Any:
 async def save_to_gridfs(bucket_name: str, obj: Any, filename: str = None, extra: dict = {}) -> str:
     """
     将整个 Pydantic 对象 pickle 后通过 GridFS 存储到 MongoDB，支持超过 16MB 的大文件。
+    对象中的 DataFrame 字段按列式格式存储（见 columnar_storage），读取时可以只取部分列、部分行。
     """
     # 序列化对象并获取元数据
     serialized_obj, serialize_metadata = _serialize_for_pickle(obj)
-    raw_bytes = cloudpickle.dumps(serialized_obj)
+    encoded = columnar_storage.encode(
+        serialized_obj, int(NODE_OUTPUT_COLUMNAR_MIN_ROWS), int(NODE_OUTPUT_ROW_GROUP_ROWS)
+    )
+    if encoded is not None:
+        raw_bytes, manifest = encoded
+        serialize_metadata["storage"] = manifest
+    else:
+        raw_bytes = cloudpickle.dumps(serialized_obj)
     
     fs = AsyncIOMotorGridFSBucket(mongodb.db, bucket_name=bucket_name)
-    file_name = filename or f"{obj.__class__.__name__}.pkl"
+    file_name = filename or f"{obj.__class__.__name__}.{'columnar' if encoded else 'pkl'}"
     
     # 合并序列化元数据到extra中
     metadata = {
@@ -111,6 +123,8 @@ async def get_from_gridfs(bucket_name: str, file_id: str) -> tuple[Any, Exceptio
         oid = ObjectId(file_id)
         stream = await fs.open_download_stream(oid)
         raw_bytes = await stream.read()
+        if columnar_storage.is_columnar(stream.metadata):
+            return columnar_storage.decode(io.BytesIO(raw_bytes), stream.metadata["storage"]), None
         return cloudpickle.loads(raw_bytes), None
     except gridfs.errors.NoFile:
         logger.info(f"GridFS file not found: {file_id}")
@@ -122,6 +136,71 @@ async def get_from_gridfs(bucket_name: str, file_id: str) -> tuple[Any, Exceptio
         logger.error(f"Unexpected error when getting GridFS file: {str(e)}")
         return None, e
 
+def _read_gridfs_partial(bucket_name: str, file_id: str, locator: str, columns: Optional[List[str]],
+                         start: Optional[int], stop: Optional[int]) -> tuple[Any, Optional[int]]:
+    # pyarrow 需要同步读取的文件对象，这里使用 motor 底层的 pymongo 连接，在线程中执行
+    fs = gridfs.GridFSBucket(mongodb.db.delegate, bucket_name=bucket_name)
+    with fs.open_download_stream(ObjectId(file_id)) as grid_out:
+        if columnar_storage.is_columnar(grid_out.metadata):
+            return columnar_storage.read_partial(
+                grid_out, grid_out.metadata["storage"], locator, columns, start, stop
+            )
+        obj = cloudpickle.loads(grid_out.read())
+    if isinstance(obj, BaseModel):
+        obj = obj.model_dump()
+    value = columnar_storage.get_by_locator(obj, columnar_storage.split_locator(locator))
+    return columnar_storage.slice_value(value, columns, start, stop)
+
+
+# 从 GridFS 读取对象的一部分
+async def get_partial_from_gridfs(
+    bucket_name: str,
+    file_id: str,
+    locator: str = "",
+    columns: Optional[List[str]] = None,
+    start: Optional[int] = None,
+    stop: Optional[int] = None,
+) -> tuple[Any, Optional[int]]:
+    """
+    按 locator 读取 GridFS 中对象的一部分，列式存储的对象只读取需要的列和行组。
+
+    Args:
+        locator: 字段检索条件, 如 'a.b.0'
+        columns: 检索结果为 DataFrame 时只返回这些列
+        start / stop: 检索结果为 DataFrame / Series / list 时只返回 [start, stop) 行
+
+    Returns:
+        tuple: (检索结果, 分页前的总行数)，检索结果不能分页时总行数为 None
+
+    Raises:
+        KeyError / IndexError / TypeError: locator 或 columns 无效
+        gridfs.errors.NoFile: 文件不存在
+    """
+    return await asyncio.to_thread(
+        _read_gridfs_partial, bucket_name, file_id, locator, columns, start, stop
+    )
+
+
+# 获取 GridFS 中对象的 DataFrame 摘要
+async def get_gridfs_summary(bucket_name: str, file_id: str) -> list[dict] | None:
+    """
+    返回对象中各 DataFrame 的位置、行数、列名与类型。
+    列式存储的对象直接读取 metadata 中的清单，否则反序列化整个对象后统计。
+    文件不存在时返回 None
+    """
+    metadata = await get_gridfs_metadata(bucket_name, file_id)
+    if metadata is None:
+        return None
+    if columnar_storage.is_columnar(metadata):
+        return columnar_storage.summarize(metadata["storage"])
+    obj, error = await get_from_gridfs(bucket_name, file_id)
+    if error is not None:
+        return None
+    if isinstance(obj, BaseModel):
+        obj = obj.model_dump()
+    return columnar_storage.summarize_object(obj)
+
+
 # 获取 GridFS 文件的 metadata
 async def get_gridfs_metadata(bucket_name: str, file_id: str) -> dict | None:
     """
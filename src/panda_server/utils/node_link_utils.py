@@ -0,0 +1,179 @@
+"""
+工作流节点间的数据传递
+
+下游节点的输入直接读取上游输出模型的对应属性，不再对整个上游输出调用 model_dump；
+DataFrame 在写时复制（copy-on-write，pandas 3 默认启用）模式下以浅拷贝传给每个下游节点，与上游共享数据，
+下游的修改不会影响上游输出及其他下游节点；未启用时与原有 model_dump 一致，直接传递同一个 DataFrame 对象；
+来自上游、类型注解与输入字段一致的值已由上游输出模型校验过，构造输入模型时不再重复校验。
+"""
+import logging
+import sys
+from typing import Any, Dict, Iterable, Optional, Tuple, Type
+
+import pandas as pd
+from pydantic import BaseModel, create_model
+
+logger = logging.getLogger(__name__)
+
+PANDAS_MAJOR_VERSION = int(pd.__version__.split(".")[0])
+
+# {(输入模型, 免校验字段): 只包含其余字段的模型}
+_partial_model_dict: Dict[Tuple[type, frozenset], Type[BaseModel]] = {}
+
+
+def resolve_link_value(node_output: Any, field_name: str) -> Any:
+    """
+    读取上游节点输出的一个字段，结果与 node_output.model_dump().get(field_name) 等价：
+    嵌套的 pydantic 模型仍转换为 dict，DataFrame 在写时复制模式下返回共享数据的浅拷贝，否则返回原对象
+    """
+    if node_output is None:
+        return None
+    if isinstance(node_output, BaseModel):
+        value = getattr(node_output, field_name, None)
+    elif isinstance(node_output, dict):
+        value = node_output.get(field_name)
+    else:
+        return None
+    return _share_value(value)
+
+
+def is_copy_on_write_enabled() -> bool:
+    """
+    是否启用写时复制，不修改全局设置
+    """
+    if PANDAS_MAJOR_VERSION >= 3:
+        return True
+    return pd.get_option("mode.copy_on_write") is True
+
+
+def _share_value(value: Any) -> Any:
+    if isinstance(value, (pd.DataFrame, pd.Series)):
+        if is_copy_on_write_enabled():
+            return value.copy(deep=False)
+        return value
+    if isinstance(value, BaseModel):
+        return value.model_dump()
+    if isinstance(value, (list, tuple)) and any(isinstance(item, BaseModel) for item in value):
+        return type(value)(_share_value(item) for item in value)
+    if isinstance(value, dict) and any(isinstance(item, BaseModel) for item in value.values()):
+        return {key: _share_value(item) for key, item in value.items()}
+    return value
+
+
+def resolve_link(node_output: Any, input_field: str, node_input_model: Type[BaseModel],
+                 output_field: str) -> Tuple[Any, bool]:
+    """
+    :return: (传给下游的值, 是否已由上游输出模型校验过)
+             上游输出字段与下游输入字段的类型注解一致、且值未经转换（不含嵌套模型）时视为已校验
+    """
+    value = resolve_link_value(node_output, input_field)
+    if not isinstance(node_output, BaseModel):
+        return value, False
+    source_field = type(node_output).model_fields.get(input_field)
+    target_field = node_input_model.model_fields.get(output_field)
+    if source_field is None or target_field is None or target_field.metadata:
+        return value, False
+    if source_field.annotation != target_field.annotation:
+        return value, False
+    original = getattr(node_output, input_field)
+    converted = value is not original and not isinstance(original, (pd.DataFrame, pd.Series))
+    return value, not converted
+
+
+def _has_validators(model: Type[BaseModel]) -> bool:
+    decorators = model.__pydantic_decorators__
+    return bool(decorators.field_validators or decorators.model_validators or decorators.validators
+                or decorators.root_validators)
+
+
+def _get_partial_model(node_input_model: Type[BaseModel], skip_fields: frozenset) -> Type[BaseModel]:
+    key = (node_input_model, skip_fields)
+    partial_model = _partial_model_dict.get(key)
+    if partial_model is None:
+        field_dict = {
+            name: (field.annotation, field)
+            for name, field in node_input_model.model_fields.items()
+            if name not in skip_fields
+        }
+        partial_model = create_model(
+            node_input_model.__name__ + "Partial",
+            __config__=node_input_model.model_config,
+            **field_dict,
+        )
+        _partial_model_dict[key] = partial_model
+    return partial_model
+
+
+def build_node_input(node_input_model: Type[BaseModel], input_data: Dict[str, Any],
+                     validated_fields: Iterable[str] = ()) -> BaseModel:
+    """
+    构造节点输入模型，validated_fields 中的字段不再校验
+    输入模型带有自定义校验器时（可能依赖这些字段）整体校验
+    """
+    skip_fields = frozenset(field for field in validated_fields if field in input_data)
+    if not skip_fields or _has_validators(node_input_model):
+        return node_input_model(**input_data)
+    try:
+        partial_model = _get_partial_model(node_input_model, skip_fields)
+    except Exception as e:
+        logger.debug(f"Failed to build partial input model for {node_input_model.__name__}: {e}")
+        return node_input_model(**input_data)
+    validated = partial_model(**{key: value for key, value in input_data.items() if key not in skip_fields})
+    values = dict(validated)
+    values.update((field, input_data[field]) for field in skip_fields)
+    return node_input_model.model_construct(
+        _fields_set=validated.model_fields_set | skip_fields, **values
+    )
+
+
+def get_peak_memory_mb() -> Optional[float]:
+    """当前进程的内存峰值（MB），平台不支持时返回 None"""
+    try:
+        import resource
+    except ImportError:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # macOS 单位为字节，Linux 为 KB
+    if sys.platform == "darwin":
+        return peak / 1024 / 1024
+    return peak / 1024
+
+
+class LinkStats:
+    """工作流一次运行中节点间数据传递的耗时统计，写入工作流运行记录"""
+
+    def __init__(self):
+        # 进程内存峰值在进程生命周期内只增不减，记录运行开始时的值，用于计算本次运行使峰值增加了多少
+        self.start_peak_memory_mb = get_peak_memory_mb()
+        self.link_count = 0
+        self.link_time = 0.0
+        self.max_link_time = 0.0
+        self.input_count = 0
+        self.input_time = 0.0
+        self.skipped_validation_count = 0
+
+    def add_link(self, seconds: float):
+        self.link_count += 1
+        self.link_time += seconds
+        if seconds > self.max_link_time:
+            self.max_link_time = seconds
+
+    def add_input(self, seconds: float, skipped_validation_count: int):
+        self.input_count += 1
+        self.input_time += seconds
+        self.skipped_validation_count += skipped_validation_count
+
+    def to_dict(self) -> Dict[str, Any]:
+        peak_memory_mb = get_peak_memory_mb()
+        peak_memory_increase_mb = None
+        if peak_memory_mb is not None and self.start_peak_memory_mb is not None:
+            peak_memory_increase_mb = round(peak_memory_mb - self.start_peak_memory_mb, 2)
+        return {
+            "link_count": self.link_count,
+            "avg_link_ms": round(self.link_time / max(self.link_count, 1) * 1000, 4),
+            "max_link_ms": round(self.max_link_time * 1000, 4),
+            "avg_input_build_ms": round(self.input_time / max(self.input_count, 1) * 1000, 4),
+            "skipped_validation_count": self.skipped_validation_count,
+            "process_peak_memory_mb": peak_memory_mb,
+            "peak_memory_increase_mb": peak_memory_increase_mb,
+        }
@@ -0,0 +1,260 @@
+"""
+工作流节点输出缓存
+
+缓存键由 (所有者, 节点类及版本, 静态输入, 上游输出指纹) 计算得到，读取行情、因子数据库的节点还包含
+行情数据的最新交易日。命中时直接复用 workflow_node_output_fs 中已保存的输出，不再执行节点也不再重复上传。
+输出文件同时属于写入它和复用它的工作流运行，淘汰缓存时只有这些运行都已不存在才删除文件。
+"""
+import hashlib
+import inspect
+import json
+import logging
+import sys
+import time
+from typing import Any, Optional, Type
+
+import cloudpickle
+import gridfs
+from bson import ObjectId
+from motor.motor_asyncio import AsyncIOMotorGridFSBucket
+from pydantic import BaseModel
+
+from panda_server.config.database import mongodb
+from panda_server.config.env import (
+    NODE_OUTPUT_CACHE_ENABLED,
+    NODE_OUTPUT_CACHE_TTL_DAYS,
+    NODE_OUTPUT_CACHE_MAX_MB,
+)
+from panda_server.utils.db_storage import _serialize_for_pickle, get_from_gridfs
+
+logger = logging.getLogger(__name__)
+
+CACHE_COLLECTION = "workflow_node_output_cache"
+OUTPUT_BUCKET = "workflow_node_output_fs"
+# 两次淘汰检查的最小间隔（秒）
+EVICT_INTERVAL = 3600
+# 行情最新交易日所在的集合
+MARKET_DATA_COLLECTION = "stock_market"
+
+_class_fingerprint_dict: dict[type, str] = {}
+_last_evict_time = 0.0
+
+
+def is_node_cacheable(node_class) -> bool:
+    if NODE_OUTPUT_CACHE_ENABLED.lower() != "true":
+        return False
+    return getattr(node_class, "__work_node_cacheable__", False)
+
+
+def is_node_market_data(node_class) -> bool:
+    return getattr(node_class, "__work_node_market_data__", False)
+
+
+async def get_market_data_as_of() -> str:
+    """
+    行情数据的最新交易日，读取行情的节点以此区分缓存；查询失败时退回当天日期
+    """
+    try:
+        doc = await mongodb.get_collection(MARKET_DATA_COLLECTION).find_one(
+            {}, {"date": 1}, sort=[("date", -1)]
+        )
+        if doc and doc.get("date"):
+            return str(doc["date"])
+    except Exception as e:
+        logger.warning(f"failed to get latest market data date: {e}")
+    return time.strftime("%Y%m%d")
+
+
+def get_node_class_fingerprint(node_class) -> str:
+    """
+    节点类指纹：类路径 + 版本号 + 所在模块源码的哈希，节点代码变更后缓存自动失效
+    """
+    fingerprint = _class_fingerprint_dict.get(node_class)
+    if fingerprint is None:
+        try:
+            source = inspect.getsource(sys.modules[node_class.__module__])
+        except (OSError, TypeError, KeyError):
+            source = ""
+        fingerprint = "%s.%s:%s:%s" % (
+            node_class.__module__,
+            node_class.__qualname__,
+            getattr(node_class, "__work_node_version__", ""),
+            hashlib.sha256(source.encode("utf-8")).hexdigest(),
+        )
+        _class_fingerprint_dict[node_class] = fingerprint
+    return fingerprint
+
+
+def compute_node_cache_key(
+    owner: str, node_class, static_input_data: dict, upstream_list: list, as_of: Optional[str] = None
+) -> str:
+    """
+    Args:
+        owner: 工作流所有者，输出文件按所有者鉴权，缓存不跨用户共享
+        node_class: 节点类
+        static_input_data: 节点静态输入
+        upstream_list: [(output_field_name, input_field_name, 上游节点指纹), ...]
+        as_of: 行情数据的最新交易日，仅读取行情的节点传入
+    """
+    payload = json.dumps(
+        [owner, get_node_class_fingerprint(node_class), static_input_data, sorted(upstream_list), as_of],
+        sort_keys=True,
+        default=str,
+        ensure_ascii=False,
+    )
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+def hash_node_output(node_output: Any) -> str:
+    """
+    不可缓存节点的输出指纹，供下游节点计算缓存键
+    """
+    serialized_obj, _ = _serialize_for_pickle(node_output)
+    return hashlib.sha256(cloudpickle.dumps(serialized_obj)).hexdigest()
+
+
+async def get_cached_node_output(
+    cache_key: str, output_model: Optional[Type[BaseModel]], workflow_run_id: str
+) -> Optional[tuple[Any, str]]:
+    """
+    Args:
+        workflow_run_id: 复用输出的工作流运行，记入缓存的引用列表
+
+    Returns:
+        命中时返回 (节点输出, output_db_id)，未命中返回 None
+    """
+    cache_collection = mongodb.get_collection(CACHE_COLLECTION)
+    entry = await cache_collection.find_one({"_id": cache_key})
+    if not entry:
+        return None
+    if time.time() - entry["created_at"] > float(NODE_OUTPUT_CACHE_TTL_DAYS) * 86400:
+        return None
+    node_output, error = await get_from_gridfs(OUTPUT_BUCKET, entry["file_id"])
+    if error is not None:
+        await cache_collection.delete_one({"_id": cache_key})
+        return None
+    # Pydantic 输出保存时转换成了 dict，按节点输出模型还原
+    if isinstance(node_output, dict) and output_model is not None:
+        node_output = output_model.model_validate(node_output)
+    await cache_collection.update_one(
+        {"_id": cache_key},
+        {
+            "$set": {"last_used_at": time.time()},
+            "$inc": {"hit_count": 1},
+            "$addToSet": {"run_ids": workflow_run_id},
+        },
+    )
+    return node_output, entry["file_id"]
+
+
+async def save_node_output_cache(cache_key: str, file_id: str, owner: str, node_name: str, workflow_run_id: str):
+    """
+    新输出替换已过期的缓存条目，创建时间与引用列表随之重置（原文件仍属于之前的运行，不删除）
+    """
+    now = time.time()
+    cache_collection = mongodb.get_collection(CACHE_COLLECTION)
+    await cache_collection.update_one(
+        {"_id": cache_key},
+        {
+            "$set": {
+                "file_id": file_id,
+                "owner": owner,
+                "node_name": node_name,
+                "created_at": now,
+                "last_used_at": now,
+                "hit_count": 0,
+                "run_ids": [workflow_run_id],
+            },
+        },
+        upsert=True,
+    )
+
+
+async def get_referenced_file_ids(entry_list: list) -> set[str]:
+    """
+    被仍存在的工作流运行引用的输出文件。旧版本写入、没有引用列表的缓存条目视为仍被引用
+    """
+    run_id_set = set()
+    referenced_id_set = set()
+    for entry in entry_list:
+        if "run_ids" not in entry:
+            referenced_id_set.add(entry["file_id"])
+        else:
+            run_id_set.update(run_id for run_id in entry["run_ids"] if ObjectId.is_valid(run_id))
+    workflow_run_collection = mongodb.get_collection("workflow_run")
+    existing_run_id_set = {
+        str(doc["_id"])
+        async for doc in workflow_run_collection.find(
+            {"_id": {"$in": [ObjectId(run_id) for run_id in run_id_set]}}, {"_id": 1}
+        )
+    }
+    for entry in entry_list:
+        if existing_run_id_set.intersection(entry.get("run_ids", [])):
+            referenced_id_set.add(entry["file_id"])
+    return referenced_id_set
+
+
+async def evict_node_output_cache(ttl_seconds: float, max_bytes: int) -> int:
+    """
+    淘汰创建超过 ttl_seconds 的缓存，并按最近使用时间保留总大小不超过 max_bytes 的缓存；
+    被淘汰缓存的输出文件仍被工作流运行引用时只删除缓存条目，否则同时从 GridFS 删除。
+
+    Returns:
+        淘汰的缓存条数
+    """
+    cache_collection = mongodb.get_collection(CACHE_COLLECTION)
+    entry_list = await cache_collection.find(
+        {}, {"file_id": 1, "created_at": 1, "last_used_at": 1, "run_ids": 1}
+    ).sort("last_used_at", -1).to_list(length=None)
+    if not entry_list:
+        return 0
+    files_collection = mongodb.get_collection(f"{OUTPUT_BUCKET}.files")
+    size_dict = {
+        str(doc["_id"]): doc["length"]
+        async for doc in files_collection.find(
+            {"_id": {"$in": [ObjectId(entry["file_id"]) for entry in entry_list]}}, {"length": 1}
+        )
+    }
+
+    now = time.time()
+    total_bytes = 0
+    evict_list = []
+    for entry in entry_list:
+        size = size_dict.get(entry["file_id"], 0)
+        if now - entry["created_at"] > ttl_seconds or total_bytes + size > max_bytes:
+            evict_list.append(entry)
+        else:
+            total_bytes += size
+    if not evict_list:
+        return 0
+
+    referenced_id_set = await get_referenced_file_ids(evict_list)
+    fs = AsyncIOMotorGridFSBucket(mongodb.db, bucket_name=OUTPUT_BUCKET)
+    for entry in evict_list:
+        file_id = entry["file_id"]
+        if file_id in referenced_id_set or file_id not in size_dict:
+            continue
+        try:
+            await fs.delete(ObjectId(file_id))
+        except gridfs.errors.NoFile:
+            pass
+    await cache_collection.delete_many({"_id": {"$in": [entry["_id"] for entry in evict_list]}})
+    logger.info(f"node output cache evicted: {len(evict_list)}, kept bytes: {total_bytes}")
+    return len(evict_list)
+
+
+async def maybe_evict_node_output_cache():
+    """
+    工作流运行结束后调用，间隔 EVICT_INTERVAL 秒以上才执行一次淘汰
+    """
+    global _last_evict_time
+    if NODE_OUTPUT_CACHE_ENABLED.lower() != "true" or time.time() - _last_evict_time < EVICT_INTERVAL:
+        return
+    _last_evict_time = time.time()
+    try:
+        await evict_node_output_cache(
+            float(NODE_OUTPUT_CACHE_TTL_DAYS) * 86400,
+            int(float(NODE_OUTPUT_CACHE_MAX_MB) * 1024 * 1024),
+        )
+    except Exception as e:
+        logger.error(f"node output cache eviction failed: {e}")
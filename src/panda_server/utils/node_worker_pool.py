@@ -0,0 +1,301 @@
+"""
+工作流节点执行池
+
+节点按注册时声明的资源类型（@work_node(resource=...)）分配到不同的执行通道：
+- light: 服务进程内的线程池，适合轻量节点，输入输出不跨进程复制
+- cpu: 进程池，进程数默认等于 CPU 核数，计算密集的节点不再与 API 争用同一个 GIL
+- memory: 进程数较少的进程池，限制同时运行的模型训练等高内存节点
+进程池的工作进程执行 max_tasks_per_child 个节点后退出并由新进程替换，避免内存持续增长。
+节点的输入、输出与取消令牌通过 cloudpickle 在进程间传递；工作进程中节点产生的用户日志与进度
+在运行期间经进程池的事件通道实时发回服务进程，由转发线程放入服务进程中对应的节点实例。
+"""
+import asyncio
+import logging
+import multiprocessing
+import os
+import threading
+import time
+import traceback
+import uuid
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Any, Callable, Dict, Optional
+
+import cloudpickle
+
+from panda_server.config.env import (
+    WORKFLOW_CPU_WORKERS,
+    WORKFLOW_MEMORY_WORKERS,
+    WORKFLOW_NODE_WORKERS,
+    WORKFLOW_WORKER_MAX_TASKS,
+)
+
+logger = logging.getLogger(__name__)
+
+RESOURCE_LIGHT = "light"
+RESOURCE_CPU = "cpu"
+RESOURCE_MEMORY = "memory"
+
+# 超过该时间没有执行过节点的工作进程（通常已被回收）不再出现在统计中
+WORKER_STATS_TTL = 600
+# 节点结束后等待其日志、进度全部转发到服务进程的最长时间（秒）
+EVENT_DRAIN_TIMEOUT = 5
+
+# 工作进程中的事件通道，由进程池 initializer 设置
+_event_channel = None
+
+
+def _init_worker(event_channel):
+    global _event_channel
+    _event_channel = event_channel
+
+
+def _timed_call(func: Callable, args: tuple) -> tuple:
+    """在执行通道中调用 func，同时返回执行者标识与耗时"""
+    start = time.perf_counter()
+    result = func(*args)
+    return result, (os.getpid(), threading.current_thread().name), time.perf_counter() - start
+
+
+def _execute_node(payload: bytes) -> bytes:
+    """在工作进程中执行节点，返回 (输出, 发回的事件数, 异常)"""
+    node_class, node_input, workflow_id, cancel_token, task_key = cloudpickle.loads(payload)
+    sent_events = 0
+
+    def log_sink(kind: str, data: dict):
+        nonlocal sent_events
+        sent_events += 1
+        _event_channel.put((task_key, kind, data))
+
+    node_instance = node_class()
+    node_instance._setup_remote_logging(workflow_id, log_sink)
+    node_instance.cancel_token = cancel_token
+    try:
+        output = node_instance.run(node_input)
+        return cloudpickle.dumps((output, sent_events, None))
+    except Exception as e:
+        # 在异常中附上工作进程内的调用栈，服务进程记录错误时一并输出
+        e.add_note(f"worker process {os.getpid()} traceback:\n{traceback.format_exc()}")
+        try:
+            return cloudpickle.dumps((None, sent_events, e))
+        except Exception:
+            return cloudpickle.dumps((None, sent_events, Exception(f"{type(e).__name__}: {e}")))
+
+
+class _NodeEvents:
+    """服务进程中接收某个节点在工作进程中产生的日志与进度"""
+
+    def __init__(self, node_instance):
+        self.node_instance = node_instance
+        self.received_events = 0
+
+    def on_event(self, kind: str, data: dict):
+        if kind == "log":
+            self.node_instance._log_queue.put_nowait(data)
+        elif kind == "progress":
+            self.node_instance._set_progress(data)
+        self.received_events += 1
+
+
+class _Lane:
+    """一个执行通道：执行器与统计"""
+
+    def __init__(self, name: str, worker_count: int, use_process: bool, max_tasks_per_child: int,
+                 dispatch: Callable[[tuple], None]):
+        self.name = name
+        self.worker_count = worker_count
+        self.use_process = use_process
+        self.max_tasks_per_child = max_tasks_per_child
+        self.dispatch = dispatch
+        self.executor = None
+        self.event_channel = None
+        self.in_flight = 0
+        self.completed = 0
+        self.failed = 0
+        self.restarted = 0
+        # {执行者标识: {"tasks", "busy_seconds", "first_seen", "last_seen"}}
+        self.worker_stats: Dict[str, dict] = {}
+
+    def get_executor(self):
+        if self.executor is None:
+            if self.use_process:
+                # spawn 启动的子进程不继承服务进程的事件循环、数据库连接等状态
+                mp_context = multiprocessing.get_context("spawn")
+                if self.event_channel is None:
+                    self.event_channel = mp_context.Queue()
+                    threading.Thread(
+                        target=self._forward_events, args=(self.event_channel,),
+                        name=f"workflow-node-{self.name}-events", daemon=True,
+                    ).start()
+                self.executor = ProcessPoolExecutor(
+                    max_workers=self.worker_count,
+                    mp_context=mp_context,
+                    max_tasks_per_child=self.max_tasks_per_child,
+                    initializer=_init_worker,
+                    initargs=(self.event_channel,),
+                )
+            else:
+                self.executor = ThreadPoolExecutor(
+                    max_workers=self.worker_count, thread_name_prefix=f"workflow-node-{self.name}"
+                )
+        return self.executor
+
+    def _forward_events(self, event_channel):
+        """转发线程：把工作进程发回的事件交给服务进程中对应的节点"""
+        while True:
+            try:
+                event = event_channel.get()
+            except (EOFError, OSError):
+                return
+            if event is None:
+                return
+            try:
+                self.dispatch(event)
+            except Exception as e:
+                logger.warning(f"Failed to dispatch workflow node event: {e}")
+
+    def close_event_channel(self):
+        event_channel, self.event_channel = self.event_channel, None
+        if event_channel is not None:
+            event_channel.put(None)
+
+    def reset(self):
+        """工作进程异常退出（如被系统因内存不足杀死）后进程池不可再用，重新创建"""
+        executor, self.executor = self.executor, None
+        if executor is not None:
+            executor.shutdown(wait=False, cancel_futures=True)
+        # 被杀死的进程可能持有通道的锁，一并重建
+        self.close_event_channel()
+        self.restarted += 1
+
+    def record(self, worker: tuple, seconds: float):
+        pid, thread_name = worker
+        worker_id = str(pid) if self.use_process else thread_name
+        now = time.time()
+        stats = self.worker_stats.get(worker_id)
+        if stats is None:
+            stats = {"tasks": 0, "busy_seconds": 0.0, "first_seen": now - seconds, "last_seen": now}
+            self.worker_stats[worker_id] = stats
+        stats["tasks"] += 1
+        stats["busy_seconds"] += seconds
+        stats["last_seen"] = now
+        self.completed += 1
+
+    def get_stats(self) -> dict:
+        now = time.time()
+        for worker_id in [key for key, value in self.worker_stats.items()
+                          if now - value["last_seen"] > WORKER_STATS_TTL]:
+            del self.worker_stats[worker_id]
+        return {
+            "mode": "process" if self.use_process else "thread",
+            "workers": self.worker_count,
+            # 进程池不暴露任务何时开始执行，按已提交未完成的数量估算
+            "running": min(self.in_flight, self.worker_count),
+            "queue_depth": max(0, self.in_flight - self.worker_count),
+            "completed": self.completed,
+            "failed": self.failed,
+            "restarted": self.restarted,
+            "worker_utilisation": {
+                worker_id: {
+                    "tasks": value["tasks"],
+                    "busy_seconds": round(value["busy_seconds"], 3),
+                    "utilisation": round(min(1.0, value["busy_seconds"] / max(now - value["first_seen"], 1e-6)), 4),
+                }
+                for worker_id, value in self.worker_stats.items()
+            },
+        }
+
+
+class NodeWorkerPool:
+    """所有工作流共享的节点执行池"""
+
+    _instance: Optional["NodeWorkerPool"] = None
+
+    def __init__(self, thread_workers: int, cpu_workers: int, memory_workers: int, max_tasks_per_child: int):
+        cpu_workers = cpu_workers or os.cpu_count() or 1
+        # {task_key: _NodeEvents}，在工作进程中运行的节点
+        self.node_events: Dict[str, _NodeEvents] = {}
+        self.lanes = {
+            RESOURCE_LIGHT: _Lane(RESOURCE_LIGHT, max(1, thread_workers), False, max_tasks_per_child,
+                                  self._dispatch),
+            RESOURCE_CPU: _Lane(RESOURCE_CPU, max(1, cpu_workers), True, max_tasks_per_child, self._dispatch),
+            RESOURCE_MEMORY: _Lane(RESOURCE_MEMORY, max(1, memory_workers), True, max_tasks_per_child,
+                                   self._dispatch),
+        }
+
+    @classmethod
+    def get_instance(cls) -> "NodeWorkerPool":
+        if cls._instance is None:
+            cls._instance = NodeWorkerPool(
+                int(WORKFLOW_NODE_WORKERS),
+                int(WORKFLOW_CPU_WORKERS),
+                int(WORKFLOW_MEMORY_WORKERS),
+                int(WORKFLOW_WORKER_MAX_TASKS),
+            )
+        return cls._instance
+
+    async def run(self, resource: str, func: Callable, *args) -> Any:
+        """
+        在资源类型对应的通道中执行 func(*args)，进程通道要求 func 与参数可以 pickle
+        """
+        lane = self.lanes.get(resource, self.lanes[RESOURCE_LIGHT])
+        lane.in_flight += 1
+        try:
+            result, worker, seconds = await asyncio.get_running_loop().run_in_executor(
+                lane.get_executor(), _timed_call, func, args
+            )
+        except BrokenProcessPool:
+            lane.failed += 1
+            lane.reset()
+            raise
+        except Exception:
+            lane.failed += 1
+            raise
+        finally:
+            lane.in_flight -= 1
+        lane.record(worker, seconds)
+        return result
+
+    def _dispatch(self, event: tuple):
+        task_key, kind, data = event
+        node_events = self.node_events.get(task_key)
+        if node_events is not None:
+            node_events.on_event(kind, data)
+
+    async def run_node(self, node_instance, node_input, workflow_id: str, resource: str,
+                       run_in_thread: Callable) -> Any:
+        """
+        执行节点的 run 方法
+        light 节点在线程中调用 run_in_thread(node_instance.run, node_input)；
+        其余节点在工作进程中新建节点实例执行（沿用 node_instance 的取消令牌），
+        运行期间的用户日志与进度实时放回 node_instance
+        """
+        if resource not in (RESOURCE_CPU, RESOURCE_MEMORY):
+            return await self.run(RESOURCE_LIGHT, run_in_thread, node_instance.run, node_input)
+        task_key = uuid.uuid4().hex
+        node_events = _NodeEvents(node_instance)
+        self.node_events[task_key] = node_events
+        try:
+            payload = cloudpickle.dumps(
+                (type(node_instance), node_input, workflow_id, node_instance.cancel_token, task_key)
+            )
+            output, sent_events, error = cloudpickle.loads(await self.run(resource, _execute_node, payload))
+            # 结果与事件经不同的管道返回，等待节点的事件全部转发完
+            deadline = time.monotonic() + EVENT_DRAIN_TIMEOUT
+            while node_events.received_events < sent_events and time.monotonic() < deadline:
+                await asyncio.sleep(0.01)
+        finally:
+            del self.node_events[task_key]
+        if error is not None:
+            raise error
+        return output
+
+    def get_stats(self) -> dict:
+        return {name: lane.get_stats() for name, lane in self.lanes.items()}
+
+    def shutdown(self):
+        for lane in self.lanes.values():
+            if lane.executor is not None:
+                lane.executor.shutdown(wait=False, cancel_futures=True)
+                lane.executor = None
+            lane.close_event_channel()
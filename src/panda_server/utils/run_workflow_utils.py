@@ -1,25 +1,49 @@
+import asyncio
+import time
 import traceback
 import logging
 import uuid
+from collections import deque
 from typing import Any
 from bson import ObjectId
-from fastapi.concurrency import run_in_threadpool
 from panda_server.enums.workflow_run_status import WorkflowStatus
 from panda_server.models.workflow_model import WorkflowModel
 from panda_server.config.database import mongodb
+from panda_server.config.env import WORKFLOW_LOG_STREAM_INTERVAL, WORKFLOW_NODE_CONCURRENCY
 from panda_server.models.workflow_run_model import (
     WorkflowRunModel,
     WorkflowRunUpdateModel,
 )
-from panda_plugins.base.work_node_registery import ALL_WORK_NODES
 from panda_server.utils.db_storage import save_to_gridfs
+from panda_server.utils.node_link_utils import (
+    LinkStats,
+    build_node_input,
+    resolve_link,
+)
+from panda_server.utils.node_worker_pool import RESOURCE_LIGHT, NodeWorkerPool
+from panda_server.utils.workflow_cancellation import WorkflowCancellationRegistry
+from panda_server.utils.node_output_cache import (
+    compute_node_cache_key,
+    get_cached_node_output,
+    get_market_data_as_of,
+    hash_node_output,
+    is_node_cacheable,
+    is_node_market_data,
+    maybe_evict_node_output_cache,
+    save_node_output_cache,
+)
 from common.logging.user_logger import UserLogger
 from panda_plugins.utils.time_util import TimeUtil
 from panda_plugins.utils.error_code import ErrorCode
-from panda_plugins.utils.work_node_loader import load_work_node_from_db, unload_work_node_from_db
+from panda_plugins.utils.work_node_loader import get_work_node_class, load_work_node_from_db, unload_work_node_from_db
 
 logger = logging.getLogger(__name__)
 
+# 所有工作流共享的节点执行池，按节点声明的资源类型在线程或工作进程中执行
+NODE_WORKER_POOL = NodeWorkerPool.get_instance()
+# 本进程内执行中的工作流运行的取消令牌
+CANCELLATION_REGISTRY = WorkflowCancellationRegistry.get_instance()
+
 
 def generate_friendly_error_message(error, node, node_input_model, input_data):
     """生成友好的错误信息和修复建议"""
@@ -154,7 +178,24 @@ def generate_friendly_error_message(error, node, node_input_model, input_data):
     return "\n".join(suggestions)
 
 
+def compute_workflow_progress(finished_count: int, running_fractions, node_count: int) -> float:
+    """
+    工作流进度（0 - 100）：已完成节点数加运行中节点上报的完成比例，占节点总数的百分比
+    """
+    if node_count == 0:
+        return 0.0
+    return round((finished_count + sum(running_fractions)) / node_count * 100, 2)
+
+
 async def run_workflow_in_background(workflow_run_id):
+    try:
+        await run_workflow_logic(workflow_run_id)
+    finally:
+        # 工作流结束（包括失败、终止）时写入缓冲区中剩余的用户日志
+        await UserLogger.flush(workflow_run_id)
+
+
+async def run_workflow_logic(workflow_run_id):
     # 生成唯一执行ID
     execution_id = str(uuid.uuid4())[:8]
     
@@ -175,6 +216,9 @@ async def run_workflow_in_background(workflow_run_id):
     # 将查询结果转换为WorkflowRunModel对象
     workflow_run = WorkflowRunModel(**query_result)
     workflow_id = workflow_run.workflow_id
+    if workflow_run.status == WorkflowStatus.MANUAL_STOP:
+        logger.info(f"Workflow run terminated before start, id: {workflow_run_id}")
+        return
 
     # 创建工作流级别的用户日志记录器
     try:
@@ -230,213 +274,349 @@ async def run_workflow_in_background(workflow_run_id):
         f"[EXEC:{execution_id}] run_workflow_logic: execution_order determined: {execution_layers}"
     )
 
-    # 简化版的执行逻辑 (单线程执行)
+    node_map = {node.uuid: node for node in workflow.nodes}
     node_outputs: dict[str, Any] = {}   # 存储节点的输出结果
+    node_fingerprints: dict[str, str] = {}  # 存储节点输出的指纹，用于计算下游节点的缓存键
+    market_data_state: dict[str, str] = {}  # 本次运行的行情最新交易日，首个读取行情的可缓存节点查询一次
     failed_node_ids = []                # 存储失败的节点ID
     success_node_ids = []               # 存储成功的节点ID
     passed_link_ids = []                # 存储已经通过的连接ID
-
-    # 按层执行工作流节点
-    for layer_index, layer in enumerate(execution_layers):
-        if await is_workflow_run_terminated(workflow_run_id):
-            logger.info(f"Workflow run terminated, id: {workflow_run_id}")
-            await user_logger.warning("工作流执行被手动终止", workflow_id=workflow_id)
-            return
-
-        # 记录当前层的执行开始
-        logger.info(
-            f"[EXEC:{execution_id}] run_workflow_logic: running layer: {layer}"
-        )
-        await user_logger.info(
-            f"开始执行第 {layer_index + 1} 层节点",
-            workflow_id=workflow_id,
-            layer_index=layer_index + 1,
-            nodes_in_layer=len(layer),
+    link_stats = LinkStats()            # 节点间数据传递的耗时统计
+    running_nodes = {}                  # 正在执行的节点实例，执行期间定时写入其日志与进度
+
+    def get_workflow_progress() -> float:
+        """工作流进度：已完成节点数加运行中节点上报的完成比例"""
+        return compute_workflow_progress(
+            len(success_node_ids),
+            [node_instance.get_progress() for node_instance in running_nodes.values()],
+            len(node_map),
         )
 
-        # 计算并更新工作流执行进度
-        progress = layer_index / len(execution_layers) * 100
-        workflow_run_update_data = WorkflowRunUpdateModel(
-            status=WorkflowStatus.RUNNING,
-            progress=progress,
-            running_node_ids=layer,
-            failed_node_ids=failed_node_ids,
-            success_node_ids=success_node_ids,
-            passed_link_ids=passed_link_ids,
-        )
-        workflow_run_collection = mongodb.get_collection("workflow_run")
-        await workflow_run_collection.update_one(
-            {"_id": ObjectId(workflow_run_id)},
-            {"$set": workflow_run_update_data.model_dump(exclude_unset=True)},
-        )
-        logger.debug(
-            f"run_workflow_logic: workflow_run_update_data: {workflow_run_update_data}"
-        )
-
-        # 并行执行当前层的所有节点
-        for node_id in layer:
-            # 再次检查是否被终止
-            if await is_workflow_run_terminated(workflow_run_id):
-                logger.info(f"Workflow run terminated, id: {workflow_run_id}")
-                await user_logger.warning(
-                    "工作流执行被手动终止", workflow_id=workflow_id, work_node_id=node_id
-                )
-                return
+    async def stream_node_events():
+        """节点执行期间定时写入节点日志，并按节点上报的进度更新工作流进度"""
+        last_progress = None
+        while True:
+            await asyncio.sleep(float(WORKFLOW_LOG_STREAM_INTERVAL))
             try:
-                # 获取节点信息并创建节点实例
-                node = [n for n in workflow.nodes if n.uuid == node_id][0]
-                logger.info(
-                    f"[EXEC:{execution_id}] run_workflow_logic: running work node id: {node_id}, name: {node.name}"
-                )
-                
-                if len(node.name.split(":")) == 1:
-                    node_class = ALL_WORK_NODES.get(node.name)
-                else:
-                    # TODO @cgt 统筹处理和调试这一部分逻辑
-                    node_class_name = node.name.split(":")[0]
-                    node_class_db_id = node.name.split(":")[1]
-                    # TODO @cgt 这里还忽视了权限检查, 你在工作流运行前统一检查
-                    module = load_work_node_from_db(node_class_db_id)
-                    node_class = getattr(module, node_class_name)
-                    # TODO @cgt 工作流运行结束后要执行
-                    # unload_work_node_from_db(node_class_db_id)
-                    
-                node_instance = node_class()
+                for node_instance in list(running_nodes.values()):
+                    await node_instance._process_queued_logs()
+                progress = get_workflow_progress()
+                if running_nodes and progress != last_progress:
+                    last_progress = progress
+                    # 只更新运行中的工作流，避免覆盖已结束工作流的进度
+                    await mongodb.get_collection("workflow_run").update_one(
+                        {"_id": ObjectId(workflow_run_id), "status": WorkflowStatus.RUNNING},
+                        {"$set": {"progress": progress}},
+                    )
+            except Exception as e:
+                logger.warning(f"Failed to stream node logs, workflow_run_id: {workflow_run_id}, error: {e}")
+
+    async def run_node(node_id) -> bool:
+        """
+        执行单个节点，成功返回 True；失败时记录错误并标记工作流失败，返回 False
+        """
+        node = node_map[node_id]
+        node_instance = None
+        node_input_model = None
+        input_data = {}
+
+        try:
+            # 创建节点实例
+            logger.info(
+                f"[EXEC:{execution_id}] run_workflow_logic: running work node id: {node_id}, name: {node.name}"
+            )
+            
+            if len(node.name.split(":")) == 1:
+                # 延迟加载的节点在首次执行时导入模块，在线程中导入避免阻塞事件循环
+                node_class = await asyncio.to_thread(get_work_node_class, node.name)
+            else:
+                # TODO @cgt 统筹处理和调试这一部分逻辑
+                node_class_name = node.name.split(":")[0]
+                node_class_db_id = node.name.split(":")[1]
+                # TODO @cgt 这里还忽视了权限检查, 你在工作流运行前统一检查
+                module = load_work_node_from_db(node_class_db_id)
+                node_class = getattr(module, node_class_name)
+                # TODO @cgt 工作流运行结束后要执行
+                # unload_work_node_from_db(node_class_db_id)
                 
-                # 设置节点的日志上下文，使用户在节点中调用 self.log_info 等方法时能存储到数据库
-                node_instance._setup_logging_context(
-                    user_id=workflow_run.owner,
-                    workflow_run_id=workflow_run_id,
-                    work_node_id=node_id,
-                    workflow_id=workflow_id
-                )
+            node_instance = node_class()
+            node_instance.cancel_token = cancel_token
+            
+            # 设置节点的日志上下文，使用户在节点中调用 self.log_info 等方法时能存储到数据库
+            node_instance._setup_logging_context(
+                user_id=workflow_run.owner,
+                workflow_run_id=workflow_run_id,
+                work_node_id=node_id,
+                workflow_id=workflow_id
+            )
 
-                node_input_model = node_class.input_model()
-                # 注入静态的输入字段
-                input_data = node.static_input_data.copy()
+            node_input_model = node_class.input_model()
+            # 注入静态的输入字段
+            input_data = node.static_input_data.copy()
+            logger.debug(
+                f"[EXEC:{execution_id}] run_workflow_logic: got static input data: {input_data}"
+            )
+            # 注入动态的从前置节点获得的输入字段
+            previous_links = [
+                link for link in workflow.links if link.next_node_uuid == node.uuid
+            ]
+            # 直接读取上游输出的对应字段，已由上游输出模型校验过的字段不再重复校验
+            validated_fields = []
+            for link in previous_links:
+                link_start = time.perf_counter()
+                link_value, validated = resolve_link(
+                    node_outputs[link.previous_node_uuid],
+                    link.input_field_name,
+                    node_input_model,
+                    link.output_field_name,
+                )
+                input_data[link.output_field_name] = link_value
+                if validated:
+                    validated_fields.append(link.output_field_name)
+                link_stats.add_link(time.perf_counter() - link_start)
                 logger.debug(
-                    f"[EXEC:{execution_id}] run_workflow_logic: got static input data: {input_data}"
+                    f"[EXEC:{execution_id}] run_workflow_logic: got data from link: link_input_field_name: {link.input_field_name}, link_output_field_name: {link.output_field_name}"
                 )
-                # 注入动态的从前置节点获得的输入字段
-                previous_links = [
-                    link for link in workflow.links if link.next_node_uuid == node.uuid
-                ]
-                for link in previous_links:
-                    previous_node_uuid = link.previous_node_uuid
-                    target_input_data = (
-                        node_outputs[previous_node_uuid]
-                        .model_dump()
-                        .get(link.input_field_name)
-                    )
-                    logger.debug(
-                        f"[EXEC:{execution_id}] run_workflow_logic: got data from link: link_input_field_name: {link.input_field_name}, link_output_field_name: {link.output_field_name}, data: {target_input_data}"
-                    )
-                    input_data[link.output_field_name] = target_input_data
-                logger.info(
-                    f"[EXEC:{execution_id}] run_workflow_logic: running work node id: {node_id}, name: {node.name}, got input_data: {input_data}"
+            logger.info(
+                f"[EXEC:{execution_id}] run_workflow_logic: running work node id: {node_id}, name: {node.name}, got input fields: {list(input_data.keys())}"
+            )
+            
+             # 创建节点输入模型实例
+            input_start = time.perf_counter()
+            node_input = build_node_input(node_input_model, input_data, validated_fields)
+            link_stats.add_input(time.perf_counter() - input_start, len(validated_fields))
+            await user_logger.debug(
+                "节点输入数据", workflow_id=workflow_id, work_node_id=node_id, input_fields=list(input_data.keys())
+            )
+            # 判断node_input中是否存在start_date和end_date,如果存在的话，则获取时间范围，看看是否超过3年。
+            if hasattr(node_input, "start_date") and hasattr(node_input, "end_date"):
+                time_range = TimeUtil.get_time_range(start_time=node_input.start_date, end_time=node_input.end_date)
+                print(f"时间范围：{time_range}天")
+                if time_range > 3 * 365:
+                    error_msg = "开始时间和结束时间之间的时间范围不能超过3年"
+                    logger.error(error_msg)
+                    raise Exception(error_msg)
+
+            # 判断node_input中是否存在test_start_date和test_end_date,如果存在的话，则获取时间范围，看看是否超过3年。
+            if hasattr(node_input, "test_start_date") and hasattr(node_input, "test_end_date"):
+                time_range = TimeUtil.get_time_range(start_time=node_input.test_start_date, end_time=node_input.test_end_date)
+                print(f"时间范围：{time_range}天")
+                if time_range > 3 * 365:
+                    error_msg = "回测开始时间和回测结束时间之间的时间范围不能超过3年"
+                    logger.error(error_msg)
+                    raise Exception(error_msg)
+
+            # 判断node_input中是否存在predict_start_date和predict_end_date,如果存在的话，则获取时间范围，看看是否超过3年。
+            if hasattr(node_input, "predict_start_date") and hasattr(node_input, "predict_end_date"):
+                time_range = TimeUtil.get_time_range(start_time=node_input.predict_start_date, end_time=node_input.predict_end_date)
+                print(f"时间范围：{time_range}天")
+                if time_range > 3 * 365:
+                    error_msg = "预测开始时间和预测结束时间之间的时间范围不能超过3年"
+                    logger.error(error_msg)
+                    raise Exception(error_msg)
+
+            # 查询节点输出缓存（仅限已注册的内置节点，数据库加载的节点无法可靠计算代码指纹）
+            cache_key = None
+            cached_output = None
+            if len(node.name.split(":")) == 1 and is_node_cacheable(node_class):
+                as_of = None
+                if is_node_market_data(node_class):
+                    if "as_of" not in market_data_state:
+                        market_data_state["as_of"] = await get_market_data_as_of()
+                    as_of = market_data_state["as_of"]
+                cache_key = compute_node_cache_key(
+                    workflow_run.owner,
+                    node_class,
+                    node.static_input_data,
+                    [
+                        (link.output_field_name, link.input_field_name, node_fingerprints[link.previous_node_uuid])
+                        for link in previous_links
+                    ],
+                    as_of,
                 )
-                
-                 # 创建节点输入模型实例
-                node_input = node_input_model(**input_data)
-                await user_logger.debug(
-                    "节点输入数据", workflow_id=workflow_id, work_node_id=node_id, input_fields=list(input_data.keys())
+                cached_output = await get_cached_node_output(
+                    cache_key, node_class.output_model(), workflow_run_id
                 )
 
-                print("----------节点输入数据-------------")
-                print(node_input)
-                # 判断node_input中是否存在start_date和end_date,如果存在的话，则获取时间范围，看看是否超过3年。
-                if hasattr(node_input, "start_date") and hasattr(node_input, "end_date"):
-                    time_range = TimeUtil.get_time_range(start_time=node_input.start_date, end_time=node_input.end_date)
-                    print(f"时间范围：{time_range}天")
-                    if time_range > 3 * 365:
-                        error_msg = "开始时间和结束时间之间的时间范围不能超过3年"
-                        logger.error(error_msg)
-                        raise Exception(error_msg)
-
-                # 判断node_input中是否存在test_start_date和test_end_date,如果存在的话，则获取时间范围，看看是否超过3年。
-                if hasattr(node_input, "test_start_date") and hasattr(node_input, "test_end_date"):
-                    time_range = TimeUtil.get_time_range(start_time=node_input.test_start_date, end_time=node_input.test_end_date)
-                    print(f"时间范围：{time_range}天")
-                    if time_range > 3 * 365:
-                        error_msg = "回测开始时间和回测结束时间之间的时间范围不能超过3年"
-                        logger.error(error_msg)
-                        raise Exception(error_msg)
-
-                # 判断node_input中是否存在predict_start_date和predict_end_date,如果存在的话，则获取时间范围，看看是否超过3年。
-                if hasattr(node_input, "predict_start_date") and hasattr(node_input, "predict_end_date"):
-                    time_range = TimeUtil.get_time_range(start_time=node_input.predict_start_date, end_time=node_input.predict_end_date)
-                    print(f"时间范围：{time_range}天")
-                    if time_range > 3 * 365:
-                        error_msg = "预测开始时间和预测结束时间之间的时间范围不能超过3年"
-                        logger.error(error_msg)
-                        raise Exception(error_msg)
-
-                # 在线程池中执行节点的run方法
-                node_output = await run_in_threadpool(
-                    lambda: run_without_stdout(node_instance.run, node_input)
+            if cached_output is not None:
+                node_output, output_db_id = cached_output
+                await user_logger.info(
+                    f"节点 {node.name} 输入未变化，复用历史输出", workflow_id=workflow_id, work_node_id=node_id
+                )
+                node_outputs[node_id] = node_output
+            else:
+                # 在节点执行池中执行节点的run方法，数据库加载的节点无法在工作进程中导入，固定在线程中执行
+                resource = RESOURCE_LIGHT
+                if len(node.name.split(":")) == 1:
+                    resource = getattr(node_class, "__work_node_resource__", RESOURCE_LIGHT)
+                running_nodes[node_id] = node_instance
+                node_output = await NODE_WORKER_POOL.run_node(
+                    node_instance, node_input, workflow_id, resource, run_without_stdout
                 )
                 # 处理节点执行期间产生的队列日志
                 await node_instance._process_queued_logs()
                 await user_logger.info(
                     f"节点 {node.name} 执行成功", workflow_id=workflow_id, work_node_id=node_id, has_output=node_output is not None
                 )
-                
+
                 node_outputs[node_id] = node_output
                 # 保存节点输出到数据库
                 output_db_id = await save_output_to_db(
                     workflow_run_id, node_id, workflow_run.owner, node_output
                 )
-                node.output_db_id = output_db_id
-                # 更新成功节点
-                success_node_ids.append(node_id)
-                # 更新通过的连接
-                passed_link_ids.extend(link.uuid for link in previous_links)
-            except Exception as e:
-                failed_node_ids.append(node_id)
-                stack_trace = traceback.format_exc()
+                if cache_key is not None and output_db_id:
+                    await save_node_output_cache(
+                        cache_key, output_db_id, workflow_run.owner, node.name, workflow_run_id
+                    )
+            node.output_db_id = output_db_id
+
+            # 节点指纹供下游节点计算缓存键：可缓存节点使用缓存键，其余节点对输出取哈希
+            if cache_key is not None:
+                node_fingerprints[node_id] = cache_key
+            elif successor_dict[node_id]:
+                node_fingerprints[node_id] = await NODE_WORKER_POOL.run(
+                    RESOURCE_LIGHT, hash_node_output, node_output
+                )
+            # 更新成功节点
+            success_node_ids.append(node_id)
+            running_nodes.pop(node_id, None)
+            # 更新通过的连接
+            passed_link_ids.extend(link.uuid for link in previous_links)
+            return True
+        except Exception as e:
+            running_nodes.pop(node_id, None)
+            if cancel_token.is_cancelled():
+                # 工作流已被终止，节点响应取消而结束，不标记为失败
+                logger.info(f"Work node stopped by cancellation, id: {node_id}, error: {e}")
+                return False
+            failed_node_ids.append(node_id)
+            stack_trace = traceback.format_exc()
+
+            # 处理节点执行期间产生的队列日志（即使节点失败）
+            try:
+                await node_instance._process_queued_logs()
+            except Exception as log_error:
+                logger.warning(f"Failed to process queued logs for failed node {node_id}: {log_error}")
 
-                # 处理节点执行期间产生的队列日志（即使节点失败）
-                try:
-                    await node_instance._process_queued_logs()
-                except Exception as log_error:
-                    logger.warning(f"Failed to process queued logs for failed node {node_id}: {log_error}")
+            # 生成友好的错误信息
+            friendly_error = generate_friendly_error_message(
+                e, node, node_input_model, input_data
+            )
 
-                # 生成友好的错误信息
-                friendly_error = generate_friendly_error_message(
-                    e, node, node_input_model, input_data
-                )
+            # 记录错误信息
+            logger.error(
+                f"Error running workflow, id: {workflow_run_id}, failed node: {node_id} error: {e},\nstack_trace: {stack_trace}\n\n=== 错误分析与修复建议 ===\n{friendly_error}"
+            )
 
-                # 记录错误信息
-                logger.error(
-                    f"Error running workflow, id: {workflow_run_id}, failed node: {node_id} error: {e},\nstack_trace: {stack_trace}\n\n=== 错误分析与修复建议 ===\n{friendly_error}"
-                )
+            # 标记工作流运行失败
+            await mark_workflow_run_failed(
+                workflow_run_id, str(e), stack_trace, failed_node_ids
+            )
+            await user_logger.error(
+                f"节点 {node.name} 执行失败，报错信息: {e}",
+                workflow_id=workflow_id,
+                work_node_id=node_id,
+                node_name=node.name,
+                error=str(e),
+                suggestions=friendly_error,
+                error_detail=ErrorCode.get_error_by_message(error_msg=str(e))
+            )
+            # 更新工作流状态为失败
+            workflow_run_update_data = WorkflowRunUpdateModel(
+                status=WorkflowStatus.FAILED,
+                failed_node_ids=failed_node_ids,
+                last_error_message=str(e),
+                last_error_stacktrace=stack_trace,
+                link_stats=link_stats.to_dict(),
+            )
+            workflow_run_collection = mongodb.get_collection("workflow_run")
+            await workflow_run_collection.update_one(
+                {"_id": ObjectId(workflow_run_id)},
+                {"$set": workflow_run_update_data.model_dump(exclude_unset=True)},
+            )
+            return False
+
+    # 按依赖关系调度：节点的前置节点全部完成后立即开始执行，不等待整层结束
+    successor_dict = {node_id: [] for node_id in node_map}
+    waiting_count = {node_id: 0 for node_id in node_map}
+    for link in workflow.links:
+        successor_dict[link.previous_node_uuid].append(link.next_node_uuid)
+        waiting_count[link.next_node_uuid] += 1
+    ready_node_ids = deque(execution_layers[0])
+    running_tasks: dict[asyncio.Task, str] = {}
+    node_concurrency = max(1, int(WORKFLOW_NODE_CONCURRENCY))
+    # 终止请求到达时立即结束等待，不再在每个节点前查询数据库；节点通过取消令牌在运行中响应终止
+    cancel_token = CANCELLATION_REGISTRY.register(workflow_run_id)
+    cancel_waiter = asyncio.create_task(CANCELLATION_REGISTRY.wait(workflow_run_id))
+    event_streamer = asyncio.create_task(stream_node_events())
 
-                # 标记工作流运行失败
-                await mark_workflow_run_failed(
-                    workflow_run_id, str(e), stack_trace, failed_node_ids
+    try:
+        while ready_node_ids or running_tasks:
+            if cancel_token.is_cancelled():
+                logger.info(f"Workflow run terminated, id: {workflow_run_id}")
+                await user_logger.warning("工作流执行被手动终止", workflow_id=workflow_id)
+                return
+
+            # 启动已就绪的节点，单个工作流同时运行的节点数不超过 node_concurrency
+            started_node_ids = []
+            while ready_node_ids and len(running_tasks) < node_concurrency:
+                node_id = ready_node_ids.popleft()
+                running_tasks[asyncio.create_task(run_node(node_id))] = node_id
+                started_node_ids.append(node_id)
+
+            if started_node_ids:
+                logger.info(
+                    f"[EXEC:{execution_id}] run_workflow_logic: starting nodes: {started_node_ids}"
                 )
-                await user_logger.error(
-                    f"节点 {node.name} 执行失败，报错信息: {e}",
+                await user_logger.info(
+                    "开始执行节点",
                     workflow_id=workflow_id,
-                    work_node_id=node_id,
-                    node_name=node.name,
-                    error=str(e),
-                    suggestions=friendly_error,
-                    error_detail=ErrorCode.get_error_by_message(error_msg=str(e))
+                    started_nodes=len(started_node_ids),
+                    running_nodes=len(running_tasks),
                 )
-                # 更新工作流状态为失败
+
+                # 计算并更新工作流执行进度
                 workflow_run_update_data = WorkflowRunUpdateModel(
-                    status=WorkflowStatus.FAILED,
+                    status=WorkflowStatus.RUNNING,
+                    progress=get_workflow_progress(),
+                    running_node_ids=list(running_tasks.values()),
                     failed_node_ids=failed_node_ids,
-                    last_error_message=str(e),
-                    last_error_stacktrace=stack_trace,
+                    success_node_ids=success_node_ids,
+                    passed_link_ids=passed_link_ids,
                 )
                 workflow_run_collection = mongodb.get_collection("workflow_run")
                 await workflow_run_collection.update_one(
                     {"_id": ObjectId(workflow_run_id)},
                     {"$set": workflow_run_update_data.model_dump(exclude_unset=True)},
                 )
-                return
+                logger.debug(
+                    f"run_workflow_logic: workflow_run_update_data: {workflow_run_update_data}"
+                )
+
+            done_tasks, _ = await asyncio.wait(
+                [*running_tasks.keys(), cancel_waiter], return_when=asyncio.FIRST_COMPLETED
+            )
+            if cancel_token.is_cancelled():
+                # 回到循环开始处理终止
+                continue
+            for task in done_tasks:
+                node_id = running_tasks.pop(task)
+                if not task.result():
+                    return
+                for successor in successor_dict[node_id]:
+                    waiting_count[successor] -= 1
+                    if waiting_count[successor] == 0:
+                        ready_node_ids.append(successor)
+    finally:
+        # 工作流失败或被终止时，不再等待其余运行中的节点，并通知节点尽快结束以释放执行线程/进程
+        cancel_waiter.cancel()
+        event_streamer.cancel()
+        if running_tasks:
+            cancel_token.cancel("工作流已结束")
+        for task in running_tasks:
+            task.cancel()
+        CANCELLATION_REGISTRY.unregister(workflow_run_id)
+
     # 所有节点执行成功，更新工作流状态
     logger.info(
         f"run_workflow_logic: all nodes executed successfully, workflow_run_id: {workflow_run_id}"
@@ -454,22 +634,15 @@ async def run_workflow_in_background(workflow_run_id):
         success_node_ids=[node.uuid for node in workflow.nodes],
         passed_link_ids=[link.uuid for link in workflow.links],
         output_data_obj={node.uuid: node.output_db_id for node in workflow.nodes},
+        link_stats=link_stats.to_dict(),
     )
     workflow_run_collection = mongodb.get_collection("workflow_run")
     await workflow_run_collection.update_one(
         {"_id": ObjectId(workflow_run_id)},
         {"$set": workflow_run_update_data.model_dump(exclude_unset=True)},
     )
-
-
-async def is_workflow_run_terminated(workflow_run_id):
-    workflow_run_collection = mongodb.get_collection("workflow_run")
-    workflow_run_query_result = await workflow_run_collection.find_one(
-        {"_id": ObjectId(workflow_run_id)}
-    )
-    if workflow_run_query_result.get("status") == WorkflowStatus.MANUAL_STOP:
-        return True
-    return False
+    # 按过期时间、总大小淘汰节点输出缓存
+    await maybe_evict_node_output_cache()
 
 
 async def save_output_to_db(workflow_run_id, node_id, owner, node_output) -> str:
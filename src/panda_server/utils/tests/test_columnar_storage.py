@@ -0,0 +1,65 @@
+import io
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from panda_server.utils import columnar_storage
+
+pytest.importorskip("pyarrow")
+
+
+def build_output():
+    df = pd.DataFrame({
+        "date": pd.date_range("2024-01-01", periods=5000, freq="min"),
+        "symbol": ["%06d.SZ" % (i % 300) for i in range(5000)],
+        "factor": np.arange(5000) * 0.5,
+    })
+    return {
+        "df": df,
+        "result": {"frames": [df.set_index(["date", "symbol"]), "note"]},
+        "small": df.head(3),
+        "params": {"window": 5},
+    }
+
+
+def test_round_trip_and_partial_read():
+    output = build_output()
+    raw_bytes, manifest = columnar_storage.encode(output, min_rows=1000, row_group_rows=1000)
+    assert [info["locator"] for info in manifest["frames"]] == ["df", "result.frames.0"]
+    assert manifest["frames"][0]["row_groups"] == [1000] * 5
+
+    file = io.BytesIO(raw_bytes)
+    restored = columnar_storage.decode(file, manifest)
+    pd.testing.assert_frame_equal(restored["df"], output["df"])
+    pd.testing.assert_frame_equal(restored["result"]["frames"][0], output["result"]["frames"][0])
+    pd.testing.assert_frame_equal(restored["small"], output["small"])
+    assert restored["params"] == {"window": 5}
+
+    # 跨行组读取部分列
+    frame, total = columnar_storage.read_partial(file, manifest, "df", ["factor"], 990, 1010)
+    assert total == 5000
+    pd.testing.assert_frame_equal(frame, output["df"][["factor"]].iloc[990:1010])
+
+    frame, total = columnar_storage.read_partial(file, manifest, "result.frames.0", None, 4998, 6000)
+    pd.testing.assert_frame_equal(frame, output["result"]["frames"][0].iloc[4998:])
+
+    series, total = columnar_storage.read_partial(file, manifest, "df.symbol", None, 0, 2)
+    assert series.tolist() == ["000000.SZ", "000001.SZ"]
+
+    value, total = columnar_storage.read_partial(file, manifest, "params.window")
+    assert value == 5 and total is None
+
+    with pytest.raises(KeyError):
+        columnar_storage.read_partial(file, manifest, "df", ["missing"])
+
+
+def test_fallback_to_pickle():
+    # 没有足够大的 DataFrame、或 DataFrame 无法无损转换时整体使用 cloudpickle
+    assert columnar_storage.encode({"small": pd.DataFrame({"a": [1, 2]})}) is None
+    assert columnar_storage.encode({"nested": pd.DataFrame({"a": [[1, 2]] * 2000})}) is None
+    assert columnar_storage.encode([1, 2, 3]) is None
+
+    summary = columnar_storage.summarize_object({"df": pd.DataFrame({"a": [1, 2]})})
+    assert summary == [{"locator": "df", "rows": 2, "columns": [{"name": "a", "dtype": "int64"}],
+                        "stored_bytes": None}]
@@ -0,0 +1,77 @@
+from typing import List, Optional
+
+import pandas as pd
+from pydantic import BaseModel, ConfigDict
+
+from panda_server.utils.node_link_utils import LinkStats, build_node_input, resolve_link, resolve_link_value
+
+
+class Params(BaseModel):
+    window: int = 5
+
+
+class UpstreamOutput(BaseModel):
+    model_config = ConfigDict(arbitrary_types_allowed=True)
+
+    df: pd.DataFrame
+    codes: List[str]
+    params: Params
+
+
+class DownstreamInput(BaseModel):
+    model_config = ConfigDict(arbitrary_types_allowed=True)
+
+    df: pd.DataFrame
+    codes: List[str]
+    params: Params
+    top_n: int = 10
+    name: Optional[str] = None
+
+
+def test_resolve_link_value_matches_model_dump_and_shares_dataframe():
+    output = UpstreamOutput(df=pd.DataFrame({"a": [1.0, 2.0]}), codes=["000001"], params=Params(window=3))
+
+    assert resolve_link_value(output, "params") == output.model_dump()["params"]
+    assert resolve_link_value(output, "missing") is None
+
+    df = resolve_link_value(output, "df")
+    df.loc[0, "a"] = 100.0
+    df["b"] = 1
+    assert output.df["a"].tolist() == [1.0, 2.0] and list(output.df.columns) == ["a"]
+
+
+def test_build_node_input_skips_validated_fields():
+    output = UpstreamOutput(df=pd.DataFrame({"a": [1.0]}), codes=["000001", "000002"], params=Params())
+    input_data = {}
+    validated_fields = []
+    for field in ("df", "codes", "params"):
+        input_data[field], validated = resolve_link(output, field, DownstreamInput, field)
+        if validated:
+            validated_fields.append(field)
+    # 嵌套模型已转换为 dict，需要重新校验
+    assert validated_fields == ["df", "codes"]
+
+    input_data["top_n"] = "20"
+    node_input = build_node_input(DownstreamInput, input_data, validated_fields)
+
+    assert node_input.codes is input_data["codes"]
+    assert node_input.params == Params() and node_input.top_n == 20 and node_input.name is None
+    assert node_input.model_fields_set == {"df", "codes", "params", "top_n"}
+
+
+def test_dataframe_passed_through_without_copy_on_write(monkeypatch):
+    monkeypatch.setattr("panda_server.utils.node_link_utils.is_copy_on_write_enabled", lambda: False)
+    output = UpstreamOutput(df=pd.DataFrame({"a": [1.0, 2.0]}), codes=[], params=Params())
+
+    # 与 model_dump 一致传递原对象，不额外复制
+    assert resolve_link_value(output, "df") is output.df
+
+
+def test_link_stats_report_peak_memory_increase_of_the_run(monkeypatch):
+    peak_list = [500.0, 620.0]
+    monkeypatch.setattr("panda_server.utils.node_link_utils.get_peak_memory_mb", lambda: peak_list.pop(0))
+
+    stats = LinkStats().to_dict()
+
+    assert stats["process_peak_memory_mb"] == 620.0
+    assert stats["peak_memory_increase_mb"] == 120.0
@@ -0,0 +1,52 @@
+import pytest
+from bson import ObjectId
+
+from panda_plugins.base import BaseWorkNode, work_node
+from panda_server.utils import node_output_cache
+from panda_server.utils.node_output_cache import (
+    compute_node_cache_key,
+    get_referenced_file_ids,
+    is_node_cacheable,
+    is_node_market_data,
+)
+
+
+class FakeRunCollection:
+    def __init__(self, run_ids):
+        self.run_ids = run_ids
+
+    async def find(self, query, projection):
+        for run_id in query["_id"]["$in"]:
+            if str(run_id) in self.run_ids:
+                yield {"_id": run_id}
+
+
+def test_nodes_are_not_cacheable_by_default():
+    @work_node(name="默认不缓存", group="测试")
+    class DefaultNode(BaseWorkNode):
+        pass
+
+    @work_node(name="行情节点", group="测试", cacheable=True, market_data=True)
+    class MarketNode(BaseWorkNode):
+        pass
+
+    assert not is_node_cacheable(DefaultNode)
+    assert is_node_cacheable(MarketNode) and is_node_market_data(MarketNode)
+    # 行情更新后缓存键变化
+    assert compute_node_cache_key("u", MarketNode, {}, [], "20250102") != compute_node_cache_key(
+        "u", MarketNode, {}, [], "20250103"
+    )
+
+
+@pytest.mark.asyncio
+async def test_evicted_file_kept_while_any_run_references_it(monkeypatch):
+    live_run, deleted_run = str(ObjectId()), str(ObjectId())
+    monkeypatch.setattr(
+        node_output_cache.mongodb, "get_collection", lambda name: FakeRunCollection({live_run})
+    )
+    entry_list = [
+        {"file_id": "reused", "run_ids": [deleted_run, live_run]},
+        {"file_id": "orphan", "run_ids": [deleted_run]},
+        {"file_id": "legacy"},
+    ]
+    assert await get_referenced_file_ids(entry_list) == {"reused", "legacy"}
@@ -0,0 +1,101 @@
+import os
+from typing import Optional, Type
+
+import pytest
+from pydantic import BaseModel
+
+from panda_plugins.base.base_work_node import BaseWorkNode
+from panda_server.utils.node_worker_pool import (
+    RESOURCE_CPU,
+    RESOURCE_LIGHT,
+    RESOURCE_MEMORY,
+    NodeWorkerPool,
+)
+
+pytestmark = pytest.mark.asyncio
+
+
+class SquareInput(BaseModel):
+    value: int
+
+
+class SquareOutput(BaseModel):
+    value: int
+    pid: int
+
+
+class SquareNode(BaseWorkNode):
+    @classmethod
+    def input_model(cls) -> Optional[Type[BaseModel]]:
+        return SquareInput
+
+    @classmethod
+    def output_model(cls) -> Optional[Type[BaseModel]]:
+        return SquareOutput
+
+    def run(self, input: SquareInput) -> SquareOutput:
+        if input.value < 0:
+            self.log_warning("negative value", value=input.value)
+            raise ValueError("value must not be negative")
+        if input.value == 13:
+            # 模拟工作进程被系统杀死
+            os._exit(1)
+        self.log_info("square", value=input.value)
+        self.report_progress(0.5, eta=1.0)
+        return SquareOutput(value=input.value * input.value, pid=os.getpid())
+
+
+def run_direct(func, *args):
+    return func(*args)
+
+
+@pytest.fixture
+def pool():
+    pool = NodeWorkerPool(thread_workers=2, cpu_workers=2, memory_workers=1, max_tasks_per_child=2)
+    yield pool
+    pool.shutdown()
+
+
+async def test_run_node_in_thread_and_process(pool):
+    node = SquareNode()
+    output = await pool.run_node(node, SquareInput(value=3), "wf", RESOURCE_LIGHT, run_direct)
+    assert output.value == 9 and output.pid == os.getpid()
+
+    node = SquareNode()
+    output = await pool.run_node(node, SquareInput(value=4), "wf", RESOURCE_CPU, run_direct)
+    assert output.value == 16 and output.pid != os.getpid()
+    # 工作进程中的用户日志与进度转发到服务进程的节点实例
+    assert node.get_progress() == 0.5
+    log_entries = node._drain_queued_logs()
+    assert [entry["message"] for entry in log_entries] == ["square"]
+    assert log_entries[0]["workflow_id"] == "wf"
+
+    # 每个工作进程执行 2 个节点后被替换
+    pid_set = set()
+    for value in range(6):
+        output = await pool.run_node(SquareNode(), SquareInput(value=value), "wf", RESOURCE_MEMORY, run_direct)
+        pid_set.add(output.pid)
+    assert len(pid_set) == 3
+
+    stats = pool.get_stats()
+    assert stats[RESOURCE_CPU]["completed"] == 1
+    assert stats[RESOURCE_MEMORY]["completed"] == 6
+    assert stats[RESOURCE_MEMORY]["queue_depth"] == 0
+    assert sum(worker["tasks"] for worker in stats[RESOURCE_MEMORY]["worker_utilisation"].values()) == 6
+
+
+async def test_node_error_and_broken_worker(pool):
+    node = SquareNode()
+    with pytest.raises(ValueError) as exc_info:
+        await pool.run_node(node, SquareInput(value=-1), "wf", RESOURCE_CPU, run_direct)
+    assert "worker process" in exc_info.value.__notes__[0]
+    assert [entry["message"] for entry in node._drain_queued_logs()] == ["negative value"]
+
+    # 工作进程异常退出后进程池重建，后续节点正常执行
+    with pytest.raises(Exception):
+        await pool.run_node(SquareNode(), SquareInput(value=13), "wf", RESOURCE_CPU, run_direct)
+    output = await pool.run_node(SquareNode(), SquareInput(value=5), "wf", RESOURCE_CPU, run_direct)
+    assert output.value == 25
+    stats = pool.get_stats()[RESOURCE_CPU]
+    # 节点自身抛出的异常不计入通道失败次数
+    assert stats["restarted"] == 1 and stats["failed"] == 1
@@ -0,0 +1,35 @@
+from panda_plugins.base import BaseWorkNode
+from panda_server.utils.run_workflow_utils import compute_workflow_progress
+
+
+class ProgressNode(BaseWorkNode):
+    @classmethod
+    def input_model(cls):
+        return None
+
+    @classmethod
+    def output_model(cls):
+        return None
+
+    def run(self, input):
+        return None
+
+
+def test_workflow_progress_across_layers():
+    # 执行层：[a, b] -> [c] -> [d]
+    execution_layers = [["a", "b"], ["c"], ["d"]]
+    node_count = sum(len(layer) for layer in execution_layers)
+    success_node_ids = []
+    progress_list = []
+
+    for layer in execution_layers:
+        running_nodes = {node_id: ProgressNode() for node_id in layer}
+        for node_instance in running_nodes.values():
+            node_instance.report_progress(0.5)
+        progress_list.append(compute_workflow_progress(
+            len(success_node_ids), [node.get_progress() for node in running_nodes.values()], node_count))
+        success_node_ids.extend(layer)
+
+    assert progress_list == [25.0, 62.5, 87.5]
+    assert compute_workflow_progress(len(success_node_ids), [], node_count) == 100.0
+    assert compute_workflow_progress(0, [], 0) == 0.0
@@ -0,0 +1,37 @@
+import asyncio
+import pickle
+
+import pytest
+
+from panda_plugins.base.cancellation import CancellationToken, WorkflowCancelledError
+from panda_server.utils.workflow_cancellation import WorkflowCancellationRegistry
+
+
+def test_token_crosses_process_boundary(tmp_path):
+    token = CancellationToken(marker_path=str(tmp_path / "run"), check_interval=0)
+    remote_token = pickle.loads(pickle.dumps(token))
+    assert not remote_token.is_cancelled()
+
+    token.cancel("stop")
+    # 反序列化后的令牌只能通过标记文件得知取消
+    assert remote_token.is_cancelled()
+    with pytest.raises(WorkflowCancelledError):
+        remote_token.raise_if_cancelled()
+    assert pickle.loads(pickle.dumps(token)).is_cancelled()
+
+
+@pytest.mark.asyncio
+async def test_registry_cancel_wakes_waiter(tmp_path, monkeypatch):
+    monkeypatch.setattr("panda_server.utils.workflow_cancellation.CANCEL_MARKER_DIR", str(tmp_path))
+    registry = WorkflowCancellationRegistry(poll_interval=0)
+    token = registry.register("run-1")
+    waiter = asyncio.create_task(registry.wait("run-1"))
+    await asyncio.sleep(0)
+    assert not waiter.done()
+
+    assert registry.cancel("run-1", "stop")
+    await asyncio.wait_for(waiter, 1)
+    assert token.is_cancelled() and (tmp_path / "run-1").exists()
+
+    registry.unregister("run-1")
+    assert not registry.cancel("run-1")
@@ -0,0 +1,163 @@
+"""
+工作流运行取消登记表
+
+每个正在本进程执行的工作流运行登记一个取消令牌（CancellationToken），终止请求通过以下途径送达：
+- 终止接口与执行在同一进程（LOCAL 模式、SERVER_ROLE=ALL）时直接调用 cancel
+- CLOUD 模式下终止接口向 fanout 交换机广播，所有消费者进程收到后调用 cancel
+- 兜底：后台任务每隔 WORKFLOW_CANCEL_POLL_INTERVAL 秒用一次查询检查本进程全部运行中的工作流状态
+执行器等待令牌对应的 asyncio.Event，不再在每个节点前查询数据库。
+"""
+import asyncio
+import datetime
+import json
+import logging
+import os
+import tempfile
+import time
+from typing import Dict, Optional
+
+from aio_pika import DeliveryMode, ExchangeType
+from bson import ObjectId
+
+from panda_plugins.base.cancellation import CancellationToken
+from panda_server.config.database import mongodb
+from panda_server.config.env import WORKFLOW_CANCEL_EXCHANGE_NAME, WORKFLOW_CANCEL_POLL_INTERVAL
+from panda_server.enums.workflow_run_status import WorkflowStatus
+
+logger = logging.getLogger(__name__)
+
+# 取消标记文件目录，工作进程中的节点通过标记文件得知取消
+CANCEL_MARKER_DIR = os.path.join(tempfile.gettempdir(), "panda_workflow_cancel")
+# 标记文件保留时间（秒），期间工作进程中仍在运行的节点可以读到
+CANCEL_MARKER_TTL = 3600
+
+
+class WorkflowCancellationRegistry:
+    """本进程内工作流运行的取消令牌，所有方法需在事件循环线程中调用"""
+
+    _instance: Optional["WorkflowCancellationRegistry"] = None
+
+    def __init__(self, poll_interval: float):
+        self.poll_interval = poll_interval
+        self.tokens: Dict[str, CancellationToken] = {}
+        self.events: Dict[str, asyncio.Event] = {}
+        self.watch_task: Optional[asyncio.Task] = None
+        self.listen_task: Optional[asyncio.Task] = None
+
+    @classmethod
+    def get_instance(cls) -> "WorkflowCancellationRegistry":
+        if cls._instance is None:
+            cls._instance = WorkflowCancellationRegistry(float(WORKFLOW_CANCEL_POLL_INTERVAL))
+        return cls._instance
+
+    def register(self, workflow_run_id: str) -> CancellationToken:
+        """登记开始执行的工作流运行，返回其取消令牌"""
+        token = CancellationToken(marker_path=os.path.join(CANCEL_MARKER_DIR, workflow_run_id))
+        self.tokens[workflow_run_id] = token
+        self.events[workflow_run_id] = asyncio.Event()
+        if self.poll_interval > 0 and (self.watch_task is None or self.watch_task.done()):
+            self.watch_task = asyncio.create_task(self._watch())
+        return token
+
+    def unregister(self, workflow_run_id: str):
+        self.tokens.pop(workflow_run_id, None)
+        self.events.pop(workflow_run_id, None)
+
+    def cancel(self, workflow_run_id: str, reason: Optional[str] = None) -> bool:
+        """
+        取消工作流运行，运行不在本进程执行时返回 False
+        """
+        token = self.tokens.get(workflow_run_id)
+        if token is None:
+            return False
+        token.cancel(reason)
+        self.events[workflow_run_id].set()
+        logger.info(f"Workflow run cancelled, id: {workflow_run_id}, reason: {reason}")
+        return True
+
+    async def wait(self, workflow_run_id: str):
+        """等待工作流运行被取消"""
+        await self.events[workflow_run_id].wait()
+
+    async def _watch(self):
+        """兜底检查：终止广播丢失或未启用时，由数据库中的状态发现终止"""
+        while self.tokens:
+            await asyncio.sleep(self.poll_interval)
+            try:
+                workflow_run_ids = [key for key, token in self.tokens.items() if not token.is_cancelled()]
+                if workflow_run_ids:
+                    cursor = mongodb.get_collection("workflow_run").find(
+                        {
+                            "_id": {"$in": [ObjectId(key) for key in workflow_run_ids]},
+                            "status": WorkflowStatus.MANUAL_STOP,
+                        },
+                        {"_id": 1},
+                    )
+                    async for doc in cursor:
+                        self.cancel(str(doc["_id"]), "工作流已被手动终止")
+                self._remove_expired_markers()
+            except Exception as e:
+                logger.warning(f"Failed to check terminated workflow runs: {e}")
+
+    def _remove_expired_markers(self):
+        if not os.path.isdir(CANCEL_MARKER_DIR):
+            return
+        expire_time = time.time() - CANCEL_MARKER_TTL
+        for name in os.listdir(CANCEL_MARKER_DIR):
+            path = os.path.join(CANCEL_MARKER_DIR, name)
+            try:
+                if name not in self.tokens and os.path.getmtime(path) < expire_time:
+                    os.remove(path)
+            except OSError:
+                pass
+
+    async def broadcast(self, workflow_run_id: str):
+        """CLOUD 模式：通知所有消费者进程取消工作流运行"""
+        # messaging 包导入时会导入工作流执行器，在此处导入以避免循环导入
+        from panda_server.messaging.rabbitmq_client import AsyncRabbitMQ
+
+        rabbitmq = AsyncRabbitMQ()
+        message = json.dumps(
+            {
+                "time": datetime.datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
+                "type": "cancel_workflow",
+                "content": workflow_run_id,
+            }
+        )
+        try:
+            await rabbitmq.publish(
+                exchange_name=WORKFLOW_CANCEL_EXCHANGE_NAME,
+                routing_key="",
+                message=message,
+                exchange_type=ExchangeType.FANOUT,
+                delivery_mode=DeliveryMode.NOT_PERSISTENT,
+            )
+        finally:
+            await rabbitmq.close()
+
+    def start_listener(self, client: "AsyncRabbitMQ"):
+        """消费者进程启动时调用，接收终止广播"""
+        if self.listen_task is None or self.listen_task.done():
+            self.listen_task = asyncio.create_task(self._listen(client))
+
+    async def _listen(self, client: "AsyncRabbitMQ"):
+        try:
+            await client.connect()
+            channel = await client.connection.channel()
+            exchange = await channel.declare_exchange(
+                WORKFLOW_CANCEL_EXCHANGE_NAME, ExchangeType.FANOUT, durable=True
+            )
+            # 每个进程一个独占队列，进程退出后自动删除
+            queue = await channel.declare_queue(exclusive=True, auto_delete=True)
+            await queue.bind(exchange)
+            logger.info(f"Listening for workflow cancel messages on exchange: {WORKFLOW_CANCEL_EXCHANGE_NAME}")
+            async with queue.iterator(no_ack=True) as queue_iter:
+                async for message in queue_iter:
+                    try:
+                        data = json.loads(message.body.decode())
+                        self.cancel(data["content"], "工作流已被手动终止")
+                    except Exception as e:
+                        logger.error(f"Error processing workflow cancel message: {e}")
+        except Exception as e:
+            # 广播不可用时仍由数据库兜底检查发现终止
+            logger.error(f"Workflow cancel listener stopped: {e}")
@@ -0,0 +1,55 @@
+import importlib.util
+import json
+import os
+
+# panda_trading.trading 包初始化会加载期货数据模块（依赖 intervaltree），这里直接按文件加载缓存模块
+_spec = importlib.util.spec_from_file_location(
+    "future_tick_quote_cache",
+    os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+                 "trading", "quotation", "real_time", "future_tick_quote_cache.py"))
+future_tick_quote_cache = importlib.util.module_from_spec(_spec)
+_spec.loader.exec_module(future_tick_quote_cache)
+FutureTickQuoteCache = future_tick_quote_cache.FutureTickQuoteCache
+
+
+def make_tick(symbol, time, last):
+    tick = dict(symbol=symbol, date=20250102, time=time, trade_date=20250102, publish_time=1.0)
+    for field in future_tick_quote_cache._FLOAT_FIELDS:
+        tick[field] = last
+    return tick
+
+
+class FakeRedisClient(object):
+    def __init__(self, tick_dict):
+        self.tick_dict = tick_dict
+        self.read_count = 0
+
+    def getHashRedis(self, key, field):
+        self.read_count += 1
+        tick = self.tick_dict.get(field.decode())
+        return json.dumps(tick) if tick else None
+
+
+def test_cold_start_reads_redis_once_and_returns_copies():
+    redis_client = FakeRedisClient({'RB2505.SHF': make_tick('RB2505.SHF', 93000, 3500.0)})
+    cache = FutureTickQuoteCache(redis_client, push_enabled=False)
+    cache.subscribed = True
+
+    bar = cache.get('RB2505.SHF')
+    bar.last = 0.0
+    assert cache.get('RB2505.SHF').last == 3500.0
+    assert redis_client.read_count == 1
+    assert cache.get('AU2506.SHF') is None
+
+
+def test_push_keeps_latest_tick_and_ignores_bad_messages():
+    cache = FutureTickQuoteCache(FakeRedisClient({}), push_enabled=False)
+    cache.subscribed = True
+
+    cache.on_message(json.dumps(make_tick('RB2505.SHF', 93001, 3501.0)))
+    # 乱序到达的旧行情不覆盖
+    cache.on_message(json.dumps(make_tick('RB2505.SHF', 93000, 3500.0)))
+    cache.on_message('not json')
+
+    assert cache.get('RB2505.SHF').last == 3501.0
+    assert cache.get_stats()['push_count'] == 2
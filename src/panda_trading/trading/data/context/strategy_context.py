@@ -69,6 +69,7 @@ class StrategyContext(object):
         self.run_info.future_account = handle_message.setdefault('future_account_id', '5588')
         self.run_info.product_id = handle_message.setdefault('product_id', None)
         self.run_info.product_name = handle_message.setdefault('product_name', None)
+        self.run_info.history_bar_size = handle_message.setdefault('history_bar_size', 500)
         standard_info_list = self.run_info.benchmark.split('.')
         if len(standard_info_list) != 2:
             self.run_info.standard_type = 0
@@ -4,11 +4,11 @@ import time
 from common.connector.mongodb_handler import DatabaseHandler as MongoClient
 
 from panda_backtest.backtest_common.data.quotation.quotation_data import QuotationData
-from panda_trading.trading.quotation.ctp.tushare.tushare_future_tick_quotation import TushareFutureTickQuotation
+from panda_trading.trading.quotation.tushare.tushare_future_tick_quotation import TushareFutureTickQuotation
 from panda_trading.trading.system.trade_time_manager import TradeTimeManager
 
 from common.connector.redis_client import RedisClient
-from panda_trading.trading_account_monitor.quotation.real_time_bar_map import RealTimeBarMap
+from panda_trading.trading.quotation.real_time.real_time_bar_map import RealTimeBarMap
 import  common.config as config
 class ReverseEventProcess(object):
     def __init__(self, context):
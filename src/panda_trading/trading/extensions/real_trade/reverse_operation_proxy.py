@@ -1,6 +1,7 @@
 from panda_backtest.backtest_common.exception.error_exception import ErrorException
 from panda_backtest.backtest_common.system.event.event import *
 from panda_backtest.backtest_common.data.quotation.quotation_data import QuotationData
+from panda_backtest.backtest_common.data.quotation.bar_history import BarHistory
 
 from common.connector.mongodb_handler import DatabaseHandler as MongoClient
 from common.connector.redis_client import RedisClient
@@ -26,9 +27,11 @@ class ReverseOperationProxy(object):
         self.redis_client = RedisClient()
         self.strategy_sub_pub = StrategySubPub()
         self.strategy_sub_flag = False
+        self.bar_history = None
 
     def init_data(self):
         strategy_context = self.context.strategy_context
+        self.bar_history = BarHistory(strategy_context.run_info.history_bar_size)
         self.future_trade_api = FutureTradeApi()
         self.all_trade_reverse_result = AllTradeReverseResult()
         strategy_context.init_all_result(self.all_trade_reverse_result)
@@ -137,6 +140,7 @@ class ReverseOperationProxy(object):
     def sys_handle_bar(self):
         quotation_data = QuotationData.get_instance()
         data = quotation_data.bar_dict
+        self.bar_history.on_bar(data, self.context.strategy_context.trade_time)
         try:
             event = Event(
                 ConstantEvent.STRATEGY_HANDLE_BAR,
@@ -213,7 +217,16 @@ class ReverseOperationProxy(object):
             SRLogger.error(e.message)
 
     def subscribe(self, symbol_list):
-        pass
+        self.bar_history.track(symbol_list)
+
+    def history_bars(self, symbol, n, fields=None, frequency=None):
+        # 实盘按交易信号推送 bar，不区分频率
+        self.bar_history.track(symbol)
+        return self.bar_history.history_bars(symbol, n, fields)
+
+    def rolling_window(self, symbol, field, window):
+        self.bar_history.track(symbol)
+        return self.bar_history.rolling(symbol, field, window)
 
     def place_order(self, account_id, order):
         """
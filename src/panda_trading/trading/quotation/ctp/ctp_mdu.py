@@ -21,6 +21,7 @@ from panda_backtest.backtest_common.data.future.future_info_map import FutureInf
 from panda_backtest.backtest_common.model.quotation.bar_quotation_data import BarQuotationData
 from common.connector.mongodb_handler import DatabaseHandler as MongoClient
 from common.connector.redis_client import RedisClient
+from panda_trading.trading.quotation.real_time.future_tick_quote_cache import FUTURE_TICK_QUOTATION_KEY
 from panda_trading.trading.util.symbol_util import SymbolUtil
 from utils.data.data_util import DateUtil
 from utils.thread.thread_util import ThreadUtil
@@ -118,9 +119,10 @@ class MdSpi(ctp.CThostFtdcMdSpi):
             if bar_quotation_data is None:
                 return
             key = bar_quotation_data.symbol
-            print("********+"+key)
-            self.__redis_client.setHashRedis('tushare_future_tick_quotation', key,
-                                             json.dumps(bar_quotation_data.__dict__))
+            bar_quotation_data.publish_time = time.time()
+            # 写入 hash 供冷启动读取，同时推送给交易进程的行情缓存
+            self.__redis_client.setHashAndPublic(FUTURE_TICK_QUOTATION_KEY, key,
+                                                 json.dumps(bar_quotation_data.__dict__), FUTURE_TICK_QUOTATION_KEY)
         except Exception as e:
             mes = traceback.format_exc()
             print(mes)
@@ -0,0 +1,127 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+# @File   : future_tick_quote_cache.py
+# @desc   : 实盘期货最新行情的进程内缓存
+#
+# 行情进程（ctp_mdu）把每笔行情写入 Redis hash 的同时发布到同名频道，
+# 交易进程中的后台线程订阅该频道，按合约保存最新一笔行情，策略读取 bar_dict 时不再访问 Redis；
+# 合约还没有收到推送（冷启动）或订阅断开期间，从 Redis hash 读取。
+import copy
+import json
+import logging
+import threading
+import time
+
+from common.config.config import config
+from panda_backtest.backtest_common.model.quotation.bar_quotation_data import BarQuotationData
+
+logger = logging.getLogger(__name__)
+
+FUTURE_TICK_QUOTATION_KEY = 'tushare_future_tick_quotation'
+
+# 行情推送中需要的字段，其余字段不进入缓存
+_FLOAT_FIELDS = ('open', 'high', 'low', 'close', 'volume', 'turnover', 'oi', 'settle', 'last', 'preclose',
+                 'limit_up', 'limit_down', 'askprice1', 'bidprice1', 'askvolume1', 'bidvolume1')
+
+
+def bar_from_dict(bar_data, receive_time):
+    bar_quotation_data = BarQuotationData()
+    bar_quotation_data.symbol = bar_data['symbol']
+    bar_quotation_data.date = str(bar_data['date'])
+    bar_quotation_data.time = str(bar_data['time'])
+    bar_quotation_data.trade_date = str(bar_data['trade_date'])
+    for field in _FLOAT_FIELDS:
+        setattr(bar_quotation_data, field, bar_data[field])
+    bar_quotation_data.publish_time = bar_data.get('publish_time', bar_quotation_data.publish_time)
+    bar_quotation_data.receive_time = receive_time
+    return bar_quotation_data
+
+
+class FutureTickQuoteCache(object):
+    """
+    每个合约只保存最新一笔行情（BarQuotationData），读取返回副本，调用方修改不影响缓存及其他读取方。
+    行情带有 publish_time（行情进程写入时间）与 receive_time（本进程收到时间），可用于判断行情是否过期。
+    """
+    _instance = None
+    _lock = threading.Lock()
+
+    def __init__(self, redis_client, push_enabled=True, retry_interval=5):
+        self.redis_client = redis_client
+        self.push_enabled = push_enabled
+        self.retry_interval = retry_interval
+        self.bar_dict = dict()
+        self.subscribed = False
+        self.thread = None
+        self.push_count = 0
+        self.redis_count = 0
+
+    @classmethod
+    def get_instance(cls, redis_client):
+        with cls._lock:
+            if cls._instance is None:
+                cls._instance = FutureTickQuoteCache(redis_client, config['FUTURE_QUOTE_PUSH_CACHE'])
+                cls._instance.start()
+        return cls._instance
+
+    def start(self):
+        if not self.push_enabled or self.thread is not None:
+            return
+        self.thread = threading.Thread(target=self.run, name='future-tick-quote-cache', daemon=True)
+        self.thread.start()
+
+    def run(self):
+        while True:
+            try:
+                ps = self.redis_client.subscribe(FUTURE_TICK_QUOTATION_KEY)
+                self.subscribed = True
+                for item in ps.listen():
+                    if item['type'] == 'message':
+                        self.on_message(item['data'])
+            except Exception:
+                logger.exception('期货行情订阅异常')
+            # 断开期间的推送已丢失，清空缓存，重新订阅前从 Redis 读取
+            self.subscribed = False
+            self.bar_dict.clear()
+            time.sleep(self.retry_interval)
+
+    def on_message(self, data):
+        try:
+            bar = bar_from_dict(json.loads(data), time.time())
+        except Exception:
+            logger.exception('期货行情推送解析失败')
+            return
+        self.push_count += 1
+        self.put(bar)
+
+    def put(self, bar):
+        # 行情进程多线程写入，推送可能乱序，只保留时间更新的一笔
+        old_bar = self.bar_dict.get(bar.symbol)
+        if old_bar is None or (bar.date, bar.time) >= (old_bar.date, old_bar.time):
+            self.bar_dict[bar.symbol] = bar
+
+    def get(self, symbol):
+        """
+        :return: 合约最新行情的副本，Redis 中也没有时返回 None
+        """
+        if self.subscribed:
+            bar = self.bar_dict.get(symbol)
+            if bar is not None:
+                return copy.copy(bar)
+        bar_data_json = self.redis_client.getHashRedis(FUTURE_TICK_QUOTATION_KEY, str.encode(symbol))
+        if not bar_data_json:
+            return None
+        self.redis_count += 1
+        bar = bar_from_dict(json.loads(bar_data_json), time.time())
+        if self.subscribed:
+            # 订阅已建立，此后的推送会覆盖这笔行情；已有推送时以推送为准
+            bar = self.bar_dict.setdefault(symbol, bar)
+            return copy.copy(bar)
+        return bar
+
+    def get_stats(self):
+        return {
+            'subscribed': self.subscribed,
+            'symbols': len(self.bar_dict),
+            'push_count': self.push_count,
+            'redis_count': self.redis_count,
+        }
@@ -1,7 +1,7 @@
-import json
 import traceback
 
 from panda_backtest.backtest_common.model.quotation.bar_quotation_data import BarQuotationData
+from panda_trading.trading.quotation.real_time.future_tick_quote_cache import FutureTickQuoteCache
 
 
 class TushareFutureTickQuotation(object):
@@ -9,37 +9,13 @@ class TushareFutureTickQuotation(object):
     def __init__(self, redis_client):
         self.my_bar_dict = dict()
         self.redis_client = redis_client
-        self.tushare_quotation_key = 'tushare_future_tick_quotation'
+        # 最新行情由进程内缓存提供，缓存未命中时从 Redis 读取
+        self.quote_cache = FutureTickQuoteCache.get_instance(redis_client)
 
     def __getitem__(self, item):
         try:
-            bar_data_json = self.redis_client.getHashRedis(
-                self.tushare_quotation_key, str.encode(item))
-            if bar_data_json:
-                bar_data = json.loads(bar_data_json)
-                bar_quotation_data = BarQuotationData()
-                bar_quotation_data.symbol = bar_data['symbol']
-                # bar_quotation_data.code = bar_data['code']
-                bar_quotation_data.date = str(bar_data['date'])
-                bar_quotation_data.time = str(bar_data['time'])
-                bar_quotation_data.trade_date = str(bar_data['trade_date'])
-                bar_quotation_data.open = bar_data['open']
-                bar_quotation_data.high = bar_data['high']
-                bar_quotation_data.low = bar_data['low']
-                bar_quotation_data.close = bar_data['close']
-                bar_quotation_data.volume = bar_data['volume']
-                bar_quotation_data.turnover = bar_data['turnover']
-                # bar_quotation_data.vwap = bar_data['vwap']
-                bar_quotation_data.oi = bar_data['oi']
-                bar_quotation_data.settle = bar_data['settle']
-                bar_quotation_data.last = bar_data['last']
-                bar_quotation_data.preclose = bar_data['preclose']
-                bar_quotation_data.limit_up = bar_data['limit_up']
-                bar_quotation_data.limit_down = bar_data['limit_down']
-                bar_quotation_data.askprice1 = bar_data['askprice1']
-                bar_quotation_data.bidprice1 = bar_data['bidprice1']
-                bar_quotation_data.askvolume1 = bar_data['askvolume1']
-                bar_quotation_data.bidvolume1 = bar_data['bidvolume1']
+            bar_quotation_data = self.quote_cache.get(item)
+            if bar_quotation_data is not None:
                 return bar_quotation_data
 
             bar = BarQuotationData()
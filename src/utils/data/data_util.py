@@ -1,35 +1,23 @@
-import pymongo
-
 from common.connector.mongodb_handler import DatabaseHandler as  MongoClient
 from common.config.config import config
+from common.utils.trade_calendar import TradeCalendar
 
 
 class DateUtil(object):
-    __quotation_db = MongoClient(config).get_mongo_db()
+    __quotation_db = MongoClient(config)
 
     @classmethod
     def get_pre_date(cls, trade_date):
-        trade_cal_col = cls.__quotation_db.trade_calendar
-        pre_trade_date_cur = trade_cal_col.find(
-            {'nature_date': {'$lt': str(trade_date)}, 'is_trade': 1, "exchange": "SH"}) \
-            .sort([('nature_date', -1)]).limit(1)
-        pre_trade_date_list = list(pre_trade_date_cur)
-        if len(pre_trade_date_list) <= 0:
-            return None
-        return pre_trade_date_list[0]['nature_date']
+        calendar = TradeCalendar.get_exchange_calendar(cls.__quotation_db)
+        return calendar.get_pre_date(trade_date)
 
     @classmethod
     def get_next_trade_date(cls, trade_date, operate='$gt'):
-        collection = cls.__quotation_db.trade_calendar
-        next_date_cur = collection.find({
-            'nature_date': {operate: str(trade_date)}, 'is_trade': 1, "exchange": "SH"}).sort('nature_date',
-                                                                                              pymongo.ASCENDING).limit(
-            1)
-        next_date_list = list(next_date_cur)
-        if len(next_date_list) <= 0:
-            return None
-        return next_date_list[0]['nature_date']
-
+        """
+        :param operate: '$gt' 不含当天，'$gte' 含当天
+        """
+        calendar = TradeCalendar.get_exchange_calendar(cls.__quotation_db)
+        return calendar.get_next_date(trade_date, include=operate == '$gte')
 
     @staticmethod
     def hand_str_list(mes_str, split_str):